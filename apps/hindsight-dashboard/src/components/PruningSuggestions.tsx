@@ -31,7 +31,7 @@ const PruningSuggestions: React.FC = () => {
   const [pruningParams, setPruningParams] = useState<PruningParams>({
     batch_size: 50,
     target_count: 100,
-    max_iterations: 10
+    max_iterations: 1
   });
 
   const navigate = useNavigate();
@@ -224,11 +224,11 @@ const PruningSuggestions: React.FC = () => {
               value={pruningParams.max_iterations}
               onChange={handleParamChange}
               min={1}
-              max={100}
+              max={10}
               className="block w-full rounded-md border border-gray-300 px-3 py-2 text-sm focus:border-blue-500 focus:outline-none focus:ring-2 focus:ring-blue-500/30"
             />
             <small className="block text-xs text-gray-500">
-              Maximum number of evaluation iterations to run (default: 10)
+              Maximum number of batches to evaluate, one LLM call each (default: 1, at most 10)
             </small>
           </div>
         </div>
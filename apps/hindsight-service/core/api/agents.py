@@ -88,6 +88,7 @@ def create_agent_endpoint(
             },
             status=AuditStatus.SUCCESS,
         )
+        db.commit()
     except Exception:
         pass
     return created
@@ -255,7 +256,6 @@ def delete_agent_endpoint(
     ensure_pat_allows_write(current_user, getattr(agent, 'organization_id', None))
     if not can_write(agent, current_user):
         raise HTTPException(status_code=403, detail="Forbidden")
-    crud.delete_agent(db, agent_id=agent_id)
     try:
         from core.audit import log, AuditAction, AuditStatus
         log(
@@ -275,6 +275,7 @@ def delete_agent_endpoint(
         )
     except Exception:
         pass
+    crud.delete_agent(db, agent_id=agent_id)
     return {"message": "Agent deleted successfully"}
 
 @router.put("/{agent_id}", response_model=schemas.Agent)
@@ -373,8 +374,6 @@ def change_agent_scope(
     agent.visibility_scope = target_scope
     agent.owner_user_id = owner_id
     agent.organization_id = org_uuid
-    db.commit()
-    db.refresh(agent)
     try:
         from core.audit import log, AuditAction, AuditStatus
         log(
@@ -396,4 +395,6 @@ def change_agent_scope(
         )
     except Exception:
         pass
+    db.commit()
+    db.refresh(agent)
     return agent
@@ -2,47 +2,139 @@
 Audit log API endpoints.
 
 Query and present audit logs with permission checks tailored for
-organization administrators.
+organization administrators. Listings are newest first; pass the
+``X-Next-Cursor`` response header back as ``cursor`` for the next page
+(keyset pagination, stable under concurrent inserts). ``/audits/export``
+streams every matching row as NDJSON for compliance pulls.
 """
+import base64
+import json
+from datetime import datetime
 from typing import Optional, List
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from core.db.database import get_db
-from core.db import schemas, crud
+from core.db import database, schemas, crud
 from core.api.deps import get_current_user_context
 from core.api.permissions import can_manage_org
+from core.services.audit_retention import run_audit_log_maintenance
 
 router = APIRouter(prefix="/audits", tags=["audits"])
 
+MAX_AUDIT_PAGE_SIZE = 1000
+EXPORT_PAGE_SIZE = 1000
+
+
+def _encode_cursor(log) -> str:
+    raw = f"{log.created_at.isoformat()}|{log.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str):
+    try:
+        created_at, log_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), uuid.UUID(log_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=422, detail="Invalid cursor")
+
+
+def _check_access(organization_id: Optional[uuid.UUID], current_user) -> None:
+    if organization_id:
+        if not can_manage_org(organization_id, current_user):
+            raise HTTPException(status_code=403, detail="Forbidden")
+    elif not current_user.is_superadmin:
+        raise HTTPException(status_code=403, detail="Forbidden, organization_id is required for non-superadmins")
+
+
+def _with_metadata(log):
+    # Schema expects .metadata (dict) but the model stores it in metadata_json.
+    setattr(log, 'metadata', getattr(log, 'metadata_json', None))
+    return log
+
+
 @router.get("/", response_model=List[schemas.AuditLog])
 def list_audit_logs(
+    response: Response,
     organization_id: Optional[uuid.UUID] = None,
     user_id: Optional[uuid.UUID] = None,
+    action_type: Optional[str] = None,
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db),
     user_context = Depends(get_current_user_context),
 ):
-    user = user_context.user
-    current_user = user_context.current
+    _check_access(organization_id, user_context.current)
 
-    if organization_id:
-        if not can_manage_org(organization_id, current_user):
-            raise HTTPException(status_code=403, detail="Forbidden")
-    elif not current_user.is_superadmin:
-        raise HTTPException(status_code=403, detail="Forbidden, organization_id is required for non-superadmins")
+    limit = max(1, min(limit, MAX_AUDIT_PAGE_SIZE))
+    audit_logs = crud.get_audit_logs(
+        db,
+        organization_id=organization_id,
+        user_id=user_id,
+        action_type=action_type,
+        status=status,
+        skip=0 if cursor else skip,
+        limit=limit,
+        before=_decode_cursor(cursor) if cursor else None,
+    )
+    if len(audit_logs) == limit:
+        response.headers["X-Next-Cursor"] = _encode_cursor(audit_logs[-1])
+    return [_with_metadata(log) for log in audit_logs]
+
+
+@router.get("/export")
+def export_audit_logs(
+    organization_id: Optional[uuid.UUID] = None,
+    user_id: Optional[uuid.UUID] = None,
+    action_type: Optional[str] = None,
+    status: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    user_context = Depends(get_current_user_context),
+):
+    """Every matching audit log as NDJSON, newest first.
+
+    Rows are read in keyset pages on a session owned by the stream, so
+    memory stays flat however large the export; a ``created_after`` /
+    ``created_before`` range limits the scan to the months it covers.
+    """
+    _check_access(organization_id, user_context.current)
+    filters = dict(
+        organization_id=organization_id,
+        user_id=user_id,
+        action_type=action_type,
+        status=status,
+        created_after=created_after,
+        created_before=created_before,
+    )
+
+    def _ndjson():
+        db = database.SessionLocal()
+        try:
+            for log in crud.iter_audit_logs(db, page_size=EXPORT_PAGE_SIZE, **filters):
+                row = schemas.AuditLog.model_validate(_with_metadata(log))
+                yield json.dumps(row.model_dump(mode="json")) + "\n"
+        finally:
+            db.close()
+
+    return StreamingResponse(
+        _ndjson(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="audit_logs.ndjson"'},
+    )
 
-    audit_logs = crud.get_audit_logs(db, organization_id=organization_id, user_id=user_id, skip=skip, limit=limit)
-    # Adapt SQLAlchemy objects: schema expects .metadata (dict) but model uses metadata_json column
-    adapted = []
-    for log in audit_logs:
-        # Create a lightweight shim object with attribute 'metadata'
-        if getattr(log, 'metadata_json', None) is not None:
-            setattr(log, 'metadata', log.metadata_json)
-        else:
-            setattr(log, 'metadata', None)
-        adapted.append(log)
-    return adapted
+
+@router.post("/maintenance")
+def run_maintenance(
+    db: Session = Depends(get_db),
+    user_context = Depends(get_current_user_context),
+):
+    """Create upcoming monthly partitions and drop those past retention (superadmin only)."""
+    if not user_context.current.is_superadmin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return run_audit_log_maintenance(db)
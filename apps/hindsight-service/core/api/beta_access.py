@@ -288,15 +288,6 @@ def update_beta_access_user_status(
     # Mirror the result to the user row in the same transaction.
     user.beta_access_status = desired
 
-    try:
-        db.commit()
-    except Exception as exc:
-        db.rollback()
-        raise HTTPException(status_code=500, detail="Failed to persist beta access status update.") from exc
-    db.refresh(user)
-    # Refresh the request snapshot we'll return in the audit log.
-    request = beta_repo.get_beta_access_request_by_email(db, user.email)
-
     audit_callable = getattr(sys.modules[__name__], "audit_log", audit_log)
     audit_callable(
         db,
@@ -312,4 +303,13 @@ def update_beta_access_user_status(
         },
     )
 
+    try:
+        db.commit()
+    except Exception as exc:
+        db.rollback()
+        raise HTTPException(status_code=500, detail="Failed to persist beta access status update.") from exc
+    db.refresh(user)
+    # Refresh the request snapshot we'll return.
+    request = beta_repo.get_beta_access_request_by_email(db, user.email)
+
     return {"success": True, "user": _serialize_user(user, request)}
@@ -6,7 +6,6 @@ memory blocks, coordinating with the async execution layer.
 """
 from typing import Optional, List
 import uuid
-import asyncio
 from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, Header, status, Body
@@ -19,10 +18,28 @@ from core.api.deps import get_current_user_context
 from core.api.permissions import can_manage_org, get_org_membership, is_member_of_org, can_manage_org_effective
 from core import async_bulk_operations  # Updated import for async system
 from core.audit import log_bulk_operation, AuditAction, AuditStatus
-from core.utils.scopes import SCOPE_ORGANIZATION, SCOPE_PERSONAL
 
 router = APIRouter(prefix="/bulk-operations", tags=["bulk-operations"])
 
+# Conflicts returned inline with a bulk-move plan; the rest are paged.
+CONFLICT_SAMPLE_SIZE = 20
+MAX_CONFLICT_PAGE_SIZE = 500
+MOVABLE_RESOURCE_TYPES = {"agents", "memory_blocks", "keywords"}
+
+
+def _coerce_move_destination(destination_organization_id, destination_owner_user_id):
+    """Parse the bulk-move destination ids, raising 422 on malformed values."""
+    try:
+        dest_org = (
+            uuid.UUID(str(destination_organization_id)) if destination_organization_id else None
+        )
+        dest_owner = (
+            uuid.UUID(str(destination_owner_user_id)) if destination_owner_user_id else None
+        )
+    except ValueError:
+        raise HTTPException(status_code=422, detail="Invalid destination id")
+    return dest_org, dest_owner
+
 
 @router.get("/organizations/{org_id}/inventory")
 def get_organization_inventory(
@@ -62,7 +79,7 @@ async def bulk_move(
     destination_organization_id = payload.get("destination_organization_id")
     destination_owner_user_id = payload.get("destination_owner_user_id")
     resource_types = payload.get("resource_types", ["agents", "memory_blocks", "keywords"])
-    if not isinstance(resource_types, list) or any(rt not in {"agents","memory_blocks","keywords"} for rt in resource_types):
+    if not isinstance(resource_types, list) or any(rt not in MOVABLE_RESOURCE_TYPES for rt in resource_types):
         raise HTTPException(status_code=422, detail="Invalid resource_types")
 
     if not destination_organization_id and not destination_owner_user_id:
@@ -177,63 +194,31 @@ async def bulk_move(
             if not can_manage_org_effective(dest_id, current_user, db=db, user_id=user.id, allow_db_fallback=True):
                 raise HTTPException(status_code=403, detail="Forbidden to move resources to the destination organization")
 
-    # Initialize plan containers for all resource types requested to guarantee keys exist
-    plan = {"resources_to_move": {}, "conflicts": {}}
+    # Counts and conflicts are computed in SQL so planning never loads the
+    # org; `conflicts` carries a sample, the full list is paged via
+    # POST /bulk-move/conflicts.
+    dest_org_uuid, dest_owner_uuid = _coerce_move_destination(destination_organization_id, destination_owner_user_id)
+    plan = {
+        "resources_to_move": crud.count_org_resources(db, org_id, resource_types),
+        "conflicts": {rt: [] for rt in resource_types},
+        "conflict_counts": {rt: 0 for rt in resource_types},
+    }
     for rt in resource_types:
-        if rt not in plan["resources_to_move"]:
-            plan["resources_to_move"][rt] = 0
-        if rt not in plan["conflicts"]:
-            plan["conflicts"][rt] = []
-
-    if "agents" in resource_types:
-        agents = db.query(models.Agent).filter(models.Agent.organization_id == org_id).all()
-        plan["resources_to_move"]["agents"] = len(agents)
-        for agent in agents:
-            existing = crud.get_agent_by_name(
-                db,
-                agent_name=agent.agent_name,
-                visibility_scope=SCOPE_ORGANIZATION if destination_organization_id else SCOPE_PERSONAL,
-                organization_id=destination_organization_id,
-                owner_user_id=destination_owner_user_id,
-            )
-            if existing:
-                plan["conflicts"]["agents"].append({"name": agent.agent_name, "id": agent.agent_id})
-
-    if "keywords" in resource_types:
-        # Fetch keywords in source org. Keep simple list semantics; Mock from tests provides .all().
-        keywords = db.query(models.Keyword).filter(models.Keyword.organization_id == org_id).all() or []
-        try:
-            plan["resources_to_move"]["keywords"] = len(keywords)
-        except TypeError:
-            # If a Mock without __len__, coerce to list
-            try:
-                keywords = list(keywords)
-                plan["resources_to_move"]["keywords"] = len(keywords)
-            except Exception:
-                keywords = []
-                plan["resources_to_move"]["keywords"] = 0
-
-        # Detect true conflicts by checking destination scope presence per keyword
-        destination_scope = SCOPE_ORGANIZATION if destination_organization_id else SCOPE_PERSONAL
-        for keyword in keywords:
-            existing = crud.get_scoped_keyword_by_text(
-                db,
-                keyword_text=keyword.keyword_text,
-                visibility_scope=destination_scope,
-                organization_id=destination_organization_id,
-                owner_user_id=destination_owner_user_id,
+        if rt not in crud.MOVE_CONFLICT_RESOURCE_TYPES:
+            continue
+        conflict_count = crud.count_move_conflicts(
+            db, rt, org_id,
+            destination_organization_id=dest_org_uuid,
+            destination_owner_user_id=dest_owner_uuid,
+        )
+        plan["conflict_counts"][rt] = conflict_count
+        if conflict_count:
+            plan["conflicts"][rt] = crud.get_move_conflicts(
+                db, rt, org_id,
+                destination_organization_id=dest_org_uuid,
+                destination_owner_user_id=dest_owner_uuid,
+                limit=CONFLICT_SAMPLE_SIZE,
             )
-            # If a keyword with the same text exists in the destination with the appropriate scope, it's a conflict
-            if existing:
-                plan["conflicts"]["keywords"].append({"text": keyword.keyword_text, "id": getattr(keyword, "keyword_id", None)})
-
-    if "memory_blocks" in resource_types:
-        raw_memory_blocks = db.query(models.MemoryBlock).filter(models.MemoryBlock.organization_id == org_id).all()
-        try:
-            memory_blocks = list(raw_memory_blocks)
-        except TypeError:
-            memory_blocks = []
-        plan["resources_to_move"]["memory_blocks"] = len(memory_blocks)
 
     if dry_run:
         return plan
@@ -254,18 +239,69 @@ async def bulk_move(
             action=AuditAction.BULK_OPERATION_START,
             metadata={"type": "bulk_move", "dry_run": False, "resource_types": resource_types},
         )
+        db.commit()
     except Exception:
         pass
 
-    # Start async task in the background
-    asyncio.create_task(
-        async_bulk_operations.execute_bulk_operation_async(
-            bulk_operation.id, "bulk_move", user.id, org_id, payload
-        )
+    # The pending row is the job; wake a local queue worker to pick it up.
+    await async_bulk_operations.execute_bulk_operation_async(
+        bulk_operation.id, "bulk_move", user.id, org_id, payload
     )
 
     return {"operation_id": bulk_operation.id, "status": "started"}
 
+@router.post("/organizations/{org_id}/bulk-move/conflicts")
+def list_bulk_move_conflicts(
+    org_id: uuid.UUID,
+    payload: dict = Body(...),
+    db: Session = Depends(get_db),
+    user_context = Depends(get_current_user_context),
+):
+    """Page through every name conflict of a planned bulk move.
+
+    Same destination fields and planning permissions as a dry-run
+    bulk-move; pages are keyset-ordered by resource id, pass
+    ``next_cursor`` back as ``cursor`` until it is null.
+    """
+    user = user_context.user
+    current_user = user_context.current
+
+    resource_type = payload.get("resource_type")
+    if resource_type not in MOVABLE_RESOURCE_TYPES:
+        raise HTTPException(status_code=422, detail="Invalid resource_type")
+    destination_organization_id = payload.get("destination_organization_id")
+    destination_owner_user_id = payload.get("destination_owner_user_id")
+    if bool(destination_organization_id) == bool(destination_owner_user_id):
+        raise HTTPException(status_code=422, detail="Exactly one of destination_organization_id or destination_owner_user_id is required")
+    dest_org_uuid, dest_owner_uuid = _coerce_move_destination(destination_organization_id, destination_owner_user_id)
+    try:
+        limit = int(payload.get("limit", 100))
+        cursor = uuid.UUID(str(payload["cursor"])) if payload.get("cursor") else None
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=422, detail="Invalid cursor or limit")
+    limit = max(1, min(limit, MAX_CONFLICT_PAGE_SIZE))
+
+    is_super = bool(current_user.is_superadmin)
+    memberships_by_org = current_user.memberships_by_org or {}
+    if not (is_super or memberships_by_org.get(str(org_id))):
+        raise HTTPException(status_code=403, detail="Forbidden")
+    if dest_org_uuid and not (is_super or memberships_by_org.get(str(dest_org_uuid))):
+        raise HTTPException(status_code=403, detail="Forbidden to move resources to the destination organization")
+    if dest_owner_uuid and not is_super and dest_owner_uuid != getattr(user, "id", None):
+        raise HTTPException(status_code=403, detail="destination_owner_user_id must match the requesting user")
+
+    items = []
+    if resource_type in crud.MOVE_CONFLICT_RESOURCE_TYPES:
+        items = crud.get_move_conflicts(
+            db, resource_type, org_id,
+            destination_organization_id=dest_org_uuid,
+            destination_owner_user_id=dest_owner_uuid,
+            after_id=cursor,
+            limit=limit,
+        )
+    next_cursor = items[-1]["id"] if len(items) == limit else None
+    return {"resource_type": resource_type, "items": items, "next_cursor": next_cursor}
+
 @router.post("/organizations/{org_id}/bulk-delete")
 async def bulk_delete(
     org_id: uuid.UUID,
@@ -327,14 +363,13 @@ async def bulk_delete(
             action=AuditAction.BULK_OPERATION_START,
             metadata={"type": "bulk_delete", "dry_run": False, "resource_types": resource_types},
         )
+        db.commit()
     except Exception:
         pass
 
-    # Start async task instead of thread
-    asyncio.create_task(
-        async_bulk_operations.execute_bulk_operation_async(
-            bulk_operation.id, "bulk_delete", user.id, org_id, payload
-        )
+    # The pending row is the job; wake a local queue worker to pick it up.
+    await async_bulk_operations.execute_bulk_operation_async(
+        bulk_operation.id, "bulk_delete", user.id, org_id, payload
     )
 
     return {"operation_id": bulk_operation.id, "status": "started"}
@@ -350,23 +385,11 @@ def get_operation_status(
     if not current_user.is_superadmin:
         raise HTTPException(status_code=403, detail="Forbidden")
 
+    # The row is kept current by whichever queue worker runs the operation.
     operation = crud.get_bulk_operation(db, bulk_operation_id=operation_id)
     if not operation:
         raise HTTPException(status_code=404, detail="Operation not found")
 
-    # Check if there's additional status from the async manager
-    async_status = async_bulk_operations.get_bulk_operation_status(operation_id)
-    if async_status:
-        # Update the operation with the latest status if it's still running
-        if async_status.get("status") in ["running", "completed", "failed"]:
-            operation.status = async_status.get("status", operation.status)
-            if async_status.get("status") == "completed":
-                operation.finished_at = operation.finished_at or datetime.now(timezone.utc)
-                if "total_moved" in async_status:
-                    operation.result_summary = {"total_moved": async_status["total_moved"]}
-                elif "total_deleted" in async_status:
-                    operation.result_summary = {"total_deleted": async_status["total_deleted"]}
-
     return operation
 
 
@@ -380,22 +403,7 @@ def get_operations_status(
     if not current_user.is_superadmin:
         raise HTTPException(status_code=403, detail="Forbidden")
 
-    operations = crud.get_bulk_operations(db)
-    
-    # Update operations with latest async status
-    for operation in operations:
-        async_status = async_bulk_operations.get_bulk_operation_status(operation.id)
-        if async_status:
-            if async_status.get("status") in ["running", "completed", "failed"]:
-                operation.status = async_status.get("status", operation.status)
-                if async_status.get("status") == "completed":
-                    operation.finished_at = operation.finished_at or datetime.now(timezone.utc)
-                    if "total_moved" in async_status:
-                        operation.result_summary = {"total_moved": async_status["total_moved"]}
-                    elif "total_deleted" in async_status:
-                        operation.result_summary = {"total_deleted": async_status["total_deleted"]}
-
-    return operations
+    return crud.get_bulk_operations(db)
 
 
 @router.post("/admin/operations/{operation_id}/cancel")
@@ -413,14 +421,13 @@ def cancel_operation(
     if not operation:
         raise HTTPException(status_code=404, detail="Operation not found")
 
-    # Try to cancel the async task
-    cancelled = async_bulk_operations.cancel_bulk_operation(operation_id)
-    
-    if cancelled:
-        # Update the operation status in the database
-        operation.status = "cancelled"
-        operation.finished_at = datetime.now(timezone.utc)
-        db.commit()
-        return {"message": "Operation cancelled successfully"}
-    else:
+    if operation.status not in ("pending", "running"):
         raise HTTPException(status_code=400, detail="Operation could not be cancelled or is not running")
+
+    # Persisting the cancel is what stops the operation: pending rows are no
+    # longer claimed, and whichever replica runs it checks between chunks.
+    operation.status = "cancelled"
+    operation.finished_at = datetime.now(timezone.utc)
+    db.commit()
+    async_bulk_operations.cancel_bulk_operation(operation_id)
+    return {"message": "Operation cancelled successfully"}
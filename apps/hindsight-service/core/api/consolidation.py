@@ -13,7 +13,7 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from core.db import crud, schemas, models
+from core.db import crud, schemas
 from core.api.permissions import can_read, can_write
 from core.api.deps import (
     get_scoped_user_and_context,
@@ -73,31 +73,40 @@ def trigger_consolidation_endpoint(
         raise HTTPException(status_code=500, detail=f"Error triggering consolidation process: {str(e)}")
 
 
+def _original_blocks(suggestion, blocks_by_id: dict) -> list:
+    """Originals of ``suggestion`` in stored order; ``None`` where a block is missing."""
+    originals = []
+    for mid in suggestion.original_memory_ids or []:
+        try:
+            originals.append(blocks_by_id.get(str(uuid.UUID(str(mid)))))
+        except ValueError:
+            originals.append(None)
+    return originals
+
+
+def _suggestion_org_id(db: Session, suggestion):
+    """Organization of the first org-owned original, for PAT checks and audit."""
+    if getattr(suggestion, 'organization_id', None):
+        return suggestion.organization_id
+    for mem in _original_blocks(suggestion, crud.get_original_memory_blocks(db, [suggestion])):
+        if mem and getattr(mem, 'organization_id', None):
+            return mem.organization_id
+    return None
+
+
 def _user_can_view_suggestion(db: Session, suggestion, current_user) -> bool:
     try:
         # Check at least one original memory is readable
-        for mid in suggestion.original_memory_ids or []:
-            try:
-                mem = db.query(models.MemoryBlock).filter(models.MemoryBlock.id == uuid.UUID(str(mid))).first()
-            except Exception:
-                mem = None
-            if mem and can_read(mem, current_user):
-                return True
+        blocks_by_id = crud.get_original_memory_blocks(db, [suggestion])
+        return any(mem and can_read(mem, current_user) for mem in _original_blocks(suggestion, blocks_by_id))
     except Exception:
-        pass
-    return False
+        return False
 
 def _user_can_write_suggestion(db: Session, suggestion, current_user) -> bool:
     try:
         # Require write on all originals to proceed with mutation
-        for mid in suggestion.original_memory_ids or []:
-            try:
-                mem = db.query(models.MemoryBlock).filter(models.MemoryBlock.id == uuid.UUID(str(mid))).first()
-            except Exception:
-                mem = None
-            if not (mem and can_write(mem, current_user)):
-                return False
-        return True
+        blocks_by_id = crud.get_original_memory_blocks(db, [suggestion])
+        return all(mem and can_write(mem, current_user) for mem in _original_blocks(suggestion, blocks_by_id))
     except Exception:
         return False
 
@@ -148,21 +157,12 @@ def get_consolidation_suggestions_endpoint(
         except Exception:
             return False
 
-    scoped_suggestions = []
-    for s in raw_suggestions:
-        ok = False
-        for mid in (s.original_memory_ids or []):
-            try:
-                mem = db.query(models.MemoryBlock).filter(models.MemoryBlock.id == uuid.UUID(str(mid))).first()
-            except Exception:
-                mem = None
-            if not mem:
-                continue
-            if can_read(mem, current_user) and _in_scope(mem):
-                ok = True
-                break
-        if ok:
-            scoped_suggestions.append(s)
+    # One query for the originals of the whole page instead of one per id.
+    blocks_by_id = crud.get_original_memory_blocks(db, raw_suggestions)
+    scoped_suggestions = [
+        s for s in raw_suggestions
+        if any(mem and can_read(mem, current_user) and _in_scope(mem) for mem in _original_blocks(s, blocks_by_id))
+    ]
 
     total_items = len(scoped_suggestions)
     total_pages = math.ceil(total_items / limit) if limit > 0 else 0
@@ -224,13 +224,7 @@ def validate_consolidation_suggestion_endpoint(
         )
     # PAT enforcement for write in org context (derive org if applicable)
     try:
-        org_id = None
-        for mid in (suggestion.original_memory_ids or []):
-            mem = db.query(models.MemoryBlock).filter(models.MemoryBlock.id == uuid.UUID(str(mid))).first()
-            if mem and getattr(mem, 'organization_id', None):
-                org_id = mem.organization_id
-                break
-        ensure_pat_allows_write(current_user, org_id)
+        ensure_pat_allows_write(current_user, _suggestion_org_id(db, suggestion))
     except Exception:
         pass
 
@@ -254,15 +248,7 @@ def validate_consolidation_suggestion_endpoint(
         # Audit: consolidation validated
         try:
             # Try to derive an org from first original memory
-            org_id = None
-            for mid in (updated.original_memory_ids or []):
-                try:
-                    mem = db.query(models.MemoryBlock).filter(models.MemoryBlock.id == uuid.UUID(str(mid))).first()
-                except Exception:
-                    mem = None
-                if mem and getattr(mem, 'organization_id', None):
-                    org_id = mem.organization_id
-                    break
+            org_id = _suggestion_org_id(db, updated)
             audit_log(
                 db,
                 action=AuditAction.CONSOLIDATION_VALIDATE,
@@ -276,6 +262,7 @@ def validate_consolidation_suggestion_endpoint(
                     "original_count": len(updated.original_memory_ids or []),
                 },
             )
+            db.commit()
         except Exception:
             pass
         return updated
@@ -310,48 +297,34 @@ def reject_consolidation_suggestion_endpoint(
         raise HTTPException(status_code=403, detail="Forbidden")
     # PAT enforcement for write on org context
     try:
-        org_id = None
-        for mid in (suggestion.original_memory_ids or []):
-            mem = db.query(models.MemoryBlock).filter(models.MemoryBlock.id == uuid.UUID(str(mid))).first()
-            if mem and getattr(mem, 'organization_id', None):
-                org_id = mem.organization_id
-                break
-        ensure_pat_allows_write(current_user, org_id)
+        ensure_pat_allows_write(current_user, _suggestion_org_id(db, suggestion))
     except Exception:
         pass
     if not _user_can_view_suggestion(db, suggestion, current_user):
         raise HTTPException(status_code=404, detail="Consolidation suggestion not found")
 
-    update_schema = schemas.ConsolidationSuggestionUpdate(status="rejected")
-    updated = crud.update_consolidation_suggestion(
-        db, suggestion_id=suggestion_id, suggestion=update_schema
-    )
-    # Audit: consolidation rejected
+    # Audit: consolidation rejected (committed with the status change below)
     try:
-        org_id = None
-        for mid in (updated.original_memory_ids or []):
-            try:
-                mem = db.query(models.MemoryBlock).filter(models.MemoryBlock.id == uuid.UUID(str(mid))).first()
-            except Exception:
-                mem = None
-            if mem and getattr(mem, 'organization_id', None):
-                org_id = mem.organization_id
-                break
+        org_id = _suggestion_org_id(db, suggestion)
         audit_log(
             db,
             action=AuditAction.CONSOLIDATION_REJECT,
             status=AuditStatus.SUCCESS,
             target_type="consolidation_suggestion",
-            target_id=updated.suggestion_id,
+            target_id=suggestion.suggestion_id,
             actor_user_id=current_user.id,
             organization_id=org_id,
             metadata={
-                "group_id": str(updated.group_id) if getattr(updated, 'group_id', None) else None,
-                "original_count": len(updated.original_memory_ids or []),
+                "group_id": str(suggestion.group_id) if getattr(suggestion, 'group_id', None) else None,
+                "original_count": len(suggestion.original_memory_ids or []),
             },
         )
     except Exception:
         pass
+    update_schema = schemas.ConsolidationSuggestionUpdate(status="rejected")
+    updated = crud.update_consolidation_suggestion(
+        db, suggestion_id=suggestion_id, suggestion=update_schema
+    )
     return updated
 
 
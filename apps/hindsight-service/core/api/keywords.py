@@ -82,6 +82,7 @@ def create_keyword_endpoint(
             },
             status=AuditStatus.SUCCESS,
         )
+        db.commit()
     except Exception:
         pass
     return created
@@ -156,6 +157,7 @@ def update_keyword_endpoint(
             },
             status=AuditStatus.SUCCESS,
         )
+        db.commit()
     except Exception:
         pass
     return db_keyword
@@ -174,25 +176,24 @@ def delete_keyword_endpoint(
     ensure_pat_allows_write(current_user, getattr(existing, 'organization_id', None))
     if not can_write(existing, current_user):
         raise HTTPException(status_code=403, detail="Forbidden")
-    success = crud.delete_keyword(db, keyword_id=keyword_id)
-    if success:
-        try:
-            from core.audit import log_keyword, AuditAction, AuditStatus
-            log_keyword(
-                db,
-                actor_user_id=current_user.id if current_user else existing.owner_user_id,
-                organization_id=existing.organization_id,
-                keyword_id=existing.keyword_id,
-                action=AuditAction.KEYWORD_DELETE,
-                text=existing.keyword_text,
-                extra_metadata={
-                    "scope": existing.visibility_scope,
-                    "organization_id": str(existing.organization_id) if existing.organization_id else None,
-                },
-                status=AuditStatus.SUCCESS,
-            )
-        except Exception:
-            pass
+    try:
+        from core.audit import log_keyword, AuditAction, AuditStatus
+        log_keyword(
+            db,
+            actor_user_id=current_user.id if current_user else existing.owner_user_id,
+            organization_id=existing.organization_id,
+            keyword_id=existing.keyword_id,
+            action=AuditAction.KEYWORD_DELETE,
+            text=existing.keyword_text,
+            extra_metadata={
+                "scope": existing.visibility_scope,
+                "organization_id": str(existing.organization_id) if existing.organization_id else None,
+            },
+            status=AuditStatus.SUCCESS,
+        )
+    except Exception:
+        pass
+    crud.delete_keyword(db, keyword_id=keyword_id)
     return {"message": "Keyword deleted successfully"}
 
 @router.get("/{keyword_id}/memory-blocks/", response_model=List[schemas.MemoryBlock])
@@ -21,6 +21,7 @@ logger.info("app_startup: log_level=%s", LOG_LEVEL_NAME)
 
 from core.api.auth import IdentityMismatchError
 from core.api.middleware.scope import enforce_write_scope_metadata
+from core.api.middleware.query_stats import record_query_stats
 
 # Resource routers (existing)
 from core.api.orgs import router as orgs_router
@@ -41,6 +42,7 @@ from core.api.pruning import router as pruning_router
 from core.api.compression import router as compression_router
 from core.api.search import router as search_router
 from core.api.memory_blocks_bulk import router as memory_blocks_bulk_router
+from core.api.metrics import router as metrics_router
 
 # Database schema is managed by Alembic migrations.
 
@@ -53,16 +55,39 @@ async def lifespan(_app: FastAPI):
     a process restart (#88). The check runs synchronously before the app
     accepts traffic; failure to reconcile is logged but does not block
     startup (better to serve traffic than to crash on a transient DB
-    glitch).
+    glitch). Then start this process's bulk-operation queue workers, which
+    also resume queued operations abandoned by a dead replica, the
+    email outbox sender, and the audit log partition maintenance.
+
+    On shutdown: stop the queue workers after their current chunk, the
+    outbox sender after its in-flight batches, the notification change
+    listener and the audit log maintenance, flush the buffered audit
+    records, and shut down the keyword-extraction process pool.
     """
+    from core import async_bulk_operations
     try:
-        from core.async_bulk_operations import reconcile_stuck_bulk_operations
-        reconciled = reconcile_stuck_bulk_operations(min_age_seconds=60)
+        reconciled = async_bulk_operations.reconcile_stuck_bulk_operations(min_age_seconds=60)
         if reconciled:
             logger.info("startup: reconciled %d stuck bulk operations to 'failed'", reconciled)
     except Exception as exc:  # pragma: no cover — defensive logging
         logger.warning("startup: bulk-operation reconciliation failed: %s", exc)
-    yield
+    async_bulk_operations.start_bulk_operation_workers()
+    from core.services.notifications import outbox
+    outbox.start_email_outbox()
+    from core.services import audit_retention
+    audit_retention.start_audit_log_maintenance()
+    try:
+        yield
+    finally:
+        async_bulk_operations.stop_bulk_operation_workers()
+        outbox.stop_email_outbox()
+        from core.services.notifications.change_stream import stop_notification_change_listener
+        stop_notification_change_listener()
+        audit_retention.stop_audit_log_maintenance()
+        from core.services.audit_writer import stop_audit_log_writer
+        stop_audit_log_writer()
+        from core.services.keyword_extraction_service import shutdown_keyword_extraction_pool
+        shutdown_keyword_extraction_pool()
 
 
 app = FastAPI(
@@ -141,6 +166,9 @@ async def enforce_readonly_for_guests(request: Request, call_next):
 # Middleware: require explicit scope metadata on write operations for scoped resources
 app.middleware("http")(enforce_write_scope_metadata)
 
+# Middleware: per-request query count / DB time, N+1 warnings, Server-Timing outside prod
+app.middleware("http")(record_query_stats)
+
 # ---------------------------------------------------------------------------
 # Router registration
 # ---------------------------------------------------------------------------
@@ -162,6 +190,10 @@ app.include_router(compression_router)
 app.include_router(search_router)
 app.include_router(memory_blocks_bulk_router)
 
+# Prometheus scrape endpoint; on by default, METRICS_ENABLED=false unmounts it.
+if os.getenv("METRICS_ENABLED", "true").lower() == "true":
+    app.include_router(metrics_router)
+
 # Test-fixtures router — ONLY mounted when E2E_TEST_HOOKS=true.
 # These endpoints seed DB state for the Playwright E2E suite and bypass
 # LLM-gated paths (e.g. consolidation suggestion creation). MUST NOT be
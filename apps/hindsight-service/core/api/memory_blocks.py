@@ -90,7 +90,10 @@ def create_memory_block_endpoint(
         'owner_user_id': u.id if scope == SCOPE_PERSONAL else None,
         'organization_id': sc.organization_id if scope == SCOPE_ORGANIZATION else None,
     })
-    db_memory_block = crud.create_memory_block(db=db, memory_block=mb)
+    try:
+        db_memory_block = crud.create_memory_block(db=db, memory_block=mb)
+    except crud.DuplicateMemoryBlockError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
     return db_memory_block
 
 @router.get("/", response_model=schemas.PaginatedMemoryBlocks)
@@ -344,23 +347,24 @@ def update_memory_block_endpoint(
     ensure_pat_allows_write(current_user, getattr(current, 'organization_id', None))
     if not can_write(current, current_user):
         raise HTTPException(status_code=403, detail="Forbidden")
-    updated = crud.update_memory_block(db, memory_id=memory_id, memory_block=memory_block)
+    # Audit first: the commit in crud.update_memory_block persists it with the change.
     try:
         from core.audit import log_memory, AuditAction, AuditStatus
         log_memory(
             db,
             actor_user_id=current_user.id,
-            organization_id=updated.organization_id,
-            memory_block_id=updated.id,
+            organization_id=current.organization_id,
+            memory_block_id=current.id,
             action=AuditAction.MEMORY_UPDATE,
             status=AuditStatus.SUCCESS,
             metadata={
-                "scope": updated.visibility_scope,
-                "organization_id": str(updated.organization_id) if updated.organization_id else None,
+                "scope": current.visibility_scope,
+                "organization_id": str(current.organization_id) if current.organization_id else None,
             },
         )
     except Exception:
         pass
+    updated = crud.update_memory_block(db, memory_id=memory_id, memory_block=memory_block)
     return updated
 
 @router.post("/{memory_id}/archive", response_model=schemas.MemoryBlock)
@@ -377,25 +381,25 @@ def archive_memory_block_endpoint(
     ensure_pat_allows_write(current_user, getattr(current, 'organization_id', None))
     if not can_write(current, current_user):
         raise HTTPException(status_code=403, detail="Forbidden")
-    db_memory_block = crud.archive_memory_block(db, memory_id=memory_id)
-    if db_memory_block is None:
-        raise HTTPException(status_code=404, detail="Memory block not found")
     try:
         from core.audit import log_memory, AuditAction, AuditStatus
         log_memory(
             db,
             actor_user_id=current_user.id,
-            organization_id=db_memory_block.organization_id,
-            memory_block_id=db_memory_block.id,
+            organization_id=current.organization_id,
+            memory_block_id=current.id,
             action=AuditAction.MEMORY_ARCHIVE,
             status=AuditStatus.SUCCESS,
             metadata={
-                "scope": db_memory_block.visibility_scope,
-                "organization_id": str(db_memory_block.organization_id) if db_memory_block.organization_id else None,
+                "scope": current.visibility_scope,
+                "organization_id": str(current.organization_id) if current.organization_id else None,
             },
         )
     except Exception:
         pass
+    db_memory_block = crud.archive_memory_block(db, memory_id=memory_id)
+    if db_memory_block is None:
+        raise HTTPException(status_code=404, detail="Memory block not found")
     return db_memory_block
 
 @router.delete("/{memory_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -414,7 +418,6 @@ def soft_delete_memory_block_endpoint(
     if not can_write(current, current_user):
         raise HTTPException(status_code=403, detail="Forbidden")
     if not getattr(current, 'archived', False):
-        crud.archive_memory_block(db, memory_id)
         try:
             from core.audit import log_memory, AuditAction, AuditStatus
             log_memory(
@@ -431,6 +434,7 @@ def soft_delete_memory_block_endpoint(
             )
         except Exception:
             pass
+        crud.archive_memory_block(db, memory_id)
     return JSONResponse(status_code=status.HTTP_204_NO_CONTENT, content=None)
 
 @router.delete("/{memory_id}/hard-delete", status_code=status.HTTP_204_NO_CONTENT)
@@ -447,9 +451,6 @@ def hard_delete_memory_block_endpoint(
     ensure_pat_allows_write(current_user, getattr(current, 'organization_id', None))
     if not can_write(current, current_user):
         raise HTTPException(status_code=403, detail="Forbidden")
-    success = crud.delete_memory_block(db, memory_id=memory_id)
-    if not success:
-        raise HTTPException(status_code=404, detail="Memory block not found")
     try:
         from core.audit import log_memory, AuditAction, AuditStatus
         log_memory(
@@ -466,6 +467,9 @@ def hard_delete_memory_block_endpoint(
         )
     except Exception:
         pass
+    success = crud.delete_memory_block(db, memory_id=memory_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Memory block not found")
     return {"message": "Memory block hard deleted successfully"}
 
 @router.post("/{memory_id}/feedback/", response_model=schemas.MemoryBlock)
@@ -658,8 +662,10 @@ def change_memory_block_scope(
         mb.organization_id = None
         mb.owner_user_id = None
 
-    db.commit()
-    db.refresh(mb)
+    # Pending suggestions over this block store its old scope; fix them in this transaction.
+    db.flush()
+    crud.resync_suggestion_scopes(db, [mb.id])
+
     # Audit log
     try:
         from core.audit import log, AuditAction, AuditStatus
@@ -682,6 +688,8 @@ def change_memory_block_scope(
         )
     except Exception:
         pass
+    db.commit()
+    db.refresh(mb)
     return mb
     # Re-query keywords since relationship may not be loaded
     current_keywords = mb.keywords
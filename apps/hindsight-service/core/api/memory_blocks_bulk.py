@@ -10,27 +10,40 @@ so they live here rather than in bulk_operations.py which carries the
 /bulk-operations prefix for admin-level operations.
 """
 import asyncio
+import json
 import logging
 import os
 import uuid
-from concurrent.futures import ThreadPoolExecutor
+from collections import defaultdict
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from core.db import crud, models, schemas
+from core.db import crud, database, models, schemas
 from core.db.database import get_db
 from core.api.deps import get_scoped_user_and_context, ensure_pat_allows_write
 from core.pruning.compression_service import get_compression_service
-from core.services.keyword_extraction_service import extract_keywords_enhanced
+from core.services.keyword_extraction_service import iter_extract_keywords
 from core.utils.feature_flags import llm_features_enabled
+from core.utils.scopes import SCOPE_ORGANIZATION, SCOPE_PERSONAL
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
+def _content_preview(content: str) -> str:
+    return content[:100] + "..." if len(content) > 100 else content
+
+
+def _keyword_text(text) -> str:
+    # Same normalisation as keywords created with a memory block.
+    return (text or "").strip().rstrip('.')
+
+
 @router.post("/memory-blocks/bulk-generate-keywords", response_model=dict)
 def bulk_generate_keywords_endpoint(
     request: dict,
@@ -40,6 +53,11 @@ def bulk_generate_keywords_endpoint(
     """
     Generate keywords for multiple memory blocks using basic keyword extraction.
     Returns suggested keywords for each memory block for user review and approval.
+
+    All blocks are fetched in one query with their keywords; extraction of
+    large selections runs in a process pool. With ``"stream": true`` the
+    response is NDJSON: one ``suggestion`` line per block as soon as it is
+    extracted, then a final ``summary`` line with the counts below.
     """
     memory_block_ids = request.get("memory_block_ids", [])
 
@@ -54,55 +72,72 @@ def bulk_generate_keywords_endpoint(
     ensure_pat_allows_write(current_user)
 
     try:
-        suggestions = []
-        successful_count = 0
         failed_count = 0
-
+        memory_ids = []
         for memory_id_str in memory_block_ids:
             try:
-                memory_id = uuid.UUID(memory_id_str)
-                memory_block = crud.get_memory_block(db, memory_id=memory_id)
-
-                if not memory_block:
-                    logger.warning(f"Memory block not found: {memory_id_str}")
-                    continue
-
-                # Extract keywords from content and lessons_learned
-                content_text = (memory_block.content or '') + ' ' + (memory_block.lessons_learned or '')
-
-                # Simple keyword extraction (enhanced version of the disabled function)
-                suggested_keywords = extract_keywords_enhanced(content_text)
-
-                if suggested_keywords:
-                    suggestions.append({
-                        "memory_block_id": str(memory_id),
-                        "memory_block_content_preview": (memory_block.content or '')[:100] + "..." if len(memory_block.content or '') > 100 else (memory_block.content or ''),
-                        "suggested_keywords": suggested_keywords,
-                        "current_keywords": [kw.keyword_text for kw in memory_block.keywords] if memory_block.keywords else []
-                    })
-                    successful_count += 1
-                else:
-                    logger.info(f"No keywords could be extracted for memory block {memory_id_str}")
-                    failed_count += 1
-
-            except ValueError:
+                memory_ids.append(uuid.UUID(memory_id_str))
+            except (TypeError, ValueError):
                 failed_count += 1
                 logger.error(f"Invalid UUID format: {memory_id_str}")
-            except Exception as e:
-                failed_count += 1
-                logger.error(f"Error processing memory block {memory_id_str}: {str(e)}")
 
+        blocks_by_id = {mb.id: mb for mb in crud.get_memory_blocks_by_ids(db, memory_ids)}
+        # Snapshot what the response needs so extraction never touches the session.
+        blocks = []
+        for memory_id in memory_ids:
+            memory_block = blocks_by_id.get(memory_id)
+            if memory_block is None:
+                logger.warning(f"Memory block not found: {memory_id}")
+                continue
+            blocks.append((
+                memory_id,
+                memory_block.content or '',
+                (memory_block.content or '') + ' ' + (memory_block.lessons_learned or ''),
+                [kw.keyword_text for kw in memory_block.keywords],
+            ))
+    except Exception as e:
+        logger.error(f"Error in bulk keyword generation: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error generating keywords: {str(e)}")
+
+    counts = {"successful": 0, "failed": failed_count}
+
+    def _suggestions():
+        extracted = iter_extract_keywords(text for _, _, text, _ in blocks)
+        for (memory_id, content, _, current_keywords), suggested_keywords in zip(blocks, extracted):
+            if suggested_keywords:
+                counts["successful"] += 1
+                yield {
+                    "memory_block_id": str(memory_id),
+                    "memory_block_content_preview": _content_preview(content),
+                    "suggested_keywords": suggested_keywords,
+                    "current_keywords": current_keywords,
+                }
+            else:
+                logger.info(f"No keywords could be extracted for memory block {memory_id}")
+                counts["failed"] += 1
+
+    def _summary():
         return {
-            "suggestions": suggestions,
-            "successful_count": successful_count,
-            "failed_count": failed_count,
+            "successful_count": counts["successful"],
+            "failed_count": counts["failed"],
             "total_processed": len(memory_block_ids),
-            "message": f"Generated keyword suggestions for {successful_count} memory blocks"
+            "message": f"Generated keyword suggestions for {counts['successful']} memory blocks"
         }
 
+    if request.get("stream"):
+        def _ndjson():
+            for suggestion in _suggestions():
+                yield json.dumps({"type": "suggestion", **suggestion}) + "\n"
+            yield json.dumps({"type": "summary", **_summary()}) + "\n"
+
+        return StreamingResponse(_ndjson(), media_type="application/x-ndjson")
+
+    try:
+        suggestions = list(_suggestions())
     except Exception as e:
         logger.error(f"Error in bulk keyword generation: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error generating keywords: {str(e)}")
+    return {"suggestions": suggestions, **_summary()}
 
 
 @router.post("/memory-blocks/bulk-apply-keywords", response_model=dict)
@@ -132,60 +167,111 @@ def bulk_apply_keywords_endpoint(
         failed_count = 0
         results = []
 
+        # Resolve every block (with its current keywords) up front, and the
+        # keyword texts once per keyword scope. Keywords live in the block's
+        # scope and match case-insensitively, like _get_or_create_keyword_scoped.
+        parsed = []
         for application in applications:
             memory_block_id = application.get("memory_block_id")
             selected_keywords = application.get("selected_keywords", [])
-
             if not memory_block_id or not selected_keywords:
                 failed_count += 1
                 continue
-
             try:
-                memory_id = uuid.UUID(memory_block_id)
-                memory_block = crud.get_memory_block(db, memory_id=memory_id)
+                parsed.append((memory_block_id, uuid.UUID(str(memory_block_id)), selected_keywords))
+            except ValueError as e:
+                # Keep its place in the results; the error stands in for the keywords.
+                parsed.append((memory_block_id, None, str(e)))
+
+        blocks_by_id = {
+            mb.id: mb
+            for mb in crud.get_memory_blocks_by_ids(db, [memory_id for _, memory_id, _ in parsed if memory_id])
+        }
 
-                if not memory_block:
-                    failed_count += 1
-                    continue
-
-                added_keywords = []
-                skipped_keywords = []
-
-                for keyword_text in selected_keywords:
-                    # Get or create keyword
-                    keyword = crud.get_keyword_by_text(db, keyword_text=keyword_text)
-                    if not keyword:
-                        keyword_create = schemas.KeywordCreate(keyword_text=keyword_text)
-                        keyword = crud.create_keyword(db=db, keyword=keyword_create)
-
-                    # Check if association already exists
-                    existing_association = db.query(models.MemoryBlockKeyword).filter(
-                        models.MemoryBlockKeyword.memory_id == memory_id,
-                        models.MemoryBlockKeyword.keyword_id == keyword.keyword_id
-                    ).first()
-
-                    if not existing_association:
-                        crud.create_memory_block_keyword(db, memory_id=memory_id, keyword_id=keyword.keyword_id)
-                        added_keywords.append(keyword_text)
-                    else:
-                        skipped_keywords.append(keyword_text)
-
-                results.append({
-                    "memory_block_id": memory_block_id,
-                    "added_keywords": added_keywords,
-                    "skipped_keywords": skipped_keywords,
-                    "success": True
-                })
-                successful_count += 1
+        def _keyword_scope(memory_block):
+            scope = memory_block.visibility_scope or SCOPE_PERSONAL
+            return (
+                scope,
+                memory_block.organization_id if scope == SCOPE_ORGANIZATION else None,
+                (memory_block.owner_user_id or user.id) if scope == SCOPE_PERSONAL else None,
+            )
+
+        texts_by_scope = defaultdict(set)
+        for _, memory_id, selected_keywords in parsed:
+            if memory_id in blocks_by_id:
+                texts_by_scope[_keyword_scope(blocks_by_id[memory_id])].update(
+                    _keyword_text(text) for text in selected_keywords
+                )
+        keywords_by_scope = {
+            key: crud.get_scoped_keywords_by_texts(
+                db, texts, visibility_scope=key[0], organization_id=key[1], owner_user_id=key[2]
+            )
+            for key, texts in texts_by_scope.items()
+        }
+
+        for memory_block_id, memory_id, selected_keywords in parsed:
+            if memory_id is None:
+                logger.error(f"Error applying keywords to memory block {memory_block_id}: {selected_keywords}")
+                results.append({"memory_block_id": memory_block_id, "error": selected_keywords, "success": False})
+                failed_count += 1
+                continue
+            memory_block = blocks_by_id.get(memory_id)
+            if not memory_block:
+                failed_count += 1
+                continue
 
+            scope, organization_id, owner_user_id = key = _keyword_scope(memory_block)
+            known = keywords_by_scope[key]
+            created = {}
+            added_keywords = []
+            skipped_keywords = []
+            try:
+                # One savepoint per block: a failing row is reported in the
+                # results without undoing the blocks applied before it.
+                with db.begin_nested():
+                    existing_ids = {mbk.keyword_id for mbk in memory_block.memory_block_keywords}
+                    for keyword_text in selected_keywords:
+                        processed = _keyword_text(keyword_text)
+                        if not processed:
+                            skipped_keywords.append(keyword_text)
+                            continue
+                        lowered = processed.lower()
+                        keyword = known.get(lowered) or created.get(lowered)
+                        if keyword is None:
+                            keyword = models.Keyword(
+                                keyword_text=processed,
+                                visibility_scope=scope,
+                                owner_user_id=owner_user_id,
+                                organization_id=organization_id,
+                            )
+                            db.add(keyword)
+                            db.flush()
+                            created[lowered] = keyword
+                        if keyword.keyword_id in existing_ids:
+                            skipped_keywords.append(keyword_text)
+                            continue
+                        db.add(models.MemoryBlockKeyword(memory_id=memory_id, keyword_id=keyword.keyword_id))
+                        existing_ids.add(keyword.keyword_id)
+                        added_keywords.append(keyword_text)
+                    db.flush()
             except Exception as e:
                 logger.error(f"Error applying keywords to memory block {memory_block_id}: {str(e)}")
-                results.append({
-                    "memory_block_id": memory_block_id,
-                    "error": str(e),
-                    "success": False
-                })
+                db.expire(memory_block)
+                results.append({"memory_block_id": memory_block_id, "error": str(e), "success": False})
                 failed_count += 1
+                continue
+
+            # Only keywords whose savepoint was released are visible to later blocks.
+            known.update(created)
+            results.append({
+                "memory_block_id": memory_block_id,
+                "added_keywords": added_keywords,
+                "skipped_keywords": skipped_keywords,
+                "success": True
+            })
+            successful_count += 1
+
+        db.commit()
 
         return {
             "results": results,
@@ -195,19 +281,62 @@ def bulk_apply_keywords_endpoint(
         }
 
     except Exception as e:
+        db.rollback()
         logger.error(f"Error in bulk keyword application: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error applying keywords: {str(e)}")
 
 
+def _prepare_compactions(memory_ids, compression_service, user_instructions: str) -> dict:
+    # Runs in the threadpool on its own session, closed before the LLM calls.
+    db = database.SessionLocal()
+    try:
+        return {
+            block.id: compression_service.prepare_block(block, user_instructions)
+            for block in crud.get_memory_blocks_by_ids(db, memory_ids)
+        }
+    finally:
+        db.close()
+
+
+def _apply_compactions(updates) -> dict:
+    """Write ``(memory_id, content, lessons)`` updates; returns errors by id.
+
+    Runs in the threadpool on its own session: each update commits and
+    re-embeds the block, which must not block the event loop.
+    """
+    errors = {}
+    db = database.SessionLocal()
+    try:
+        for memory_id, content, lessons in updates:
+            try:
+                updated_memory = crud.update_memory_block(
+                    db=db,
+                    memory_id=memory_id,
+                    memory_block=schemas.MemoryBlockUpdate(content=content, lessons_learned=lessons),
+                )
+            except Exception as e:
+                logger.error(f"Error compacting memory block {memory_id}: {str(e)}")
+                db.rollback()
+                errors[memory_id] = str(e)
+                continue
+            if not updated_memory:
+                errors[memory_id] = "Failed to update memory block"
+    finally:
+        db.close()
+    return errors
+
+
 @router.post("/memory-blocks/bulk-compact", response_model=dict)
 async def bulk_compact_memory_blocks_endpoint(
     request: dict,
-    db: Session = Depends(get_db),
     scoped = Depends(get_scoped_user_and_context),
 ):
     """
     Bulk compact multiple memory blocks using AI compression.
     This endpoint processes multiple memory blocks for compaction with optional concurrency.
+
+    Blocks are read and updated in the threadpool on short-lived sessions,
+    so neither the database work nor the re-embedding blocks the event loop.
     """
     user = scoped.user
     current_user = scoped.current
@@ -244,111 +373,89 @@ async def bulk_compact_memory_blocks_endpoint(
 
     logger.info(f"Starting bulk compaction for {len(memory_block_ids)} blocks with {max_concurrent} concurrent processes")
 
-    def process_single_block(memory_id_str: str):
-        """Process a single memory block in a separate thread."""
-        try:
-            memory_id = uuid.UUID(memory_id_str)
-            logger.info(f"Starting compression for block {memory_id_str}")
-
-            # Get compression service instance (in the thread)
-            compression_service = get_compression_service(llm_api_key)
+    compression_service = get_compression_service(llm_api_key)
 
-            # Create a new DB session for this thread
-            db_gen = get_db()
-            thread_db = next(db_gen)
+    def _failure(memory_id_str: str, error: str) -> dict:
+        return {"memory_block_id": memory_id_str, "success": False, "error": error}
 
+    try:
+        # Resolve every block with one query and snapshot the prompts; no
+        # pooled connection is held while the LLM calls are in flight.
+        parsed_ids = {}
+        for memory_id_str in memory_block_ids:
             try:
-                # Compress the memory block
-                compression_result = compression_service.compress_memory_block(
-                    db=thread_db,
-                    memory_id=memory_id,
-                    user_instructions=user_instructions
-                )
-                logger.info(f"Compression completed for block {memory_id_str}")
-
-                # Check if compression was successful
-                if "error" not in compression_result:
-                    # Auto-apply the compression if successful
-                    compressed_content = compression_result.get("compressed_content")
-                    compressed_lessons = compression_result.get("compressed_lessons_learned")
-
-                    if compressed_content:
-                        # Update the memory block with compressed content
-                        update_data = schemas.MemoryBlockUpdate(
-                            content=compressed_content,
-                            lessons_learned=compressed_lessons
-                        )
-
-                        updated_memory = crud.update_memory_block(
-                            db=thread_db,
-                            memory_id=memory_id,
-                            memory_block=update_data
-                        )
-
-                        if updated_memory:
-                            return {
-                                "memory_block_id": memory_id_str,
-                                "success": True,
-                                "original_length": len(compression_result.get("original_content", "")),
-                                "compressed_length": len(compressed_content),
-                                "compression_ratio": compression_result.get("compression_ratio", 0),
-                                "message": "Successfully compacted"
-                            }
-                        else:
-                            return {
-                                "memory_block_id": memory_id_str,
-                                "success": False,
-                                "error": "Failed to update memory block"
-                            }
-                    else:
-                        return {
-                            "memory_block_id": memory_id_str,
-                            "success": False,
-                            "error": "No compressed content returned"
-                        }
-                else:
-                    return {
-                        "memory_block_id": memory_id_str,
-                        "success": False,
-                        "error": compression_result.get("message", "Compression failed")
-                    }
-            finally:
-                thread_db.close()
-
-        except ValueError:
-            logger.error(f"Invalid UUID format: {memory_id_str}")
-            return {
-                "memory_block_id": memory_id_str,
-                "success": False,
-                "error": "Invalid UUID format"
-            }
-        except Exception as e:
-            logger.error(f"Error compacting memory block {memory_id_str}: {str(e)}")
-            return {
+                parsed_ids[memory_id_str] = uuid.UUID(str(memory_id_str))
+            except ValueError:
+                logger.error(f"Invalid UUID format: {memory_id_str}")
+        prepared = await run_in_threadpool(
+            _prepare_compactions, list(set(parsed_ids.values())), compression_service, user_instructions
+        )
+
+        # The gateway enforces the global rate/concurrency limits; this
+        # semaphore only caps how much of that budget one request may take.
+        semaphore = asyncio.Semaphore(max_concurrent)
+
+        async def compress_one(memory_id_str: str):
+            memory_id = parsed_ids.get(memory_id_str)
+            if memory_id is None:
+                return memory_id_str, None, _failure(memory_id_str, "Invalid UUID format")
+            if memory_id not in prepared:
+                return memory_id_str, None, _failure(memory_id_str, f"Memory block {memory_id} does not exist")
+            async with semaphore:
+                logger.info(f"Starting compression for block {memory_id_str}")
+                compression_result = await compression_service.compress_prepared(prepared[memory_id])
+            return memory_id_str, memory_id, compression_result
+
+        compressed = await asyncio.gather(
+            *(compress_one(memory_id_str) for memory_id_str in memory_block_ids),
+            return_exceptions=True,
+        )
+
+        # Results keep the request order; successful compressions are applied
+        # together and their placeholders filled in afterwards.
+        results = []
+        applied = []
+        for outcome in compressed:
+            if isinstance(outcome, Exception):
+                results.append(outcome)
+                continue
+            memory_id_str, memory_id, compression_result = outcome
+            if memory_id is None:
+                results.append(compression_result)
+                continue
+            if "error" in compression_result:
+                results.append(_failure(memory_id_str, compression_result.get("message", "Compression failed")))
+                continue
+
+            # Auto-apply the compression if successful
+            compressed_content = compression_result.get("compressed_content")
+            if not compressed_content:
+                results.append(_failure(memory_id_str, "No compressed content returned"))
+                continue
+            applied.append((len(results), memory_id_str, memory_id, compression_result))
+            results.append(None)
+
+        errors = await run_in_threadpool(
+            _apply_compactions,
+            [
+                (memory_id, result.get("compressed_content"), result.get("compressed_lessons_learned"))
+                for _, _, memory_id, result in applied
+            ],
+        )
+        for index, memory_id_str, memory_id, compression_result in applied:
+            if memory_id in errors:
+                results[index] = _failure(memory_id_str, errors[memory_id])
+                continue
+            results[index] = {
                 "memory_block_id": memory_id_str,
-                "success": False,
-                "error": str(e)
+                "success": True,
+                "original_length": len(compression_result.get("original_content") or ""),
+                "compressed_length": len(compression_result["compressed_content"]),
+                "compression_ratio": compression_result.get("compression_ratio", 0),
+                "llm_cache_hit": compression_result.get("llm_cache_hit", False),
+                "message": "Successfully compacted"
             }
 
-    try:
-        # Use ThreadPoolExecutor for concurrent processing
-        # Use a fresh event loop retrieval that is future-safe; if no loop set, create one
-        try:
-            loop = asyncio.get_running_loop()
-        except RuntimeError:
-            # No running loop; create a temporary one (mainly for sync test contexts)
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-        with ThreadPoolExecutor(max_workers=max_concurrent) as executor:
-            # Create tasks for all memory blocks
-            tasks = [
-                loop.run_in_executor(executor, process_single_block, memory_id)
-                for memory_id in memory_block_ids
-            ]
-
-            # Wait for all tasks to complete
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-
         # Process results and handle exceptions
         processed_results = []
         successful_count = 0
@@ -374,6 +481,7 @@ async def bulk_compact_memory_blocks_endpoint(
             "successful_count": successful_count,
             "failed_count": failed_count,
             "total_processed": len(memory_block_ids),
+            "llm_cache_hits": sum(1 for item in processed_results if item.get("llm_cache_hit")),
             "message": f"Successfully compacted {successful_count} out of {len(memory_block_ids)} memory blocks"
         }
 
@@ -2,141 +2,150 @@
 Memory optimization endpoints.
 
 Analyzes memory blocks to surface compaction, keyword, archival, and
-duplicate‑merge suggestions; simple mock execution support.
+duplicate‑merge suggestions; simple mock execution support. Suggestions
+are computed with aggregate queries and cached per scope as a snapshot that
+is refreshed in the background once it expires.
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from sqlalchemy import exists, func
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+import os
+import threading
+import time
 import uuid
-from datetime import datetime, UTC
+from datetime import datetime, timedelta, UTC
 import json
+from collections import OrderedDict
 
 from core.db import crud, models
-from core.db.database import get_db
+from core.db.database import SessionLocal, get_db
 from core.db import schemas
 from core.db import scope_utils
 from core.api.deps import get_scoped_user_and_context, ensure_pat_allows_read
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Seconds a per-scope suggestions snapshot is served before it is refreshed
+# in the background; the stale snapshot is served while that runs.
+SNAPSHOT_TTL_SECONDS = int(os.getenv("MEMORY_OPTIMIZATION_SNAPSHOT_TTL_SECONDS", 300))
+# Snapshots kept at once (one per user and scope); the least recently used
+# is evicted beyond this. 0 disables caching.
+SNAPSHOT_MAX_ENTRIES = int(os.getenv("MEMORY_OPTIMIZATION_SNAPSHOT_MAX_ENTRIES", 256))
+
+COMPACTION_MIN_LENGTH = 1500
+ARCHIVE_MIN_AGE_DAYS = 90
+PREVIEW_LIMIT = 20
+
+_snapshots: "OrderedDict[Tuple[Any, ...], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_refreshing: set = set()
+_snapshots_lock = threading.Lock()
+
+
+def _scoped_blocks(db: Session, current_user, scope_ctx):
+    q = db.query(models.MemoryBlock).filter(models.MemoryBlock.archived == False)
+    q = scope_utils.apply_scope_filter(q, current_user, models.MemoryBlock)
+    if scope_ctx is not None:
+        q = scope_utils.apply_optional_scope_narrowing(q, scope_ctx.scope, scope_ctx.organization_id, models.MemoryBlock)
+    return q
+
+
+def _ids(query, limit: Optional[int] = None) -> List[str]:
+    query = query.with_entities(models.MemoryBlock.id).order_by(models.MemoryBlock.created_at, models.MemoryBlock.id)
+    if limit is not None:
+        query = query.limit(limit)
+    return [str(memory_id) for (memory_id,) in query.all()]
+
+
+def _count(query) -> int:
+    return query.with_entities(func.count(models.MemoryBlock.id)).scalar() or 0
+
 
 def _compute_suggestions(db: Session, *, current_user, scope_ctx):
     """
-    Analyze memory blocks and return AI-powered optimization suggestions
+    Analyze memory blocks and return AI-powered optimization suggestions.
+
+    Every check is an aggregate or id-only query over the scoped blocks, so
+    no block rows are loaded into Python.
     """
     try:
         suggestions = []
+        blocks = _scoped_blocks(db, current_user, scope_ctx)
+        total_blocks = _count(blocks)
         
         # 1. Analyze for compaction opportunities (long memory blocks)
-        q = db.query(models.MemoryBlock).filter(models.MemoryBlock.archived == False)
-        q = scope_utils.apply_scope_filter(q, current_user, models.MemoryBlock)
-        if scope_ctx is not None:
-            q = scope_utils.apply_optional_scope_narrowing(q, scope_ctx.scope, scope_ctx.organization_id, models.MemoryBlock)
-        long_blocks = q.all()
+        compaction_ids = _ids(blocks.filter(func.length(models.MemoryBlock.content) > COMPACTION_MIN_LENGTH))
         
-        # Find blocks that are longer than 1500 characters
-        compaction_candidates = [
-            block for block in long_blocks 
-            if len(block.content or '') > 1500
-        ]
-        
-        if compaction_candidates:
+        if compaction_ids:
             suggestions.append({
                 "id": str(uuid.uuid4()),
                 "type": "compaction",
-                "title": f"Compact {len(compaction_candidates)} lengthy memory blocks",
-                "description": f"Found {len(compaction_candidates)} memory blocks with more than 1500 characters that could benefit from compaction to improve performance and reduce storage.",
-                "priority": "high" if len(compaction_candidates) > 10 else "medium",
-                "affected_blocks": [str(block.id) for block in compaction_candidates[:20]],  # Limit to 20 for display
-                "all_affected_blocks": [str(block.id) for block in compaction_candidates],   # full set for execution
-                "estimated_impact": f"Reduce storage by an estimated 30-50% ({len(compaction_candidates)} blocks)",
+                "title": f"Compact {len(compaction_ids)} lengthy memory blocks",
+                "description": f"Found {len(compaction_ids)} memory blocks with more than {COMPACTION_MIN_LENGTH} characters that could benefit from compaction to improve performance and reduce storage.",
+                "priority": "high" if len(compaction_ids) > 10 else "medium",
+                "affected_blocks": compaction_ids[:PREVIEW_LIMIT],  # Limit to 20 for display
+                "all_affected_blocks": compaction_ids,   # full set for execution
+                "estimated_impact": f"Reduce storage by an estimated 30-50% ({len(compaction_ids)} blocks)",
                 "status": "pending"
             })
         
-        # 2. Analyze for keyword optimization (blocks without keywords)
-        blocks_without_keywords = []
-        for block in long_blocks:
-            if not block.memory_block_keywords or len(block.memory_block_keywords) == 0:
-                blocks_without_keywords.append(block)
+        # 2. Analyze for keyword optimization (anti-join on memory_block_keywords)
+        has_keywords = exists().where(models.MemoryBlockKeyword.memory_id == models.MemoryBlock.id)
+        keywordless_ids = _ids(blocks.filter(~has_keywords))
         
-        if blocks_without_keywords:
+        if keywordless_ids:
             suggestions.append({
                 "id": str(uuid.uuid4()),
                 "type": "keywords",
-                "title": f"Add keywords to {len(blocks_without_keywords)} memory blocks",
-                "description": f"Found {len(blocks_without_keywords)} memory blocks without keywords. Adding keywords will improve searchability and organization.",
+                "title": f"Add keywords to {len(keywordless_ids)} memory blocks",
+                "description": f"Found {len(keywordless_ids)} memory blocks without keywords. Adding keywords will improve searchability and organization.",
                 "priority": "medium",
-                "affected_blocks": [str(block.id) for block in blocks_without_keywords[:20]],  # preview subset
-                "all_affected_blocks": [str(block.id) for block in blocks_without_keywords],   # full set for execution
-                "estimated_impact": f"Improve searchability for {len(blocks_without_keywords)} blocks",
+                "affected_blocks": keywordless_ids[:PREVIEW_LIMIT],  # preview subset
+                "all_affected_blocks": keywordless_ids,   # full set for execution
+                "estimated_impact": f"Improve searchability for {len(keywordless_ids)} blocks",
                 "status": "pending"
             })
         
         # 3. Analyze for archival opportunities (old, low-feedback blocks)
-        old_query = db.query(models.MemoryBlock).filter(
-            models.MemoryBlock.archived == False,
+        # More than 90 whole days old, matching the previous timedelta.days > 90 check.
+        archive_cutoff = datetime.now(UTC) - timedelta(days=ARCHIVE_MIN_AGE_DAYS + 1)
+        archival = blocks.filter(
             models.MemoryBlock.feedback_score <= 0,
-            models.MemoryBlock.retrieval_count <= 1
+            models.MemoryBlock.retrieval_count <= 1,
+            models.MemoryBlock.created_at <= archive_cutoff,
         )
-        old_query = scope_utils.apply_scope_filter(old_query, current_user, models.MemoryBlock)
-        if scope_ctx is not None:
-            old_query = scope_utils.apply_optional_scope_narrowing(old_query, scope_ctx.scope, scope_ctx.organization_id, models.MemoryBlock)
-        old_blocks = old_query.all()
-
-        # Filter to blocks older than 90 days with low engagement
-        archival_candidates = []
-        current_time = datetime.now(UTC)
-        for block in old_blocks:
-            # Handle timezone-aware vs naive datetime comparison
-            created_at = block.created_at
-            if created_at is None:
-                continue
-
-            # Ensure created_at is timezone-aware for comparison
-            if created_at.tzinfo is None:
-                created_at = created_at.replace(tzinfo=UTC)
-
-            days_old = (current_time - created_at).days
-            
-            if days_old > 90:
-                archival_candidates.append(block)
+        archival_count = _count(archival)
         
-        if archival_candidates:
+        if archival_count:
             suggestions.append({
                 "id": str(uuid.uuid4()),
                 "type": "archive",
-                "title": f"Archive {len(archival_candidates)} old, unused memory blocks",
-                "description": f"Found {len(archival_candidates)} memory blocks that are over 90 days old with low engagement (0 feedback, ≤1 retrievals). Consider archiving to improve performance.",
+                "title": f"Archive {archival_count} old, unused memory blocks",
+                "description": f"Found {archival_count} memory blocks that are over {ARCHIVE_MIN_AGE_DAYS} days old with low engagement (0 feedback, ≤1 retrievals). Consider archiving to improve performance.",
                 "priority": "low",
-                "affected_blocks": [str(block.id) for block in archival_candidates[:20]],
-                "estimated_impact": f"Clean up {len(archival_candidates)} low-value blocks",
+                "affected_blocks": _ids(archival, PREVIEW_LIMIT),
+                "estimated_impact": f"Clean up {archival_count} low-value blocks",
                 "status": "pending"
             })
         
-        # 4. Analyze for potential duplicates (simple content similarity)
-        # This is a basic implementation - in a real system you'd use semantic similarity
-        content_groups = {}
-        for block in long_blocks[:100]:  # Limit to avoid performance issues
-            # Simple similarity based on first 100 characters
-            content_key = (block.content or '')[:100].lower().strip()
-            if len(content_key) > 50:  # Only consider blocks with substantial content
-                if content_key not in content_groups:
-                    content_groups[content_key] = []
-                content_groups[content_key].append(block)
-
-        duplicate_groups = {k: v for k, v in content_groups.items() if len(v) > 1}
-        if duplicate_groups:
-            total_duplicates = sum(len(group) for group in duplicate_groups.values())
-            all_duplicate_blocks = []
-            for group in duplicate_groups.values():
-                all_duplicate_blocks.extend(group)
-
+        # 4. Analyze for exact duplicates: GROUP BY the stored content hash
+        # within each scope. Totals come from a count; only a preview's worth
+        # of ids is fetched.
+        duplicate_group_count, total_duplicates = crud.count_duplicate_content_blocks(db, blocks)
+        if duplicate_group_count:
+            duplicate_groups = crud.get_duplicate_content_groups(
+                db, blocks, limit=PREVIEW_LIMIT, max_ids_per_group=PREVIEW_LIMIT
+            )
+            duplicate_ids = [str(memory_id) for group in duplicate_groups for memory_id in group]
             suggestions.append({
                 "id": str(uuid.uuid4()),
                 "type": "merge",
                 "title": f"Merge {total_duplicates} potentially duplicate memory blocks",
-                "description": f"Found {len(duplicate_groups)} groups of similar memory blocks that might be duplicates. Merging them could reduce redundancy.",
+                "description": f"Found {duplicate_group_count} groups of identical memory blocks. Merging them could reduce redundancy.",
                 "priority": "medium",
-                "affected_blocks": [str(block.id) for block in all_duplicate_blocks[:20]],
+                "affected_blocks": duplicate_ids[:PREVIEW_LIMIT],
                 "estimated_impact": f"Reduce redundancy by merging {total_duplicates} similar blocks",
                 "status": "pending"
             })
@@ -144,15 +153,89 @@ def _compute_suggestions(db: Session, *, current_user, scope_ctx):
         return {
             "suggestions": suggestions,
             "analysis_timestamp": datetime.now(UTC).isoformat(),
-            "total_memory_blocks_analyzed": len(long_blocks)
+            "total_memory_blocks_analyzed": total_blocks
         }
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to analyze memory blocks: {str(e)}")
 
 
+def _snapshot_key(current_user, scope_ctx) -> Tuple[Any, ...]:
+    user_id = getattr(current_user, "id", None) if current_user is not None else None
+    return (
+        user_id,
+        getattr(scope_ctx, "scope", None),
+        getattr(scope_ctx, "organization_id", None),
+    )
+
+
+def _store_snapshot(key: Tuple[Any, ...], snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    with _snapshots_lock:
+        _refreshing.discard(key)
+        if SNAPSHOT_MAX_ENTRIES <= 0:
+            return snapshot
+        _snapshots[key] = (time.monotonic(), snapshot)
+        _snapshots.move_to_end(key)
+        while len(_snapshots) > SNAPSHOT_MAX_ENTRIES:
+            _snapshots.popitem(last=False)
+    return snapshot
+
+
+def _refresh_snapshot(key: Tuple[Any, ...], current_user, scope_ctx) -> None:
+    """Recompute one scope's snapshot on a fresh session (background task)."""
+    db = SessionLocal()
+    try:
+        _store_snapshot(key, _compute_suggestions(db, current_user=current_user, scope_ctx=scope_ctx))
+    except Exception as e:
+        logger.error(f"Memory optimization snapshot refresh failed: {e}")
+        with _snapshots_lock:
+            _refreshing.discard(key)
+    finally:
+        db.close()
+
+
+def _get_suggestions_snapshot(
+    db: Session,
+    *,
+    current_user,
+    scope_ctx,
+    background_tasks: BackgroundTasks,
+) -> Dict[str, Any]:
+    """Cached suggestions for the caller's scope.
+
+    A missing snapshot is computed inline. An expired one is still returned
+    and refreshed after the response, once per scope at a time. Suggestion
+    ids stay stable for a snapshot's lifetime, so the execute endpoint can
+    resolve them.
+    """
+    key = _snapshot_key(current_user, scope_ctx)
+    with _snapshots_lock:
+        cached = _snapshots.get(key)
+        if cached is not None:
+            _snapshots.move_to_end(key)
+        refresh = (
+            cached is not None
+            and time.monotonic() - cached[0] >= SNAPSHOT_TTL_SECONDS
+            and key not in _refreshing
+        )
+        if refresh:
+            _refreshing.add(key)
+    if cached is None:
+        return _store_snapshot(key, _compute_suggestions(db, current_user=current_user, scope_ctx=scope_ctx))
+    if refresh:
+        background_tasks.add_task(_refresh_snapshot, key, current_user, scope_ctx)
+    return cached[1]
+
+
+def reset_suggestion_snapshots() -> None:  # pragma: no cover - used in tests
+    with _snapshots_lock:
+        _snapshots.clear()
+        _refreshing.clear()
+
+
 @router.get("/suggestions")
 async def get_memory_optimization_suggestions(
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     scoped = Depends(get_scoped_user_and_context),
 ):
@@ -160,27 +243,28 @@ async def get_memory_optimization_suggestions(
     current_user = scoped.current
     scope_ctx = scoped.scope
     ensure_pat_allows_read(current_user, scope_ctx.organization_id)
-    return _compute_suggestions(db, current_user=current_user, scope_ctx=scope_ctx)
+    return _get_suggestions_snapshot(
+        db, current_user=current_user, scope_ctx=scope_ctx, background_tasks=background_tasks
+    )
 
 @router.post("/suggestions/{suggestion_id}/execute")
 async def execute_optimization_suggestion(
     suggestion_id: str,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     scoped = Depends(get_scoped_user_and_context),
 ):
     """
     Execute a specific optimization suggestion
     """
-    import logging
-    
-    logger = logging.getLogger(__name__)
-    
     try:
-        # First, re-analyze to get current suggestions and find the suggestion by ID
+        # Look the suggestion up in the scope's snapshot, which issued its ID
         user = scoped.user
         current_user = scoped.current
         scope_ctx = scoped.scope
-        response = _compute_suggestions(db, current_user=current_user, scope_ctx=scope_ctx)
+        response = _get_suggestions_snapshot(
+            db, current_user=current_user, scope_ctx=scope_ctx, background_tasks=background_tasks
+        )
         suggestions = response.get("suggestions", [])
         
         # Find the suggestion by ID
@@ -0,0 +1,89 @@
+"""
+Prometheus scrape endpoint.
+
+GET /metrics — this process's metrics in the text exposition format
+
+Latencies and counts are recorded where the work happens (see
+``core.metrics``); the gauges below are refreshed on each scrape: DB pool
+occupancy, LLM gateway totals, the bulk-operation queue and the email
+outbox. A collector that fails is logged and skipped so the rest of the
+scrape still answers. Mounted unless ``METRICS_ENABLED=false``.
+"""
+import logging
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.orm import Session
+
+from core import metrics
+from core.db import database
+from core.db.database import get_db
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["metrics"])
+
+
+def _collect_db_pool() -> None:
+    pool = database.engine.pool
+    # StaticPool / NullPool (SQLite, tests) have no size to report.
+    for gauge, reader in (
+        (metrics.DB_POOL_SIZE, "size"),
+        (metrics.DB_POOL_CHECKED_OUT, "checkedout"),
+        (metrics.DB_POOL_OVERFLOW, "overflow"),
+    ):
+        read = getattr(pool, reader, None)
+        if callable(read):
+            gauge.set(read())
+
+
+def _collect_llm_gateway() -> None:
+    from core.services.llm_gateway import get_llm_gateway
+
+    for purpose, stats in get_llm_gateway().metrics().items():
+        metrics.LLM_CALLS.set_total(stats["calls"], purpose=purpose)
+        metrics.LLM_ERRORS.set_total(stats["errors"], purpose=purpose)
+        metrics.LLM_CACHE_HITS.set_total(stats["cache_hits"], purpose=purpose)
+        metrics.LLM_LATENCY.set_total(stats["latency_seconds_total"], purpose=purpose)
+        metrics.LLM_THROTTLED.set_total(stats["throttled_seconds_total"], purpose=purpose)
+        metrics.LLM_TOKENS.set_total(stats["input_tokens"], purpose=purpose, direction="input")
+        metrics.LLM_TOKENS.set_total(stats["output_tokens"], purpose=purpose, direction="output")
+
+
+def _collect_bulk_operation_queue(db: Session) -> None:
+    from core.async_bulk_operations import count_queued_bulk_operations
+
+    for status, count in count_queued_bulk_operations(db).items():
+        metrics.BULK_OPERATION_QUEUE_DEPTH.set(count, status=status)
+
+
+def _collect_email_outbox(db: Session) -> None:
+    from core.db.repositories.email_outbox import get_outbox_stats
+
+    stats = get_outbox_stats(db)
+    metrics.EMAIL_OUTBOX_QUEUED.set(stats["queued"])
+    metrics.EMAIL_OUTBOX_DEAD_LETTER.set(stats["dead_letter"])
+    lag = 0.0
+    oldest = stats["oldest_due_at"]
+    if oldest is not None:
+        if oldest.tzinfo is None:
+            oldest = oldest.replace(tzinfo=timezone.utc)
+        lag = max((datetime.now(timezone.utc) - oldest).total_seconds(), 0.0)
+    metrics.EMAIL_OUTBOX_LAG.set(lag)
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def scrape_metrics(db: Session = Depends(get_db)):
+    for collector in (_collect_db_pool, _collect_llm_gateway):
+        try:
+            collector()
+        except Exception as exc:
+            logger.warning("metrics collector %s failed: %s", collector.__name__, exc)
+    for collector in (_collect_bulk_operation_queue, _collect_email_outbox):
+        try:
+            collector(db)
+        except Exception as exc:
+            db.rollback()
+            logger.warning("metrics collector %s failed: %s", collector.__name__, exc)
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
@@ -0,0 +1,44 @@
+"""
+Middleware: per-request SQL statistics.
+
+Counts the statements each request runs (``core.db.query_stats``) and logs
+a warning naming the statement shape when one repeats
+``QUERY_STATS_REPEAT_THRESHOLD`` times, the signature of an N+1 loop.
+Outside production (``DEV_MODE=true`` or ``QUERY_STATS_SERVER_TIMING=true``)
+the totals are also returned in a ``Server-Timing`` header, which browser
+dev tools show next to the request.
+"""
+import logging
+import os
+
+from starlette.requests import Request
+
+from core.db.query_stats import QUERY_STATS_REPEAT_THRESHOLD, collect_queries
+
+logger = logging.getLogger(__name__)
+
+QUERY_STATS_ENABLED = os.getenv("QUERY_STATS_ENABLED", "true").lower() == "true"
+
+
+def _server_timing_enabled() -> bool:
+    return (
+        os.getenv("QUERY_STATS_SERVER_TIMING", "false").lower() == "true"
+        or os.getenv("DEV_MODE", "false").lower() == "true"
+    )
+
+
+async def record_query_stats(request: Request, call_next):
+    if not QUERY_STATS_ENABLED:
+        return await call_next(request)
+    with collect_queries() as stats:
+        response = await call_next(request)
+    for shape, count in stats.repeated(QUERY_STATS_REPEAT_THRESHOLD):
+        logger.warning(
+            "possible N+1: %s %s ran %d x %s",
+            request.method, request.url.path, count, shape[:300],
+        )
+    if _server_timing_enabled():
+        existing = response.headers.get("Server-Timing")
+        entry = stats.server_timing()
+        response.headers["Server-Timing"] = f"{existing}, {entry}" if existing else entry
+    return response
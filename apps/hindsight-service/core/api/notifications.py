@@ -6,15 +6,25 @@ Supports both in-app notifications and email notification preferences.
 """
 
 from typing import List, Dict, Any
+import asyncio
+import json
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
+from core.db import database
 from core.db.database import get_db
 from core.db import schemas
 from core.api.deps import get_current_user_context
 from core.services.notification_service import NotificationService
+from core.services.notifications.change_stream import (
+    NOTIFICATION_STREAM_HEARTBEAT_SECONDS,
+    NOTIFICATION_STREAM_MAX_SECONDS,
+    get_notification_change_listener,
+)
 
 
 router = APIRouter(prefix="/notifications", tags=["notifications"])
@@ -60,6 +70,68 @@ def get_notifications(
     )
 
 
+def _read_unread_count(user_id: uuid.UUID) -> int:
+    # Short-lived session per read: request-scoped sessions are closed before
+    # a streaming body starts, and a stream must not pin a pooled connection.
+    db = database.SessionLocal()
+    try:
+        return NotificationService(db).get_unread_count(user_id)
+    finally:
+        db.close()
+
+
+@router.get("/stream")
+async def stream_notifications(
+    request: Request,
+    max_seconds: float = Query(NOTIFICATION_STREAM_MAX_SECONDS, gt=0, le=3600),
+    user_context = Depends(get_current_user_context)
+):
+    """
+    Server-Sent Events stream of the current user's unread count.
+
+    Sends an `unread_count` event on connect and whenever the user's
+    notifications change (pushed via Postgres LISTEN/NOTIFY), plus heartbeat
+    comments while idle. The stream closes after **max_seconds**; clients
+    reconnect automatically after the advertised `retry` delay.
+    """
+    user_id = user_context.user.id
+    listener = get_notification_change_listener()
+
+    async def _events():
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_seconds
+        wakeup = listener.subscribe(user_id)
+        last_count = None
+        try:
+            yield "retry: 3000\n\n"
+            changed = True
+            while True:
+                if changed:
+                    count = await run_in_threadpool(_read_unread_count, user_id)
+                    if count != last_count:
+                        last_count = count
+                        yield f"event: unread_count\ndata: {json.dumps({'unread_count': count})}\n\n"
+                remaining = deadline - loop.time()
+                if remaining <= 0 or await request.is_disconnected():
+                    return
+                try:
+                    await asyncio.wait_for(wakeup.wait(), min(NOTIFICATION_STREAM_HEARTBEAT_SECONDS, remaining))
+                    changed = True
+                except asyncio.TimeoutError:
+                    # Without a live LISTEN connection, fall back to polling on heartbeat.
+                    changed = not listener.listening
+                    yield ": keepalive\n\n"
+                wakeup.clear()
+        finally:
+            listener.unsubscribe(user_id, wakeup)
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/{notification_id}/read", status_code=status.HTTP_204_NO_CONTENT)
 def mark_notification_read(
     notification_id: uuid.UUID,
@@ -69,6 +69,7 @@ def create_invitation(
         organization_id=org_id,
         metadata={"email": invitation.email, "role": invitation.role},
     )
+    db.commit()
 
     # Send notification to invitee (email always; in-app if user exists)
     try:
@@ -135,6 +136,15 @@ def decline_invitation(
         db_invitation.revoked_at = datetime.now(timezone.utc)
     except Exception:
         pass
+    log(
+        db,
+        action=AuditAction.INVITATION_DECLINE,
+        status=AuditStatus.SUCCESS,
+        target_type="invitation",
+        target_id=invitation_id,
+        actor_user_id=user.id,
+        organization_id=org_id,
+    )
     db.commit()
 
     # Notify inviter
@@ -152,15 +162,6 @@ def decline_invitation(
     except Exception:
         pass
 
-    log(
-        db,
-        action=AuditAction.INVITATION_DECLINE,
-        status=AuditStatus.SUCCESS,
-        target_type="invitation",
-        target_id=invitation_id,
-        actor_user_id=user.id,
-        organization_id=org_id,
-    )
     return {"status": "revoked"}
 
 @router.get("/{org_id}/invitations", response_model=List[schemas.OrganizationInvitation])
@@ -202,6 +203,16 @@ def resend_invitation(
         db_invitation.token = _uuid.uuid4().hex
     except Exception:
         pass
+    log(
+        db,
+        action=AuditAction.INVITATION_RESEND,
+        status=AuditStatus.SUCCESS,
+        target_type="invitation",
+        target_id=db_invitation.id,
+        actor_user_id=user.id,
+        organization_id=org_id,
+        metadata={"new_expires_at": db_invitation.expires_at.isoformat() if db_invitation.expires_at else None},
+    )
     db.commit()
     db.refresh(db_invitation)
 
@@ -236,16 +247,6 @@ def resend_invitation(
         # Log error but don't fail the resend operation
         logger.error(f"Failed to send notification for invitation resend {db_invitation.id}: {str(e)}")
 
-    log(
-        db,
-        action=AuditAction.INVITATION_RESEND,
-        status=AuditStatus.SUCCESS,
-        target_type="invitation",
-        target_id=db_invitation.id,
-        actor_user_id=user.id,
-        organization_id=org_id,
-        metadata={"new_expires_at": db_invitation.expires_at.isoformat() if db_invitation.expires_at else None},
-    )
     return db_invitation
 
 @router.delete("/{org_id}/invitations/{invitation_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -266,8 +267,6 @@ def revoke_invitation(
 
     db_invitation.status = 'revoked'
     db_invitation.revoked_at = datetime.now(timezone.utc)
-    db.commit()
-
     log(
         db,
         action=AuditAction.INVITATION_REVOKE,
@@ -277,6 +276,7 @@ def revoke_invitation(
         actor_user_id=user.id,
         organization_id=org_id,
     )
+    db.commit()
 
 @router.post("/{org_id}/invitations/{invitation_id}/accept", response_model=schemas.OrganizationMember)
 def accept_invitation(
@@ -336,6 +336,15 @@ def accept_invitation(
     # Update invitation
     db_invitation.status = 'accepted'
     db_invitation.accepted_at = now_utc
+    log(
+        db,
+        action=AuditAction.INVITATION_ACCEPT,
+        status=AuditStatus.SUCCESS,
+        target_type="invitation",
+        target_id=invitation_id,
+        actor_user_id=accept_user_id,
+        organization_id=org_id,
+    )
     db.commit()
 
     # Notify inviter
@@ -353,14 +362,4 @@ def accept_invitation(
     except Exception:
         pass
 
-    log(
-        db,
-        action=AuditAction.INVITATION_ACCEPT,
-        status=AuditStatus.SUCCESS,
-        target_type="invitation",
-        target_id=invitation_id,
-        actor_user_id=accept_user_id,
-        organization_id=org_id,
-    )
-
     return db_member
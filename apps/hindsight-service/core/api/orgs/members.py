@@ -100,8 +100,6 @@ def add_member(
         can_write=can_write,
     )
     db.add(m)
-    db.commit()
-
     log(
         db,
         action=AuditAction.MEMBER_ADD,
@@ -112,6 +110,7 @@ def add_member(
         organization_id=org_id,
         metadata={"role": role},
     )
+    db.commit()
 
     # Send notification to the new member using the central NotificationService
     try:
@@ -179,8 +178,6 @@ def update_member(
                 # Shouldn't happen because we validated above, but guard anyway
                 raise HTTPException(status_code=422, detail="Invalid role")
 
-    db.commit()
-
     if old_role != m.role:
         log(
             db,
@@ -192,6 +189,9 @@ def update_member(
             organization_id=org_id,
             metadata={"old_role": old_role, "new_role": m.role},
         )
+    db.commit()
+
+    if old_role != m.role:
         # Notify the affected user about role change
         try:
             from core.services.notification_service import NotificationService
@@ -227,8 +227,6 @@ def remove_member(
     ).delete(synchronize_session=False)
     if deleted == 0:
         raise HTTPException(status_code=404, detail="Membership not found")
-    db.commit()
-
     log(
         db,
         action=AuditAction.MEMBER_REMOVE,
@@ -238,6 +236,7 @@ def remove_member(
         actor_user_id=user.id,
         organization_id=org_id,
     )
+    db.commit()
 
     # Notify the removed user
     try:
@@ -54,9 +54,6 @@ def create_organization(
         can_write=True,
     )
     db.add(mem)
-    db.commit()
-    db.refresh(org)
-
     log(
         db,
         action=AuditAction.ORGANIZATION_CREATE,
@@ -66,6 +63,8 @@ def create_organization(
         actor_user_id=user.id,
         organization_id=org.id,
     )
+    db.commit()
+    db.refresh(org)
 
     return {
         "id": str(org.id),
@@ -233,9 +232,6 @@ def update_organization(
         changed = True
 
     if changed:
-        db.commit()
-        db.refresh(org)
-
         log(
             db,
             action=AuditAction.ORGANIZATION_UPDATE,
@@ -246,6 +242,8 @@ def update_organization(
             organization_id=org.id,
             metadata={"old_data": old_data, "new_data": {"name": org.name, "slug": org.slug, "is_active": org.is_active}},
         )
+        db.commit()
+        db.refresh(org)
 
     return {"id": str(org.id), "name": org.name, "slug": org.slug, "is_active": org.is_active}
 
@@ -271,7 +269,7 @@ def delete_organization(
     if has_agents or has_memories or has_keywords:
         raise HTTPException(status_code=409, detail="Organization not empty; empty it before deletion")
 
-    # Log the deletion BEFORE actually deleting the organization to avoid foreign key constraint issues
+    # Log the deletion BEFORE deleting the organization; the record commits with the delete
     log(
         db,
         action=AuditAction.ORGANIZATION_DELETE,
@@ -14,7 +14,7 @@ from sqlalchemy.orm import Session
 from core.db import crud
 from core.db.database import get_db
 from core.api.deps import get_scoped_user_and_context, ensure_pat_allows_write
-from core.pruning.pruning_service import get_pruning_service
+from core.pruning.pruning_service import DEFAULT_MAX_ITERATIONS, get_pruning_service
 from core.utils.feature_flags import llm_features_enabled
 
 logger = logging.getLogger(__name__)
@@ -31,6 +31,10 @@ def generate_pruning_suggestions_endpoint(
     """
     Generate memory block pruning suggestions using LLM evaluation.
     Returns a batch of memory blocks with pruning scores for human review.
+
+    Each sampled batch costs one LLM call. ``max_iterations`` (default 1,
+    capped at ``PRUNING_MAX_ITERATIONS``) bounds how many batches are
+    sampled while looking for ``target_count`` prunable blocks.
     """
     if request is None:
         request = {}
@@ -52,7 +56,12 @@ def generate_pruning_suggestions_endpoint(
 
     batch_size = request.get("batch_size", 50)
     target_count = request.get("target_count")
-    max_iterations = request.get("max_iterations", 10)
+    max_iterations = request.get("max_iterations")
+    if max_iterations is None:
+        max_iterations = 1
+    if isinstance(max_iterations, bool) or not isinstance(max_iterations, int) or max_iterations < 1:
+        raise HTTPException(status_code=422, detail="max_iterations must be a positive integer")
+    max_iterations = min(max_iterations, DEFAULT_MAX_ITERATIONS)
 
     # Retrieve LLM_API_KEY from environment variables
     llm_api_key = os.getenv("LLM_API_KEY")
@@ -80,6 +80,7 @@ def create_token(
                 "expires_at": payload.expires_at.isoformat() if payload.expires_at else None,
             },
         )
+        db.commit()
     except Exception:
         pass
     # Compose response
@@ -101,9 +102,6 @@ def revoke_token(
         uuid_token = uuid.UUID(str(token_id))
     except Exception:
         raise HTTPException(status_code=422, detail="Invalid token id")
-    ok = token_repo.revoke_token(db, token_db_id=uuid_token, user_id=user.id)
-    if not ok:
-        raise HTTPException(status_code=404, detail="Token not found")
     try:
         log(
             db,
@@ -116,6 +114,9 @@ def revoke_token(
         )
     except Exception:
         pass
+    ok = token_repo.revoke_token(db, token_db_id=uuid_token, user_id=user.id)
+    if not ok:
+        raise HTTPException(status_code=404, detail="Token not found")
     return {"message": "revoked"}
 
 
@@ -131,10 +132,6 @@ def rotate_token(
         uuid_token = uuid.UUID(str(token_id))
     except Exception:
         raise HTTPException(status_code=422, detail="Invalid token id")
-    result = token_repo.rotate_token(db, token_db_id=uuid_token, user_id=user.id)
-    if not result:
-        raise HTTPException(status_code=404, detail="Token not found or not active")
-    pat, new_token = result
     try:
         log(
             db,
@@ -147,6 +144,10 @@ def rotate_token(
         )
     except Exception:
         pass
+    result = token_repo.rotate_token(db, token_db_id=uuid_token, user_id=user.id)
+    if not result:
+        raise HTTPException(status_code=404, detail="Token not found or not active")
+    pat, new_token = result
     return schemas.TokenCreateResponse(
         **schemas.TokenResponse.model_validate(pat, from_attributes=True).model_dump(),
         token=new_token,
@@ -1,30 +1,78 @@
 """
-Improved async bulk operations system.
-
-Replaces the basic threading approach with a proper async task system
-that provides better scalability, monitoring, and error handling.
+Bulk operations execution layer.
+
+`bulk_operations` rows double as a durable job queue: API handlers insert a
+`pending` row, and a pool of worker threads (on every API replica, or on a
+dedicated worker deployment) claims rows with ``SELECT ... FOR UPDATE SKIP
+LOCKED``, heartbeats them while running and resumes rows whose heartbeat
+went stale (e.g. the previous owner was killed mid-operation). Because all
+state lives on the row, status and cancel work from any replica.
 """
 import asyncio
 import logging
+import os
+import socket
+import threading
 import uuid
-from typing import Dict, Any, Optional, Callable
-from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Callable
+from datetime import datetime, timedelta, timezone
 from contextlib import asynccontextmanager
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, delete, exists, func, or_, select, update
+from sqlalchemy.orm import Session, aliased
 from sqlalchemy.orm.exc import StaleDataError, ObjectDeletedError
 
 from core.db import models, crud
 from core.audit import log_bulk_operation, AuditAction, AuditStatus
 from core.db.database import get_db_session_local
+from core.metrics import BULK_OPERATION_DURATION
 
 logger = logging.getLogger(__name__)
 
+# Rows per set-based UPDATE/DELETE; each chunk commits in its own transaction.
+BULK_OPERATION_CHUNK_SIZE = int(os.getenv("BULK_OPERATION_CHUNK_SIZE", 1000))
+
+# Operation types executed by the queue workers below.
+QUEUED_OPERATION_TYPES = ("bulk_move", "bulk_delete")
+# Worker threads per process; 0 disables the pool (e.g. API-only pods).
+BULK_OPERATION_WORKERS = int(os.getenv("BULK_OPERATION_WORKERS", 2))
+BULK_OPERATION_POLL_SECONDS = float(os.getenv("BULK_OPERATION_POLL_SECONDS", 5))
+# A running row whose heartbeat is older than this is considered abandoned.
+BULK_OPERATION_HEARTBEAT_TIMEOUT_SECONDS = int(os.getenv("BULK_OPERATION_HEARTBEAT_TIMEOUT_SECONDS", 120))
+BULK_OPERATION_MAX_ATTEMPTS = int(os.getenv("BULK_OPERATION_MAX_ATTEMPTS", 3))
+
+# resource_type -> (model, primary key column)
+_RESOURCE_PKS = {
+    "agents": (models.Agent, models.Agent.agent_id),
+    "memory_blocks": (models.MemoryBlock, models.MemoryBlock.id),
+    "keywords": (models.Keyword, models.Keyword.keyword_id),
+}
+
 
 class BulkOperationTask:
-    """Represents a bulk operation task with async execution."""
+    """Represents a bulk operation task with async execution.
+
+    Moves and deletes are applied set-based, one chunk of primary keys at a
+    time: each chunk is a single ``UPDATE``/``DELETE ... WHERE organization_id
+    = :org AND id IN (:chunk) RETURNING id`` committed in its own transaction
+    together with the operation's ``progress`` counter. Between chunks the
+    task checks for a cancel request (in-process flag or the DB row being
+    flipped to ``cancelled``) and stops cooperatively.
+
+    When run by a queue worker, ``worker_id`` is the lease holder recorded on
+    the row. Every chunk starts by renewing ``heartbeat_at`` with a
+    conditional UPDATE that only matches while the row still carries this
+    task's worker id and last heartbeat; the renewal keeps the row locked
+    until the chunk commits, so a claimer's ``SKIP LOCKED`` scan cannot take
+    the operation over mid-chunk however long the chunk runs. If the lease
+    was taken over anyway the task stops. ``resume`` keeps the progress of
+    a previous attempt: moved/deleted rows have already left the source org,
+    so re-walking the org picks up exactly where that attempt stopped.
+    """
 
     def __init__(self, operation_id: uuid.UUID, task_type: str, actor_user_id: uuid.UUID,
-                 organization_id: uuid.UUID, payload: Dict[str, Any]):
+                 organization_id: uuid.UUID, payload: Dict[str, Any],
+                 chunk_size: Optional[int] = None, worker_id: Optional[str] = None,
+                 resume: bool = False):
         self.operation_id = operation_id
         self.task_type = task_type
         self.actor_user_id = actor_user_id
@@ -33,6 +81,28 @@ class BulkOperationTask:
         self.status = "pending"
         self.progress = 0
         self.errors = []
+        self.chunk_size = max(1, int(chunk_size or payload.get("chunk_size") or BULK_OPERATION_CHUNK_SIZE))
+        self.cancel_requested = False
+        self.cancelled = False
+        self.shutdown_requested = False
+        self.interrupted = False
+        self.worker_id = worker_id
+        self.resume = resume
+        self.lease_lost = False
+        self._operation = None
+        self._heartbeat_at: Optional[datetime] = None
+
+    def request_cancel(self) -> None:
+        """Ask the task to stop before its next chunk."""
+        self.cancel_requested = True
+
+    def request_shutdown(self) -> None:
+        """Stop before the next chunk without finishing the operation.
+
+        Unlike a cancel, the row is left ``running`` so another worker
+        resumes it once its heartbeat goes stale.
+        """
+        self.shutdown_requested = True
 
     async def execute(self) -> Dict[str, Any]:
         """Execute the bulk operation asynchronously.
@@ -76,42 +146,98 @@ class BulkOperationTask:
         else:
             raise ValueError(f"Unknown task type: {self.task_type}")
 
+    def _start_operation(self, db: Session, operation, resource_types: list) -> None:
+        """Mark the operation running and record the number of rows it will touch."""
+        now = datetime.now(timezone.utc)
+        remaining = sum(
+            self._count_rows(db, resource_type, self.organization_id)
+            for resource_type in resource_types
+        )
+        if self.resume:
+            self.progress = operation.progress or 0
+            operation.started_at = operation.started_at or now
+        else:
+            operation.progress = 0
+            operation.started_at = now
+        operation.status = "running"
+        operation.total = self.progress + remaining
+        operation.heartbeat_at = now
+        if self.worker_id is not None:
+            operation.worker_id = self.worker_id
+        db.commit()
+        db.refresh(operation)
+        self._operation = operation
+        self._heartbeat_at = now
+        self.status = "running"
+
+    def _finish_operation(self, db: Session, operation, summary: Dict[str, Any], errors: list) -> None:
+        """Write the terminal status, keeping a cancel that landed mid-run."""
+        if self.lease_lost or not self._renew_lease(db):
+            # Another worker owns the row now; it writes the outcome.
+            db.rollback()
+            return
+        if self.cancelled:
+            operation.status = "cancelled"
+            summary["cancelled"] = True
+        else:
+            operation.status = "completed" if not errors else "failed"
+        started_at = operation.started_at
+        operation.finished_at = datetime.now(timezone.utc)
+        operation.result_summary = summary
+        if errors:
+            operation.error_log = {"errors": errors}
+        finished_at, final_status = operation.finished_at, operation.status
+        db.commit()
+        self.status = final_status
+        self.errors = errors
+        if isinstance(started_at, datetime):
+            if started_at.tzinfo is None:
+                started_at = started_at.replace(tzinfo=timezone.utc)
+            BULK_OPERATION_DURATION.observe(
+                max((finished_at - started_at).total_seconds(), 0.0),
+                type=self.task_type,
+                status=final_status,
+            )
+
+    def _leave_running(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Result of a run stopped by shutdown; the row stays ``running``."""
+        logger.info(
+            "bulk operation %s: stopped for shutdown after %d rows, left for resumption",
+            self.operation_id, self.progress,
+        )
+        return {"status": "running", "interrupted": True, **result}
+
     async def _perform_bulk_move(self, db: Session) -> Dict[str, Any]:
         """Perform bulk move operation with proper async handling."""
         operation = crud.get_bulk_operation(db, self.operation_id)
         if not operation:
             return {"status": "failed", "error": "Operation not found"}
+        if operation.status == "cancelled":
+            return {"status": "cancelled", "total_moved": 0, "errors_count": 0}
 
-        operation.status = "running"
-        operation.started_at = datetime.now(timezone.utc)
-        db.commit()
-        db.refresh(operation)
+        resource_types = self.payload.get("resource_types", ["agents", "memory_blocks", "keywords"])
+        self._start_operation(db, operation, resource_types)
 
         destination_org_id = self.payload.get("destination_organization_id")
         destination_owner_id = self.payload.get("destination_owner_user_id")
-        resource_types = self.payload.get("resource_types", ["agents", "memory_blocks", "keywords"])
 
         total_moved = 0
         errors = []
 
         # Process each resource type
         for resource_type in resource_types:
+            if self.cancelled or self.interrupted:
+                break
             moved_count = await self._process_resource_type(
                 db, resource_type, self.organization_id,
                 destination_org_id, destination_owner_id, errors
             )
             total_moved += moved_count
 
-        # Update operation status
-        operation.status = "completed" if not errors else "failed"
-        operation.finished_at = datetime.now(timezone.utc)
-        operation.result_summary = {"total_moved": total_moved, "errors_count": len(errors)}
-        if errors:
-            operation.error_log = {"errors": errors}
-
-        db.commit()
+        if self.interrupted:
+            return self._leave_running({"total_moved": total_moved, "errors_count": len(errors)})
 
-        # Log completion
+        # Log completion; committed with the terminal status
         try:
             log_bulk_operation(
                 db,
@@ -125,6 +251,10 @@ class BulkOperationTask:
         except Exception:
             pass
 
+        self._finish_operation(
+            db, operation, {"total_moved": total_moved, "errors_count": len(errors)}, errors
+        )
+
         return {
             "status": operation.status,
             "total_moved": total_moved,
@@ -136,33 +266,28 @@ class BulkOperationTask:
         operation = crud.get_bulk_operation(db, self.operation_id)
         if not operation:
             return {"status": "failed", "error": "Operation not found"}
-
-        operation.status = "running"
-        operation.started_at = datetime.now(timezone.utc)
-        db.commit()
-        db.refresh(operation)
+        if operation.status == "cancelled":
+            return {"status": "cancelled", "total_deleted": 0, "errors_count": 0}
 
         resource_types = self.payload.get("resource_types", ["agents", "memory_blocks", "keywords"])
+        self._start_operation(db, operation, resource_types)
+
         total_deleted = 0
         errors = []
 
         # Process each resource type
         for resource_type in resource_types:
+            if self.cancelled or self.interrupted:
+                break
             deleted_count = await self._delete_resource_type(
                 db, resource_type, self.organization_id, errors
             )
             total_deleted += deleted_count
 
-        # Update operation status
-        operation.status = "completed" if not errors else "failed"
-        operation.finished_at = datetime.now(timezone.utc)
-        operation.result_summary = {"total_deleted": total_deleted, "errors_count": len(errors)}
-        if errors:
-            operation.error_log = {"errors": errors}
-
-        db.commit()
+        if self.interrupted:
+            return self._leave_running({"total_deleted": total_deleted, "errors_count": len(errors)})
 
-        # Log completion
+        # Log completion; committed with the terminal status
         try:
             log_bulk_operation(
                 db,
@@ -176,6 +301,10 @@ class BulkOperationTask:
         except Exception:
             pass
 
+        self._finish_operation(
+            db, operation, {"total_deleted": total_deleted, "errors_count": len(errors)}, errors
+        )
+
         return {
             "status": operation.status,
             "total_deleted": total_deleted,
@@ -213,221 +342,531 @@ class BulkOperationTask:
         # organization_id=NULL, which violates the ck_*_org_has_org constraints.
         return "organization" if dest_org_id is not None else "personal"
 
-    async def _move_agents(self, db: Session, org_id: uuid.UUID,
-                          dest_org_id: Optional[uuid.UUID], dest_owner_id: Optional[uuid.UUID],
-                          errors: list) -> int:
-        """Move agents with proper error handling."""
-        agents = db.query(models.Agent).filter(models.Agent.organization_id == org_id).all()
-        moved_count = 0
-        new_scope = self._destination_visibility_scope(dest_org_id, dest_owner_id)
+    # ------------------------------------------------------------------
+    # Chunking helpers
+    # ------------------------------------------------------------------
 
-        for agent in agents:
+    @staticmethod
+    def _count_rows(db: Session, resource_type: str, org_id: uuid.UUID) -> int:
+        model_pk = _RESOURCE_PKS.get(resource_type)
+        if model_pk is None:
+            return 0
+        model, pk = model_pk
+        return db.query(func.count(pk)).filter(model.organization_id == org_id).scalar() or 0
+
+    def _next_chunk_ids(self, db: Session, model, pk, org_id: uuid.UUID,
+                        after_id: Optional[uuid.UUID]) -> List[uuid.UUID]:
+        """Return the next ``chunk_size`` primary keys of ``model`` in ``org_id``.
+
+        Keyset pagination on the primary key: rows that failed to move stay in
+        the source org, so re-reading "the first N rows" would loop forever.
+        """
+        stmt = select(pk).where(model.organization_id == org_id)
+        if after_id is not None:
+            stmt = stmt.where(pk > after_id)
+        stmt = stmt.order_by(pk).limit(self.chunk_size)
+        return list(db.execute(stmt).scalars().all())
+
+    def _cancellation_requested(self, db: Session) -> bool:
+        """True when a cancel was requested in-process or on the DB row.
+
+        Also stops (setting ``lease_lost``) when a queue worker's lease was
+        taken over after its heartbeat went stale.
+        """
+        if self.cancel_requested or self.lease_lost:
+            return True
+        try:
+            row = (
+                db.query(models.BulkOperation.status, models.BulkOperation.worker_id)
+                .filter(models.BulkOperation.id == self.operation_id)
+                .first()
+            )
+        except Exception:
+            return False
+        if not row:
+            return False
+        status, owner = row
+        if self.worker_id is not None and owner is not None and owner != self.worker_id:
+            logger.warning("bulk operation %s: lease taken over by %s", self.operation_id, owner)
+            self.lease_lost = True
+            return True
+        return status == "cancelled"
+
+    def _renew_lease(self, db: Session) -> bool:
+        """Move ``heartbeat_at`` forward if this task still holds the row.
+
+        Matches only while the row still has the heartbeat this task last
+        wrote (and its ``worker_id``), i.e. nobody re-claimed it in between.
+        The UPDATE keeps the row locked until the caller's transaction ends.
+        Returns False (and sets ``lease_lost``) once the lease is gone.
+        """
+        op = models.BulkOperation
+        conditions = [op.id == self.operation_id]
+        if self._heartbeat_at is not None:
+            conditions.append(op.heartbeat_at == self._heartbeat_at)
+        if self.worker_id is not None:
+            conditions.append(op.worker_id == self.worker_id)
+        now = datetime.now(timezone.utc)
+        renewed = db.query(op).filter(*conditions).update({"heartbeat_at": now}, synchronize_session=False)
+        if not renewed:
+            logger.warning("bulk operation %s: lease lost by %s", self.operation_id, self.worker_id)
+            self.lease_lost = True
+            return False
+        self._heartbeat_at = now
+        return True
+
+    def _heartbeat_after_failure(self, db: Session) -> None:
+        """Renew the lease in its own transaction after a chunk was rolled back.
+
+        A run of failing chunks commits nothing else, and without this the
+        heartbeat would go stale while the task is still alive.
+        """
+        try:
+            if self._renew_lease(db):
+                db.commit()
+            else:
+                db.rollback()
+        except Exception as exc:
+            db.rollback()
+            logger.warning("bulk operation %s: heartbeat failed: %s", self.operation_id, exc)
+
+    def _record_progress(self, count: int) -> None:
+        """Stage the progress counter so it commits with the chunk."""
+        self.progress += count
+        if self._operation is not None:
+            self._operation.progress = self.progress
+
+    async def _run_chunked(self, db: Session, model, pk, org_id: uuid.UUID,
+                           apply_chunk: Callable[[Session, List[uuid.UUID]], int],
+                           label: str, errors: list) -> int:
+        """Apply ``apply_chunk`` to ``org_id``'s rows of ``model`` chunk by chunk.
+
+        Each chunk (lease renewal + statement(s) + progress update) is one
+        transaction. A failing chunk is rolled back, recorded in ``errors``
+        and skipped; the heartbeat is then renewed on its own.
+        """
+        processed = 0
+        after_id = None
+        while True:
+            if self.shutdown_requested:
+                self.interrupted = True
+                break
+            if self._cancellation_requested(db):
+                self.cancelled = not self.lease_lost
+                break
+            committed_heartbeat = self._heartbeat_at
+            if not self._renew_lease(db):
+                db.rollback()
+                break
+            ids = self._next_chunk_ids(db, model, pk, org_id, after_id)
+            if not ids:
+                db.commit()
+                break
+            after_id = ids[-1]
+            staged = 0
             try:
-                agent.organization_id = dest_org_id
-                agent.owner_user_id = dest_owner_id
-                agent.visibility_scope = new_scope
+                staged = apply_chunk(db, ids)
+                self._record_progress(staged)
                 db.commit()
-                moved_count += 1
+                processed += staged
             except (StaleDataError, ObjectDeletedError) as e:
                 db.rollback()
-                errors.append(f"Concurrent modification for agent {agent.agent_id}: {e}")
+                self.progress -= staged
+                errors.append(f"Concurrent modification for {label} chunk starting at {ids[0]}: {e}")
+                self._heartbeat_at = committed_heartbeat
+                self._heartbeat_after_failure(db)
             except Exception as e:
                 db.rollback()
-                errors.append(f"Failed to move agent {agent.agent_id}: {e}")
+                self.progress -= staged
+                errors.append(f"Failed to {label} chunk of {len(ids)} starting at {ids[0]}: {e}")
+                self._heartbeat_at = committed_heartbeat
+                self._heartbeat_after_failure(db)
+            # Yield to the event loop between chunks.
+            await asyncio.sleep(0)
+        return processed
+
+    # ------------------------------------------------------------------
+    # Per-chunk statements
+    # ------------------------------------------------------------------
+
+    def _move_rows(self, db: Session, model, pk, org_id: uuid.UUID,
+                   dest_org_id: Optional[uuid.UUID], dest_owner_id: Optional[uuid.UUID],
+                   ids: List[uuid.UUID], name_column=None,
+                   conflicts: Optional[list] = None) -> int:
+        """Re-scope one chunk of ``model`` rows with a single UPDATE.
+
+        ``name_column`` is the case-insensitive unique name in the destination
+        scope (agent name, keyword text). Rows whose name is already taken
+        there are left in place by a ``NOT EXISTS`` anti-join, so one
+        collision does not fail the whole chunk; their ids are appended to
+        ``conflicts``.
+        """
+        dest_scope = self._destination_visibility_scope(dest_org_id, dest_owner_id)
+        stmt = update(model).where(model.organization_id == org_id, pk.in_(ids))
+        if name_column is not None:
+            target = aliased(model)
+            target_name = getattr(target, name_column.key)
+            same_scope = (
+                target.organization_id == dest_org_id if dest_org_id is not None
+                else target.owner_user_id == dest_owner_id
+            )
+            stmt = stmt.where(~exists().where(
+                target.visibility_scope == dest_scope,
+                same_scope,
+                func.lower(target_name) == func.lower(name_column),
+            ))
+        stmt = (
+            stmt.values(
+                organization_id=dest_org_id,
+                owner_user_id=dest_owner_id,
+                visibility_scope=dest_scope,
+            )
+            .returning(pk)
+            .execution_options(synchronize_session=False)
+        )
+        moved = {row[0] for row in db.execute(stmt).all()}
+        if name_column is not None and conflicts is not None and len(moved) < len(ids):
+            skipped = [str(i) for i in ids if i not in moved]
+            conflicts.append(
+                f"{len(skipped)} {model.__tablename__} not moved, name already exists in the destination: "
+                + ", ".join(skipped)
+            )
+        return len(moved)
+
+    def _move_memory_block_rows(self, db: Session, org_id: uuid.UUID,
+                                dest_org_id: Optional[uuid.UUID], dest_owner_id: Optional[uuid.UUID],
+                                ids: List[uuid.UUID]) -> int:
+        """Move one chunk of memory blocks and, in the same transaction,
+        resync the scope of pending consolidation suggestions over them."""
+        moved = self._move_rows(db, models.MemoryBlock, models.MemoryBlock.id, org_id, dest_org_id, dest_owner_id, ids)
+        if moved:
+            crud.resync_suggestion_scopes(db, ids)
+        return moved
+
+    def _delete_agent_rows(self, db: Session, org_id: uuid.UUID, ids: List[uuid.UUID]) -> int:
+        """Delete one chunk of agents plus the dependents crud.delete_agent removes."""
+        db.execute(delete(models.AgentTranscript).where(models.AgentTranscript.agent_id.in_(ids)))
+        db.execute(delete(models.MemoryBlock).where(models.MemoryBlock.agent_id.in_(ids)))
+        stmt = (
+            delete(models.Agent)
+            .where(models.Agent.organization_id == org_id, models.Agent.agent_id.in_(ids))
+            .returning(models.Agent.agent_id)
+        )
+        return len(db.execute(stmt).all())
+
+    def _delete_memory_block_rows(self, db: Session, org_id: uuid.UUID, ids: List[uuid.UUID]) -> int:
+        """Delete one chunk of memory blocks.
 
-        return moved_count
+        Feedback logs and keyword associations go with them via their
+        ``ON DELETE CASCADE`` foreign keys.
+        """
+        stmt = (
+            delete(models.MemoryBlock)
+            .where(models.MemoryBlock.organization_id == org_id, models.MemoryBlock.id.in_(ids))
+            .returning(models.MemoryBlock.id)
+        )
+        return len(db.execute(stmt).all())
+
+    def _delete_keyword_rows(self, db: Session, org_id: uuid.UUID, ids: List[uuid.UUID]) -> int:
+        """Delete one chunk of keywords and their memory-block associations."""
+        db.execute(delete(models.MemoryBlockKeyword).where(models.MemoryBlockKeyword.keyword_id.in_(ids)))
+        stmt = (
+            delete(models.Keyword)
+            .where(models.Keyword.organization_id == org_id, models.Keyword.keyword_id.in_(ids))
+            .returning(models.Keyword.keyword_id)
+        )
+        return len(db.execute(stmt).all())
+
+    # ------------------------------------------------------------------
+    # Moves
+    # ------------------------------------------------------------------
+
+    async def _move_agents(self, db: Session, org_id: uuid.UUID,
+                          dest_org_id: Optional[uuid.UUID], dest_owner_id: Optional[uuid.UUID],
+                          errors: list) -> int:
+        """Move agents chunk by chunk."""
+        model, pk = models.Agent, models.Agent.agent_id
+        return await self._run_chunked(
+            db, model, pk, org_id,
+            lambda db, ids: self._move_rows(
+                db, model, pk, org_id, dest_org_id, dest_owner_id, ids,
+                name_column=model.agent_name, conflicts=errors,
+            ),
+            "move agents", errors,
+        )
 
     async def _move_memory_blocks(self, db: Session, org_id: uuid.UUID,
                                  dest_org_id: Optional[uuid.UUID], dest_owner_id: Optional[uuid.UUID],
                                  errors: list) -> int:
-        """Move memory blocks with proper error handling."""
-        memory_blocks = db.query(models.MemoryBlock).filter(models.MemoryBlock.organization_id == org_id).all()
-        moved_count = 0
-        new_scope = self._destination_visibility_scope(dest_org_id, dest_owner_id)
-
-        for mb in memory_blocks:
-            try:
-                mb.organization_id = dest_org_id
-                mb.owner_user_id = dest_owner_id
-                mb.visibility_scope = new_scope
-                db.commit()
-                moved_count += 1
-            except (StaleDataError, ObjectDeletedError) as e:
-                db.rollback()
-                errors.append(f"Concurrent modification for memory block {mb.id}: {e}")
-            except Exception as e:
-                db.rollback()
-                errors.append(f"Failed to move memory block {mb.id}: {e}")
-
-        return moved_count
+        """Move memory blocks chunk by chunk."""
+        model, pk = models.MemoryBlock, models.MemoryBlock.id
+        return await self._run_chunked(
+            db, model, pk, org_id,
+            lambda db, ids: self._move_memory_block_rows(db, org_id, dest_org_id, dest_owner_id, ids),
+            "move memory blocks", errors,
+        )
 
     async def _move_keywords(self, db: Session, org_id: uuid.UUID,
                            dest_org_id: Optional[uuid.UUID], dest_owner_id: Optional[uuid.UUID],
                            errors: list) -> int:
-        """Move keywords with proper error handling."""
-        keywords = db.query(models.Keyword).filter(models.Keyword.organization_id == org_id).all()
-        moved_count = 0
-        new_scope = self._destination_visibility_scope(dest_org_id, dest_owner_id)
-
-        for keyword in keywords:
-            try:
-                keyword.organization_id = dest_org_id
-                keyword.owner_user_id = dest_owner_id
-                keyword.visibility_scope = new_scope
-                db.commit()
-                moved_count += 1
-            except (StaleDataError, ObjectDeletedError) as e:
-                db.rollback()
-                errors.append(f"Concurrent modification for keyword {keyword.keyword_id}: {e}")
-            except Exception as e:
-                db.rollback()
-                errors.append(f"Failed to move keyword {keyword.keyword_id}: {e}")
+        """Move keywords chunk by chunk."""
+        model, pk = models.Keyword, models.Keyword.keyword_id
+        return await self._run_chunked(
+            db, model, pk, org_id,
+            lambda db, ids: self._move_rows(
+                db, model, pk, org_id, dest_org_id, dest_owner_id, ids,
+                name_column=model.keyword_text, conflicts=errors,
+            ),
+            "move keywords", errors,
+        )
 
-        return moved_count
+    # ------------------------------------------------------------------
+    # Deletes
+    # ------------------------------------------------------------------
 
     async def _delete_agents(self, db: Session, org_id: uuid.UUID, errors: list) -> int:
-        """Delete agents with proper error handling."""
-        agents = db.query(models.Agent).filter(models.Agent.organization_id == org_id).all()
-        deleted_count = 0
-
-        for agent in agents:
-            try:
-                crud.delete_agent(db, agent.agent_id)
-                deleted_count += 1
-            except Exception as e:
-                errors.append(f"Failed to delete agent {agent.agent_id}: {e}")
-        
-        return deleted_count
+        """Delete agents (with their transcripts and memory blocks) chunk by chunk."""
+        return await self._run_chunked(
+            db, models.Agent, models.Agent.agent_id, org_id,
+            lambda db, ids: self._delete_agent_rows(db, org_id, ids),
+            "delete agents", errors,
+        )
 
     async def _delete_memory_blocks(self, db: Session, org_id: uuid.UUID, errors: list) -> int:
-        """Delete memory blocks with proper error handling."""
-        memory_blocks = db.query(models.MemoryBlock).filter(models.MemoryBlock.organization_id == org_id).all()
-        deleted_count = 0
-
-        for mb in memory_blocks:
-            try:
-                crud.delete_memory_block(db, mb.id)
-                deleted_count += 1
-            except Exception as e:
-                errors.append(f"Failed to delete memory block {mb.id}: {e}")
-        
-        return deleted_count
+        """Delete memory blocks chunk by chunk."""
+        return await self._run_chunked(
+            db, models.MemoryBlock, models.MemoryBlock.id, org_id,
+            lambda db, ids: self._delete_memory_block_rows(db, org_id, ids),
+            "delete memory blocks", errors,
+        )
 
     async def _delete_keywords(self, db: Session, org_id: uuid.UUID, errors: list) -> int:
-        """Delete keywords with proper error handling."""
-        keywords = db.query(models.Keyword).filter(models.Keyword.organization_id == org_id).all()
-        deleted_count = 0
+        """Delete keywords chunk by chunk."""
+        return await self._run_chunked(
+            db, models.Keyword, models.Keyword.keyword_id, org_id,
+            lambda db, ids: self._delete_keyword_rows(db, org_id, ids),
+            "delete keywords", errors,
+        )
 
-        for keyword in keywords:
-            try:
-                crud.delete_keyword(db, keyword.keyword_id)
-                deleted_count += 1
-            except Exception as e:
-                errors.append(f"Failed to delete keyword {keyword.keyword_id}: {e}")
-        
-        return deleted_count
 
+def claim_next_bulk_operation(
+    db: Session,
+    worker_id: str,
+    heartbeat_timeout_seconds: Optional[int] = None,
+):
+    """Claim the oldest runnable queued operation for ``worker_id``.
 
-class AsyncBulkOperationsManager:
-    """Manages async bulk operations with proper task queuing and monitoring."""
+    Runnable means ``pending``, or ``running`` with a heartbeat older than
+    the timeout (its worker died). ``FOR UPDATE SKIP LOCKED`` lets any
+    number of workers poll concurrently without blocking on or double
+    claiming the same row. Rows that already used up
+    ``BULK_OPERATION_MAX_ATTEMPTS`` are failed instead of retried.
 
-    def __init__(self):
-        self._running_tasks: Dict[uuid.UUID, asyncio.Task] = {}
-        self._task_results: Dict[uuid.UUID, Dict[str, Any]] = {}
+    Returns ``(operation, resumed)`` or ``None`` when the queue is empty.
+    The claim is committed before returning so the row lock is released.
+    """
+    timeout = heartbeat_timeout_seconds
+    if timeout is None:
+        timeout = BULK_OPERATION_HEARTBEAT_TIMEOUT_SECONDS
+    while True:
+        stale_before = datetime.now(timezone.utc) - timedelta(seconds=timeout)
+        op = (
+            db.query(models.BulkOperation)
+            .filter(
+                models.BulkOperation.type.in_(QUEUED_OPERATION_TYPES),
+                or_(
+                    models.BulkOperation.status == "pending",
+                    and_(
+                        models.BulkOperation.status == "running",
+                        or_(
+                            models.BulkOperation.heartbeat_at == None,  # noqa: E711
+                            models.BulkOperation.heartbeat_at < stale_before,
+                        ),
+                    ),
+                ),
+            )
+            .order_by(models.BulkOperation.created_at)
+            .with_for_update(skip_locked=True)
+            .limit(1)
+            .first()
+        )
+        if op is None:
+            db.rollback()
+            return None
 
-    async def submit_task(self, operation_id: uuid.UUID, task_type: str,
-                         actor_user_id: uuid.UUID, organization_id: uuid.UUID,
-                         payload: Dict[str, Any]) -> None:
-        """Submit a bulk operation task for async execution."""
-        task = BulkOperationTask(operation_id, task_type, actor_user_id, organization_id, payload)
+        resumed = op.status == "running"
+        if (op.attempts or 0) >= BULK_OPERATION_MAX_ATTEMPTS:
+            op.status = "failed"
+            op.finished_at = datetime.now(timezone.utc)
+            existing_log = op.error_log or {}
+            errors = list(existing_log.get("errors") or [])
+            errors.append(f"abandoned after {op.attempts} attempts")
+            op.error_log = {**existing_log, "errors": errors}
+            db.commit()
+            continue
 
-        # Create async task
-        asyncio_task = asyncio.create_task(task.execute())
-        self._running_tasks[operation_id] = asyncio_task
+        op.status = "running"
+        op.worker_id = worker_id
+        op.heartbeat_at = datetime.now(timezone.utc)
+        op.attempts = (op.attempts or 0) + 1
+        db.commit()
+        db.refresh(op)
+        return op, resumed
 
-        # Set up completion callback
-        asyncio_task.add_done_callback(
-            lambda t, op_id=operation_id: self._on_task_complete(op_id, t)
-        )
 
-    def _on_task_complete(self, operation_id: uuid.UUID, task: asyncio.Task) -> None:
-        """Handle task completion."""
-        # If cancel_task() already recorded "cancelled", preserve it — the
-        # task.result() call below would raise CancelledError and clobber it
-        # with "failed".
-        already_cancelled = (
-            self._task_results.get(operation_id, {}).get("status") == "cancelled"
-        )
+class BulkOperationWorkerPool:
+    """Worker threads draining the ``bulk_operations`` queue.
+
+    Each thread claims one row at a time and runs its BulkOperationTask on a
+    private event loop, so the synchronous SQLAlchemy I/O never blocks the
+    API's event loop. Idle threads poll every ``poll_seconds`` and can be
+    woken early with :meth:`wake` after a new row is inserted locally; rows
+    inserted on other replicas are picked up on the next poll.
+    """
+
+    def __init__(self, workers: int = BULK_OPERATION_WORKERS,
+                 poll_seconds: float = BULK_OPERATION_POLL_SECONDS):
+        self.workers = workers
+        self.poll_seconds = poll_seconds
+        self.worker_prefix = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+        self._wakeup = threading.Condition()
+        self._pending_wakeups = 0
+        self._active: Dict[uuid.UUID, BulkOperationTask] = {}
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        if self._threads or self.workers <= 0:
+            return
+        self._stop.clear()
+        for index in range(self.workers):
+            thread = threading.Thread(
+                target=self._worker_loop,
+                args=(f"{self.worker_prefix}:{index}",),
+                name=f"bulk-ops-worker-{index}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+        logger.info("bulk operations: started %d queue workers (%s)", self.workers, self.worker_prefix)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop polling; running tasks stop after their current chunk.
+
+        Their rows are left ``running`` (not cancelled) and are resumed by
+        another worker once their heartbeat goes stale.
+        """
+        self._stop.set()
+        with self._lock:
+            for task in self._active.values():
+                task.request_shutdown()
+        self.wake(all_workers=True)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def wake(self, all_workers: bool = False) -> None:
+        with self._wakeup:
+            if all_workers:
+                self._pending_wakeups += self.workers
+                self._wakeup.notify_all()
+            else:
+                self._pending_wakeups += 1
+                self._wakeup.notify()
+
+    def _wait_for_work(self) -> None:
+        with self._wakeup:
+            if self._pending_wakeups == 0:
+                self._wakeup.wait(self.poll_seconds)
+            self._pending_wakeups = max(0, self._pending_wakeups - 1)
+
+    def _worker_loop(self, worker_id: str) -> None:
+        while not self._stop.is_set():
+            try:
+                ran = self.run_once(worker_id)
+            except Exception as exc:  # pragma: no cover - defensive logging
+                logger.error("bulk operations worker %s: %s", worker_id, exc)
+                ran = False
+            if not ran:
+                self._wait_for_work()
+
+    def run_once(self, worker_id: str) -> bool:
+        """Claim and run at most one operation. Returns True if one ran."""
+        from core.db import database as db_module
+
+        db = db_module.SessionLocal()
         try:
-            result = task.result()
-            if not already_cancelled:
-                self._task_results[operation_id] = result
-        except asyncio.CancelledError:
-            if not already_cancelled:
-                self._task_results[operation_id] = {"status": "cancelled"}
-        except Exception as e:
-            logger.error(f"Task {operation_id} failed with exception: {e}")
-            if not already_cancelled:
-                self._task_results[operation_id] = {"status": "failed", "error": str(e)}
+            claimed = claim_next_bulk_operation(db, worker_id)
+            if claimed is None:
+                return False
+            op, resumed = claimed
+            task = BulkOperationTask(
+                op.id, op.type, op.actor_user_id, op.organization_id,
+                dict(op.request_payload or {}), worker_id=worker_id, resume=resumed,
+            )
         finally:
-            # Clean up completed task
-            self._running_tasks.pop(operation_id, None)
+            db.close()
 
-    def get_task_status(self, operation_id: uuid.UUID) -> Optional[Dict[str, Any]]:
-        """Get the status of a bulk operation task."""
-        if operation_id in self._running_tasks:
-            return {"status": "running"}
+        if resumed:
+            logger.info("bulk operation %s: resuming on %s", task.operation_id, worker_id)
+        with self._lock:
+            self._active[task.operation_id] = task
+        try:
+            asyncio.run(task.execute())
+        finally:
+            with self._lock:
+                self._active.pop(task.operation_id, None)
+        return True
 
-        if operation_id in self._task_results:
-            return self._task_results[operation_id]
+    def cancel_local(self, operation_id: uuid.UUID) -> bool:
+        """Flag a task running in this process; the DB row is the source of truth."""
+        with self._lock:
+            task = self._active.get(operation_id)
+        if task is None:
+            return False
+        task.request_cancel()
+        return True
 
-        return None
+    def active_count(self) -> int:
+        with self._lock:
+            return len(self._active)
 
-    def cancel_task(self, operation_id: uuid.UUID) -> bool:
-        """Cancel a running bulk operation task.
 
-        Reconciles the in-memory state with the cancel intent:
-        - Cancels the asyncio task (the existing behavior).
-        - Records "cancelled" in `_task_results` so a subsequent
-          `get_task_status` returns the cancel state instead of "failed"
-          (the asyncio.CancelledError propagating through `_on_task_complete`
-          would otherwise classify it as failed).
-        Caller (the cancel endpoint) is responsible for the DB write.
-        """
-        if operation_id in self._running_tasks:
-            task = self._running_tasks[operation_id]
-            task.cancel()
-            self._task_results[operation_id] = {"status": "cancelled"}
-            return True
-        return False
+# Process-wide worker pool (started from the FastAPI lifespan hook)
+_worker_pool = BulkOperationWorkerPool()
 
-    def get_running_tasks_count(self) -> int:
-        """Get the count of currently running tasks."""
-        return len(self._running_tasks)
 
+def start_bulk_operation_workers() -> None:
+    """Start this process's queue workers (no-op when BULK_OPERATION_WORKERS=0)."""
+    _worker_pool.start()
 
-# Global manager instance
-_bulk_operations_manager = AsyncBulkOperationsManager()
+
+def stop_bulk_operation_workers(timeout: float = 10.0) -> None:
+    """Stop this process's queue workers."""
+    _worker_pool.stop(timeout)
 
 
 @asynccontextmanager
 async def get_async_db_session():
     """Get an async database session."""
-    SessionLocal = get_db_session_local()
-    db = SessionLocal()
+    session_gen = get_db_session_local()
+    db = next(session_gen)
     try:
         yield db
     finally:
-        db.close()
+        session_gen.close()
 
 
 async def execute_bulk_operation_async(operation_id: uuid.UUID, task_type: str,
                                      actor_user_id: uuid.UUID, organization_id: uuid.UUID,
                                      payload: Dict[str, Any]) -> None:
-    """Execute a bulk operation asynchronously using the manager."""
-    await _bulk_operations_manager.submit_task(
-        operation_id, task_type, actor_user_id, organization_id, payload
-    )
+    """Hand a committed ``pending`` bulk operation row to the queue.
+
+    The row itself is the job; this only wakes a local worker so the
+    operation starts without waiting for the next poll.
+    """
+    _worker_pool.wake()
 
 
 def reconcile_stuck_bulk_operations(
@@ -442,6 +881,9 @@ def reconcile_stuck_bulk_operations(
     `status='running'` indefinitely. The status endpoint then reports the
     operation as live forever.
 
+    Queued types (`QUEUED_OPERATION_TYPES`) are skipped: a queue worker
+    resumes them once their heartbeat goes stale.
+
     Called from the FastAPI `lifespan` startup hook in `core/api/main.py`
     BEFORE the new process accepts traffic. Reconciles any rows whose
     `started_at` is older than `min_age_seconds` (default 60s) — that
@@ -455,8 +897,6 @@ def reconcile_stuck_bulk_operations(
 
     Returns the number of rows reconciled.
     """
-    from datetime import datetime, timedelta, timezone
-    from core.db import models
     owns_session = session is None
     if owns_session:
         from core.db.database import SessionLocal
@@ -469,6 +909,7 @@ def reconcile_stuck_bulk_operations(
             db.query(models.BulkOperation)
             .filter(
                 models.BulkOperation.status == 'running',
+                models.BulkOperation.type.notin_(QUEUED_OPERATION_TYPES),
                 models.BulkOperation.started_at != None,  # noqa: E711 — SQLAlchemy needs `!=` not `is not`
                 models.BulkOperation.started_at < cutoff,
             )
@@ -491,16 +932,31 @@ def reconcile_stuck_bulk_operations(
             db.close()
 
 
-def get_bulk_operation_status(operation_id: uuid.UUID) -> Optional[Dict[str, Any]]:
-    """Get the status of a bulk operation."""
-    return _bulk_operations_manager.get_task_status(operation_id)
+def cancel_bulk_operation(operation_id: uuid.UUID) -> bool:
+    """Stop a bulk operation running in this process before its next chunk.
 
+    Callers persist ``status='cancelled'`` on the row; workers on other
+    replicas see that between chunks.
+    """
+    return _worker_pool.cancel_local(operation_id)
 
-def cancel_bulk_operation(operation_id: uuid.UUID) -> bool:
-    """Cancel a running bulk operation."""
-    return _bulk_operations_manager.cancel_task(operation_id)
+
+def count_queued_bulk_operations(db: Session) -> Dict[str, int]:
+    """Queued operations waiting for (``pending``) or held by (``running``) a worker."""
+    rows = (
+        db.query(models.BulkOperation.status, func.count(models.BulkOperation.id))
+        .filter(
+            models.BulkOperation.type.in_(QUEUED_OPERATION_TYPES),
+            models.BulkOperation.status.in_(("pending", "running")),
+        )
+        .group_by(models.BulkOperation.status)
+        .all()
+    )
+    counts = {"pending": 0, "running": 0}
+    counts.update({status: count for status, count in rows})
+    return counts
 
 
 def get_running_bulk_operations_count() -> int:
-    """Get the count of currently running bulk operations."""
-    return _bulk_operations_manager.get_running_tasks_count()
+    """Get the count of bulk operations running in this process."""
+    return _worker_pool.active_count()
@@ -3,15 +3,33 @@ Audit logging helpers and enums.
 
 Centralized helpers to persist normalized audit records with consistent
 schema; includes convenience wrappers per target type.
+
+Records go to one of two sinks:
+
+- ``transactional`` (default): the row is added to the caller's session and
+  written by the caller's next commit, atomically with the audited change.
+  Nothing is committed on the caller's behalf, so log before the commit
+  that persists the change.
+- ``async``: the record is buffered and bulk-inserted by the background
+  :class:`core.services.audit_writer.AuditLogWriter`; the caller's session
+  is not touched. Suits high-volume emitters such as bulk operations.
+
+``AUDIT_SINK_MODE`` picks the default; ``log(..., sink=...)`` overrides it.
 """
 from __future__ import annotations
+import os
 import uuid
+from datetime import datetime, timezone
 from enum import Enum
 from typing import Any, Optional, Dict
 from sqlalchemy.orm import Session
 
 from core.db import crud, schemas
 
+AUDIT_SINK_TRANSACTIONAL = "transactional"
+AUDIT_SINK_ASYNC = "async"
+AUDIT_SINK_MODE = os.getenv("AUDIT_SINK_MODE", AUDIT_SINK_TRANSACTIONAL).lower()
+
 class AuditAction(str, Enum):
     # Organization
     ORGANIZATION_CREATE = "organization_create"
@@ -75,10 +93,13 @@ def log(
     actor_user_id: uuid.UUID,
     organization_id: Optional[uuid.UUID] = None,
     metadata: Optional[Dict[str, Any]] = None,
-) -> schemas.AuditLog:
+    sink: Optional[str] = None,
+):
     """Central audit logging helper.
 
     Ensures consistent schema and future-proof single place for enrichment.
+    Returns the pending ``models.AuditLog`` row with the transactional sink
+    and None with the async sink.
     """
     # Ensure we persist pure string values, not Enum reprs (avoid 'AuditAction.XYZ')
     action_value = action.value if isinstance(action, AuditAction) else str(action)
@@ -90,14 +111,27 @@ def log(
         target_id=target_id,
         metadata=metadata or {},
     )
-    return crud.create_audit_log(
+    if (sink or AUDIT_SINK_MODE) == AUDIT_SINK_ASYNC:
+        from core.services.audit_writer import get_audit_log_writer
+
+        data = audit_log.model_dump()
+        data["metadata_json"] = data.pop("metadata")
+        get_audit_log_writer().submit({
+            **data,
+            "id": uuid.uuid4(),
+            "actor_user_id": actor_user_id,
+            "organization_id": organization_id,
+            "created_at": datetime.now(timezone.utc),
+        })
+        return None
+    return crud.add_audit_log(
         db,
         audit_log=audit_log,
         actor_user_id=actor_user_id,
         organization_id=organization_id,
     )
 
-__all__ = ["AuditAction", "AuditStatus", "log"]
+__all__ = ["AuditAction", "AuditStatus", "AUDIT_SINK_TRANSACTIONAL", "AUDIT_SINK_ASYNC", "log"]
 
 # Convenience wrappers (non-breaking). Keep optional organization_id explicit.
 def log_agent(
@@ -110,6 +144,7 @@ def log_agent(
     name: Optional[str] = None,
     status: AuditStatus | str = AuditStatus.SUCCESS,
     extra_metadata: Optional[Dict[str, Any]] = None,
+    sink: Optional[str] = None,
 ):
     md: Dict[str, Any] = {"name": name} if name else {}
     if extra_metadata:
@@ -123,6 +158,7 @@ def log_agent(
         actor_user_id=actor_user_id,
         organization_id=organization_id,
         metadata=md or None,
+        sink=sink,
     )
 
 def log_keyword(
@@ -135,6 +171,7 @@ def log_keyword(
     text: Optional[str] = None,
     status: AuditStatus | str = AuditStatus.SUCCESS,
     extra_metadata: Optional[Dict[str, Any]] = None,
+    sink: Optional[str] = None,
 ):
     md: Dict[str, Any] = {"text": text} if text else {}
     if extra_metadata:
@@ -148,6 +185,7 @@ def log_keyword(
         actor_user_id=actor_user_id,
         organization_id=organization_id,
         metadata=md or None,
+        sink=sink,
     )
 
 def log_memory(
@@ -159,6 +197,7 @@ def log_memory(
     action: AuditAction,
     status: AuditStatus | str = AuditStatus.SUCCESS,
     metadata: Optional[Dict[str, Any]] = None,
+    sink: Optional[str] = None,
 ):
     return log(
         db,
@@ -169,6 +208,7 @@ def log_memory(
         actor_user_id=actor_user_id,
         organization_id=organization_id,
         metadata=metadata,
+        sink=sink,
     )
 
 def log_bulk_operation(
@@ -180,6 +220,7 @@ def log_bulk_operation(
     action: AuditAction,
     status: AuditStatus | str = AuditStatus.SUCCESS,
     metadata: Optional[Dict[str, Any]] = None,
+    sink: Optional[str] = None,
 ):
     return log(
         db,
@@ -190,6 +231,7 @@ def log_bulk_operation(
         actor_user_id=actor_user_id,
         organization_id=organization_id,
         metadata=metadata,
+        sink=sink,
     )
 
 __all__.extend(["log_agent", "log_keyword", "log_memory", "log_bulk_operation"])
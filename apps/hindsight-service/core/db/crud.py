@@ -12,11 +12,21 @@ from core.db.repositories.bulk_ops import (
     get_bulk_operation,
     get_bulk_operations,
     update_bulk_operation,
+    count_org_resources,
+    count_move_conflicts,
+    get_move_conflicts,
+    MOVE_CONFLICT_RESOURCE_TYPES,
 )
 # audit logs
 from core.db.repositories.audits import (
+    add_audit_log,
     create_audit_log,
+    insert_audit_logs,
     get_audit_logs,
+    iter_audit_logs,
+    list_audit_log_partitions,
+    ensure_audit_log_partitions,
+    drop_audit_log_partitions,
 )
 # agents and transcripts
 from core.db.repositories.agents import (
@@ -39,6 +49,7 @@ from core.db.repositories.keywords import (
     create_keyword,
     get_keyword,
     get_keyword_by_text,
+    get_scoped_keywords_by_texts,
     get_scoped_keyword_by_text,
     get_keywords,
     update_keyword,
@@ -53,6 +64,7 @@ from core.db.repositories.keywords import (
 from core.db.repositories.memory_blocks import (
     create_memory_block,
     get_memory_block,
+    get_memory_blocks_by_ids,
     get_memory_blocks_by_agent,
     get_memory_blocks_by_conversation,
     get_all_memory_blocks,
@@ -66,6 +78,11 @@ from core.db.repositories.memory_blocks import (
     get_feedback_logs_by_memory_block,
     update_feedback_log,
     delete_feedback_log,
+    find_duplicate_memory_block,
+    get_duplicate_content_groups,
+    count_duplicate_content_blocks,
+    backfill_memory_block_content_hashes,
+    DuplicateMemoryBlockError,
 )
 # organizations
 from core.db.repositories.organizations import (
@@ -92,9 +109,32 @@ from core.db.repositories.consolidation_suggestions import (
     get_consolidation_suggestion,
     get_consolidation_suggestions,
     get_consolidation_suggestions_scoped,
+    get_pending_suggestion_memory_ids,
+    get_original_memory_blocks,
+    resync_suggestion_scopes,
     update_consolidation_suggestion,
     delete_consolidation_suggestion,
     apply_consolidation,
 )
+# consolidation runs
+from core.db.repositories.consolidation_runs import (
+    claim_consolidation_run,
+    checkpoint_consolidation_run,
+    finish_consolidation_run,
+    get_consolidation_runs,
+    get_memory_blocks_since,
+    get_memory_block_rows,
+)
+# pruning scores
+from core.db.repositories.pruning_scores import (
+    refresh_pruning_scores,
+)
+# email outbox
+from core.db.repositories.email_outbox import (
+    enqueue_email,
+    claim_outbox_emails,
+    record_outbox_results,
+    get_outbox_stats,
+)
 # search
 from core.services.search_service import search_memory_blocks_enhanced
@@ -6,10 +6,13 @@ test fallbacks (SQLite in-memory) and exposes FastAPI dependencies.
 """
 import os
 import sys
+import time
 from sqlalchemy import create_engine, text
 from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import QueuePool, StaticPool
+
+from core.metrics import DB_POOL_WAIT
 
 # Database connection URL
 # Generate dynamically from individual components if DATABASE_URL is not provided
@@ -83,6 +86,22 @@ elif pytest_indicator and not is_e2e_context:
 else:
     _sqlite_kwargs = {}
 
+
+class TimedQueuePool(QueuePool):
+    """QueuePool recording each checkout's wait (including opening a new
+    connection) in ``hindsight_db_pool_wait_seconds``."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT.observe(time.perf_counter() - started)
+
+
+if DATABASE_URL.startswith("postgresql"):
+    _sqlite_kwargs = {**_sqlite_kwargs, "poolclass": TimedQueuePool}
+
 def _create_engine_with_fallback(url: str, kwargs: dict):
     """Create engine; if creation fails under pytest and no explicit DB is set, fall back to in-memory sqlite.
 
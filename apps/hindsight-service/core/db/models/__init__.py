@@ -13,8 +13,10 @@ from .organizations import Organization, OrganizationMembership, OrganizationInv
 from .agents import Agent, AgentTranscript
 from .keywords import Keyword
 from .memory import MemoryBlock, FeedbackLog, MemoryBlockKeyword, ConsolidationSuggestion
+from .consolidation import MemoryBlockMinHash, MemoryBlockLSHBucket, ConsolidationRun
 from .audit import AuditLog
 from .bulk_ops import BulkOperation
+from .llm_cache import LLMResultCache
 from .notifications import UserNotificationPreference, Notification, EmailNotificationLog
 from .beta_access import BetaAccessRequest
 from .tokens import PersonalAccessToken
@@ -37,9 +39,14 @@ __all__ = [
     "FeedbackLog",
     "MemoryBlockKeyword",
     "ConsolidationSuggestion",
+    "MemoryBlockMinHash",
+    "MemoryBlockLSHBucket",
+    "ConsolidationRun",
     # audit/bulk
     "AuditLog",
     "BulkOperation",
+    # llm cache
+    "LLMResultCache",
     # notifications
     "UserNotificationPreference",
     "Notification",
@@ -5,6 +5,9 @@ from .base import Base, now_utc
 
 
 class AuditLog(Base):
+    # On Postgres the table is range-partitioned by month on created_at
+    # (migration 2026102800), so its primary key there is (id, created_at);
+    # ids stay unique and the mapper keys rows by id alone.
     __tablename__ = 'audit_logs'
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     organization_id = Column(UUID(as_uuid=True), ForeignKey('organizations.id', ondelete='SET NULL'), nullable=True)
@@ -19,9 +22,13 @@ class AuditLog(Base):
     created_at = Column(DateTime(timezone=True), default=now_utc, nullable=False)
 
     __table_args__ = (
-        Index('ix_audit_logs_organization_id_created_at', 'organization_id', 'created_at'),
-        Index('ix_audit_logs_actor_user_id_created_at', 'actor_user_id', 'created_at'),
-        Index('ix_audit_logs_action_type', 'action_type'),
+        # Every GET /audits/ filter combination ends in the keyset order.
+        Index('ix_audit_logs_created_at_id', created_at.desc(), id.desc()),
+        Index('ix_audit_logs_org_created_at_id', organization_id, created_at.desc(), id.desc()),
+        Index('ix_audit_logs_org_action_created_at_id', organization_id, action_type, created_at.desc(), id.desc()),
+        Index('ix_audit_logs_org_status_created_at_id', organization_id, status, created_at.desc(), id.desc()),
+        Index('ix_audit_logs_actor_created_at_id', actor_user_id, created_at.desc(), id.desc()),
+        Index('ix_audit_logs_action_created_at_id', action_type, created_at.desc(), id.desc()),
     )
 
     def get_metadata(self):
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, Text, DateTime, Integer, ForeignKey, Index
+from sqlalchemy import Column, Text, DateTime, Integer, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from .base import Base, now_utc
 
@@ -19,9 +19,18 @@ class BulkOperation(Base):
     error_log = Column(JSONB, nullable=True)
     result_summary = Column(JSONB, nullable=True)
     created_at = Column(DateTime(timezone=True), default=now_utc, nullable=False)
+    # Job-queue lease: which worker owns a running row and when it last reported.
+    worker_id = Column(Text, nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    attempts = Column(Integer, nullable=False, default=0, server_default='0')
 
     __table_args__ = (
         Index('ix_bulk_operations_organization_id_created_at', 'organization_id', 'created_at'),
         Index('ix_bulk_operations_actor_user_id_created_at', 'actor_user_id', 'created_at'),
+        Index(
+            'ix_bulk_operations_queue',
+            'created_at',
+            postgresql_where=text("status IN ('pending', 'running')"),
+        ),
     )
 
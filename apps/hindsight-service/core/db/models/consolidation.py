@@ -0,0 +1,67 @@
+import uuid
+from sqlalchemy import Column, Text, DateTime, Integer, SmallInteger, BigInteger, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import UUID, ARRAY
+from .base import Base, now_utc
+
+
+class MemoryBlockMinHash(Base):
+    """MinHash signature of a memory block's text, used for near-duplicate search."""
+
+    __tablename__ = 'memory_block_minhash'
+    memory_id = Column(UUID(as_uuid=True), ForeignKey('memory_blocks.id', ondelete='CASCADE'), primary_key=True)
+    # "<visibility_scope>:<organization_id>:<owner_user_id>" — candidates never cross it.
+    partition_key = Column(Text, nullable=False)
+    content_hash = Column(Text, nullable=False)
+    signature = Column(ARRAY(Integer), nullable=False)
+    updated_at = Column(DateTime(timezone=True), default=now_utc, onupdate=now_utc, nullable=False)
+
+
+class MemoryBlockLSHBucket(Base):
+    """One LSH band bucket per (block, band); blocks sharing a bucket are candidates."""
+
+    __tablename__ = 'memory_block_lsh_buckets'
+    partition_key = Column(Text, primary_key=True)
+    band = Column(SmallInteger, primary_key=True)
+    bucket = Column(BigInteger, primary_key=True)
+    memory_id = Column(UUID(as_uuid=True), ForeignKey('memory_blocks.id', ondelete='CASCADE'), primary_key=True)
+
+    __table_args__ = (
+        Index('ix_memory_block_lsh_buckets_memory_id', 'memory_id'),
+    )
+
+
+class ConsolidationRun(Base):
+    """One consolidation worker run and the watermark it has checkpointed.
+
+    Runs process blocks in ``(updated_at, id)`` order; after each batch the
+    last processed key and the counters are committed together, so a run
+    that dies is resumed from its last checkpoint and the next run starts
+    where the previous one stopped.
+    """
+
+    __tablename__ = 'consolidation_runs'
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    status = Column(Text, nullable=False, default='running')  # running|completed|failed
+    started_at = Column(DateTime(timezone=True), default=now_utc, nullable=False)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), default=now_utc, nullable=True)
+    attempts = Column(Integer, nullable=False, default=1, server_default='1')
+    watermark_updated_at = Column(DateTime(timezone=True), nullable=True)
+    watermark_id = Column(UUID(as_uuid=True), nullable=True)
+    blocks_processed = Column(Integer, nullable=False, default=0, server_default='0')
+    batches_processed = Column(Integer, nullable=False, default=0, server_default='0')
+    groups_found = Column(Integer, nullable=False, default=0, server_default='0')
+    groups_skipped = Column(Integer, nullable=False, default=0, server_default='0')
+    suggestions_created = Column(Integer, nullable=False, default=0, server_default='0')
+    error = Column(Text, nullable=True)
+
+    __table_args__ = (
+        Index('ix_consolidation_runs_started_at', 'started_at'),
+        # At most one run in progress; a second worker's insert fails instead of racing.
+        Index(
+            'uq_consolidation_runs_running',
+            'status',
+            unique=True,
+            postgresql_where=text("status = 'running'"),
+        ),
+    )
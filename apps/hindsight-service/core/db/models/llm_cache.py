@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Text, DateTime, Integer, Index
+from .base import Base, now_utc
+
+
+class LLMResultCache(Base):
+    """Persisted LLM responses keyed by model, prompt template version and content hash."""
+
+    __tablename__ = 'llm_result_cache'
+    cache_key = Column(Text, primary_key=True)  # sha256 of model/purpose/template version/content hash
+    model = Column(Text, nullable=False)
+    purpose = Column(Text, nullable=False)
+    template_version = Column(Text, nullable=False)
+    content_hash = Column(Text, nullable=False)
+    response_text = Column(Text, nullable=False)
+    input_tokens = Column(Integer, nullable=True)
+    output_tokens = Column(Integer, nullable=True)
+    hit_count = Column(Integer, nullable=False, default=0, server_default='0')
+    created_at = Column(DateTime(timezone=True), default=now_utc, nullable=False)
+    last_used_at = Column(DateTime(timezone=True), default=now_utc, nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index('ix_llm_result_cache_expires_at', 'expires_at'),
+        Index('ix_llm_result_cache_last_used_at', 'last_used_at'),
+    )
@@ -1,5 +1,6 @@
+import random
 import uuid
-from sqlalchemy import Column, String, Text, DateTime, Integer, ForeignKey, Index, Boolean, CheckConstraint
+from sqlalchemy import Column, String, Text, DateTime, Integer, Float, ForeignKey, Index, Boolean, CheckConstraint, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB, TSVECTOR
 from sqlalchemy.orm import relationship
 from .base import Base, now_utc
@@ -26,6 +27,12 @@ class MemoryBlock(Base):
     organization_id = Column(UUID(as_uuid=True), ForeignKey('organizations.id'), nullable=True)
     created_at = Column(DateTime(timezone=True), default=now_utc)
     updated_at = Column(DateTime(timezone=True), default=now_utc, onupdate=now_utc)
+    # Uniform key for indexed random sampling (pruning); the migration adds a random() server default.
+    random_key = Column(Float, nullable=False, default=random.random)
+    # Heuristic pruning score (1-100, lower prunes first); maintained by a trigger and refresh_pruning_scores.
+    pruning_score = Column(Integer, nullable=True)
+    # SHA-256 of the normalized embedded text (EmbeddingService.content_hash).
+    content_hash = Column(String(64), nullable=True)
 
     # Search-related fields
     search_vector = Column(TSVECTOR, nullable=True)  # For full-text search
@@ -46,6 +53,13 @@ class MemoryBlock(Base):
         Index('idx_memory_blocks_archived_at', 'archived_at'),
         Index('idx_memory_blocks_owner_user_id', 'owner_user_id'),
         Index('idx_memory_blocks_org_scope', 'organization_id', 'visibility_scope'),
+        # Keyset order for incremental consolidation runs.
+        Index('idx_memory_blocks_updated_at_id', 'updated_at', 'id'),
+        # Keyset walk for pruning samples.
+        Index('idx_memory_blocks_random_key', 'random_key', 'id', postgresql_where=text('archived IS NOT TRUE')),
+        Index('idx_memory_blocks_pruning_score', 'pruning_score', 'id', postgresql_where=text('archived IS NOT TRUE')),
+        # Exact-duplicate lookups and GROUP BY within a scope.
+        Index('idx_memory_blocks_scope_content_hash', 'visibility_scope', 'organization_id', 'owner_user_id', 'content_hash'),
         CheckConstraint("visibility_scope in ('personal','organization','public')", name='ck_memory_blocks_visibility_scope'),
     )
 
@@ -82,8 +96,21 @@ class ConsolidationSuggestion(Base):
     timestamp = Column(DateTime(timezone=True), default=now_utc)
     created_at = Column(DateTime(timezone=True), default=now_utc)
     updated_at = Column(DateTime(timezone=True), default=now_utc, onupdate=now_utc)
+    # Shared scope of the originals, copied at creation; NULL when they differ
+    # (or for rows written without it) and callers fall back to the originals.
+    visibility_scope = Column(String(20), nullable=True)
+    owner_user_id = Column(UUID(as_uuid=True), nullable=True)
+    organization_id = Column(UUID(as_uuid=True), nullable=True)
 
     __table_args__ = (
         Index('idx_consolidation_suggestions_status', 'status'),
         Index('idx_consolidation_suggestions_group_id', 'group_id'),
+        Index('idx_consolidation_suggestions_scope', 'visibility_scope', 'organization_id', 'owner_user_id'),
+        # Serves the pending-overlap check (original_memory_ids ?| ids).
+        Index(
+            'idx_consolidation_suggestions_pending_originals',
+            'original_memory_ids',
+            postgresql_using='gin',
+            postgresql_where=text("status = 'pending'"),
+        ),
     )
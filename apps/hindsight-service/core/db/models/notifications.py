@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, Text, DateTime, Boolean, ForeignKey, Index
+from sqlalchemy import Column, String, Text, DateTime, Boolean, ForeignKey, Index, Integer, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from .base import Base, now_utc
 
@@ -39,7 +39,9 @@ class Notification(Base):
 
     __table_args__ = (
         Index('idx_notifications_user_id_created_at', 'user_id', 'created_at'),
-        Index('idx_notifications_user_id_is_read', 'user_id', 'is_read'),
+        # Unread-count and unread-feed reads; expiry is a range on the second key.
+        Index('idx_notifications_unread_user_expires_at', 'user_id', 'expires_at', postgresql_where=text('is_read = false')),
+        Index('idx_notifications_unread_user_created_at', 'user_id', 'created_at', postgresql_where=text('is_read = false')),
         Index('idx_notifications_expires_at', 'expires_at'),
         Index('idx_notifications_event_type', 'event_type'),
     )
@@ -56,7 +58,8 @@ class EmailNotificationLog(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     notification_id = Column(UUID(as_uuid=True), ForeignKey('notifications.id', ondelete='CASCADE'), nullable=True)
-    user_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    # NULL for emails to addresses without an account (beta access).
+    user_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), nullable=True)
     email_address = Column(String(320), nullable=False)
     event_type = Column(String(50), nullable=False)
     subject = Column(String(200), nullable=False)
@@ -67,11 +70,22 @@ class EmailNotificationLog(Base):
     delivered_at = Column(DateTime(timezone=True), nullable=True)
     bounced_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), default=now_utc, nullable=False)
+    # Outbox: a 'pending' row with next_attempt_at set is queued for the
+    # sender, which retries with backoff and dead-letters after max attempts.
+    body_html = Column(Text, nullable=True)
+    body_text = Column(Text, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0, server_default='0')
+    next_attempt_at = Column(DateTime(timezone=True), nullable=True)
 
     __table_args__ = (
         Index('idx_email_notification_logs_user_id_created_at', 'user_id', 'created_at'),
         Index('idx_email_notification_logs_status', 'status'),
         Index('idx_email_notification_logs_event_type', 'event_type'),
         Index('idx_email_notification_logs_notification_id', 'notification_id'),
+        Index(
+            'idx_email_notification_logs_outbox',
+            'next_attempt_at',
+            postgresql_where=text("status = 'pending' AND next_attempt_at IS NOT NULL"),
+        ),
     )
 
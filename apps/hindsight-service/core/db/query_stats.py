@@ -0,0 +1,144 @@
+"""
+Per-request SQL statistics: statement count, DB time and repeated shapes.
+
+:func:`collect_queries` records every statement executed in the current
+context (the request middleware in ``core.api.middleware.query_stats``
+opens one per request; sync endpoints running in the thread pool inherit
+it). Passing ``bind`` instead records whatever runs on that engine or
+connection, from any thread, which is what the ``max_queries`` test
+fixture uses.
+
+A statement's *shape* is its SQL with parameters, literals and expanded
+``IN`` lists collapsed, so the same query issued for different ids counts
+as one shape. A shape repeated ``QUERY_STATS_REPEAT_THRESHOLD`` times in
+one request is almost always a lazy load or a lookup inside a loop (N+1).
+"""
+
+import os
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+QUERY_STATS_REPEAT_THRESHOLD = int(os.getenv("QUERY_STATS_REPEAT_THRESHOLD", 10))
+
+_START_KEY = "query_stats_started"
+
+_PARAM = re.compile(r"%\(\w+\)s|\$\d+|:\w+|\?")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def statement_shape(statement: str) -> str:
+    """``statement`` with parameters and literals replaced by ``?`` and ``IN`` lists collapsed."""
+    shape = _PARAM.sub("?", statement)
+    shape = _LITERAL.sub("?", shape)
+    shape = _LIST.sub("(?)", shape)
+    return _SPACE.sub(" ", shape).strip()
+
+
+class QueryStats:
+    """Statements seen by one collector."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.duration_seconds = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.duration_seconds += seconds
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int = QUERY_STATS_REPEAT_THRESHOLD) -> List[Tuple[str, int]]:
+        """Shapes executed at least ``threshold`` times, most frequent first."""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+    def server_timing(self) -> str:
+        """``Server-Timing`` entry, e.g. ``db;dur=12.3;desc="7 queries"``."""
+        return f'db;dur={self.duration_seconds * 1000:.1f};desc="{self.count} queries"'
+
+    def describe(self, limit: int = 10) -> str:
+        lines = [f"{self.count} queries in {self.duration_seconds * 1000:.1f} ms"]
+        lines += [f"  {n:>4} x {shape[:200]}" for shape, n in self.shapes.most_common(limit)]
+        return "\n".join(lines)
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info[_START_KEY] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop(_START_KEY, None)
+    stats = _current.get()
+    if stats is not None and started is not None:
+        stats.record(statement, time.perf_counter() - started)
+
+
+def _install() -> None:
+    # Class-level listeners cover every engine, including ones created later
+    # (the test suite swaps the engine after import).
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+_install()
+
+
+@contextmanager
+def _collect_on(bind) -> Iterator[QueryStats]:
+    stats = QueryStats()
+    # Start times live on each connection, so threads sharing the bind don't
+    # overwrite each other's; the key is per collector so nested ones and
+    # the context-var listeners keep their own.
+    start_key = (_START_KEY, object())
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info[start_key] = time.perf_counter()
+
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop(start_key, None)
+        if started is not None:
+            stats.record(statement, time.perf_counter() - started)
+
+    event.listen(bind, "before_cursor_execute", _before)
+    event.listen(bind, "after_cursor_execute", _after)
+    try:
+        yield stats
+    finally:
+        event.remove(bind, "before_cursor_execute", _before)
+        event.remove(bind, "after_cursor_execute", _after)
+
+
+@contextmanager
+def collect_queries(bind=None) -> Iterator[QueryStats]:
+    """Record the statements executed inside the block.
+
+    Without ``bind``, statements on any engine in this context (and the
+    threads/tasks it spawns) are counted; nested collectors each see only
+    their own block. With ``bind`` (an Engine or Connection), every
+    statement on it is counted regardless of thread.
+    """
+    if bind is not None:
+        with _collect_on(bind) as stats:
+            yield stats
+        return
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
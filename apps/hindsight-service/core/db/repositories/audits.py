@@ -1,18 +1,30 @@
 """
 Audit log repository functions.
 
-Implements create and query functions for audit logs.
+Implements create and query functions for audit logs. ``create_audit_log``
+commits its row; ``add_audit_log`` only adds it to the caller's session so
+it is persisted by the caller's commit; ``insert_audit_logs`` writes many
+prepared rows in one multi-row INSERT and commits.
+
+On Postgres ``audit_logs`` is range-partitioned by month on ``created_at``.
+``ensure_audit_log_partitions`` creates upcoming months and
+``drop_audit_log_partitions`` implements retention by dropping whole
+months; both commit. Listings are ordered by ``(created_at, id)``
+descending and page by keyset (``before``) as well as by offset.
 """
 from __future__ import annotations
 
+import re
 import uuid
-from typing import Optional
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from sqlalchemy import insert, text, tuple_
 from sqlalchemy.orm import Session
 
 from core.db import schemas, models
 
 
-def create_audit_log(db: Session, audit_log: schemas.AuditLogCreate, actor_user_id: uuid.UUID, organization_id: Optional[uuid.UUID] = None):
+def add_audit_log(db: Session, audit_log: schemas.AuditLogCreate, actor_user_id: uuid.UUID, organization_id: Optional[uuid.UUID] = None):
     data = audit_log.model_dump()
     metadata_payload = data.pop('metadata', None)
     db_audit_log = models.AuditLog(
@@ -22,19 +34,33 @@ def create_audit_log(db: Session, audit_log: schemas.AuditLogCreate, actor_user_
         metadata_json=metadata_payload,
     )
     db.add(db_audit_log)
+    return db_audit_log
+
+
+def create_audit_log(db: Session, audit_log: schemas.AuditLogCreate, actor_user_id: uuid.UUID, organization_id: Optional[uuid.UUID] = None):
+    db_audit_log = add_audit_log(db, audit_log, actor_user_id=actor_user_id, organization_id=organization_id)
     db.commit()
     db.refresh(db_audit_log)
     return db_audit_log
 
 
-def get_audit_logs(
+def insert_audit_logs(db: Session, rows: Sequence[Dict[str, Any]]) -> int:
+    """Bulk-insert ``rows`` (``models.AuditLog`` column values keyed by attribute name)."""
+    if not rows:
+        return 0
+    db.execute(insert(models.AuditLog), list(rows))
+    db.commit()
+    return len(rows)
+
+
+def _filtered_audit_logs(
     db: Session,
     organization_id: Optional[uuid.UUID] = None,
     user_id: Optional[uuid.UUID] = None,
     action_type: Optional[str] = None,
     status: Optional[str] = None,
-    skip: int = 0,
-    limit: int = 100,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
 ):
     query = db.query(models.AuditLog)
     if organization_id:
@@ -45,5 +71,124 @@ def get_audit_logs(
         query = query.filter(models.AuditLog.action_type == action_type)
     if status:
         query = query.filter(models.AuditLog.status == status)
-    return query.order_by(models.AuditLog.created_at.desc()).offset(skip).limit(limit).all()
+    # Time bounds let Postgres prune partitions outside the range.
+    if created_after:
+        query = query.filter(models.AuditLog.created_at >= created_after)
+    if created_before:
+        query = query.filter(models.AuditLog.created_at < created_before)
+    return query
+
+
+def get_audit_logs(
+    db: Session,
+    organization_id: Optional[uuid.UUID] = None,
+    user_id: Optional[uuid.UUID] = None,
+    action_type: Optional[str] = None,
+    status: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    before: Optional[Tuple[datetime, uuid.UUID]] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+):
+    """Newest first. ``before`` is the ``(created_at, id)`` of the last row of the previous page."""
+    query = _filtered_audit_logs(
+        db,
+        organization_id=organization_id,
+        user_id=user_id,
+        action_type=action_type,
+        status=status,
+        created_after=created_after,
+        created_before=created_before,
+    )
+    if before is not None:
+        query = query.filter(tuple_(models.AuditLog.created_at, models.AuditLog.id) < tuple_(*before))
+    query = query.order_by(models.AuditLog.created_at.desc(), models.AuditLog.id.desc())
+    if skip:
+        query = query.offset(skip)
+    return query.limit(limit).all()
+
+
+def iter_audit_logs(db: Session, page_size: int = 1000, **filters) -> Iterator[models.AuditLog]:
+    """Every matching row, newest first, fetched in keyset pages of ``page_size``."""
+    before = None
+    while True:
+        page = get_audit_logs(db, limit=page_size, before=before, **filters)
+        yield from page
+        if len(page) < page_size:
+            return
+        before = (page[-1].created_at, page[-1].id)
+        # Rows already yielded are not needed again; keep memory flat.
+        for row in page:
+            db.expunge(row)
+
+
+_PARTITION_NAME = re.compile(r"^audit_logs_p(\d{4})(\d{2})$")
+
+
+def _month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def _add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
 
+
+def _is_partitioned(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def list_audit_log_partitions(db: Session) -> List[Tuple[str, date]]:
+    """``(name, month)`` of the monthly partitions, oldest first; empty off Postgres."""
+    if not _is_partitioned(db):
+        return []
+    rows = db.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = 'audit_logs'::regclass"
+    )).scalars()
+    partitions = []
+    for name in rows:
+        match = _PARTITION_NAME.match(name)
+        if match:
+            partitions.append((name, date(int(match.group(1)), int(match.group(2)), 1)))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def ensure_audit_log_partitions(db: Session, months_ahead: int, today: Optional[date] = None) -> List[str]:
+    """Create the partitions from this month through ``months_ahead`` months ahead; returns the new ones."""
+    if not _is_partitioned(db):
+        return []
+    current = _month_start(today or datetime.now(timezone.utc).date())
+    created = []
+    for offset in range(months_ahead + 1):
+        name = db.execute(
+            text("SELECT ensure_audit_log_partition(:month)"),
+            {"month": _add_months(current, offset)},
+        ).scalar()
+        if name:
+            created.append(name)
+    db.commit()
+    return created
+
+
+def drop_audit_log_partitions(db: Session, before: date) -> List[str]:
+    """Drop the partitions of the months before ``before``'s month; returns their names.
+
+    Rows that old left in the default partition are deleted.
+    """
+    if not _is_partitioned(db):
+        return []
+    cutoff = _month_start(before)
+    dropped = []
+    for name, month in list_audit_log_partitions(db):
+        if _add_months(month, 1) > cutoff:
+            break
+        db.execute(text(f'DROP TABLE IF EXISTS "{name}"'))
+        dropped.append(name)
+    db.execute(
+        text("DELETE FROM audit_logs_default WHERE created_at < (CAST(:cutoff AS timestamp) AT TIME ZONE 'UTC')"),
+        {"cutoff": cutoff},
+    )
+    db.commit()
+    return dropped
@@ -1,15 +1,28 @@
 """
 Bulk operations repository functions.
 
-Implements create/read/list/update for bulk operations.
+Implements create/read/list/update for bulk operations, plus the
+aggregate queries used to plan a bulk move without loading the org.
 """
 from __future__ import annotations
 
 import uuid
-from typing import Optional
-from sqlalchemy.orm import Session
+from typing import Dict, List, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session, aliased
 
 from core.db import schemas, models
+from core.utils.scopes import SCOPE_ORGANIZATION, SCOPE_PERSONAL
+
+# resource_type -> (model, primary key, name column, conflict item label)
+_MOVABLE_RESOURCES = {
+    "agents": (models.Agent, "agent_id", "agent_name", "name"),
+    "memory_blocks": (models.MemoryBlock, "id", None, None),
+    "keywords": (models.Keyword, "keyword_id", "keyword_text", "text"),
+}
+
+# Resource types whose names must be unique within the destination scope.
+MOVE_CONFLICT_RESOURCE_TYPES = ("agents", "keywords")
 
 
 def create_bulk_operation(db: Session, bulk_operation: schemas.BulkOperationCreate, actor_user_id: uuid.UUID, organization_id: Optional[uuid.UUID] = None):
@@ -47,3 +60,93 @@ def update_bulk_operation(db: Session, bulk_operation_id: uuid.UUID, bulk_operat
         db.refresh(db_bulk_operation)
     return db_bulk_operation
 
+
+
+def count_org_resources(db: Session, organization_id: uuid.UUID, resource_types: List[str]) -> Dict[str, int]:
+    """Row counts per resource type in an organization, in one round trip."""
+    counts = [
+        db.query(func.count())
+        .select_from(_MOVABLE_RESOURCES[rt][0])
+        .filter(_MOVABLE_RESOURCES[rt][0].organization_id == organization_id)
+        .scalar_subquery()
+        .label(rt)
+        for rt in resource_types
+    ]
+    if not counts:
+        return {}
+    row = db.query(*counts).one()
+    return {rt: int(getattr(row, rt) or 0) for rt in resource_types}
+
+
+def _move_conflicts_query(
+    db: Session,
+    resource_type: str,
+    organization_id: uuid.UUID,
+    *,
+    destination_organization_id: Optional[uuid.UUID] = None,
+    destination_owner_user_id: Optional[uuid.UUID] = None,
+):
+    """Source rows whose name already exists (case-insensitively) in the destination scope.
+
+    Joins the source org against the destination scope on ``lower(name)``,
+    which the scoped unique indexes on agents and keywords cover.
+    """
+    model, pk, name_attr, _ = _MOVABLE_RESOURCES[resource_type]
+    dest = aliased(model)
+    name = getattr(model, name_attr)
+    q = (
+        db.query(getattr(model, pk).label("id"), name.label("name"))
+        .join(dest, func.lower(getattr(dest, name_attr)) == func.lower(name))
+        .filter(model.organization_id == organization_id)
+    )
+    if destination_organization_id is not None:
+        q = q.filter(
+            dest.visibility_scope == SCOPE_ORGANIZATION,
+            dest.organization_id == destination_organization_id,
+        )
+    else:
+        q = q.filter(
+            dest.visibility_scope == SCOPE_PERSONAL,
+            dest.owner_user_id == destination_owner_user_id,
+        )
+    # A row is not a conflict with itself (e.g. moving an org into itself).
+    return q.filter(getattr(dest, pk) != getattr(model, pk)).distinct()
+
+
+def count_move_conflicts(
+    db: Session,
+    resource_type: str,
+    organization_id: uuid.UUID,
+    *,
+    destination_organization_id: Optional[uuid.UUID] = None,
+    destination_owner_user_id: Optional[uuid.UUID] = None,
+) -> int:
+    q = _move_conflicts_query(
+        db, resource_type, organization_id,
+        destination_organization_id=destination_organization_id,
+        destination_owner_user_id=destination_owner_user_id,
+    )
+    return q.count()
+
+
+def get_move_conflicts(
+    db: Session,
+    resource_type: str,
+    organization_id: uuid.UUID,
+    *,
+    destination_organization_id: Optional[uuid.UUID] = None,
+    destination_owner_user_id: Optional[uuid.UUID] = None,
+    after_id: Optional[uuid.UUID] = None,
+    limit: int = 100,
+) -> List[dict]:
+    """One keyset page of move conflicts, ordered by source primary key."""
+    model, pk, _, label = _MOVABLE_RESOURCES[resource_type]
+    q = _move_conflicts_query(
+        db, resource_type, organization_id,
+        destination_organization_id=destination_organization_id,
+        destination_owner_user_id=destination_owner_user_id,
+    )
+    if after_id is not None:
+        q = q.filter(getattr(model, pk) > after_id)
+    rows = q.order_by(getattr(model, pk)).limit(limit).all()
+    return [{label: row.name, "id": row.id} for row in rows]
@@ -0,0 +1,165 @@
+"""
+Consolidation candidate index repository functions.
+
+Maintains the MinHash signatures and LSH band buckets used to find
+near-duplicate memory blocks, and answers candidate-pair queries against
+them and against stored content embeddings. Callers own the transaction.
+"""
+from __future__ import annotations
+
+import uuid
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from sqlalchemy import Float, and_, cast, delete, select, true
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session, aliased
+
+from core.db import models
+
+
+def get_minhash_content_hashes(db: Session, memory_ids: Sequence[uuid.UUID]) -> Dict[uuid.UUID, Tuple[str, str]]:
+    """Map memory id -> (partition_key, content_hash) for already indexed blocks."""
+    if not memory_ids:
+        return {}
+    rows = db.execute(
+        select(
+            models.MemoryBlockMinHash.memory_id,
+            models.MemoryBlockMinHash.partition_key,
+            models.MemoryBlockMinHash.content_hash,
+        ).where(models.MemoryBlockMinHash.memory_id.in_(list(memory_ids)))
+    ).all()
+    return {row.memory_id: (row.partition_key, row.content_hash) for row in rows}
+
+
+def upsert_minhash_entries(db: Session, entries: Iterable[dict]) -> int:
+    """Store signatures and replace band buckets.
+
+    Each entry holds ``memory_id``, ``partition_key``, ``content_hash``,
+    ``signature`` and ``bands`` (one bucket id per band).
+    """
+    entries = list(entries)
+    if not entries:
+        return 0
+    ids = [entry["memory_id"] for entry in entries]
+    db.execute(delete(models.MemoryBlockLSHBucket).where(models.MemoryBlockLSHBucket.memory_id.in_(ids)))
+
+    stmt = insert(models.MemoryBlockMinHash).values([
+        {
+            "memory_id": entry["memory_id"],
+            "partition_key": entry["partition_key"],
+            "content_hash": entry["content_hash"],
+            "signature": entry["signature"],
+        }
+        for entry in entries
+    ])
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[models.MemoryBlockMinHash.memory_id],
+        set_={
+            "partition_key": stmt.excluded.partition_key,
+            "content_hash": stmt.excluded.content_hash,
+            "signature": stmt.excluded.signature,
+            "updated_at": models.now_utc(),
+        },
+    ))
+
+    bucket_rows = [
+        {"partition_key": entry["partition_key"], "band": band, "bucket": bucket, "memory_id": entry["memory_id"]}
+        for entry in entries
+        for band, bucket in enumerate(entry["bands"])
+    ]
+    # Two bands of one block can land on the same bucket id only by hash
+    # collision; ON CONFLICT keeps the insert idempotent either way.
+    db.execute(insert(models.MemoryBlockLSHBucket).values(bucket_rows).on_conflict_do_nothing())
+    return len(entries)
+
+
+def delete_minhash_entries(db: Session, memory_ids: Sequence[uuid.UUID]) -> int:
+    if not memory_ids:
+        return 0
+    ids = list(memory_ids)
+    db.execute(delete(models.MemoryBlockLSHBucket).where(models.MemoryBlockLSHBucket.memory_id.in_(ids)))
+    return db.execute(
+        delete(models.MemoryBlockMinHash).where(models.MemoryBlockMinHash.memory_id.in_(ids))
+    ).rowcount or 0
+
+
+def delete_archived_minhash_entries(db: Session) -> int:
+    """Drop index rows for blocks that have been archived since they were indexed."""
+    archived = select(models.MemoryBlock.id).where(models.MemoryBlock.archived.is_(True))
+    db.execute(delete(models.MemoryBlockLSHBucket).where(models.MemoryBlockLSHBucket.memory_id.in_(archived)))
+    return db.execute(
+        delete(models.MemoryBlockMinHash).where(models.MemoryBlockMinHash.memory_id.in_(archived))
+    ).rowcount or 0
+
+
+def find_lsh_candidate_pairs(db: Session, memory_ids: Sequence[uuid.UUID]) -> List[Tuple[uuid.UUID, uuid.UUID, List[int], List[int]]]:
+    """Pairs (a, b, signature_a, signature_b) sharing a bucket, for a in ``memory_ids``.
+
+    The join stays inside one partition key, so pairs never cross scope,
+    organization or owner boundaries.
+    """
+    if not memory_ids:
+        return []
+    mine = aliased(models.MemoryBlockLSHBucket)
+    other = aliased(models.MemoryBlockLSHBucket)
+    pairs = (
+        select(mine.memory_id.label("a"), other.memory_id.label("b"))
+        .join(other, and_(
+            other.partition_key == mine.partition_key,
+            other.band == mine.band,
+            other.bucket == mine.bucket,
+            other.memory_id != mine.memory_id,
+        ))
+        .where(mine.memory_id.in_(list(memory_ids)))
+        .distinct()
+        .subquery()
+    )
+    sig_a = aliased(models.MemoryBlockMinHash)
+    sig_b = aliased(models.MemoryBlockMinHash)
+    rows = db.execute(
+        select(pairs.c.a, pairs.c.b, sig_a.signature, sig_b.signature)
+        .join(sig_a, sig_a.memory_id == pairs.c.a)
+        .join(sig_b, sig_b.memory_id == pairs.c.b)
+    ).all()
+    return [(row[0], row[1], row[2], row[3]) for row in rows]
+
+
+def find_embedding_neighbors(
+    db: Session,
+    memory_ids: Sequence[uuid.UUID],
+    k: int,
+) -> List[Tuple[uuid.UUID, uuid.UUID, float]]:
+    """Nearest ``k`` neighbours (a, b, cosine distance) for each of ``memory_ids``.
+
+    One LATERAL query per batch. The inner ``ORDER BY embedding <=> ...
+    LIMIT k`` is the shape a pgvector HNSW/IVFFlat index serves; callers
+    apply their distance threshold afterwards so the index stays usable.
+    Neighbours come only from the same scope, organization and owner and
+    exclude archived blocks.
+    """
+    if not memory_ids or k <= 0:
+        return []
+    src = aliased(models.MemoryBlock, name="src")
+    neighbor = aliased(models.MemoryBlock, name="neighbor")
+    distance = neighbor.content_embedding.op("<=>")(src.content_embedding)
+    nearest = (
+        select(neighbor.id.label("neighbor_id"), cast(distance, Float).label("distance"))
+        .where(
+            neighbor.id != src.id,
+            neighbor.content_embedding.isnot(None),
+            neighbor.archived.isnot(True),
+            neighbor.visibility_scope == src.visibility_scope,
+            neighbor.organization_id.is_not_distinct_from(src.organization_id),
+            neighbor.owner_user_id.is_not_distinct_from(src.owner_user_id),
+        )
+        .order_by(distance)
+        .limit(k)
+        .lateral("nearest")
+    )
+    rows = db.execute(
+        select(src.id, nearest.c.neighbor_id, nearest.c.distance)
+        .select_from(src)
+        .join(nearest, true())
+        .where(src.id.in_(list(memory_ids)), src.content_embedding.isnot(None))
+    ).all()
+    return [(row[0], row[1], float(row[2])) for row in rows]
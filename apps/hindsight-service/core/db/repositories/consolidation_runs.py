@@ -0,0 +1,175 @@
+"""
+Consolidation run repository functions.
+
+Tracks worker runs in ``consolidation_runs``: claiming (or resuming) the
+single in-progress run, checkpointing its ``(updated_at, id)`` watermark
+with per-batch statistics, and reading the blocks changed since the
+watermark. Claim, checkpoint and finish commit; the reads do not.
+
+Block reads select plain columns into dicts rather than ORM objects, so
+embeddings, search vectors and identity-map state never reach the worker.
+"""
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from core.db import models
+
+Watermark = Tuple[Optional[datetime], Optional[uuid.UUID]]
+
+_BLOCK_COLUMNS = (
+    models.MemoryBlock.id,
+    models.MemoryBlock.updated_at,
+    models.MemoryBlock.visibility_scope,
+    models.MemoryBlock.owner_user_id,
+    models.MemoryBlock.organization_id,
+    models.MemoryBlock.content,
+    models.MemoryBlock.lessons_learned,
+)
+
+
+def claim_consolidation_run(
+    db: Session,
+    heartbeat_timeout_seconds: int,
+) -> Optional[Tuple[models.ConsolidationRun, bool]]:
+    """Start a run, or resume one whose worker stopped heartbeating.
+
+    A new run starts from the watermark of the most recent run, whatever
+    its outcome: checkpoints are only written after a batch is fully
+    stored. Returns ``(run, resumed)``, or ``None`` while another worker
+    holds a live run.
+    """
+    now = datetime.now(timezone.utc)
+    running = (
+        db.query(models.ConsolidationRun)
+        .filter(models.ConsolidationRun.status == "running")
+        .with_for_update(skip_locked=True)
+        .first()
+    )
+    if running is not None:
+        stale_before = now - timedelta(seconds=heartbeat_timeout_seconds)
+        if running.heartbeat_at is not None and running.heartbeat_at >= stale_before:
+            db.rollback()
+            return None
+        running.attempts = (running.attempts or 0) + 1
+        running.heartbeat_at = now
+        db.commit()
+        db.refresh(running)
+        return running, True
+
+    previous = (
+        db.query(models.ConsolidationRun)
+        .order_by(models.ConsolidationRun.started_at.desc())
+        .first()
+    )
+    run = models.ConsolidationRun(
+        status="running",
+        started_at=now,
+        heartbeat_at=now,
+        watermark_updated_at=previous.watermark_updated_at if previous else None,
+        watermark_id=previous.watermark_id if previous else None,
+    )
+    db.add(run)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another worker inserted its running row first (or holds it locked).
+        db.rollback()
+        return None
+    db.refresh(run)
+    return run, False
+
+
+def checkpoint_consolidation_run(
+    db: Session,
+    run: models.ConsolidationRun,
+    watermark: Watermark,
+    *,
+    blocks: int = 0,
+    groups_found: int = 0,
+    groups_skipped: int = 0,
+    suggestions_created: int = 0,
+) -> models.ConsolidationRun:
+    """Advance the watermark and add one batch's counters, then commit."""
+    run.watermark_updated_at, run.watermark_id = watermark
+    run.blocks_processed = (run.blocks_processed or 0) + blocks
+    run.batches_processed = (run.batches_processed or 0) + 1
+    run.groups_found = (run.groups_found or 0) + groups_found
+    run.groups_skipped = (run.groups_skipped or 0) + groups_skipped
+    run.suggestions_created = (run.suggestions_created or 0) + suggestions_created
+    run.heartbeat_at = datetime.now(timezone.utc)
+    db.commit()
+    return run
+
+
+def finish_consolidation_run(
+    db: Session,
+    run: models.ConsolidationRun,
+    status: str,
+    error: Optional[str] = None,
+) -> models.ConsolidationRun:
+    run.status = status
+    run.error = error
+    run.finished_at = datetime.now(timezone.utc)
+    db.commit()
+    return run
+
+
+def get_consolidation_runs(db: Session, skip: int = 0, limit: int = 20) -> List[models.ConsolidationRun]:
+    return (
+        db.query(models.ConsolidationRun)
+        .order_by(models.ConsolidationRun.started_at.desc())
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+
+
+def get_memory_blocks_since(
+    db: Session,
+    watermark: Watermark,
+    limit: int,
+    until: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """Active blocks after ``watermark`` in ``(updated_at, id)`` order, as dicts.
+
+    ``until`` caps ``updated_at`` so rows written by transactions that are
+    still open when the run starts are left for the next run rather than
+    skipped by a watermark that has already moved past them.
+    """
+    mb = models.MemoryBlock
+    query = select(*_BLOCK_COLUMNS).where(mb.archived.isnot(True), mb.updated_at.isnot(None))
+    after_updated_at, after_id = watermark
+    if after_updated_at is not None:
+        query = query.where(
+            tuple_(mb.updated_at, mb.id) > tuple_(after_updated_at, after_id or uuid.UUID(int=0))
+        )
+    if until is not None:
+        query = query.where(mb.updated_at <= until)
+    rows = db.execute(query.order_by(mb.updated_at, mb.id).limit(limit))
+    return [dict(row._mapping) for row in rows]
+
+
+def get_memory_block_rows(db: Session, memory_ids: Sequence[uuid.UUID]) -> List[Dict[str, Any]]:
+    """Blocks by id as dicts with their keyword texts, in two queries."""
+    if not memory_ids:
+        return []
+    ids = list(set(memory_ids))
+    blocks = [dict(row._mapping) for row in db.execute(select(*_BLOCK_COLUMNS).where(models.MemoryBlock.id.in_(ids)))]
+    keywords: Dict[uuid.UUID, List[str]] = {}
+    for memory_id, keyword_text in db.execute(
+        select(models.MemoryBlockKeyword.memory_id, models.Keyword.keyword_text)
+        .join(models.Keyword, models.Keyword.keyword_id == models.MemoryBlockKeyword.keyword_id)
+        .where(models.MemoryBlockKeyword.memory_id.in_(ids))
+        .order_by(models.MemoryBlockKeyword.memory_id, models.Keyword.keyword_text)
+    ):
+        keywords.setdefault(memory_id, []).append(keyword_text)
+    for block in blocks:
+        block["keywords"] = keywords.get(block["id"], [])
+    return blocks
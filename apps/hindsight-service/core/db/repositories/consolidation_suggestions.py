@@ -9,12 +9,15 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Dict, Iterable, List, Optional
 
-from sqlalchemy import cast, exists, func, select
+from sqlalchemy import and_, cast, exists, func, or_, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.types import Text
 from sqlalchemy.orm import Session
 
 from core.db import models, schemas, scope_utils
+from core.services import get_embedding_service
 from core.utils.scopes import SCOPE_PERSONAL, SCOPE_ORGANIZATION
 
 
@@ -63,6 +66,36 @@ def _get_or_create_keyword(
     return keyword
 
 
+def _parse_memory_ids(memory_ids: Iterable) -> List[uuid.UUID]:
+    parsed = []
+    for memory_id in memory_ids or []:
+        try:
+            parsed.append(uuid.UUID(str(memory_id)))
+        except ValueError:
+            continue
+    return parsed
+
+
+def _shared_scope(db: Session, memory_ids: Iterable) -> dict:
+    """Scope columns shared by every original, or an empty dict if they differ."""
+    ids = _parse_memory_ids(memory_ids)
+    if not ids:
+        return {}
+    scopes = db.query(
+        models.MemoryBlock.visibility_scope,
+        models.MemoryBlock.owner_user_id,
+        models.MemoryBlock.organization_id,
+    ).filter(models.MemoryBlock.id.in_(ids)).distinct().all()
+    if len(scopes) != 1:
+        return {}
+    visibility_scope, owner_user_id, organization_id = scopes[0]
+    return {
+        "visibility_scope": visibility_scope,
+        "owner_user_id": owner_user_id,
+        "organization_id": organization_id,
+    }
+
+
 def create_consolidation_suggestion(db: Session, suggestion: schemas.ConsolidationSuggestionCreate):
     db_suggestion = models.ConsolidationSuggestion(
         group_id=suggestion.group_id,
@@ -70,7 +103,8 @@ def create_consolidation_suggestion(db: Session, suggestion: schemas.Consolidati
         suggested_lessons_learned=suggestion.suggested_lessons_learned,
         suggested_keywords=suggestion.suggested_keywords,
         original_memory_ids=suggestion.original_memory_ids,
-        status=suggestion.status or 'pending'
+        status=suggestion.status or 'pending',
+        **_shared_scope(db, suggestion.original_memory_ids),
     )
     db.add(db_suggestion)
     db.commit()
@@ -95,6 +129,76 @@ def get_consolidation_suggestions(db: Session, status: Optional[str] = None, gro
     return suggestions, total_items
 
 
+def get_pending_suggestion_memory_ids(db: Session, memory_ids: Iterable) -> set[str]:
+    """Which of ``memory_ids`` (as strings) already belong to a pending suggestion.
+
+    One ``original_memory_ids ?| ids`` lookup served by the partial GIN index
+    on pending suggestions.
+    """
+    wanted = {str(memory_id) for memory_id in memory_ids or []}
+    if not wanted:
+        return set()
+    rows = db.query(models.ConsolidationSuggestion.original_memory_ids).filter(
+        models.ConsolidationSuggestion.status == 'pending',
+        models.ConsolidationSuggestion.original_memory_ids.has_any(cast(sorted(wanted), ARRAY(Text))),
+    ).all()
+    return {str(memory_id) for (ids,) in rows for memory_id in (ids or [])} & wanted
+
+
+def resync_suggestion_scopes(db: Session, memory_ids: Iterable) -> int:
+    """Recompute the stored scope of pending suggestions that reference ``memory_ids``.
+
+    Call it in the transaction that re-scopes those memory blocks, after the
+    change is flushed: a suggestion whose originals no longer share one scope
+    gets NULL scope columns, so the scoped listing falls back to checking the
+    originals. Does not commit. Returns the number of suggestions touched.
+    """
+    wanted = {str(memory_id) for memory_id in memory_ids or []}
+    if not wanted:
+        return 0
+    cs = models.ConsolidationSuggestion
+    suggestions = db.query(cs).filter(
+        cs.status == 'pending',
+        cs.original_memory_ids.has_any(cast(sorted(wanted), ARRAY(Text))),
+    ).all()
+    if not suggestions:
+        return 0
+    ids = {
+        memory_id
+        for suggestion in suggestions
+        for memory_id in _parse_memory_ids(suggestion.original_memory_ids)
+    }
+    # Column rows rather than entities: bulk UPDATEs leave stale blocks in the identity map.
+    mb = models.MemoryBlock
+    scopes = {
+        str(row.id): (row.visibility_scope, row.owner_user_id, row.organization_id)
+        for row in db.query(mb.id, mb.visibility_scope, mb.owner_user_id, mb.organization_id).filter(mb.id.in_(ids))
+    }
+    for suggestion in suggestions:
+        shared = {
+            scopes[str(memory_id)]
+            for memory_id in _parse_memory_ids(suggestion.original_memory_ids)
+            if str(memory_id) in scopes
+        }
+        scope = shared.pop() if len(shared) == 1 else (None, None, None)
+        suggestion.visibility_scope, suggestion.owner_user_id, suggestion.organization_id = scope
+    db.flush()
+    return len(suggestions)
+
+
+def get_original_memory_blocks(db: Session, suggestions: Iterable) -> Dict[str, models.MemoryBlock]:
+    """Map original memory id (string) -> MemoryBlock for all ``suggestions`` in one query."""
+    ids = {
+        memory_id
+        for suggestion in suggestions
+        for memory_id in _parse_memory_ids(getattr(suggestion, 'original_memory_ids', None))
+    }
+    if not ids:
+        return {}
+    blocks = db.query(models.MemoryBlock).filter(models.MemoryBlock.id.in_(ids)).all()
+    return {str(block.id): block for block in blocks}
+
+
 def get_consolidation_suggestions_scoped(
     db: Session,
     *,
@@ -105,23 +209,31 @@ def get_consolidation_suggestions_scoped(
     scope_ctx: Optional[scope_utils.ScopeContext] = None,
     current_user: Optional[dict] = None,
 ):
-    """List consolidation suggestions with SQL-level scope narrowing via EXISTS.
+    """List consolidation suggestions with SQL-level scope narrowing.
 
-    This reduces cross-scope noise by ensuring at least one original memory
-    matches the active scope. Membership checks (can_read) should still be
-    enforced by callers at the API layer.
+    Suggestions carrying a denormalized scope are matched on their own
+    indexed columns; the rest (mixed or legacy originals) fall back to an
+    EXISTS over the original memories. Membership checks (can_read) should
+    still be enforced by callers at the API layer.
     """
     mb = models.MemoryBlock
+    cs = models.ConsolidationSuggestion
     filters = []
+    own_filters = []
     scope = getattr(scope_ctx, 'scope', None) if scope_ctx else None
     if scope == 'organization' and getattr(scope_ctx, 'organization_id', None):
         filters.append(mb.organization_id == scope_ctx.organization_id)
         filters.append(mb.visibility_scope == 'organization')
+        own_filters.append(cs.organization_id == scope_ctx.organization_id)
+        own_filters.append(cs.visibility_scope == 'organization')
     elif scope == 'personal' and current_user and current_user.id:
         filters.append(mb.owner_user_id == current_user.id)
         filters.append(mb.visibility_scope == 'personal')
+        own_filters.append(cs.owner_user_id == current_user.id)
+        own_filters.append(cs.visibility_scope == 'personal')
     elif scope == 'public':
         filters.append(mb.visibility_scope == 'public')
+        own_filters.append(cs.visibility_scope == 'public')
 
     exists_cond = exists(
         select(1).
@@ -133,7 +245,10 @@ def get_consolidation_suggestions_scoped(
         )
     )
 
-    query = db.query(models.ConsolidationSuggestion).filter(exists_cond)
+    query = db.query(models.ConsolidationSuggestion).filter(or_(
+        and_(cs.visibility_scope.isnot(None), *own_filters),
+        and_(cs.visibility_scope.is_(None), exists_cond),
+    ))
     if status:
         query = query.filter(models.ConsolidationSuggestion.status == status)
     if group_id:
@@ -214,6 +329,7 @@ def apply_consolidation(db: Session, suggestion_id: uuid.UUID):
                     owner_user_id=getattr(first_memory_block, 'owner_user_id', None),
                     organization_id=getattr(first_memory_block, 'organization_id', None),
                 )
+                new_memory_block.content_hash = get_embedding_service().content_hash(new_memory_block)
                 db.add(new_memory_block)
                 db.flush()
 
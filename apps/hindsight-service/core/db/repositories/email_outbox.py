@@ -0,0 +1,130 @@
+"""
+Email outbox repository functions.
+
+The outbox lives in ``email_notification_logs``: a ``pending`` row with
+``next_attempt_at`` set is queued for delivery. Senders claim due rows
+with ``FOR UPDATE SKIP LOCKED`` and push ``next_attempt_at`` out by a
+lease, so a sender that dies mid-batch only delays its rows; the send
+itself happens outside any transaction. Each result is then recorded as
+``sent``, as ``pending`` again after an exponential backoff, or as
+``dead_letter`` once ``max_attempts`` is reached. Every function commits.
+"""
+from __future__ import annotations
+
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from core.db import models
+
+STATUS_PENDING = "pending"
+STATUS_SENT = "sent"
+STATUS_DEAD_LETTER = "dead_letter"
+
+
+def enqueue_email(
+    db: Session,
+    email_log: models.EmailNotificationLog,
+    html_content: str,
+    text_content: Optional[str] = None,
+) -> models.EmailNotificationLog:
+    """Store the rendered bodies on ``email_log`` and queue it for sending now."""
+    email_log.body_html = html_content
+    email_log.body_text = text_content
+    email_log.status = STATUS_PENDING
+    email_log.next_attempt_at = datetime.now(timezone.utc)
+    db.commit()
+    return email_log
+
+
+def claim_outbox_emails(db: Session, limit: int, lease_seconds: float) -> List[Dict[str, Any]]:
+    """Claim up to ``limit`` due rows, oldest first, as plain dicts.
+
+    Claiming counts as an attempt: ``attempts`` is incremented and the row
+    is hidden from other senders for ``lease_seconds``.
+    """
+    now = datetime.now(timezone.utc)
+    log = models.EmailNotificationLog
+    rows = (
+        db.query(log)
+        .filter(log.status == STATUS_PENDING, log.next_attempt_at.isnot(None), log.next_attempt_at <= now)
+        .order_by(log.next_attempt_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    claimed = []
+    for row in rows:
+        row.attempts = (row.attempts or 0) + 1
+        row.next_attempt_at = now + timedelta(seconds=lease_seconds)
+        claimed.append({
+            "id": row.id,
+            "email_address": row.email_address,
+            "subject": row.subject,
+            "body_html": row.body_html,
+            "body_text": row.body_text,
+            "attempts": row.attempts,
+        })
+    db.commit()
+    return claimed
+
+
+def outbox_backoff_seconds(attempts: int, base_seconds: float, max_seconds: float) -> float:
+    """Delay before retry ``attempts + 1``: doubling from ``base_seconds``, capped, +/-20% jitter."""
+    delay = min(max_seconds, base_seconds * (2 ** max(0, attempts - 1)))
+    return delay * random.uniform(0.8, 1.2)
+
+
+def record_outbox_results(
+    db: Session,
+    results: Sequence[Tuple[uuid.UUID, Dict[str, Any]]],
+    *,
+    max_attempts: int,
+    backoff_base_seconds: float,
+    backoff_max_seconds: float,
+) -> Dict[str, int]:
+    """Apply ``(email_log_id, send_result)`` pairs and return counts per outcome."""
+    counts = {STATUS_SENT: 0, "retry": 0, STATUS_DEAD_LETTER: 0}
+    if not results:
+        return counts
+    log = models.EmailNotificationLog
+    rows = {row.id: row for row in db.query(log).filter(log.id.in_([log_id for log_id, _ in results]))}
+    now = datetime.now(timezone.utc)
+    for log_id, result in results:
+        row = rows.get(log_id)
+        if row is None:
+            continue
+        if result.get("success"):
+            row.status = STATUS_SENT
+            row.sent_at = now
+            row.next_attempt_at = None
+            row.error_message = None
+            if result.get("message_id"):
+                row.provider_message_id = str(result["message_id"])[:255]
+            counts[STATUS_SENT] += 1
+            continue
+        row.error_message = result.get("error") or "Unknown error"
+        if (row.attempts or 0) >= max_attempts:
+            row.status = STATUS_DEAD_LETTER
+            row.next_attempt_at = None
+            counts[STATUS_DEAD_LETTER] += 1
+        else:
+            delay = outbox_backoff_seconds(row.attempts or 0, backoff_base_seconds, backoff_max_seconds)
+            row.next_attempt_at = now + timedelta(seconds=delay)
+            counts["retry"] += 1
+    db.commit()
+    return counts
+
+
+def get_outbox_stats(db: Session) -> Dict[str, Any]:
+    """Queued and dead-lettered counts, and the due time of the oldest queued row."""
+    log = models.EmailNotificationLog
+    queued, oldest = db.query(func.count(log.id), func.min(log.next_attempt_at)).filter(
+        log.status == STATUS_PENDING, log.next_attempt_at.isnot(None)
+    ).one()
+    dead = db.query(func.count(log.id)).filter(log.status == STATUS_DEAD_LETTER).scalar()
+    return {"queued": queued or 0, "oldest_due_at": oldest, "dead_letter": dead or 0}
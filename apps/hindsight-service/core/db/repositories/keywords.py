@@ -7,7 +7,7 @@ scope-aware list queries.
 from __future__ import annotations
 
 import uuid
-from typing import Optional, List
+from typing import Dict, Iterable, Optional, List
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
@@ -36,6 +36,36 @@ def get_keyword_by_text(db: Session, keyword_text: str):
     return db.query(models.Keyword).filter(models.Keyword.keyword_text == keyword_text).first()
 
 
+def get_scoped_keywords_by_texts(
+    db: Session,
+    keyword_texts: Iterable[str],
+    *,
+    visibility_scope: str,
+    owner_user_id: Optional[uuid.UUID] = None,
+    organization_id: Optional[uuid.UUID] = None,
+) -> Dict[str, models.Keyword]:
+    """Map lower-cased text -> keyword for all ``keyword_texts`` in one scope, in one query.
+
+    Batch form of :func:`get_scoped_keyword_by_text`: matching is
+    case-insensitive and limited to the same scope, owner and organization.
+    """
+    lowered = {text.lower() for text in keyword_texts if text}
+    if not lowered:
+        return {}
+    q = db.query(models.Keyword).filter(
+        models.Keyword.visibility_scope == visibility_scope,
+        func.lower(models.Keyword.keyword_text).in_(lowered),
+    )
+    if visibility_scope == SCOPE_ORGANIZATION and organization_id is not None:
+        q = q.filter(models.Keyword.organization_id == organization_id)
+    elif visibility_scope == SCOPE_PERSONAL and owner_user_id is not None:
+        q = q.filter(models.Keyword.owner_user_id == owner_user_id)
+    keywords = {}
+    for keyword in q:
+        keywords.setdefault(keyword.keyword_text.lower(), keyword)
+    return keywords
+
+
 def get_scoped_keyword_by_text(
     db: Session,
     keyword_text: str,
@@ -0,0 +1,100 @@
+"""
+LLM result cache repository functions.
+
+Lookup, upsert and eviction for ``llm_result_cache`` rows. Callers own the
+session; these helpers only flush/commit what they change.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, UTC
+from typing import Optional
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from core.db import models
+
+
+def get_llm_cache_entry(db: Session, cache_key: str, now: Optional[datetime] = None):
+    """Return the live entry for ``cache_key`` and record the hit, or ``None``.
+
+    One ``UPDATE ... RETURNING`` filtered on ``expires_at``: expired rows
+    never match, and the returned row is plain data that is not reloaded
+    after the commit.
+    """
+    now = now or datetime.now(UTC)
+    table = models.LLMResultCache
+    entry = db.execute(
+        update(table)
+        .where(table.cache_key == cache_key, table.expires_at > now)
+        .values(hit_count=table.hit_count + 1, last_used_at=now)
+        .returning(table.response_text, table.input_tokens, table.output_tokens)
+    ).first()
+    db.commit()
+    return entry
+
+
+def put_llm_cache_entry(
+    db: Session,
+    *,
+    cache_key: str,
+    model: str,
+    purpose: str,
+    template_version: str,
+    content_hash: str,
+    response_text: str,
+    ttl_seconds: int,
+    input_tokens: Optional[int] = None,
+    output_tokens: Optional[int] = None,
+    now: Optional[datetime] = None,
+) -> None:
+    """Insert or refresh a cache entry."""
+    now = now or datetime.now(UTC)
+    values = dict(
+        cache_key=cache_key,
+        model=model,
+        purpose=purpose,
+        template_version=template_version,
+        content_hash=content_hash,
+        response_text=response_text,
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        hit_count=0,
+        created_at=now,
+        last_used_at=now,
+        expires_at=now + timedelta(seconds=ttl_seconds),
+    )
+    stmt = insert(models.LLMResultCache).values(**values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[models.LLMResultCache.cache_key],
+        set_={key: stmt.excluded[key] for key in values if key != "cache_key"},
+    )
+    db.execute(stmt)
+    db.commit()
+
+
+def prune_llm_cache(db: Session, max_entries: int, now: Optional[datetime] = None) -> int:
+    """Drop expired entries, then the least recently used ones beyond ``max_entries``."""
+    now = now or datetime.now(UTC)
+    removed = db.execute(
+        delete(models.LLMResultCache).where(models.LLMResultCache.expires_at <= now)
+    ).rowcount or 0
+    if max_entries > 0:
+        # Everything older than the max_entries-th most recently used row goes.
+        keep_boundary = (
+            select(models.LLMResultCache.last_used_at)
+            .order_by(models.LLMResultCache.last_used_at.desc())
+            .offset(max_entries - 1)
+            .limit(1)
+            .scalar_subquery()
+        )
+        removed += db.execute(
+            delete(models.LLMResultCache).where(models.LLMResultCache.last_used_at < keep_boundary)
+        ).rowcount or 0
+    db.commit()
+    return removed
+
+
+def count_llm_cache_entries(db: Session) -> int:
+    return db.query(func.count(models.LLMResultCache.cache_key)).scalar() or 0
@@ -5,13 +5,15 @@ Implements memory block CRUD, search/list, archival, and feedback updates.
 """
 from __future__ import annotations
 
+import os
 import uuid
 from typing import Optional, List, Tuple
 from datetime import datetime, timezone
 import logging
 
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy import or_, Text, func
+from sqlalchemy.dialects.postgresql import aggregate_order_by, array_agg
 
 from core.db import models, schemas, scope_utils
 from core.services import get_embedding_service
@@ -20,6 +22,117 @@ from core.services.search_service import get_search_service
 
 logger = logging.getLogger(__name__)
 
+# Reject a new block whose normalized text already exists, active, in the same scope.
+REJECT_DUPLICATE_MEMORY_BLOCKS = os.getenv("MEMORY_BLOCK_REJECT_DUPLICATES", "false").lower() == "true"
+
+
+class DuplicateMemoryBlockError(ValueError):
+    """Raised on create when an active block with the same content hash
+    already exists in the same (visibility_scope, owner_user_id,
+    organization_id) scope."""
+
+    def __init__(self, existing_id: uuid.UUID):
+        super().__init__(f"Duplicate of memory block {existing_id}")
+        self.existing_id = existing_id
+
+
+def _scope_hash_filters(visibility_scope, owner_user_id, organization_id, content_hash):
+    mb = models.MemoryBlock
+    return [
+        mb.visibility_scope == visibility_scope,
+        mb.owner_user_id.is_(None) if owner_user_id is None else mb.owner_user_id == owner_user_id,
+        mb.organization_id.is_(None) if organization_id is None else mb.organization_id == organization_id,
+        mb.content_hash == content_hash,
+        mb.archived.isnot(True),
+    ]
+
+
+def find_duplicate_memory_block(
+    db: Session,
+    *,
+    visibility_scope: str,
+    owner_user_id,
+    organization_id,
+    content_hash: str,
+) -> Optional[uuid.UUID]:
+    """Id of an active block with ``content_hash`` in the given scope, if any."""
+    return (
+        db.query(models.MemoryBlock.id)
+        .filter(*_scope_hash_filters(visibility_scope, owner_user_id, organization_id, content_hash))
+        .limit(1)
+        .scalar()
+    )
+
+
+def _duplicate_content_grouping(db: Session, query=None):
+    mb = models.MemoryBlock
+    base = query if query is not None else db.query(mb)
+    group_key = (mb.visibility_scope, mb.organization_id, mb.owner_user_id, mb.content_hash)
+    return (
+        base.filter(mb.content_hash.isnot(None), mb.archived.isnot(True))
+        .group_by(*group_key)
+        .having(func.count(mb.id) > 1)
+    )
+
+
+def get_duplicate_content_groups(
+    db: Session,
+    query=None,
+    limit: Optional[int] = None,
+    max_ids_per_group: Optional[int] = None,
+) -> List[List[uuid.UUID]]:
+    """Groups of active blocks with identical content hashes, per scope.
+
+    ``query`` optionally narrows the candidates (e.g. a scope-filtered
+    ``db.query(models.MemoryBlock)``). One GROUP BY over the per-scope hash
+    index; groups are ordered by size, largest first. ``limit`` caps the
+    number of groups and ``max_ids_per_group`` the ids returned per group
+    (the lowest ones); use ``count_duplicate_content_blocks`` for totals.
+    """
+    mb = models.MemoryBlock
+    member_ids = array_agg(aggregate_order_by(mb.id, mb.id))
+    if max_ids_per_group is not None:
+        member_ids = member_ids[1:max_ids_per_group]
+    grouped = (
+        _duplicate_content_grouping(db, query)
+        .with_entities(member_ids.label("ids"))
+        .order_by(func.count(mb.id).desc(), func.min(mb.content_hash))
+    )
+    if limit is not None:
+        grouped = grouped.limit(limit)
+    return [sorted(ids, key=str) for (ids,) in grouped.all()]
+
+
+def count_duplicate_content_blocks(db: Session, query=None) -> Tuple[int, int]:
+    """(groups, blocks) over the same grouping as ``get_duplicate_content_groups``."""
+    sizes = (
+        _duplicate_content_grouping(db, query)
+        .with_entities(func.count(models.MemoryBlock.id).label("size"))
+        .subquery()
+    )
+    groups, blocks = db.query(func.count(), func.coalesce(func.sum(sizes.c.size), 0)).select_from(sizes).one()
+    return int(groups), int(blocks)
+
+
+def backfill_memory_block_content_hashes(db: Session, batch_size: int = 500) -> int:
+    """Set ``content_hash`` on blocks that predate it; commits per batch."""
+    embedding_service = get_embedding_service()
+    updated = 0
+    while True:
+        batch = (
+            db.query(models.MemoryBlock)
+            .filter(models.MemoryBlock.content_hash.is_(None))
+            .order_by(models.MemoryBlock.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not batch:
+            return updated
+        for memory_block in batch:
+            memory_block.content_hash = embedding_service.content_hash(memory_block)
+        updated += len(batch)
+        db.commit()
+
 
 def _get_or_create_keyword_scoped(
     db: Session,
@@ -51,7 +164,12 @@ def _get_or_create_keyword_scoped(
     return kw
 
 
-def create_memory_block(db: Session, memory_block: schemas.MemoryBlockCreate):
+def create_memory_block(
+    db: Session,
+    memory_block: schemas.MemoryBlockCreate,
+    reject_duplicates: Optional[bool] = None,
+):
+    """Create a block; raises DuplicateMemoryBlockError when duplicates are rejected."""
     db_memory_block = models.MemoryBlock(
         agent_id=memory_block.agent_id,
         conversation_id=memory_block.conversation_id,
@@ -64,6 +182,18 @@ def create_memory_block(db: Session, memory_block: schemas.MemoryBlockCreate):
         owner_user_id=getattr(memory_block, 'owner_user_id', None),
         organization_id=getattr(memory_block, 'organization_id', None),
     )
+    embedding_service = get_embedding_service()
+    db_memory_block.content_hash = embedding_service.content_hash(db_memory_block)
+    if REJECT_DUPLICATE_MEMORY_BLOCKS if reject_duplicates is None else reject_duplicates:
+        existing_id = find_duplicate_memory_block(
+            db,
+            visibility_scope=db_memory_block.visibility_scope,
+            owner_user_id=db_memory_block.owner_user_id,
+            organization_id=db_memory_block.organization_id,
+            content_hash=db_memory_block.content_hash,
+        )
+        if existing_id is not None:
+            raise DuplicateMemoryBlockError(existing_id)
     db.add(db_memory_block)
     db.flush()
 
@@ -86,7 +216,6 @@ def create_memory_block(db: Session, memory_block: schemas.MemoryBlockCreate):
         db.add(models.MemoryBlockKeyword(memory_id=db_memory_block.id, keyword_id=keyword.keyword_id))
 
     # Attach embeddings when provider is enabled
-    embedding_service = get_embedding_service()
     if embedding_service.is_enabled:
         try:
             embedding_service.attach_embedding(db_memory_block, save_empty=True)
@@ -111,6 +240,20 @@ def get_memory_block(db: Session, memory_id: uuid.UUID):
     return db.query(models.MemoryBlock).filter(models.MemoryBlock.id == memory_id).first()
 
 
+def get_memory_blocks_by_ids(db: Session, memory_ids: List[uuid.UUID]) -> List[models.MemoryBlock]:
+    """Fetch many memory blocks in one ``IN (...)`` query with keywords loaded."""
+    if not memory_ids:
+        return []
+    return (
+        db.query(models.MemoryBlock)
+        .options(
+            selectinload(models.MemoryBlock.memory_block_keywords).joinedload(models.MemoryBlockKeyword.keyword)
+        )
+        .filter(models.MemoryBlock.id.in_(set(memory_ids)))
+        .all()
+    )
+
+
 def get_all_memory_blocks(
     db: Session,
     agent_id: Optional[uuid.UUID] = None,
@@ -217,14 +360,23 @@ def update_memory_block(db: Session, memory_id: uuid.UUID, memory_block: schemas
     db_memory_block = db.query(models.MemoryBlock).filter(models.MemoryBlock.id == memory_id).first()
     if db_memory_block:
         update_data = memory_block.model_dump(exclude_unset=True)
-        should_refresh_embedding = any(
+        text_changed = any(
             key in update_data for key in ("content", "lessons_learned", "errors", "metadata_col")
         )
+        if text_changed:
+            embedding_service = get_embedding_service()
+            previous_text = embedding_service.compose_memory_text(db_memory_block)
         for key, value in update_data.items():
             setattr(db_memory_block, key, value)
-        if should_refresh_embedding:
-            embedding_service = get_embedding_service()
-            if embedding_service.is_enabled:
+        if text_changed:
+            db_memory_block.content_hash = embedding_service.content_hash(db_memory_block)
+            # Compare the exact embedded text: content_hash ignores case and
+            # whitespace, which the embedding does not.
+            unchanged = (
+                previous_text == embedding_service.compose_memory_text(db_memory_block)
+                and db_memory_block.content_embedding is not None
+            )
+            if embedding_service.is_enabled and not unchanged:
                 try:
                     embedding_service.attach_embedding(db_memory_block, save_empty=True)
                 except Exception as exc:  # pragma: no cover - defensive logging
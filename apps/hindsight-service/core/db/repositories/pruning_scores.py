@@ -0,0 +1,38 @@
+"""
+Pruning score repository functions.
+
+``memory_blocks.pruning_score`` holds the heuristic pruning score computed
+by the ``memory_block_pruning_score()`` SQL function. A trigger rescores a
+row whenever its feedback, retrieval count, content or creation time is
+written; :func:`refresh_pruning_scores` catches the scores that drift as
+blocks age past the 6- and 12-month thresholds.
+"""
+from __future__ import annotations
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+_REFRESH_SQL = text(
+    """
+    UPDATE memory_blocks
+    SET pruning_score = memory_block_pruning_score(feedback_score, retrieval_count, content, created_at)
+    WHERE archived IS NOT TRUE
+      AND pruning_score IS DISTINCT FROM
+          memory_block_pruning_score(feedback_score, retrieval_count, content, created_at)
+    """
+)
+
+
+def refresh_pruning_scores(db: Session) -> int:
+    """Rescore the whole corpus in one statement; return the rows that changed.
+
+    Only rows whose score actually differs are written, so repeated runs
+    cost a scan but no row churn. Commits. PostgreSQL only; returns 0 on
+    other dialects.
+    """
+    bind = db.get_bind()
+    if getattr(getattr(bind, "dialect", None), "name", "") != "postgresql":
+        return 0
+    changed = db.execute(_REFRESH_SQL).rowcount or 0
+    db.commit()
+    return changed
@@ -25,6 +25,9 @@ class BulkOperation(BulkOperationBase):
     error_log: Optional[Dict[str, Any]] = None
     result_summary: Optional[Dict[str, Any]] = None
     created_at: datetime
+    worker_id: Optional[str] = None
+    heartbeat_at: Optional[datetime] = None
+    attempts: int = 0
     model_config = ConfigDict(from_attributes=True)
 
 
@@ -52,7 +52,7 @@ class Notification(NotificationBase):
 
 class EmailNotificationLogBase(BaseModel):
     notification_id: Optional[uuid.UUID] = None
-    user_id: uuid.UUID
+    user_id: Optional[uuid.UUID] = None
     email_address: str
     event_type: str
     subject: str
@@ -71,6 +71,8 @@ class EmailNotificationLog(EmailNotificationLogBase):
     delivered_at: Optional[datetime]
     bounced_at: Optional[datetime]
     created_at: datetime
+    attempts: int = 0
+    next_attempt_at: Optional[datetime] = None
     model_config = ConfigDict(from_attributes=True)
 
 
@@ -1,6 +1,6 @@
 """SQLite compilation shims for PostgreSQL-specific SQLAlchemy types.
 
-This module installs lightweight compilers for JSONB and TSVECTOR when the
+This module installs lightweight compilers for JSONB, TSVECTOR and ARRAY when the
 active dialect is SQLite so that declarative metadata can be created in test
 runs that substitute an in-memory SQLite database. The goal is only to allow
 `Base.metadata.create_all()` to succeed; no attempt is made to fully emulate
@@ -10,7 +10,7 @@ Usage: Imported for side-effects by core.db.models.
 """
 from __future__ import annotations
 
-from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSVECTOR
 from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.sql.sqltypes import JSON
 
@@ -29,3 +29,9 @@ def _compile_tsvector_sqlite(element, compiler, **kw):  # pragma: no cover - tri
     # Represent TSVECTOR as TEXT in SQLite. Full-text features won't work;
     # tests using SQLite should not rely on PostgreSQL full-text search.
     return "TEXT"
+
+@compiles(ARRAY, "sqlite")
+def _compile_array_sqlite(element, compiler, **kw):  # pragma: no cover - trivial
+    # Store arrays (e.g. MinHash signatures) as JSON text in SQLite; array
+    # operators are PostgreSQL-only and not used by SQLite-backed tests.
+    return "JSON"
@@ -1,38 +1,43 @@
 """Custom SQLAlchemy types used by the persistence layer."""
 from __future__ import annotations
 
+import importlib.util
 import json
 from typing import Iterable, List, Optional
 
 from sqlalchemy.dialects import postgresql
 from sqlalchemy.types import JSON, TypeDecorator
 
-try:  # pragma: no cover - optional dependency
-    from pgvector.sqlalchemy import Vector  # type: ignore
-    from pgvector.sqlalchemy.vector import VECTOR as PGVector  # type: ignore
-except Exception:  # pragma: no cover - optional dependency
-    Vector = None  # type: ignore
-    PGVector = None  # type: ignore
+# pgvector is imported when a Postgres dialect first compiles or binds an
+# embedding column, not when the models are imported.
+HAS_PGVECTOR = importlib.util.find_spec("pgvector") is not None
+_pgvector_type = None
 
 
-HAS_PGVECTOR = PGVector is not None or Vector is not None
+def _load_pgvector_type():
+    """The pgvector SQLAlchemy type to use, or None when pgvector is missing."""
+    global _pgvector_type
+    if _pgvector_type is None and HAS_PGVECTOR:
+        try:  # pragma: no cover - optional dependency
+            from pgvector.sqlalchemy.vector import VECTOR as PGVector  # type: ignore
+        except Exception:  # pragma: no cover - optional dependency
+            return None
 
-if PGVector is not None:  # pragma: no cover - optional dependency
-    class _SafePGVector(PGVector):
-        """PGVector variant resilient to psycopg returning Python sequences."""
+        class _SafePGVector(PGVector):
+            """PGVector variant resilient to psycopg returning Python sequences."""
 
-        def result_processor(self, dialect, coltype):  # type: ignore[override]
-            base_processor = super().result_processor(dialect, coltype)
+            def result_processor(self, dialect, coltype):  # type: ignore[override]
+                base_processor = super().result_processor(dialect, coltype)
 
-            def process(value):
-                if isinstance(value, (list, tuple)):
-                    return [float(v) for v in value]
-                return base_processor(value)
+                def process(value):
+                    if isinstance(value, (list, tuple)):
+                        return [float(v) for v in value]
+                    return base_processor(value)
 
-            return process
+                return process
 
-else:  # pragma: no cover - optional dependency
-    _SafePGVector = None  # type: ignore
+        _pgvector_type = _SafePGVector
+    return _pgvector_type
 
 
 __all__ = ["EmbeddingVector", "HAS_PGVECTOR"]
@@ -55,16 +60,12 @@ class EmbeddingVector(TypeDecorator[List[float]]):
     def load_dialect_impl(self, dialect):  # type: ignore[override]
         if dialect.name == "postgresql":
             dim = self._dimension
-            if _SafePGVector is not None:
-                try:
-                    return dialect.type_descriptor(_SafePGVector(dim))  # type: ignore[arg-type]
-                except TypeError:
-                    return dialect.type_descriptor(_SafePGVector())  # type: ignore[call-arg]
-            if Vector is not None:
+            vector_type = _load_pgvector_type()
+            if vector_type is not None:
                 try:
-                    return dialect.type_descriptor(Vector(dim))  # type: ignore[arg-type]
+                    return dialect.type_descriptor(vector_type(dim))  # type: ignore[arg-type]
                 except TypeError:
-                    return dialect.type_descriptor(Vector())  # type: ignore[call-arg]
+                    return dialect.type_descriptor(vector_type())  # type: ignore[call-arg]
             return dialect.type_descriptor(postgresql.JSONB(none_as_null=True))
         return dialect.type_descriptor(JSON(none_as_null=True))
 
@@ -78,7 +79,7 @@ class EmbeddingVector(TypeDecorator[List[float]]):
                 f"EmbeddingVector expects an iterable of floats, got {type(value)!r}"
             )
         vector = [float(v) for v in value]
-        if dialect.name == "postgresql" and Vector is not None:
+        if dialect.name == "postgresql" and HAS_PGVECTOR:
             # pgvector driver expects a plain python sequence
             if self._dimension and len(vector) != self._dimension:
                 raise ValueError(
@@ -90,7 +91,7 @@ class EmbeddingVector(TypeDecorator[List[float]]):
     def process_result_value(self, value, dialect):  # type: ignore[override]
         if value is None:
             return None
-        if dialect.name == "postgresql" and Vector is not None:
+        if dialect.name == "postgresql" and HAS_PGVECTOR:
             try:
                 return [float(v) for v in value]
             except TypeError:
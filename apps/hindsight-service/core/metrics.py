@@ -0,0 +1,313 @@
+"""
+In-process metrics rendered in the Prometheus text exposition format.
+
+Hot paths record into the module-level metrics below; ``GET /metrics``
+(``core.api.metrics``) refreshes the gauges that are read at scrape time
+and returns :meth:`MetricsRegistry.render`. Everything lives in this
+process, so each replica is scraped on its own.
+
+Label values must come from small fixed sets (strategy names, provider
+names, operation types). As a guard against an unbounded value slipping
+through, a metric keeps at most ``METRICS_MAX_SERIES_PER_METRIC`` label
+combinations and records any further ones under ``"other"``.
+"""
+
+import math
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+METRICS_MAX_SERIES_PER_METRIC = int(os.getenv("METRICS_MAX_SERIES_PER_METRIC", 50))
+OVERFLOW_LABEL_VALUE = "other"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+JOB_DURATION_BUCKETS = (0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 3600.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(pairs: Iterable[Tuple[str, str]]) -> str:
+    rendered = ",".join(f'{name}="{_escape(value)}"' for name, value in pairs)
+    return "{" + rendered + "}" if rendered else ""
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        max_series: int = METRICS_MAX_SERIES_PER_METRIC,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.max_series = max_series
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, ...], object] = {}
+
+    def _key(self, labels: Dict[str, object]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        if key not in self._series and len(self._series) >= self.max_series:
+            return (OVERFLOW_LABEL_VALUE,) * len(self.labelnames)
+        return key
+
+    def _label_pairs(self, key: Tuple[str, ...]) -> List[Tuple[str, str]]:
+        return list(zip(self.labelnames, key))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def _samples(self) -> List[str]:  # pragma: no cover - overridden
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        with self._lock:
+            lines.extend(self._samples())
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonic total; by convention the name ends in ``_total``."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        if amount < 0:
+            raise ValueError("counters only go up")
+        with self._lock:
+            key = self._key(labels)
+            self._series[key] = self._series.get(key, 0.0) + amount
+
+    def set_total(self, value: float, **labels: object) -> None:
+        """Mirror a total kept elsewhere (read at scrape time)."""
+        with self._lock:
+            self._series[self._key(labels)] = float(value)
+
+    def value(self, **labels: object) -> float:
+        with self._lock:
+            return self._series.get(tuple(str(labels[name]) for name in self.labelnames), 0.0)
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self._label_pairs(key))} {_format_value(value)}"
+            for key, value in sorted(self._series.items())
+        ]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: object) -> None:
+        with self._lock:
+            self._series[self._key(labels)] = float(value)
+
+    def value(self, **labels: object) -> Optional[float]:
+        with self._lock:
+            return self._series.get(tuple(str(labels[name]) for name in self.labelnames))
+
+    _samples = Counter._samples
+
+
+class _Timer:
+    """Context manager observing the elapsed time on exit.
+
+    ``labels`` may be updated inside the block, e.g. to record an outcome
+    only known once the timed work returns.
+    """
+
+    def __init__(self, histogram: "Histogram", labels: Dict[str, object]) -> None:
+        self._histogram = histogram
+        self.labels = labels
+        self._started = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._histogram.observe(time.perf_counter() - self._started, **self.labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        max_series: int = METRICS_MAX_SERIES_PER_METRIC,
+    ) -> None:
+        super().__init__(name, documentation, labelnames, max_series=max_series)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels: object) -> None:
+        with self._lock:
+            key = self._key(labels)
+            series = self._series.get(key)
+            if series is None:
+                # Per-bucket counts (made cumulative on render), sum, count.
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][index] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def time(self, **labels: object) -> _Timer:
+        return _Timer(self, labels)
+
+    def count(self, **labels: object) -> int:
+        with self._lock:
+            series = self._series.get(tuple(str(labels[name]) for name in self.labelnames))
+            return series[2] if series else 0
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, (counts, total, count) in sorted(self._series.items()):
+            pairs = self._label_pairs(key)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _format_labels(pairs + [("le", _format_value(bound))])
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(pairs)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(pairs)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = (), **kwargs) -> Counter:
+        return self.register(Counter(name, documentation, labelnames, **kwargs))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = (), **kwargs) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames, **kwargs))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), **kwargs) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, **kwargs))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# Search -------------------------------------------------------------------
+
+SEARCH_DURATION = REGISTRY.histogram(
+    "hindsight_search_duration_seconds",
+    "Memory block search latency by strategy and fallback reason ('none' when the strategy answered).",
+    ("strategy", "fallback"),
+)
+QUERY_EXPANSION_DURATION = REGISTRY.histogram(
+    "hindsight_query_expansion_duration_seconds",
+    "Query expansion latency by source of the LLM rewrites ('rules' when no LLM step ran).",
+    ("source",),
+)
+
+# Embeddings ---------------------------------------------------------------
+
+EMBEDDING_DURATION = REGISTRY.histogram(
+    "hindsight_embedding_request_duration_seconds",
+    "Embedding provider call latency.",
+    ("provider", "operation"),
+)
+EMBEDDING_ERRORS = REGISTRY.counter(
+    "hindsight_embedding_errors_total",
+    "Embedding provider calls that raised.",
+    ("provider", "operation"),
+)
+EMBEDDING_BATCH_SIZE = REGISTRY.histogram(
+    "hindsight_embedding_batch_size",
+    "Texts sent per embedding provider call.",
+    ("provider",),
+    buckets=BATCH_SIZE_BUCKETS,
+)
+
+# LLM gateway (mirrored from LLMGateway.metrics() at scrape time) -----------
+
+LLM_CALLS = REGISTRY.counter("hindsight_llm_calls_total", "LLM calls that reached the model.", ("purpose",))
+LLM_ERRORS = REGISTRY.counter("hindsight_llm_errors_total", "LLM calls that failed after retries.", ("purpose",))
+LLM_CACHE_HITS = REGISTRY.counter("hindsight_llm_cache_hits_total", "LLM calls answered from the response cache.", ("purpose",))
+LLM_LATENCY = REGISTRY.counter("hindsight_llm_latency_seconds_total", "Time spent waiting on the model.", ("purpose",))
+LLM_THROTTLED = REGISTRY.counter("hindsight_llm_throttled_seconds_total", "Time spent waiting on the rate limiter.", ("purpose",))
+LLM_TOKENS = REGISTRY.counter("hindsight_llm_tokens_total", "Tokens billed by the model.", ("purpose", "direction"))
+
+# Database pool ------------------------------------------------------------
+
+DB_POOL_SIZE = REGISTRY.gauge("hindsight_db_pool_size", "Configured connection pool size.")
+DB_POOL_CHECKED_OUT = REGISTRY.gauge("hindsight_db_pool_checked_out", "Connections currently checked out of the pool.")
+DB_POOL_OVERFLOW = REGISTRY.gauge("hindsight_db_pool_overflow", "Connections open beyond the pool size (negative while the pool is filling).")
+DB_POOL_WAIT = REGISTRY.histogram(
+    "hindsight_db_pool_wait_seconds",
+    "Time spent waiting to check a connection out of the pool.",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+
+# Background jobs ----------------------------------------------------------
+
+BULK_OPERATION_QUEUE_DEPTH = REGISTRY.gauge(
+    "hindsight_bulk_operation_queue_depth",
+    "Queued bulk operations by status (pending, running).",
+    ("status",),
+)
+BULK_OPERATION_DURATION = REGISTRY.histogram(
+    "hindsight_bulk_operation_duration_seconds",
+    "Bulk operation run time from start to terminal status.",
+    ("type", "status"),
+    buckets=JOB_DURATION_BUCKETS,
+)
+AUDIT_LOG_DROPPED = REGISTRY.counter(
+    "hindsight_audit_log_dropped_total",
+    "Buffered audit records dropped because their INSERT failed on its own.",
+)
+EMAIL_OUTBOX_QUEUED = REGISTRY.gauge("hindsight_email_outbox_queued", "Emails waiting in the outbox.")
+EMAIL_OUTBOX_DEAD_LETTER = REGISTRY.gauge("hindsight_email_outbox_dead_letter", "Emails that exhausted their send attempts.")
+EMAIL_OUTBOX_LAG = REGISTRY.gauge(
+    "hindsight_email_outbox_lag_seconds",
+    "How long the oldest due email has been waiting (0 when none is due).",
+)
@@ -2,7 +2,7 @@
 Memory Compression Service for Hindsight AI
 
 This service implements LLM-based compression of memory blocks.
-It uses Google Gemini API to generate condensed versions of memory content
+It uses the shared LLM gateway (Google Gemini by default) to generate condensed versions of memory content
 while preserving critical information and insights.
 
 The service works with individual memory blocks and provides human-in-the-loop
@@ -15,14 +15,38 @@ import logging
 import uuid
 from typing import Dict, Any, Optional
 from sqlalchemy.orm import Session
-import requests
 from datetime import datetime, UTC
 
 from core.db.crud import get_memory_block
+from core.services.llm_gateway import get_llm_gateway, release_db_connection, run_sync
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Part of the LLM result cache key; bump when the prompt template changes.
+COMPRESSION_PROMPT_VERSION = "compression-v1"
+
+# Structured JSON schema for the compression response
+COMPRESSION_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "compressed_content": {"type": "string"},
+        "compressed_lessons_learned": {"type": "string"},
+        "compression_ratio": {"type": "number", "minimum": 0, "maximum": 1},
+        "key_insights_preserved": {"type": "array", "items": {"type": "string"}},
+        "compression_quality_score": {"type": "integer", "minimum": 1, "maximum": 10},
+        "rationale": {"type": "string"}
+    },
+    "required": [
+        "compressed_content",
+        "compressed_lessons_learned",
+        "compression_ratio",
+        "key_insights_preserved",
+        "compression_quality_score",
+        "rationale"
+    ]
+}
+
 class CompressionService:
     """Service for compressing memory blocks using LLM evaluation."""
 
@@ -48,7 +72,17 @@ class CompressionService:
         Returns:
             Dictionary containing compression results
         """
-        if not self.llm_api_key:
+        prepared = self.prepare_compression(db, memory_id, user_instructions)
+        if "error" in prepared:
+            return prepared
+        # Nothing else is read from the session, so hand its connection back
+        # to the pool while the model call is in flight.
+        release_db_connection(db)
+        return run_sync(self.compress_prepared(prepared))
+
+    def prepare_compression(self, db: Session, memory_id: uuid.UUID, user_instructions: str = "") -> Dict[str, Any]:
+        """Snapshot everything the LLM call needs so it can run without the session."""
+        if not self.llm_api_key and get_llm_gateway().requires_api_key:
             logger.warning("LLM_API_KEY not available, cannot perform compression")
             return {
                 "error": "LLM service not available",
@@ -62,46 +96,29 @@ class CompressionService:
                 "error": "Memory block not found",
                 "message": f"Memory block {memory_id} does not exist"
             }
-
+        return self.prepare_block(memory_block, user_instructions)
+
+    def prepare_block(self, memory_block, user_instructions: str = "") -> Dict[str, Any]:
+        """Build the compression request for an already loaded memory block."""
+        return {
+            "memory_id": memory_block.id,
+            "original_content": memory_block.content,
+            "original_lessons_learned": memory_block.lessons_learned,
+            "user_instructions": user_instructions,
+            "prompt": self._create_compression_prompt(memory_block, user_instructions),
+        }
+
+    async def compress_prepared(self, prepared: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the LLM compression for a request built by :meth:`prepare_block`."""
+        memory_id = prepared["memory_id"]
         try:
-            from google import genai
-
-            # Initialize the Gemini client with API key
-            client = genai.Client(api_key=self.llm_api_key)
-
-            # Create compression prompt
-            prompt = self._create_compression_prompt(memory_block, user_instructions)
-
-            # Define structured JSON schema for response
-            response_schema = {
-                "type": "object",
-                "properties": {
-                    "compressed_content": {"type": "string"},
-                    "compressed_lessons_learned": {"type": "string"},
-                    "compression_ratio": {"type": "number", "minimum": 0, "maximum": 1},
-                    "key_insights_preserved": {"type": "array", "items": {"type": "string"}},
-                    "compression_quality_score": {"type": "integer", "minimum": 1, "maximum": 10},
-                    "rationale": {"type": "string"}
-                },
-                "required": [
-                    "compressed_content",
-                    "compressed_lessons_learned",
-                    "compression_ratio",
-                    "key_insights_preserved",
-                    "compression_quality_score",
-                    "rationale"
-                ]
-            }
-
-            # Make LLM call for compression
-            response = client.models.generate_content(
+            response = await get_llm_gateway().generate(
+                prepared["prompt"],
                 model=self.llm_model_name,
-                contents=prompt,
-                config={
-                    "response_mime_type": "application/json",
-                    "response_schema": response_schema,
-                    "temperature": 0.3
-                }
+                api_key=self.llm_api_key,
+                purpose="compression",
+                response_schema=COMPRESSION_RESPONSE_SCHEMA,
+                template_version=COMPRESSION_PROMPT_VERSION,
             )
 
             # Parse the structured JSON response
@@ -110,8 +127,8 @@ class CompressionService:
                 compression_result = json.loads(result_text)
 
                 # Validate compression results
-                original_content_length = len(memory_block.content or "")
-                original_lessons_length = len(memory_block.lessons_learned or "")
+                original_content_length = len(prepared["original_content"] or "")
+                original_lessons_length = len(prepared["original_lessons_learned"] or "")
                 compressed_content_length = len(compression_result.get("compressed_content", ""))
                 compressed_lessons_length = len(compression_result.get("compressed_lessons_learned", ""))
 
@@ -131,15 +148,16 @@ class CompressionService:
                 # Return successful compression result
                 return {
                     "memory_id": str(memory_id),
-                    "original_content": memory_block.content,
-                    "original_lessons_learned": memory_block.lessons_learned,
+                    "original_content": prepared["original_content"],
+                    "original_lessons_learned": prepared["original_lessons_learned"],
                     "compressed_content": compression_result.get("compressed_content", ""),
                     "compressed_lessons_learned": compression_result.get("compressed_lessons_learned", ""),
                     "compression_ratio": actual_ratio,
                     "key_insights_preserved": compression_result.get("key_insights_preserved", []),
                     "compression_quality_score": compression_result.get("compression_quality_score", 5),
                     "rationale": compression_result.get("rationale", ""),
-                    "user_instructions": user_instructions,
+                    "user_instructions": prepared["user_instructions"],
+                    "llm_cache_hit": response.cached,
                     "timestamp": datetime.now(UTC).isoformat()
                 }
 
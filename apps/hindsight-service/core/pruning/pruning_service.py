@@ -2,7 +2,7 @@
 Memory Pruning Service for Hindsight AI
 
 This service implements an LLM-based approach to evaluate memory blocks for pruning.
-It uses Google Gemini API with structured JSON output to assess the usefulness and 
+It uses the shared LLM gateway (Google Gemini by default) with structured JSON output to assess the usefulness and 
 importance of memory blocks, generating pruning suggestions that require human review 
 and confirmation.
 
@@ -15,20 +15,61 @@ import json
 import logging
 import uuid
 from typing import List, Dict, Any, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy.sql import func
-import requests
+from sqlalchemy.orm import Session, selectinload
 from datetime import datetime, timezone
 
-from core.db.crud import get_all_memory_blocks
-from core.db.models import MemoryBlock
+from core.db.models import MemoryBlock, MemoryBlockKeyword
+from core.pruning.samplers import PruningSampler, get_sampler
+from core.services.llm_gateway import LLMResponse, get_llm_gateway, release_db_connection, run_sync
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 # Configuration settings - Reduced batch size to 20 for better LLM performance
 DEFAULT_BATCH_SIZE = int(os.getenv("PRUNING_BATCH_SIZE", 20))
+# Upper bound on batches (LLM calls) for callers that opt into sampling until
+# target_count is met; a plain request evaluates a single batch.
 DEFAULT_MAX_ITERATIONS = int(os.getenv("PRUNING_MAX_ITERATIONS", 10))
+# Blocks scoring at or below this count towards the target; sampling stops once it is met.
+PRUNABLE_SCORE_THRESHOLD = int(os.getenv("PRUNING_PRUNABLE_SCORE_THRESHOLD", 30))
+
+# Part of the LLM result cache key; bump when the evaluation prompt changes.
+PRUNING_PROMPT_VERSION = "pruning-v1"
+
+# Structured JSON schema for the batch evaluation response
+PRUNING_RESPONSE_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "memory_block_id": {"type": "string"},
+            "criticality_score": {"type": "integer", "minimum": 1, "maximum": 10},
+            "information_value_score": {"type": "integer", "minimum": 1, "maximum": 10},
+            "redundancy_score": {"type": "integer", "minimum": 1, "maximum": 10},
+            "temporal_relevance_score": {"type": "integer", "minimum": 1, "maximum": 10},
+            "pruning_priority_score": {"type": "integer", "minimum": 1, "maximum": 100},
+            "rationale": {"type": "string"}
+        },
+        "required": [
+            "memory_block_id",
+            "criticality_score",
+            "information_value_score",
+            "redundancy_score",
+            "temporal_relevance_score",
+            "pruning_priority_score",
+            "rationale"
+        ],
+        "propertyOrdering": [
+            "memory_block_id",
+            "criticality_score",
+            "information_value_score",
+            "redundancy_score",
+            "temporal_relevance_score",
+            "pruning_priority_score",
+            "rationale"
+        ]
+    }
+}
 
 class PruningService:
     """Service for evaluating and suggesting memory blocks for pruning using batch processing."""
@@ -43,7 +84,13 @@ class PruningService:
         self.llm_api_key = llm_api_key or os.getenv("LLM_API_KEY")
         self.llm_model_name = os.getenv("LLM_MODEL_NAME", "gemini-2.5-flash-preview-05-20")
         
-    def get_random_memory_blocks(self, db: Session, batch_size: int = DEFAULT_BATCH_SIZE, exclude_ids: set = None) -> List[Dict[str, Any]]:
+    def get_random_memory_blocks(
+        self,
+        db: Session,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        exclude_ids: set = None,
+        sampler: Optional[PruningSampler] = None,
+    ) -> List[Dict[str, Any]]:
         """
         Retrieve a random batch of non-archived memory blocks for evaluation.
         
@@ -51,22 +98,28 @@ class PruningService:
             db: Database session
             batch_size: Number of memory blocks to retrieve (default 20)
             exclude_ids: Set of memory block IDs to exclude from selection
+            sampler: Sampler to draw from; pass the same one across batches of a run
             
         Returns:
             List of memory block dictionaries
         """
         try:
-            # Build query for non-archived memory blocks
-            query = db.query(MemoryBlock).filter(MemoryBlock.archived == False)
-            
-            # Exclude previously selected blocks
-            if exclude_ids:
-                query = query.filter(~MemoryBlock.id.in_(exclude_ids))
-            
-            # Get random blocks using ORDER BY RANDOM() and limit
-            memory_blocks = query.order_by(func.random()).limit(batch_size).all()
+            sampler = sampler or get_sampler()
+            sampled_ids = sampler.sample(db, batch_size, exclude_ids)
+            if not sampled_ids:
+                return []
+
+            # One query for the sampled blocks and their keywords.
+            memory_blocks = (
+                db.query(MemoryBlock)
+                .options(selectinload(MemoryBlock.memory_block_keywords).joinedload(MemoryBlockKeyword.keyword))
+                .filter(MemoryBlock.id.in_(sampled_ids))
+                .all()
+            )
+            position = {memory_id: i for i, memory_id in enumerate(sampled_ids)}
+            memory_blocks.sort(key=lambda block: position[block.id])
             
-            logger.info(f"Retrieved {len(memory_blocks)} random memory blocks for pruning evaluation")
+            logger.info(f"Retrieved {len(memory_blocks)} memory blocks for pruning evaluation ({sampler.name} sampler)")
             
             # Convert to dictionary format for processing
             blocks_data = []
@@ -105,73 +158,14 @@ class PruningService:
             logger.warning("No memory blocks to evaluate")
             return []
         
-        if not self.llm_api_key:
+        if not self.llm_api_key and get_llm_gateway().requires_api_key:
             logger.warning("LLM_API_KEY not available, using fallback scoring")
             return self._fallback_scoring(memory_blocks)
         
         try:
-            from google import genai
-            
-            # Initialize the Gemini client with API key
-            client = genai.Client(api_key=self.llm_api_key)
-            
-            # Create batch prompt with all memory blocks
-            prompt = self._create_batch_evaluation_prompt(memory_blocks)
-            
-            # Define structured JSON schema for response
-            response_schema = {
-                "type": "array",
-                "items": {
-                    "type": "object",
-                    "properties": {
-                        "memory_block_id": {"type": "string"},
-                        "criticality_score": {"type": "integer", "minimum": 1, "maximum": 10},
-                        "information_value_score": {"type": "integer", "minimum": 1, "maximum": 10},
-                        "redundancy_score": {"type": "integer", "minimum": 1, "maximum": 10},
-                        "temporal_relevance_score": {"type": "integer", "minimum": 1, "maximum": 10},
-                        "pruning_priority_score": {"type": "integer", "minimum": 1, "maximum": 100},
-                        "rationale": {"type": "string"}
-                    },
-                    "required": [
-                        "memory_block_id",
-                        "criticality_score",
-                        "information_value_score",
-                        "redundancy_score",
-                        "temporal_relevance_score",
-                        "pruning_priority_score",
-                        "rationale"
-                    ],
-                    "propertyOrdering": [
-                        "memory_block_id",
-                        "criticality_score",
-                        "information_value_score",
-                        "redundancy_score",
-                        "temporal_relevance_score",
-                        "pruning_priority_score",
-                        "rationale"
-                    ]
-                }
-            }
-            
-            # Make single LLM call for entire batch with structured output
-            response = client.models.generate_content(
-                model=self.llm_model_name,
-                contents=prompt,
-                config={
-                    "response_mime_type": "application/json",
-                    "response_schema": response_schema,
-                    "temperature": 0.3
-                }
-            )
-            
-            # Parse the structured JSON response
-            result_text = response.text if response.text else "[]"
             try:
-                evaluation_results = json.loads(result_text)
-                
-                # Create lookup dictionary for quick access
-                evaluation_lookup = {result["memory_block_id"]: result for result in evaluation_results}
-                
+                evaluation_lookup = run_sync(self._evaluate_with_cache(memory_blocks))
+
                 # Apply scores to memory blocks
                 evaluated_blocks = []
                 for block in memory_blocks:
@@ -190,7 +184,8 @@ class PruningService:
                             "criticality_score": evaluation_data.get("criticality_score", 5),
                             "information_value_score": evaluation_data.get("information_value_score", 5),
                             "redundancy_score": evaluation_data.get("redundancy_score", 5),
-                            "temporal_relevance_score": evaluation_data.get("temporal_relevance_score", 5)
+                            "temporal_relevance_score": evaluation_data.get("temporal_relevance_score", 5),
+                            "llm_cache_hit": evaluation_data.get("llm_cache_hit", False)
                         }
                         
                         evaluated_blocks.append(evaluated_block)
@@ -207,13 +202,98 @@ class PruningService:
                 
             except json.JSONDecodeError as parse_error:
                 logger.error(f"Failed to parse LLM batch response: {str(parse_error)}")
-                logger.error(f"Response content: {result_text}")
+                logger.error(f"Response content: {parse_error.doc}")
                 return self._fallback_scoring(memory_blocks)
                 
         except Exception as e:
             logger.error(f"LLM batch evaluation failed: {str(e)}. Using fallback scoring.")
             return self._fallback_scoring(memory_blocks)
     
+    async def _evaluate_with_cache(self, memory_blocks: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Return LLM evaluations keyed by block id.
+
+        Evaluations are cached per block (keyed on the block's content, the
+        model and the prompt version), so a random sample that repeats
+        earlier blocks only sends the unseen ones to the model.
+        """
+        gateway = get_llm_gateway()
+        evaluations: Dict[str, Dict[str, Any]] = {}
+        pending = []
+        for block in memory_blocks:
+            cached = await gateway.cache_lookup(
+                self._cache_content(block),
+                model=self.llm_model_name,
+                purpose="pruning",
+                template_version=PRUNING_PROMPT_VERSION,
+            )
+            if cached is not None:
+                evaluations[block["id"]] = {**json.loads(cached.text), "llm_cache_hit": True}
+            else:
+                pending.append(block)
+
+        if not pending:
+            return evaluations
+
+        # Make single LLM call for the remaining blocks with structured output
+        response = await gateway.generate(
+            self._create_batch_evaluation_prompt(pending),
+            model=self.llm_model_name,
+            api_key=self.llm_api_key,
+            purpose="pruning",
+            response_schema=PRUNING_RESPONSE_SCHEMA,
+        )
+
+        # Parse the structured JSON response
+        result_text = response.text if response.text else "[]"
+        evaluation_results = json.loads(result_text)
+
+        pending_by_id = {block["id"]: block for block in pending}
+        for result in evaluation_results:
+            block = pending_by_id.get(result.get("memory_block_id"))
+            if block is None:
+                continue
+            evaluations[block["id"]] = {**result, "llm_cache_hit": False}
+            # Identical content elsewhere may reuse this entry; the id is not part of it.
+            cached_result = {key: value for key, value in result.items() if key != "memory_block_id"}
+            await gateway.cache_store(
+                self._cache_content(block),
+                LLMResponse(text=json.dumps(cached_result), model=response.model, latency_seconds=0.0),
+                model=self.llm_model_name,
+                purpose="pruning",
+                template_version=PRUNING_PROMPT_VERSION,
+            )
+        return evaluations
+
+    @staticmethod
+    def _cache_content(block: Dict[str, Any]) -> str:
+        """The part of a block its cached evaluation is keyed on.
+
+        Only the text: retrieval counts, feedback scores and timestamps
+        change constantly and would make every lookup miss.
+        """
+        return "\0".join((block.get("content") or "", block.get("lessons_learned") or ""))
+
+    def _format_block_for_prompt(self, block: Dict[str, Any]) -> str:
+        """Render one block's section of the batch evaluation prompt."""
+        return f"""Memory Block ID: {block['id']}
+Created: {block['created_at']}
+
+Content:
+{block.get('content', '')[:2000]}
+
+Lessons Learned:
+{block.get('lessons_learned', '')[:1000]}
+
+Metadata:
+{json.dumps(block.get('metadata_col', {}), indent=2, default=str)}
+
+Keywords:
+{', '.join(block.get('keywords', [])[:20])}
+
+Feedback Score: {block.get('feedback_score', 0)}
+Retrieval Count: {block.get('retrieval_count', 0)}
+"""
+
     def _create_batch_evaluation_prompt(self, memory_blocks: List[Dict[str, Any]]) -> str:
         """Create a single prompt for batch evaluation of all memory blocks."""
         prompt = """You are an AI assistant tasked with evaluating multiple memory blocks for pruning priority. 
@@ -245,24 +325,7 @@ Here are the memory blocks to evaluate:
             prompt += f"""
 
 [BLOCK {i}]
-Memory Block ID: {block['id']}
-Created: {block['created_at']}
-
-Content:
-{block.get('content', '')[:2000]}
-
-Lessons Learned:
-{block.get('lessons_learned', '')[:1000]}
-
-Metadata:
-{json.dumps(block.get('metadata_col', {}), indent=2, default=str)}
-
-Keywords:
-{', '.join(block.get('keywords', [])[:20])}
-
-Feedback Score: {block.get('feedback_score', 0)}
-Retrieval Count: {block.get('retrieval_count', 0)}
-"""
+{self._format_block_for_prompt(block)}"""
         
         prompt += """
 
@@ -299,7 +362,12 @@ Do not include any other text in your response. Ensure each memory block is eval
         return evaluated_blocks
     
     def _fallback_score_block(self, block: Dict[str, Any]) -> Dict[str, Any]:
-        """Calculate fallback score based on metadata factors."""
+        """Calculate fallback score based on metadata factors.
+
+        The ``memory_block_pruning_score()`` SQL function persists this same
+        score for every block (see ``core.db.repositories.pruning_scores``);
+        keep the two in step.
+        """
         # Simple heuristic scoring
         feedback_score = block.get("feedback_score", 0)
         retrieval_count = block.get("retrieval_count", 0)
@@ -354,7 +422,7 @@ Do not include any other text in your response. Ensure each memory block is eval
         db: Session,
         batch_size: int = DEFAULT_BATCH_SIZE,
         target_count: Optional[int] = None,
-        max_iterations: int = DEFAULT_MAX_ITERATIONS
+        max_iterations: int = 1
     ) -> Dict[str, Any]:
         """
         Generate pruning suggestions by evaluating random memory blocks using batch processing.
@@ -363,35 +431,57 @@ Do not include any other text in your response. Ensure each memory block is eval
             db: Database session
             batch_size: Number of blocks to evaluate per batch (default 20)
             target_count: Target number of blocks to suggest for pruning
-            max_iterations: Maximum number of iterations to run
+            max_iterations: Maximum number of batches to evaluate (one LLM call
+                each); more than one keeps sampling until target_count
+                prunable blocks are found
             
         Returns:
             Dictionary containing suggestions and workflow information
         """
         logger.info(f"Generating pruning suggestions: batch_size={batch_size}, target_count={target_count}, max_iterations={max_iterations}")
         
-        # Get random memory blocks for evaluation (limited to batch size of 20)
+        # Each batch is evaluated in one LLM call, so batches stay at most 20 blocks
         actual_batch_size = min(batch_size, DEFAULT_BATCH_SIZE)
-        memory_blocks = self.get_random_memory_blocks(db, actual_batch_size)
+        wanted = target_count or actual_batch_size
+        sampler = get_sampler()
+        seen_ids: set = set()
+        evaluated_blocks: List[Dict[str, Any]] = []
+        iterations = 0
         
-        if not memory_blocks:
+        while iterations < max(1, max_iterations):
+            memory_blocks = [
+                block
+                for block in self.get_random_memory_blocks(db, actual_batch_size, seen_ids, sampler=sampler)
+                if block["id"] not in seen_ids
+            ]
+            if not memory_blocks:
+                break
+            iterations += 1
+            seen_ids.update(block["id"] for block in memory_blocks)
+
+            # The sampled blocks are plain dicts; release the connection before
+            # waiting on the LLM.
+            release_db_connection(db)
+
+            # Evaluate blocks with LLM using batch processing
+            evaluated_blocks.extend(self.evaluate_memory_blocks_with_llm(memory_blocks))
+            prunable = sum(1 for block in evaluated_blocks if block.get("pruning_score", 100) <= PRUNABLE_SCORE_THRESHOLD)
+            if prunable >= wanted:
+                break
+        
+        if not evaluated_blocks:
             return {
                 "suggestions": [],
                 "message": "No memory blocks available for pruning evaluation",
                 "batch_size": actual_batch_size,
                 "target_count": target_count,
-                "max_iterations": max_iterations
+                "max_iterations": max_iterations,
+                "iterations": iterations
             }
         
-        # Evaluate blocks with LLM using batch processing
-        evaluated_blocks = self.evaluate_memory_blocks_with_llm(memory_blocks)
-        
         # Select blocks with lowest pruning scores (highest priority for pruning)
-        suggestions = evaluated_blocks[:min(actual_batch_size, len(evaluated_blocks))]
-        
-        # Filter to target count if specified
-        if target_count:
-            suggestions = suggestions[:min(target_count, len(suggestions))]
+        evaluated_blocks.sort(key=lambda x: x.get("pruning_score", 100))
+        suggestions = evaluated_blocks[:wanted]
         
         # Format suggestions for API response
         formatted_suggestions = []
@@ -407,7 +497,8 @@ Do not include any other text in your response. Ensure each memory block is eval
                 "content_preview": block.get("content", "")[:200] + "..." if len(block.get("content", "")) > 200 else block.get("content", ""),
                 "feedback_score": block.get("feedback_score", 0),
                 "retrieval_count": block.get("retrieval_count", 0),
-                "created_at": block.get("created_at")
+                "created_at": block.get("created_at"),
+                "llm_cache_hit": block.get("llm_cache_hit", False)
             })
         
         return {
@@ -416,6 +507,8 @@ Do not include any other text in your response. Ensure each memory block is eval
             "batch_size": actual_batch_size,
             "target_count": target_count,
             "max_iterations": max_iterations,
+            "iterations": iterations,
+            "llm_cache_hits": sum(1 for block in evaluated_blocks if block.get("llm_cache_hit")),
             "message": f"Generated {len(formatted_suggestions)} pruning suggestions"
         }
 
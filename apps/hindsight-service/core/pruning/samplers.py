@@ -0,0 +1,257 @@
+"""
+Samplers that pick memory blocks for pruning evaluation.
+
+Each sampler returns ids of active (non-archived) blocks without sorting
+the whole table, so the cost of a pruning batch does not grow with the
+corpus:
+
+* ``random_key`` walks the indexed, precomputed ``memory_blocks.random_key``
+  from a random starting point, wrapping around once. Successive calls on
+  the same sampler continue the walk, so batches never repeat a block and
+  no ``NOT IN`` list is needed.
+* ``tablesample`` reads a ``TABLESAMPLE SYSTEM``/``BERNOULLI`` sample sized
+  from the planner's row estimate, doubling the percentage until enough
+  rows come back (PostgreSQL only; other dialects use ``random_key``).
+* ``lowest_score`` walks the indexed, persisted ``pruning_score`` upwards,
+  so only the blocks the heuristic ranks lowest reach the LLM; blocks not
+  scored yet are drawn with ``random_key`` once the scored ones run out.
+* ``stratified`` draws a bounded ``random_key`` window and picks from it
+  round-robin across age x feedback buckets, so old, disliked and liked
+  blocks all reach the evaluator even when one bucket dominates.
+
+Samplers are stateful; create one per pruning run with :func:`get_sampler`.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import random
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select, tablesample, text, tuple_
+from sqlalchemy.orm import Session
+
+from core.db.models import MemoryBlock
+
+logger = logging.getLogger(__name__)
+
+PRUNING_SAMPLER = os.getenv("PRUNING_SAMPLER", "lowest_score")
+PRUNING_TABLESAMPLE_METHOD = os.getenv("PRUNING_TABLESAMPLE_METHOD", "system")
+# Rows requested from TABLESAMPLE per row needed; SYSTEM samples whole pages.
+TABLESAMPLE_OVERSAMPLE = float(os.getenv("PRUNING_TABLESAMPLE_OVERSAMPLE", 3.0))
+# Window drawn per stratified batch, as a multiple of the batch size.
+STRATIFIED_WINDOW_FACTOR = int(os.getenv("PRUNING_STRATIFIED_WINDOW_FACTOR", 5))
+
+# Upper bounds (days) of the age buckets; older blocks fall in a final bucket.
+AGE_BUCKET_DAYS = (30, 180, 365)
+
+
+def _is_postgresql(db: Session) -> bool:
+    bind = getattr(db, "bind", None)
+    return getattr(getattr(bind, "dialect", None), "name", "") == "postgresql"
+
+
+def _excluded(exclude_ids: Optional[Iterable[Any]]) -> set:
+    return {str(memory_id) for memory_id in exclude_ids or ()}
+
+
+class PruningSampler(ABC):
+    """Base class: ``sample`` returns up to ``size`` active block ids."""
+
+    name = "base"
+
+    @abstractmethod
+    def sample(self, db: Session, size: int, exclude_ids: Optional[Iterable[Any]] = None) -> List[uuid.UUID]:
+        """Up to ``size`` active block ids, none of them in ``exclude_ids``."""
+
+
+class RandomKeySampler(PruningSampler):
+    """Keyset walk over ``(random_key, id)`` from a random start point."""
+
+    name = "random_key"
+
+    def __init__(self, start: Optional[float] = None):
+        self.start = random.random() if start is None else start
+        self._after: Optional[Tuple[float, uuid.UUID]] = None
+        self._wrapped = False
+        self.exhausted = False
+
+    def rows(self, db: Session, size: int, *columns: Any) -> List[Any]:
+        """Next ``size`` rows of the walk with ``random_key``, ``id`` and ``columns``."""
+        rows: List[Any] = []
+        while len(rows) < size and not self.exhausted:
+            query = select(MemoryBlock.random_key, MemoryBlock.id, *columns).where(MemoryBlock.archived.isnot(True))
+            if not self._wrapped:
+                query = query.where(MemoryBlock.random_key >= self.start)
+            else:
+                query = query.where(MemoryBlock.random_key < self.start)
+            if self._after is not None:
+                query = query.where(tuple_(MemoryBlock.random_key, MemoryBlock.id) > tuple_(*self._after))
+            wanted = size - len(rows)
+            page = db.execute(query.order_by(MemoryBlock.random_key, MemoryBlock.id).limit(wanted)).all()
+            rows.extend(page)
+            if page:
+                self._after = (page[-1].random_key, page[-1].id)
+            if len(page) < wanted:
+                if self._wrapped:
+                    self.exhausted = True
+                else:
+                    self._wrapped, self._after = True, None
+        return rows
+
+    def sample(self, db: Session, size: int, exclude_ids: Optional[Iterable[Any]] = None) -> List[uuid.UUID]:
+        excluded = _excluded(exclude_ids)
+        ids: List[uuid.UUID] = []
+        while len(ids) < size and not self.exhausted:
+            for row in self.rows(db, size - len(ids)):
+                if str(row.id) not in excluded:
+                    ids.append(row.id)
+        return ids
+
+
+class LowestScoreSampler(PruningSampler):
+    """Keyset walk over ``(pruning_score, id)``, lowest scores first."""
+
+    name = "lowest_score"
+
+    def __init__(self):
+        self._after: Optional[Tuple[int, uuid.UUID]] = None
+        self._scored_exhausted = False
+        self._returned: set = set()
+        self._unscored = RandomKeySampler()
+
+    def sample(self, db: Session, size: int, exclude_ids: Optional[Iterable[Any]] = None) -> List[uuid.UUID]:
+        excluded = _excluded(exclude_ids)
+        ids: List[uuid.UUID] = []
+        while len(ids) < size and not self._scored_exhausted:
+            wanted = size - len(ids)
+            query = select(MemoryBlock.pruning_score, MemoryBlock.id).where(
+                MemoryBlock.archived.isnot(True), MemoryBlock.pruning_score.isnot(None)
+            )
+            if self._after is not None:
+                query = query.where(tuple_(MemoryBlock.pruning_score, MemoryBlock.id) > tuple_(*self._after))
+            page = db.execute(query.order_by(MemoryBlock.pruning_score, MemoryBlock.id).limit(wanted)).all()
+            if page:
+                self._after = (page[-1].pruning_score, page[-1].id)
+            self._scored_exhausted = len(page) < wanted
+            ids.extend(row.id for row in page if str(row.id) not in excluded)
+        if len(ids) < size:
+            # Scored rows are used up; fall back to a random walk, skipping
+            # the scored rows already handed out.
+            skip = excluded | self._returned | {str(memory_id) for memory_id in ids}
+            ids.extend(self._unscored.sample(db, size - len(ids), skip))
+        self._returned.update(str(memory_id) for memory_id in ids)
+        return ids
+
+
+class TableSampleSampler(PruningSampler):
+    """``TABLESAMPLE`` with a percentage sized from ``pg_class.reltuples``."""
+
+    name = "tablesample"
+
+    def __init__(self, method: str = PRUNING_TABLESAMPLE_METHOD, oversample: float = TABLESAMPLE_OVERSAMPLE):
+        method = method.lower()
+        if method not in ("system", "bernoulli"):
+            raise ValueError(f"Unsupported TABLESAMPLE method: {method}")
+        self.method = method
+        self.oversample = oversample
+        self._fallback: Optional[RandomKeySampler] = None
+
+    def _estimated_rows(self, db: Session) -> float:
+        estimate = db.execute(
+            text("SELECT reltuples FROM pg_class WHERE oid = to_regclass('memory_blocks')")
+        ).scalar()
+        return float(estimate or 0)
+
+    def sample(self, db: Session, size: int, exclude_ids: Optional[Iterable[Any]] = None) -> List[uuid.UUID]:
+        if not _is_postgresql(db):
+            if self._fallback is None:
+                self._fallback = RandomKeySampler()
+            return self._fallback.sample(db, size, exclude_ids)
+        if size <= 0:
+            return []
+        excluded = _excluded(exclude_ids)
+        estimate = self._estimated_rows(db)
+        # reltuples is -1 (or 0) until the table has been analyzed.
+        percent = 100.0 if estimate <= 0 else min(100.0, 100.0 * size * self.oversample / estimate)
+        method = func.system if self.method == "system" else func.bernoulli
+        while True:
+            sampled = tablesample(MemoryBlock.__table__, method(percent))
+            query = (
+                select(sampled.c.id)
+                .where(sampled.c.archived.isnot(True))
+                # The sample is small, so shuffling it is cheap; SYSTEM returns whole pages in order.
+                .order_by(func.random())
+                .limit(size + len(excluded))
+            )
+            ids = [memory_id for memory_id in db.execute(query).scalars() if str(memory_id) not in excluded]
+            if len(ids) >= size or percent >= 100.0:
+                return ids[:size]
+            percent = min(100.0, percent * 2)
+
+
+class StratifiedSampler(PruningSampler):
+    """Round-robin over age x feedback buckets of a bounded random window."""
+
+    name = "stratified"
+
+    def __init__(self, window_factor: int = STRATIFIED_WINDOW_FACTOR, now: Optional[datetime] = None):
+        self.window_factor = max(1, window_factor)
+        self.now = now
+        self._walk = RandomKeySampler()
+        # Window rows not picked yet; they stay eligible for later batches.
+        self._leftover: List[Any] = []
+
+    def bucket(self, created_at: Optional[datetime], feedback_score: Optional[int]) -> Tuple[int, int]:
+        age_bucket = len(AGE_BUCKET_DAYS)
+        if created_at is not None:
+            if created_at.tzinfo is None:
+                created_at = created_at.replace(tzinfo=timezone.utc)
+            age_days = ((self.now or datetime.now(timezone.utc)) - created_at).days
+            age_bucket = next((i for i, bound in enumerate(AGE_BUCKET_DAYS) if age_days <= bound), age_bucket)
+        feedback = feedback_score or 0
+        feedback_bucket = 0 if feedback < 0 else (1 if feedback == 0 else 2)
+        return age_bucket, feedback_bucket
+
+    def sample(self, db: Session, size: int, exclude_ids: Optional[Iterable[Any]] = None) -> List[uuid.UUID]:
+        excluded = _excluded(exclude_ids)
+        window = self._leftover + self._walk.rows(
+            db,
+            max(0, size * self.window_factor - len(self._leftover)),
+            MemoryBlock.created_at,
+            MemoryBlock.feedback_score,
+        )
+        buckets: Dict[Tuple[int, int], List[Any]] = {}
+        for row in window:
+            if str(row.id) not in excluded:
+                buckets.setdefault(self.bucket(row.created_at, row.feedback_score), []).append(row)
+        picked: List[Any] = []
+        queues = [buckets[key] for key in sorted(buckets)]
+        while len(picked) < size and any(queues):
+            for queue in queues:
+                if queue and len(picked) < size:
+                    picked.append(queue.pop(0))
+        picked_ids = {row.id for row in picked}
+        self._leftover = [row for row in window if row.id not in picked_ids and str(row.id) not in excluded]
+        return [row.id for row in picked]
+
+
+SAMPLERS = {
+    LowestScoreSampler.name: LowestScoreSampler,
+    RandomKeySampler.name: RandomKeySampler,
+    TableSampleSampler.name: TableSampleSampler,
+    StratifiedSampler.name: StratifiedSampler,
+}
+
+
+def get_sampler(name: Optional[str] = None) -> PruningSampler:
+    """A fresh sampler by name (default ``PRUNING_SAMPLER``)."""
+    name = (name or PRUNING_SAMPLER).lower()
+    sampler_class = SAMPLERS.get(name)
+    if sampler_class is None:
+        logger.warning(f"Unknown pruning sampler '{name}', using lowest_score")
+        sampler_class = LowestScoreSampler
+    return sampler_class()
@@ -0,0 +1,118 @@
+"""
+AuditLogMaintenance: keeps the monthly ``audit_logs`` partitions rolling.
+
+``audit_logs`` is range-partitioned by month on ``created_at``. Each run
+creates the partitions from the current month through
+``AUDIT_LOG_PARTITION_MONTHS_AHEAD`` months ahead (rows that reached the
+default partition in the meantime are moved into their month) and, when
+``AUDIT_LOG_RETENTION_MONTHS`` is set, drops the partitions of months that
+ended before the retention window. Dropping a partition is a catalog
+operation, so retention costs no DELETE, no dead tuples and no vacuum.
+
+The API process runs the maintenance on startup and then every
+``AUDIT_LOG_MAINTENANCE_INTERVAL_SECONDS`` on a daemon thread; superadmins
+can also trigger a run with ``POST /audits/maintenance``. Runs on several
+replicas are harmless: existing partitions are skipped and a drop that
+lost the race is a no-op.
+"""
+
+import logging
+import os
+import threading
+from datetime import date, datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+from core.db.repositories.audits import drop_audit_log_partitions, ensure_audit_log_partitions
+
+logger = logging.getLogger(__name__)
+
+AUDIT_LOG_PARTITION_MONTHS_AHEAD = int(os.getenv("AUDIT_LOG_PARTITION_MONTHS_AHEAD", 2))
+# Whole months of audit history to keep besides the current one; 0 keeps everything.
+AUDIT_LOG_RETENTION_MONTHS = int(os.getenv("AUDIT_LOG_RETENTION_MONTHS", 0))
+# 0 disables the in-process maintenance thread.
+AUDIT_LOG_MAINTENANCE_INTERVAL_SECONDS = float(os.getenv("AUDIT_LOG_MAINTENANCE_INTERVAL_SECONDS", 6 * 3600))
+
+
+def run_audit_log_maintenance(
+    db,
+    *,
+    months_ahead: int = AUDIT_LOG_PARTITION_MONTHS_AHEAD,
+    retention_months: int = AUDIT_LOG_RETENTION_MONTHS,
+    today: Optional[date] = None,
+) -> Dict[str, Any]:
+    """Create upcoming partitions and drop expired ones; returns their names."""
+    today = today or datetime.now(timezone.utc).date()
+    created = ensure_audit_log_partitions(db, months_ahead, today=today)
+    dropped = []
+    if retention_months > 0:
+        # First day of the oldest month kept.
+        month_index = today.year * 12 + today.month - 1 - retention_months
+        dropped = drop_audit_log_partitions(db, date(month_index // 12, month_index % 12 + 1, 1))
+    if created or dropped:
+        logger.info("audit log maintenance: created %s, dropped %s", created, dropped)
+    return {"created": created, "dropped": dropped}
+
+
+class AuditLogMaintenance:
+    """Daemon thread running :func:`run_audit_log_maintenance` periodically."""
+
+    def __init__(
+        self,
+        *,
+        session_factory: Optional[Callable[[], Any]] = None,
+        interval_seconds: float = AUDIT_LOG_MAINTENANCE_INTERVAL_SECONDS,
+    ):
+        self._session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def _session(self):
+        if self._session_factory is not None:
+            return self._session_factory()
+        from core.db.database import SessionLocal
+        return SessionLocal()
+
+    def run_once(self) -> Dict[str, Any]:
+        db = self._session()
+        try:
+            return run_audit_log_maintenance(db)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as exc:
+                logger.warning("audit log maintenance failed: %s", exc)
+            self._stop.wait(self.interval_seconds)
+
+    def start(self) -> None:
+        if self.interval_seconds <= 0:
+            return
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="audit-log-maintenance", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+
+_audit_log_maintenance = AuditLogMaintenance()
+
+
+def start_audit_log_maintenance() -> None:
+    _audit_log_maintenance.start()
+
+
+def stop_audit_log_maintenance(timeout: float = 10.0) -> None:
+    _audit_log_maintenance.stop(timeout)
@@ -0,0 +1,170 @@
+"""
+AuditLogWriter: buffers audit records and bulk-inserts them in the background.
+
+With ``AUDIT_SINK_MODE=async`` (or ``core.audit.log(..., sink="async")``)
+audit records are appended to an in-memory buffer instead of the caller's
+session. A daemon flusher thread writes the buffer every
+``AUDIT_WRITER_FLUSH_SECONDS``, or as soon as ``AUDIT_WRITER_BATCH_SIZE``
+records are waiting, as multi-row INSERTs in one transaction per batch. The
+buffer holds at most ``AUDIT_WRITER_MAX_PENDING`` records: a producer that
+finds it full flushes a batch itself, so memory stays bounded without
+dropping records. :func:`stop_audit_log_writer` flushes what is left on
+shutdown.
+
+A batch whose INSERT fails is split in half and retried until the failing
+rows are isolated; only those are dropped (logged and counted in
+``hindsight_audit_log_dropped_total``), the rest of the batch is written.
+
+Records are written on the writer's own connection, so they are not rolled
+back with the caller's transaction and rows they reference (the actor user,
+the organization) must already be committed.
+"""
+
+import logging
+import os
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from core.db.repositories.audits import insert_audit_logs
+from core.metrics import AUDIT_LOG_DROPPED
+
+logger = logging.getLogger(__name__)
+
+AUDIT_WRITER_BATCH_SIZE = int(os.getenv("AUDIT_WRITER_BATCH_SIZE", 500))
+AUDIT_WRITER_FLUSH_SECONDS = float(os.getenv("AUDIT_WRITER_FLUSH_SECONDS", 1.0))
+AUDIT_WRITER_MAX_PENDING = int(os.getenv("AUDIT_WRITER_MAX_PENDING", 10000))
+
+
+class AuditLogWriter:
+    """Bounded in-memory audit buffer with a background bulk-insert flusher."""
+
+    def __init__(
+        self,
+        *,
+        session_factory: Optional[Callable[[], Any]] = None,
+        batch_size: int = AUDIT_WRITER_BATCH_SIZE,
+        flush_seconds: float = AUDIT_WRITER_FLUSH_SECONDS,
+        max_pending: int = AUDIT_WRITER_MAX_PENDING,
+    ):
+        self._session_factory = session_factory
+        self.batch_size = max(1, batch_size)
+        self.flush_seconds = flush_seconds
+        self.max_pending = max(self.batch_size, max_pending)
+        self._pending: Deque[Dict[str, Any]] = deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        # Serialises flushes so batches are written in submission order.
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.written = 0
+        self.failed = 0
+
+    def _session(self):
+        if self._session_factory is not None:
+            return self._session_factory()
+        from core.db.database import SessionLocal
+        return SessionLocal()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def submit(self, record: Dict[str, Any]) -> None:
+        """Buffer one ``models.AuditLog`` row (column values keyed by attribute name)."""
+        with self._lock:
+            full = len(self._pending) >= self.max_pending
+            if not full:
+                self._pending.append(record)
+                if len(self._pending) >= self.batch_size:
+                    self._wakeup.notify()
+        if full:
+            # Backpressure: the producer writes a batch before adding more.
+            self.flush(max_batches=1)
+            with self._lock:
+                self._pending.append(record)
+        self.start()
+
+    def _take_batch(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            count = min(self.batch_size, len(self._pending))
+            return [self._pending.popleft() for _ in range(count)]
+
+    def flush(self, max_batches: Optional[int] = None) -> int:
+        """Write buffered records now; returns the number written."""
+        written = 0
+        batches = 0
+        with self._flush_lock:
+            while max_batches is None or batches < max_batches:
+                batch = self._take_batch()
+                if not batch:
+                    break
+                batches += 1
+                db = self._session()
+                try:
+                    written += self._insert(db, batch)
+                finally:
+                    db.close()
+        self.written += written
+        return written
+
+    def _insert(self, db, batch: List[Dict[str, Any]]) -> int:
+        """Insert ``batch``, bisecting on failure so one bad row only drops itself."""
+        try:
+            return insert_audit_logs(db, batch)
+        except Exception as exc:
+            db.rollback()
+            if len(batch) == 1:
+                self.failed += 1
+                AUDIT_LOG_DROPPED.inc()
+                record = batch[0]
+                logger.error(
+                    "audit writer: dropped %s record %s after insert failure: %s",
+                    record.get("action_type"), record.get("id"), exc,
+                )
+                return 0
+        middle = len(batch) // 2
+        return self._insert(db, batch[:middle]) + self._insert(db, batch[middle:])
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            with self._lock:
+                if len(self._pending) < self.batch_size:
+                    self._wakeup.wait(self.flush_seconds)
+            try:
+                self.flush()
+            except Exception as exc:  # pragma: no cover - defensive logging
+                logger.error("audit writer: flush failed: %s", exc)
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> int:
+        """Stop the flusher and write everything still buffered."""
+        self._stop.set()
+        with self._lock:
+            self._wakeup.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+        return self.flush()
+
+
+_audit_log_writer = AuditLogWriter()
+
+
+def get_audit_log_writer() -> AuditLogWriter:
+    return _audit_log_writer
+
+
+def stop_audit_log_writer(timeout: float = 10.0) -> int:
+    """Shutdown flush of this process's audit buffer."""
+    return _audit_log_writer.stop(timeout)
@@ -50,6 +50,7 @@ class BetaAccessService:
         if user_id is not None:
             audit_log(self.db, action=AuditAction.BETA_ACCESS_REQUEST, status=AuditStatus.SUCCESS,
                       target_type='beta_access_request', target_id=request.id, actor_user_id=user_id)
+            self.db.commit()
 
         return {'success': True, 'request_id': request.id}
 
@@ -171,6 +172,7 @@ class BetaAccessService:
                 actor_user_id=log_actor_id,
                 metadata=metadata,
             )
+            self.db.commit()
 
         return self._build_review_success_result(updated, decision, message)
 
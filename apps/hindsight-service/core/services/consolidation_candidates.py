@@ -0,0 +1,191 @@
+"""Duplicate-candidate generation for the consolidation worker.
+
+Two candidate sources feed consolidation: the persistent MinHash/LSH index
+over block text, and kNN lookups on the stored content embeddings. Pairs
+from both are unioned into consolidation groups. Everything is
+partitioned by (visibility scope, organization, owner): a group never mixes
+blocks that could not be consolidated into a single block.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import uuid
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy.orm import Session
+
+from core.db.repositories.consolidation_index import (
+    delete_minhash_entries,
+    find_embedding_neighbors,
+    find_lsh_candidate_pairs,
+    get_minhash_content_hashes,
+    upsert_minhash_entries,
+)
+from core.services.minhash import MinHasher, get_minhasher, normalize_text
+
+logger = logging.getLogger(__name__)
+
+MINHASH_SIMILARITY_THRESHOLD = float(os.getenv("CONSOLIDATION_MINHASH_THRESHOLD", 0.5))
+MAX_GROUP_SIZE = int(os.getenv("CONSOLIDATION_MAX_GROUP_SIZE", 10))
+# Cosine distance (1 - similarity) under which two embeddings are duplicates.
+EMBEDDING_MAX_DISTANCE = float(os.getenv("CONSOLIDATION_EMBEDDING_MAX_DISTANCE", 0.08))
+EMBEDDING_NEIGHBORS = int(os.getenv("CONSOLIDATION_EMBEDDING_NEIGHBORS", 5))
+# Comma-separated subset of "minhash,embedding".
+CANDIDATE_SOURCES = tuple(
+    source.strip()
+    for source in os.getenv("CONSOLIDATION_CANDIDATE_SOURCES", "minhash,embedding").split(",")
+    if source.strip()
+)
+
+
+def partition_key(visibility_scope: Optional[str], organization_id: Any = None, owner_user_id: Any = None) -> str:
+    return f"{visibility_scope or ''}:{organization_id or ''}:{owner_user_id or ''}"
+
+
+def block_partition_key(block: Dict[str, Any]) -> str:
+    return partition_key(block.get("visibility_scope"), block.get("organization_id"), block.get("owner_user_id"))
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class DisjointSet:
+    """Union-find with path halving and union by size."""
+
+    def __init__(self) -> None:
+        self._parent: Dict[Any, Any] = {}
+        self._size: Dict[Any, int] = {}
+
+    def find(self, item: Any) -> Any:
+        parent = self._parent.setdefault(item, item)
+        if parent == item:
+            self._size.setdefault(item, 1)
+            return item
+        while self._parent[item] != item:
+            self._parent[item] = self._parent[self._parent[item]]
+            item = self._parent[item]
+        return item
+
+    def union(self, a: Any, b: Any) -> None:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return
+        if self._size[root_a] < self._size[root_b]:
+            root_a, root_b = root_b, root_a
+        self._parent[root_b] = root_a
+        self._size[root_a] += self._size.pop(root_b)
+
+    def groups(self) -> List[List[Any]]:
+        members: Dict[Any, List[Any]] = {}
+        for item in self._parent:
+            members.setdefault(self.find(item), []).append(item)
+        return [group for group in members.values() if len(group) > 1]
+
+
+def refresh_minhash_index(
+    db: Session,
+    memory_blocks: Sequence[Dict[str, Any]],
+    hasher: Optional[MinHasher] = None,
+) -> List[uuid.UUID]:
+    """Bring index rows for ``memory_blocks`` up to date; return ids that changed.
+
+    Blocks whose normalized text and partition are unchanged are skipped, so
+    re-running over the same rows costs one lookup query. Blocks without
+    any text are removed from the index.
+    """
+    hasher = hasher or get_minhasher()
+    existing = get_minhash_content_hashes(db, [block["id"] for block in memory_blocks])
+    entries, emptied = [], []
+    for block in memory_blocks:
+        text = normalize_text(block.get("content"), block.get("lessons_learned"))
+        key = block_partition_key(block)
+        digest = content_hash(text)
+        if existing.get(block["id"]) == (key, digest):
+            continue
+        signature = hasher.signature(text)
+        if signature is None:
+            if block["id"] in existing:
+                emptied.append(block["id"])
+            continue
+        entries.append({
+            "memory_id": block["id"],
+            "partition_key": key,
+            "content_hash": digest,
+            "signature": signature,
+            "bands": hasher.band_hashes(signature),
+        })
+    upsert_minhash_entries(db, entries)
+    delete_minhash_entries(db, emptied)
+    if entries:
+        logger.info(f"Refreshed MinHash signatures for {len(entries)} memory blocks")
+    return [entry["memory_id"] for entry in entries]
+
+
+def minhash_candidate_pairs(
+    db: Session,
+    memory_ids: Sequence[uuid.UUID],
+    threshold: float = MINHASH_SIMILARITY_THRESHOLD,
+) -> List[Tuple[uuid.UUID, uuid.UUID]]:
+    """Indexed blocks whose estimated Jaccard similarity with one of ``memory_ids`` reaches ``threshold``."""
+    pairs = []
+    for a, b, sig_a, sig_b in find_lsh_candidate_pairs(db, memory_ids):
+        if MinHasher.similarity(sig_a, sig_b) >= threshold:
+            pairs.append((a, b))
+    return pairs
+
+
+def embedding_candidate_pairs(
+    db: Session,
+    memory_ids: Sequence[uuid.UUID],
+    max_distance: float = EMBEDDING_MAX_DISTANCE,
+    k: int = EMBEDDING_NEIGHBORS,
+) -> List[Tuple[uuid.UUID, uuid.UUID]]:
+    """Same-partition nearest neighbours of ``memory_ids`` within ``max_distance``.
+
+    Blocks without a stored embedding are skipped; the MinHash source still
+    covers them.
+    """
+    bind = db.get_bind()
+    if getattr(getattr(bind, "dialect", None), "name", "") != "postgresql":
+        return []
+    return [
+        (a, b)
+        for a, b, distance in find_embedding_neighbors(db, memory_ids, k)
+        if distance <= max_distance
+    ]
+
+
+def candidate_pairs(
+    db: Session,
+    memory_ids: Sequence[uuid.UUID],
+    sources: Sequence[str] = CANDIDATE_SOURCES,
+) -> List[Tuple[uuid.UUID, uuid.UUID]]:
+    """Candidate duplicate pairs for ``memory_ids`` from the configured sources."""
+    pairs: List[Tuple[uuid.UUID, uuid.UUID]] = []
+    if "minhash" in sources:
+        pairs.extend(minhash_candidate_pairs(db, memory_ids))
+    if "embedding" in sources:
+        pairs.extend(embedding_candidate_pairs(db, memory_ids))
+    return pairs
+
+
+def group_pairs(pairs: Iterable[Tuple[Any, Any]], max_group_size: int = MAX_GROUP_SIZE) -> List[List[str]]:
+    """Union candidate pairs into groups of memory id strings.
+
+    Components larger than ``max_group_size`` are split into consecutive
+    chunks so one LLM prompt never has to merge an unbounded cluster.
+    """
+    components = DisjointSet()
+    for a, b in pairs:
+        components.union(str(a), str(b))
+    groups = []
+    for members in components.groups():
+        members = sorted(members)
+        for start in range(0, len(members), max_group_size):
+            chunk = members[start:start + max_group_size]
+            if len(chunk) > 1:
+                groups.append(chunk)
+    return groups
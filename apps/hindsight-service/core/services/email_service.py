@@ -14,7 +14,6 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email import encoders
-from jinja2 import Environment, FileSystemLoader, Template
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -66,6 +65,8 @@ class EmailService:
     
     def _setup_templates(self):
         """Setup Jinja2 template environment."""
+        from jinja2 import Environment, FileSystemLoader
+
         template_path = Path(self.config.template_dir)
         if template_path.exists():
             self.template_env = Environment(loader=FileSystemLoader(str(template_path)))
@@ -103,28 +104,7 @@ class EmailService:
             }
         
         try:
-            # Create message
-            message = MIMEMultipart('alternative')
-            message['From'] = f"{self.config.from_name} <{self.config.from_email}>"
-            message['To'] = to_email
-            message['Subject'] = subject
-            
-            if reply_to or self.config.reply_to_email:
-                message['Reply-To'] = reply_to or self.config.reply_to_email
-            
-            # Add text content
-            if text_content:
-                text_part = MIMEText(text_content, 'plain', 'utf-8')
-                message.attach(text_part)
-            
-            # Add HTML content
-            html_part = MIMEText(html_content, 'html', 'utf-8')
-            message.attach(html_part)
-            
-            # Add attachments if any
-            if attachments:
-                for attachment in attachments:
-                    self._add_attachment(message, attachment)
+            message = self._build_message(to_email, subject, html_content, text_content, reply_to, attachments)
             
             # Send email
             result = await self._send_via_smtp(message, to_email)
@@ -140,22 +120,102 @@ class EmailService:
                 'error': error_msg
             }
     
+    async def send_batch(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Send several emails over a single SMTP connection.
+        
+        Each message is a dict of ``send_email`` keyword arguments. Results
+        come back in the same order; a connection failure fails every
+        message not sent yet.
+        """
+        if not self.config.is_configured():
+            return [{'success': False, 'error': 'Email service not configured'} for _ in messages]
+        
+        results: List[Dict[str, Any]] = []
+        try:
+            async with aiosmtplib.SMTP(**self._smtp_kwargs()) as smtp:
+                if self.config.smtp_username and self.config.smtp_password:
+                    await smtp.login(self.config.smtp_username, self.config.smtp_password)
+                
+                for item in messages:
+                    try:
+                        message = self._build_message(
+                            item['to_email'],
+                            item['subject'],
+                            item['html_content'],
+                            item.get('text_content'),
+                            item.get('reply_to'),
+                            item.get('attachments'),
+                        )
+                        await smtp.send_message(message)
+                        results.append({'success': True, 'message_id': message.get('Message-ID', '')})
+                    except aiosmtplib.SMTPServerDisconnected:
+                        raise
+                    except Exception as e:
+                        results.append({
+                            'success': False,
+                            'error': f"Failed to send email to {item.get('to_email')}: {str(e)}"
+                        })
+        except Exception as e:
+            error_msg = f"SMTP sending failed: {str(e)}"
+            logger.error(error_msg)
+            results.extend({'success': False, 'error': error_msg} for _ in messages[len(results):])
+        
+        return results
+    
+    def _build_message(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        text_content: Optional[str] = None,
+        reply_to: Optional[str] = None,
+        attachments: Optional[List[Dict[str, Any]]] = None
+    ) -> MIMEMultipart:
+        """Build the multipart message for one recipient."""
+        message = MIMEMultipart('alternative')
+        message['From'] = f"{self.config.from_name} <{self.config.from_email}>"
+        message['To'] = to_email
+        message['Subject'] = subject
+        
+        if reply_to or self.config.reply_to_email:
+            message['Reply-To'] = reply_to or self.config.reply_to_email
+        
+        # Add text content
+        if text_content:
+            text_part = MIMEText(text_content, 'plain', 'utf-8')
+            message.attach(text_part)
+        
+        # Add HTML content
+        html_part = MIMEText(html_content, 'html', 'utf-8')
+        message.attach(html_part)
+        
+        # Add attachments if any
+        if attachments:
+            for attachment in attachments:
+                self._add_attachment(message, attachment)
+        
+        return message
+    
+    def _smtp_kwargs(self) -> Dict[str, Any]:
+        """Connection arguments for aiosmtplib.SMTP."""
+        smtp_kwargs = {
+            'hostname': self.config.smtp_host,
+            'port': self.config.smtp_port,
+            'use_tls': self.config.smtp_use_tls,
+        }
+        
+        if self.config.smtp_use_ssl:
+            smtp_kwargs['use_tls'] = False
+            smtp_kwargs['port'] = self.config.smtp_port or 465
+        
+        return smtp_kwargs
+    
     async def _send_via_smtp(self, message: MIMEMultipart, to_email: str) -> Dict[str, Any]:
         """Send email via SMTP with proper connection handling."""
         try:
-            # Configure SMTP connection
-            smtp_kwargs = {
-                'hostname': self.config.smtp_host,
-                'port': self.config.smtp_port,
-                'use_tls': self.config.smtp_use_tls,
-            }
-            
-            if self.config.smtp_use_ssl:
-                smtp_kwargs['use_tls'] = False
-                smtp_kwargs['port'] = self.config.smtp_port or 465
-            
             # Connect and send
-            async with aiosmtplib.SMTP(**smtp_kwargs) as smtp:
+            async with aiosmtplib.SMTP(**self._smtp_kwargs()) as smtp:
                 if self.config.smtp_username and self.config.smtp_password:
                     await smtp.login(self.config.smtp_username, self.config.smtp_password)
                 
@@ -7,18 +7,26 @@ import logging
 import os
 import threading
 import time
+from contextlib import contextmanager
 from dataclasses import dataclass
 from typing import List, Optional, Sequence
 
 import requests
 
 from core.db import models
+from core.metrics import EMBEDDING_BATCH_SIZE, EMBEDDING_DURATION, EMBEDDING_ERRORS
 
 logger = logging.getLogger(__name__)
 
 _DEFAULT_TIMEOUT = (3, 60)
 
 
+def memory_text_hash(text: str) -> str:
+    """SHA-256 of ``text`` with case and whitespace runs normalized."""
+    normalized = " ".join((text or "").split()).lower()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
 @dataclass
 class EmbeddingConfig:
     provider: str
@@ -236,15 +244,38 @@ class EmbeddingService:
             return None
         return getattr(self._provider, "dimension", self.config.dimension)
 
+    @contextmanager
+    def _measure(self, operation: str, batch_size: int):
+        """Record latency, batch size and errors of one provider call."""
+        provider = self.config.provider
+        EMBEDDING_BATCH_SIZE.observe(batch_size, provider=provider)
+        with EMBEDDING_DURATION.time(provider=provider, operation=operation):
+            try:
+                yield
+            except Exception:
+                EMBEDDING_ERRORS.inc(provider=provider, operation=operation)
+                raise
+
     def embed_text(self, text: str) -> Optional[List[float]]:
         if not self._provider:
             return None
         if not text.strip():
             return None
-        with self._lock:
+        with self._lock, self._measure("embed", 1):
             vector = self._provider.embed(text)
         return vector
 
+    def embed_texts(self, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """Embed several texts in one provider call; blank texts map to ``None``."""
+        if not self._provider:
+            return [None] * len(texts)
+        wanted = [text for text in texts if text.strip()]
+        if not wanted:
+            return [None] * len(texts)
+        with self._lock, self._measure("embed_many", len(wanted)):
+            vectors = iter(self._provider.embed_many(wanted))
+        return [next(vectors) if text.strip() else None for text in texts]
+
     def compose_memory_text(self, memory_block: models.MemoryBlock) -> str:
         parts: List[str] = []
         if memory_block.content:
@@ -260,6 +291,10 @@ class EmbeddingService:
                 pass
         return "\n\n".join(p for p in parts if p)
 
+    def content_hash(self, memory_block: models.MemoryBlock) -> str:
+        """Hash of the normalized text the block's embedding is computed from."""
+        return memory_text_hash(self.compose_memory_text(memory_block))
+
     def embed_memory_block(self, memory_block: models.MemoryBlock) -> Optional[List[float]]:
         text = self.compose_memory_text(memory_block)
         return self.embed_text(text)
@@ -302,6 +337,7 @@ class EmbeddingService:
             for memory_block in batch:
                 try:
                     self.attach_embedding(memory_block, save_empty=True)
+                    memory_block.content_hash = self.content_hash(memory_block)
                 except Exception as exc:  # pragma: no cover - defensive logging
                     logger.error("Embedding backfill error for %s: %s", memory_block.id, exc)
                     batch_errors.append(str(memory_block.id))
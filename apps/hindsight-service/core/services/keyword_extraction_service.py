@@ -5,13 +5,48 @@ Single canonical implementation for keyword extraction across the
 backend. Used by bulk keyword generation, the per-block suggest endpoint,
 and the memory-optimization keyword suggestion path.
 
-Public API: `extract_keywords(text, max_keywords=10)`. The legacy alias
+Public API: `extract_keywords(text, max_keywords=10)` and the batch form
+`iter_extract_keywords(texts, max_keywords=10)`. The legacy alias
 `extract_keywords_enhanced` is preserved for backwards compatibility with
 existing callers and patch points.
 """
+import multiprocessing
+import os
 import re
+import threading
 from collections import Counter
-from typing import List
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Iterable, Iterator, List, Optional
+
+# Batches at least this large are extracted in a process pool (0 workers disables it).
+KEYWORD_EXTRACTION_WORKERS = int(os.getenv("KEYWORD_EXTRACTION_WORKERS", min(4, os.cpu_count() or 1)))
+KEYWORD_EXTRACTION_PARALLEL_THRESHOLD = int(os.getenv("KEYWORD_EXTRACTION_PARALLEL_THRESHOLD", 200))
+
+_STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by',
+    'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did',
+    'will', 'would', 'could', 'should', 'may', 'might', 'can', 'this', 'that', 'these', 'those',
+    'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them', 'my', 'your',
+    'his', 'hers', 'its', 'our', 'their', 'myself', 'yourself', 'himself', 'herself', 'itself',
+    'ourselves', 'yourselves', 'themselves', 'what', 'which', 'who', 'whom', 'whose', 'where',
+    'when', 'why', 'how', 'all', 'any', 'both', 'each', 'few', 'more', 'most', 'other', 'some',
+    'such', 'no', 'nor', 'not', 'only', 'own', 'same', 'so', 'than', 'too', 'very', 'just',
+    'now', 'here', 'there', 'then', 'up', 'down', 'out', 'off', 'over', 'under', 'again',
+    'further', 'once', 'during', 'before', 'after', 'above', 'below', 'between', 'through',
+    'into', 'from', 'about', 'against', 'within', 'without'
+})
+
+# Alphanumeric sequences of 3+ characters
+_WORD_RE = re.compile(r'\b[a-zA-Z]{3,}\b')
+
+# Technical terms, languages/tools, and UI/product vocabulary
+_TECHNICAL_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'\b(?:api|database|server|client|service|system|process|function|method|class|object|data|model|algorithm|framework|library|module|component|interface|protocol|network|security|authentication|authorization|token|session|cache|memory|storage|disk|cpu|gpu|performance|optimization|configuration|deployment|environment|production|development|testing|debugging|logging|monitoring|analytics|metrics|dashboard|report|analysis|query|search|filter|sort|pagination|validation|error|exception|warning|info|debug|trace)\b',
+    r'\b(?:python|javascript|typescript|java|c\+\+|golang|rust|php|ruby|html|css|sql|json|xml|yaml|api|rest|graphql|http|https|tcp|udp|websocket|oauth|jwt|ssl|tls|aws|azure|gcp|docker|kubernetes|git|github|gitlab|jenkins|terraform|ansible|nginx|apache|postgresql|mysql|mongodb|redis|elasticsearch|kafka|rabbitmq|react|vue|angular|node|express|flask|django|fastapi|spring|laravel)\b',
+    r'\b(?:user|admin|client|customer|account|profile|settings|preferences|notification|email|password|login|logout|signup|registration|dashboard|home|page|view|screen|form|input|button|menu|navigation|header|footer|sidebar|modal|dialog|popup|tab|accordion|carousel|slider|chart|graph|table|list|grid|card|tile|widget|component)\b',
+))
 
 
 def extract_keywords(text: str, max_keywords: int = 10) -> List[str]:
@@ -25,40 +60,16 @@ def extract_keywords(text: str, max_keywords: int = 10) -> List[str]:
     # Clean and normalize text
     text = text.lower()
 
-    # Remove common stop words
-    stop_words = {
-        'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by',
-        'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did',
-        'will', 'would', 'could', 'should', 'may', 'might', 'can', 'this', 'that', 'these', 'those',
-        'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them', 'my', 'your',
-        'his', 'hers', 'its', 'our', 'their', 'myself', 'yourself', 'himself', 'herself', 'itself',
-        'ourselves', 'yourselves', 'themselves', 'what', 'which', 'who', 'whom', 'whose', 'where',
-        'when', 'why', 'how', 'all', 'any', 'both', 'each', 'few', 'more', 'most', 'other', 'some',
-        'such', 'no', 'nor', 'not', 'only', 'own', 'same', 'so', 'than', 'too', 'very', 'just',
-        'now', 'here', 'there', 'then', 'up', 'down', 'out', 'off', 'over', 'under', 'again',
-        'further', 'once', 'during', 'before', 'after', 'above', 'below', 'between', 'through',
-        'into', 'from', 'about', 'against', 'within', 'without'
-    }
-
-    # Extract words (alphanumeric sequences of 3+ characters)
-    words = re.findall(r'\b[a-zA-Z]{3,}\b', text)
+    words = _WORD_RE.findall(text)
 
     # Filter out stop words and get word frequencies
-    meaningful_words = [word for word in words if word not in stop_words]
+    meaningful_words = [word for word in words if word not in _STOP_WORDS]
     word_freq = Counter(meaningful_words)
 
-    # Look for technical terms, proper nouns (capitalized words in original text), and domain-specific keywords
-    technical_patterns = [
-        r'\b(?:api|database|server|client|service|system|process|function|method|class|object|data|model|algorithm|framework|library|module|component|interface|protocol|network|security|authentication|authorization|token|session|cache|memory|storage|disk|cpu|gpu|performance|optimization|configuration|deployment|environment|production|development|testing|debugging|logging|monitoring|analytics|metrics|dashboard|report|analysis|query|search|filter|sort|pagination|validation|error|exception|warning|info|debug|trace)\b',
-        r'\b(?:python|javascript|typescript|java|c\+\+|golang|rust|php|ruby|html|css|sql|json|xml|yaml|api|rest|graphql|http|https|tcp|udp|websocket|oauth|jwt|ssl|tls|aws|azure|gcp|docker|kubernetes|git|github|gitlab|jenkins|terraform|ansible|nginx|apache|postgresql|mysql|mongodb|redis|elasticsearch|kafka|rabbitmq|react|vue|angular|node|express|flask|django|fastapi|spring|laravel)\b',
-        r'\b(?:user|admin|client|customer|account|profile|settings|preferences|notification|email|password|login|logout|signup|registration|dashboard|home|page|view|screen|form|input|button|menu|navigation|header|footer|sidebar|modal|dialog|popup|tab|accordion|carousel|slider|chart|graph|table|list|grid|card|tile|widget|component)\b'
-    ]
-
     # Find technical terms
     technical_words = set()
-    for pattern in technical_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        technical_words.update(matches)
+    for pattern in _TECHNICAL_PATTERNS:
+        technical_words.update(pattern.findall(text))
 
     # Combine high-frequency words with technical terms
     # Get top words by frequency (minimum frequency of 2 or if text is short, frequency of 1)
@@ -80,5 +91,61 @@ def extract_keywords(text: str, max_keywords: int = 10) -> List[str]:
     return keywords[:max_keywords]
 
 
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+def _pool_context():
+    # The pool is created inside a multithreaded server process; a forked
+    # child could inherit a lock (logging, DB pool, HTTP client) held by
+    # another thread and deadlock. Start workers from a clean interpreter.
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(max_workers=KEYWORD_EXTRACTION_WORKERS, mp_context=_pool_context())
+        return _process_pool
+
+
+def shutdown_keyword_extraction_pool() -> None:
+    """Shut down the shared extraction process pool, if one was started."""
+    global _process_pool
+    with _process_pool_lock:
+        pool, _process_pool = _process_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_extract_keywords(texts: Iterable[str], max_keywords: int = 10) -> Iterator[List[str]]:
+    """Yield ``extract_keywords(text)`` for each text, in input order.
+
+    Large batches are spread over a shared process pool (the extraction is
+    pure CPU work, so threads would serialize on the GIL); results are
+    yielded as soon as each one is ready in order, so callers can stream.
+    """
+    texts = list(texts)
+    extract = partial(extract_keywords, max_keywords=max_keywords)
+    if KEYWORD_EXTRACTION_WORKERS <= 1 or len(texts) < KEYWORD_EXTRACTION_PARALLEL_THRESHOLD:
+        for text in texts:
+            yield extract(text)
+        return
+
+    chunksize = max(1, len(texts) // (KEYWORD_EXTRACTION_WORKERS * 4))
+    done = 0
+    try:
+        for keywords in _get_process_pool().map(extract, texts, chunksize=chunksize):
+            done += 1
+            yield keywords
+    except BrokenProcessPool:
+        # A worker died; drop the pool and finish this batch inline.
+        shutdown_keyword_extraction_pool()
+        for text in texts[done:]:
+            yield extract(text)
+
+
 # Backward-compatible alias — pre-#82 callers used this name.
 extract_keywords_enhanced = extract_keywords
@@ -0,0 +1,652 @@
+"""Shared, rate-limited gateway for LLM calls.
+
+Compression, pruning and consolidation all send prompts through one
+process-wide :class:`LLMGateway` instead of building a provider client per
+call. The gateway owns:
+
+- one cached provider client per API key (connection reuse),
+- a global token-bucket rate limit (``LLM_REQUESTS_PER_MINUTE`` /
+  ``LLM_RATE_BURST``),
+- a concurrency limit on in-flight calls (``LLM_MAX_CONCURRENCY``),
+- retries with jittered exponential backoff for transient failures
+  (``LLM_MAX_RETRIES``, ``LLM_RETRY_BACKOFF_SECONDS``),
+- per-call latency and token metrics,
+- a persistent result cache (``llm_result_cache``) keyed by model, prompt
+  template version and content hash, so re-evaluating unchanged memory
+  blocks skips the model entirely.
+
+The limiter and metrics are thread-safe and not bound to an event loop,
+because callers run on the API loop, in sync endpoints via
+:func:`run_sync`, and on the bulk-operation worker threads.
+
+``LLM_PROVIDER=stub`` swaps Gemini for :class:`StubLLMProvider`, which
+answers locally from the response schema so the maintenance flows can be
+exercised offline.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class LLMGatewayConfig:
+    provider: str = "gemini"
+    requests_per_minute: float = 120.0
+    burst: int = 10
+    max_concurrency: int = 4
+    max_retries: int = 3
+    backoff_seconds: float = 1.0
+    max_backoff_seconds: float = 30.0
+    timeout_seconds: float = 120.0
+    cache_enabled: bool = True
+    cache_ttl_seconds: int = 7 * 24 * 3600
+    cache_max_entries: int = 10000
+
+    @classmethod
+    def from_env(cls) -> "LLMGatewayConfig":
+        provider = (os.getenv("LLM_PROVIDER") or "gemini").strip().lower()
+        if provider not in {"gemini", "stub"}:
+            logger.warning("Unknown LLM_PROVIDER '%s'; using gemini.", provider)
+            provider = "gemini"
+        return cls(
+            provider=provider,
+            requests_per_minute=float(os.getenv("LLM_REQUESTS_PER_MINUTE", 120)),
+            burst=int(os.getenv("LLM_RATE_BURST", 10)),
+            max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", 4)),
+            max_retries=int(os.getenv("LLM_MAX_RETRIES", 3)),
+            backoff_seconds=float(os.getenv("LLM_RETRY_BACKOFF_SECONDS", 1.0)),
+            max_backoff_seconds=float(os.getenv("LLM_RETRY_MAX_BACKOFF_SECONDS", 30.0)),
+            timeout_seconds=float(os.getenv("LLM_TIMEOUT_SECONDS", 120.0)),
+            cache_enabled=os.getenv("LLM_CACHE_ENABLED", "true").strip().lower() in {"1", "true", "yes", "on"},
+            cache_ttl_seconds=int(os.getenv("LLM_CACHE_TTL_SECONDS", 7 * 24 * 3600)),
+            cache_max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", 10000)),
+        )
+
+
+@dataclass
+class LLMResponse:
+    text: str
+    model: str
+    latency_seconds: float
+    attempts: int = 1
+    input_tokens: Optional[int] = None
+    output_tokens: Optional[int] = None
+    cached: bool = False
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+class LLMProviderError(RuntimeError):
+    """A provider call failed; ``retryable`` marks transient failures."""
+
+    def __init__(self, message: str, *, retryable: bool = False) -> None:
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class TokenBucket:
+    """Thread-safe token bucket.
+
+    Callers reserve a token and sleep for their own wait, so concurrent
+    callers queue up fairly without holding a lock while sleeping. A rate
+    of 0 disables limiting.
+    """
+
+    def __init__(self, rate_per_second: float, capacity: int) -> None:
+        self.rate = rate_per_second
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token; return how long the caller must wait before using it."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    async def acquire(self) -> float:
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+class BaseLLMProvider(ABC):
+    name = "base"
+    requires_api_key = True
+
+    @abstractmethod
+    async def generate(
+        self,
+        prompt: str,
+        *,
+        model: str,
+        api_key: Optional[str],
+        config: Dict[str, Any],
+    ) -> LLMResponse:
+        """Send ``prompt`` to ``model`` and return the response."""
+
+
+async def _run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Like ``asyncio.to_thread``, but a cancelled caller still waits for the
+    thread to finish, so the gateway's concurrency slot (released when the
+    provider coroutine ends) covers the whole provider call."""
+    loop = asyncio.get_running_loop()
+    call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+    future = loop.run_in_executor(None, call)
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        await asyncio.wait([future])
+        raise
+
+
+class GeminiLLMProvider(BaseLLMProvider):
+    """Google Gemini via ``google-genai``.
+
+    One client is kept per API key so its HTTP connection pool is reused
+    across calls. The blocking SDK call runs on a worker thread so the
+    caller's event loop stays free while waiting on the model.
+    """
+
+    name = "gemini"
+
+    def __init__(self) -> None:
+        self._clients: Dict[Any, Any] = {}
+        self._lock = threading.Lock()
+
+    def _client(self, api_key: Optional[str]):
+        from google import genai
+
+        # Keyed on the client class too, so a swapped SDK module gets a fresh client.
+        key = (genai.Client, api_key)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = genai.Client(api_key=api_key)
+                self._clients[key] = client
+            return client
+
+    async def generate(self, prompt, *, model, api_key, config):
+        client = self._client(api_key)
+        started = time.perf_counter()
+        try:
+            response = await _run_blocking(
+                client.models.generate_content, model=model, contents=prompt, config=config
+            )
+        except Exception as exc:
+            raise LLMProviderError(str(exc), retryable=_is_transient(exc)) from exc
+        usage = getattr(response, "usage_metadata", None)
+        return LLMResponse(
+            text=response.text or "",
+            model=model,
+            latency_seconds=time.perf_counter() - started,
+            input_tokens=_token_count(usage, "prompt_token_count"),
+            output_tokens=_token_count(usage, "candidates_token_count"),
+        )
+
+
+class StubLLMProvider(BaseLLMProvider):
+    """Offline provider answering from the response schema (or a custom responder)."""
+
+    name = "stub"
+    requires_api_key = False
+
+    def __init__(self, responder: Optional[Callable[[str, Dict[str, Any]], str]] = None) -> None:
+        self.responder = responder
+        self.calls = 0
+
+    async def generate(self, prompt, *, model, api_key, config):
+        self.calls += 1
+        if self.responder is not None:
+            text = self.responder(prompt, config)
+        elif config.get("response_schema"):
+            text = json.dumps(_sample_for_schema(config["response_schema"]))
+        else:
+            text = "{}"
+        return LLMResponse(
+            text=text,
+            model=model,
+            latency_seconds=0.0,
+            input_tokens=len(prompt.split()),
+            output_tokens=len(text.split()),
+        )
+
+
+def _sample_for_schema(schema: Dict[str, Any]) -> Any:
+    kind = schema.get("type")
+    if kind == "object":
+        return {name: _sample_for_schema(sub) for name, sub in (schema.get("properties") or {}).items()}
+    if kind == "array":
+        return []
+    if kind in {"integer", "number"}:
+        return schema.get("minimum", 0)
+    if kind == "boolean":
+        return False
+    return "stub"
+
+
+def _token_count(usage: Any, attr: str) -> Optional[int]:
+    value = getattr(usage, attr, None) if usage is not None else None
+    return value if isinstance(value, int) else None
+
+
+def _is_transient(exc: BaseException) -> bool:
+    code = getattr(exc, "code", None)
+    if not isinstance(code, int):
+        code = getattr(exc, "status_code", None)
+    if isinstance(code, int):
+        return code == 429 or code >= 500
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    try:
+        import httpx
+    except ImportError:  # pragma: no cover - httpx ships with google-genai
+        return False
+    return isinstance(exc, httpx.TransportError)
+
+
+class LLMResultCache:
+    """Database-backed LLM response cache.
+
+    Each lookup/store uses its own short session so callers never hold a
+    connection across the model call. Cache failures are logged and treated
+    as misses; they never fail the LLM call itself.
+    """
+
+    # Run TTL/size eviction once every this many stores.
+    PRUNE_EVERY = 100
+
+    def __init__(
+        self,
+        ttl_seconds: int,
+        max_entries: int,
+        session_factory: Optional[Callable[[], Any]] = None,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._session_factory = session_factory
+        self._stores = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def content_hash(prompt: str, config: Dict[str, Any]) -> str:
+        digest = hashlib.sha256()
+        digest.update(json.dumps(config, sort_keys=True, default=str).encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(prompt.encode("utf-8"))
+        return digest.hexdigest()
+
+    @staticmethod
+    def cache_key(model: str, purpose: str, template_version: str, content_hash: str) -> str:
+        return hashlib.sha256(
+            "\0".join((model, purpose, template_version, content_hash)).encode("utf-8")
+        ).hexdigest()
+
+    def _session(self):
+        if self._session_factory is not None:
+            return self._session_factory()
+        # Resolved at call time so a rebound SessionLocal (tests) is honoured.
+        from core.db import database
+
+        return database.SessionLocal()
+
+    def get(self, cache_key: str, model: str) -> Optional[LLMResponse]:
+        from core.db.repositories.llm_cache import get_llm_cache_entry
+
+        db = self._session()
+        try:
+            entry = get_llm_cache_entry(db, cache_key)
+            if entry is None:
+                return None
+            return LLMResponse(
+                text=entry.response_text,
+                model=model,
+                latency_seconds=0.0,
+                attempts=0,
+                input_tokens=entry.input_tokens,
+                output_tokens=entry.output_tokens,
+                cached=True,
+            )
+        except Exception as exc:
+            logger.warning("LLM cache lookup failed: %s", exc)
+            db.rollback()
+            return None
+        finally:
+            db.close()
+
+    def put(
+        self,
+        cache_key: str,
+        *,
+        model: str,
+        purpose: str,
+        template_version: str,
+        content_hash: str,
+        response: LLMResponse,
+    ) -> None:
+        from core.db.repositories.llm_cache import prune_llm_cache, put_llm_cache_entry
+
+        with self._lock:
+            self._stores += 1
+            prune = self._stores % self.PRUNE_EVERY == 0
+        db = self._session()
+        try:
+            put_llm_cache_entry(
+                db,
+                cache_key=cache_key,
+                model=model,
+                purpose=purpose,
+                template_version=template_version,
+                content_hash=content_hash,
+                response_text=response.text,
+                ttl_seconds=self.ttl_seconds,
+                input_tokens=response.input_tokens,
+                output_tokens=response.output_tokens,
+            )
+            if prune:
+                removed = prune_llm_cache(db, self.max_entries)
+                if removed:
+                    logger.info("Evicted %d LLM cache entries", removed)
+        except Exception as exc:
+            logger.warning("LLM cache store failed: %s", exc)
+            db.rollback()
+        finally:
+            db.close()
+
+
+class LLMGateway:
+    """Process-wide entry point for LLM calls."""
+
+    def __init__(
+        self,
+        config: Optional[LLMGatewayConfig] = None,
+        provider: Optional[BaseLLMProvider] = None,
+        cache: Optional[LLMResultCache] = None,
+    ) -> None:
+        self.config = config or LLMGatewayConfig.from_env()
+        self.provider = provider or self._build_provider()
+        if cache is None and self.config.cache_enabled:
+            cache = LLMResultCache(self.config.cache_ttl_seconds, self.config.cache_max_entries)
+        self.cache = cache
+        self._bucket = TokenBucket(self.config.requests_per_minute / 60.0, self.config.burst)
+        self._slots = threading.BoundedSemaphore(max(1, self.config.max_concurrency))
+        self._metrics_lock = threading.Lock()
+        self._metrics: Dict[str, Dict[str, float]] = {}
+
+    def _build_provider(self) -> BaseLLMProvider:
+        if self.config.provider == "stub":
+            return StubLLMProvider()
+        return GeminiLLMProvider()
+
+    @property
+    def requires_api_key(self) -> bool:
+        return self.provider.requires_api_key
+
+    async def generate(
+        self,
+        prompt: str,
+        *,
+        model: str,
+        api_key: Optional[str] = None,
+        purpose: str = "default",
+        response_schema: Optional[Dict[str, Any]] = None,
+        response_mime_type: str = "application/json",
+        temperature: float = 0.3,
+        template_version: Optional[str] = None,
+    ) -> LLMResponse:
+        """Send one prompt, waiting for a rate-limit token and a concurrency slot.
+
+        Transient failures are retried with jittered exponential backoff;
+        the last error is raised once retries are exhausted.
+
+        When ``template_version`` is given the result is cached under
+        (model, purpose, template version, hash of prompt and config); a
+        live entry is returned with ``cached=True`` without calling the
+        provider. Bump the version whenever the prompt template changes.
+        """
+        config: Dict[str, Any] = {"response_mime_type": response_mime_type, "temperature": temperature}
+        if response_schema is not None:
+            config["response_schema"] = response_schema
+        api_key = api_key or os.getenv("LLM_API_KEY")
+
+        if template_version:
+            cached = await self.cache_lookup(
+                prompt, model=model, purpose=purpose, template_version=template_version, config=config
+            )
+            if cached is not None:
+                return cached
+
+        response = await self._generate_with_retries(prompt, model=model, api_key=api_key, purpose=purpose, config=config)
+
+        if template_version and _cacheable(response, config):
+            await self.cache_store(
+                prompt, response, model=model, purpose=purpose, template_version=template_version, config=config
+            )
+        return response
+
+    async def cache_lookup(
+        self,
+        content: str,
+        *,
+        model: str,
+        purpose: str,
+        template_version: str,
+        config: Optional[Dict[str, Any]] = None,
+    ) -> Optional[LLMResponse]:
+        """Return a cached response for ``content`` or ``None``.
+
+        Exposed for callers that batch several items into one prompt but
+        cache each item's result separately.
+        """
+        if self.cache is None:
+            return None
+        content_hash = self.cache.content_hash(content, config or {})
+        cache_key = self.cache.cache_key(model, purpose, template_version, content_hash)
+        cached = await asyncio.to_thread(self.cache.get, cache_key, model)
+        if cached is not None:
+            self._record(purpose, response=cached)
+        return cached
+
+    async def cache_store(
+        self,
+        content: str,
+        response: LLMResponse,
+        *,
+        model: str,
+        purpose: str,
+        template_version: str,
+        config: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        if self.cache is None:
+            return
+        content_hash = self.cache.content_hash(content, config or {})
+        await asyncio.to_thread(
+            self.cache.put,
+            self.cache.cache_key(model, purpose, template_version, content_hash),
+            model=model,
+            purpose=purpose,
+            template_version=template_version,
+            content_hash=content_hash,
+            response=response,
+        )
+
+    async def _generate_with_retries(
+        self,
+        prompt: str,
+        *,
+        model: str,
+        api_key: Optional[str],
+        purpose: str,
+        config: Dict[str, Any],
+    ) -> LLMResponse:
+        attempt = 0
+        while True:
+            attempt += 1
+            throttled = await self._bucket.acquire()
+            await self._acquire_slot()
+            # The slot is released when the provider call itself ends, not when
+            # we stop waiting for it: a timed-out call may still be running on a
+            # worker thread and must keep counting against the limit.
+            call = asyncio.ensure_future(
+                self.provider.generate(prompt, model=model, api_key=api_key, config=config)
+            )
+            call.add_done_callback(self._release_slot)
+            try:
+                response = await asyncio.wait_for(asyncio.shield(call), timeout=self.config.timeout_seconds)
+            except Exception as exc:
+                retryable = getattr(exc, "retryable", False) or isinstance(exc, asyncio.TimeoutError)
+                self._record(purpose, error=True, throttled=throttled)
+                if not retryable or attempt > self.config.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(
+                    "LLM call for %s failed (attempt %d/%d), retrying in %.2fs: %s",
+                    purpose, attempt, self.config.max_retries + 1, delay, exc,
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            response.attempts = attempt
+            self._record(purpose, response=response, throttled=throttled)
+            return response
+
+    async def _acquire_slot(self) -> None:
+        # A threading semaphore (not asyncio) so the limit spans every event
+        # loop in the process; poll instead of blocking the loop.
+        while not self._slots.acquire(blocking=False):
+            await asyncio.sleep(0.05)
+
+    def _release_slot(self, call: "asyncio.Future") -> None:
+        self._slots.release()
+        if not call.cancelled():
+            # Mark the outcome of an abandoned call as seen.
+            call.exception()
+
+    def _backoff(self, attempt: int) -> float:
+        ceiling = min(self.config.max_backoff_seconds, self.config.backoff_seconds * (2 ** (attempt - 1)))
+        # Full jitter keeps retries from concurrent callers from synchronising.
+        return random.uniform(0, ceiling)
+
+    def _record(
+        self,
+        purpose: str,
+        *,
+        response: Optional[LLMResponse] = None,
+        error: bool = False,
+        throttled: float = 0.0,
+    ) -> None:
+        with self._metrics_lock:
+            stats = self._metrics.setdefault(purpose, {
+                "calls": 0, "errors": 0, "cache_hits": 0, "latency_seconds_total": 0.0,
+                "input_tokens": 0, "output_tokens": 0, "throttled_seconds_total": 0.0,
+            })
+            stats["throttled_seconds_total"] += throttled
+            if error:
+                stats["errors"] += 1
+                return
+            if response.cached:
+                stats["cache_hits"] += 1
+                return
+            stats["calls"] += 1
+            stats["latency_seconds_total"] += response.latency_seconds
+            stats["input_tokens"] += response.input_tokens or 0
+            stats["output_tokens"] += response.output_tokens or 0
+        logger.info(
+            "LLM call",
+            extra={
+                "purpose": purpose,
+                "model": response.model,
+                "latency_seconds": round(response.latency_seconds, 3),
+                "attempts": response.attempts,
+                "input_tokens": response.input_tokens,
+                "output_tokens": response.output_tokens,
+            },
+        )
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """Snapshot of per-purpose call, error, latency and token counters."""
+        with self._metrics_lock:
+            return {purpose: dict(stats) for purpose, stats in self._metrics.items()}
+
+
+def _cacheable(response: LLMResponse, config: Dict[str, Any]) -> bool:
+    """Only keep responses callers can use again: JSON must parse."""
+    if not response.text:
+        return False
+    if config.get("response_mime_type") == "application/json":
+        try:
+            json.loads(response.text)
+        except ValueError:
+            return False
+    return True
+
+
+def run_sync(coro: Awaitable[T]) -> T:
+    """Run a gateway coroutine from synchronous code.
+
+    Uses ``asyncio.run`` when the current thread has no running loop (sync
+    endpoints, workers); otherwise runs it on a helper thread so the
+    caller's loop is not re-entered.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+def release_db_connection(db) -> None:
+    """End the session's transaction so its connection goes back to the pool
+    while the caller waits on the model.
+
+    Nothing is discarded implicitly: a session holding unflushed changes is
+    refused, and the transaction is committed, not rolled back. The session
+    re-acquires a connection on next use.
+    """
+    if db.new or db.dirty or db.deleted:
+        raise RuntimeError("release_db_connection() called with pending changes; commit or discard them first")
+    db.commit()
+
+
+_llm_gateway: Optional[LLMGateway] = None
+_llm_gateway_lock = threading.Lock()
+
+
+def get_llm_gateway() -> LLMGateway:
+    global _llm_gateway
+    if _llm_gateway is None:
+        with _llm_gateway_lock:
+            if _llm_gateway is None:
+                _llm_gateway = LLMGateway()
+    return _llm_gateway
+
+
+def reset_llm_gateway_for_tests(gateway: Optional[LLMGateway] = None) -> None:  # pragma: no cover - used in tests
+    global _llm_gateway
+    _llm_gateway = gateway
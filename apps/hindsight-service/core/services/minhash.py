@@ -0,0 +1,106 @@
+"""MinHash signatures and LSH banding for near-duplicate text detection.
+
+A block's text is reduced to word shingles, and each shingle set to a
+fixed-length MinHash signature whose per-position agreement estimates
+Jaccard similarity. Signatures are split into bands; blocks that share any
+band bucket become candidates, which finds similar pairs without comparing
+every pair.
+
+With the defaults (128 permutations, 32 bands of 4 rows) a pair with
+Jaccard 0.5 shares at least one bucket with probability ~0.87; pairs below
+0.2 rarely do.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import struct
+from typing import Iterable, List, Optional, Sequence
+
+import numpy as np
+
+MINHASH_PERMUTATIONS = int(os.getenv("CONSOLIDATION_MINHASH_PERMUTATIONS", 128))
+MINHASH_BANDS = int(os.getenv("CONSOLIDATION_MINHASH_BANDS", 32))
+MINHASH_SHINGLE_SIZE = int(os.getenv("CONSOLIDATION_MINHASH_SHINGLE_SIZE", 3))
+
+# Universal hashing modulo a Mersenne prime; values stay below 2**31 so
+# a * x + b never overflows uint64 and signatures fit a Postgres integer.
+_MERSENNE_PRIME = (1 << 31) - 1
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def normalize_text(*parts: Optional[str]) -> str:
+    """Lowercase and collapse whitespace across the given text fields."""
+    return " ".join(" ".join(part.lower().split()) for part in parts if part).strip()
+
+
+def _hash32(value: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(value, digest_size=4).digest(), "little") % _MERSENNE_PRIME
+
+
+class MinHasher:
+    def __init__(
+        self,
+        num_perm: int = MINHASH_PERMUTATIONS,
+        bands: int = MINHASH_BANDS,
+        shingle_size: int = MINHASH_SHINGLE_SIZE,
+        seed: int = 1,
+    ) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        # Fixed seed: signatures are persisted, so permutations must be stable.
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+    def shingles(self, text: str) -> set[int]:
+        tokens = _TOKEN_RE.findall(text.lower())
+        if not tokens:
+            return set()
+        k = min(self.shingle_size, len(tokens))
+        return {
+            _hash32(" ".join(tokens[i:i + k]).encode("utf-8"))
+            for i in range(len(tokens) - k + 1)
+        }
+
+    def signature(self, text: str) -> Optional[List[int]]:
+        """MinHash signature of ``text``, or ``None`` when it has no tokens."""
+        shingles = self.shingles(text)
+        if not shingles:
+            return None
+        values = np.fromiter(shingles, dtype=np.uint64, count=len(shingles))
+        hashed = (np.outer(values, self._a) + self._b) % _MERSENNE_PRIME
+        return hashed.min(axis=0).astype(np.int64).tolist()
+
+    def band_hashes(self, signature: Sequence[int]) -> List[int]:
+        """One signed 64-bit bucket id per band."""
+        buckets = []
+        for band in range(self.bands):
+            rows = signature[band * self.rows:(band + 1) * self.rows]
+            digest = hashlib.blake2b(struct.pack(f"<{len(rows)}I", *rows), digest_size=8).digest()
+            buckets.append(int.from_bytes(digest, "little", signed=True))
+        return buckets
+
+    @staticmethod
+    def similarity(a: Iterable[int], b: Iterable[int]) -> float:
+        """Estimated Jaccard similarity of two signatures."""
+        left = np.asarray(list(a))
+        right = np.asarray(list(b))
+        if left.shape != right.shape or not left.size:
+            return 0.0
+        return float(np.mean(left == right))
+
+
+_default_hasher: Optional[MinHasher] = None
+
+
+def get_minhasher() -> MinHasher:
+    global _default_hasher
+    if _default_hasher is None:
+        _default_hasher = MinHasher()
+    return _default_hasher
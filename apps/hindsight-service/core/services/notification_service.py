@@ -35,6 +35,7 @@ from core.services.notifications.dispatcher import NotificationDispatcher
 from core.services.notifications.org_invitation_flow import OrgInvitationFlow
 from core.services.notifications.membership_change_flow import MembershipChangeFlow
 from core.services.notifications.beta_access_flow import BetaAccessFlow
+from core.services.notifications.org_broadcast_flow import OrgBroadcastFlow
 
 
 class NotificationService:
@@ -54,10 +55,11 @@ class NotificationService:
         self._dispatcher = NotificationDispatcher(db, self.email_service)
         # Each flow holds a reference to the facade (self) instead of the
         # dispatcher directly so that test patches on
-        # `service.send_email_notification` propagate at call time.
+        # `service.queue_email_notification` propagate at call time.
         self._org_invitation = OrgInvitationFlow(self, self.email_service)
         self._membership = MembershipChangeFlow(self, self.email_service)
         self._beta_access = BetaAccessFlow(self, self.email_service)
+        self._org_broadcast = OrgBroadcastFlow(self, self.email_service)
 
     # ------------------------------------------------------------------ #
     # Dispatcher delegates — preferences                                  #
@@ -65,12 +67,14 @@ class NotificationService:
 
     def get_user_preferences(self, *a, **kw): return self._dispatcher.get_user_preferences(*a, **kw)
     def set_user_preference(self, *a, **kw): return self._dispatcher.set_user_preference(*a, **kw)
+    def get_preferences_for_users(self, *a, **kw): return self._dispatcher.get_preferences_for_users(*a, **kw)
 
     # ------------------------------------------------------------------ #
     # Dispatcher delegates — in-app notifications                         #
     # ------------------------------------------------------------------ #
 
     def create_notification(self, *a, **kw): return self._dispatcher.create_notification(*a, **kw)
+    def notify_users(self, *a, **kw): return self._dispatcher.notify_users(*a, **kw)
     def get_user_notifications(self, *a, **kw): return self._dispatcher.get_user_notifications(*a, **kw)
     def mark_notification_read(self, *a, **kw): return self._dispatcher.mark_notification_read(*a, **kw)
     def get_unread_count(self, *a, **kw): return self._dispatcher.get_unread_count(*a, **kw)
@@ -84,6 +88,8 @@ class NotificationService:
     def _safe_update_email_status(self, *a, **kw): return self._dispatcher._safe_update_email_status(*a, **kw)
     def _update_email_status_with_session(self, *a, **kw): return self._dispatcher._update_email_status_with_session(*a, **kw)
     async def send_email_notification(self, *a, **kw): return await self._dispatcher.send_email_notification(*a, **kw)
+    def queue_email(self, *a, **kw): return self._dispatcher.queue_email(*a, **kw)
+    def queue_email_notification(self, *a, **kw): return self._dispatcher.queue_email_notification(*a, **kw)
 
     # ------------------------------------------------------------------ #
     # Dispatcher delegates — cleanup                                      #
@@ -117,6 +123,12 @@ class NotificationService:
     def notify_beta_access_acceptance(self, *a, **kw): return self._beta_access.notify_beta_access_acceptance(*a, **kw)
     def notify_beta_access_denial(self, *a, **kw): return self._beta_access.notify_beta_access_denial(*a, **kw)
 
+    # ------------------------------------------------------------------ #
+    # OrgBroadcastFlow delegates                                          #
+    # ------------------------------------------------------------------ #
+
+    def notify_organization_members(self, *a, **kw): return self._org_broadcast.notify_organization_members(*a, **kw)
+
 
 # Convenience function to get a NotificationService instance
 def get_notification_service(db: Session = None) -> NotificationService:
@@ -6,6 +6,7 @@ Public surface:
     OrgInvitationFlow       — org invitation lifecycle
     MembershipChangeFlow    — membership added / role changed / removed
     BetaAccessFlow          — beta access email flows
+    OrgBroadcastFlow        — events addressed to every member of an org
 """
 
 from core.services.notifications.constants import (  # noqa: F401
@@ -30,6 +31,7 @@ from core.services.notifications.dispatcher import NotificationDispatcher
 from core.services.notifications.org_invitation_flow import OrgInvitationFlow
 from core.services.notifications.membership_change_flow import MembershipChangeFlow
 from core.services.notifications.beta_access_flow import BetaAccessFlow
+from core.services.notifications.org_broadcast_flow import OrgBroadcastFlow
 
 __all__ = [
     # Constants
@@ -54,4 +56,5 @@ __all__ = [
     "OrgInvitationFlow",
     "MembershipChangeFlow",
     "BetaAccessFlow",
+    "OrgBroadcastFlow",
 ]
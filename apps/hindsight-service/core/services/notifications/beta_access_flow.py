@@ -21,7 +21,8 @@ class BetaAccessFlow:
     """
     Handles all notification flows for beta access requests.
     These methods are email-only (no in-app notifications), so they do not
-    use the dispatcher's in-app methods.
+    use the dispatcher's in-app methods; their emails are logged without a
+    user and queued on the outbox.
     """
 
     def __init__(self, dispatcher: NotificationDispatcher, email_service=None):
@@ -32,7 +33,7 @@ class BetaAccessFlow:
     # Private helper                                                       #
     # ------------------------------------------------------------------ #
 
-    def _send_direct_email(
+    def _queue_direct_email(
         self,
         to_email: str,
         subject: str,
@@ -40,42 +41,21 @@ class BetaAccessFlow:
         template_context: Dict[str, Any],
     ) -> Dict[str, Any]:
         """
-        Render a template and send directly (no email log entry).
-        Returns a result dict with 'success' and optional 'message_id' / 'error'.
+        Render a template and queue it on the outbox under an email log with
+        no user (the recipient may not have an account yet). The template
+        name doubles as the log's event type.
+        Returns a result dict with 'success', 'queued' and 'email_log_id';
+        render errors propagate to the caller.
         """
-        from inspect import iscoroutinefunction, isawaitable
-
-        result: Dict[str, Any] = {}
         html_content, text_content = self.email_service.render_template(template_name, template_context)
-
-        send_fn = getattr(self.email_service, 'send_email')
-        if iscoroutinefunction(send_fn):
-            import asyncio
-            send_res = asyncio.run(send_fn(
-                to_email=to_email,
-                subject=subject,
-                html_content=html_content,
-                text_content=text_content,
-            ))
-        else:
-            send_res = send_fn(
-                to_email=to_email,
-                subject=subject,
-                html_content=html_content,
-                text_content=text_content,
-            )
-            if isawaitable(send_res):
-                import asyncio
-                send_res = asyncio.run(send_res)
-
-        if send_res.get('success'):
-            result['success'] = True
-            result['message_id'] = send_res.get('message_id')
-        else:
-            result['success'] = False
-            result['error'] = send_res.get('error', 'Unknown error')
-
-        return result
+        email_log = self._dispatcher.create_email_notification_log(
+            notification_id=None,
+            user_id=None,
+            email_address=to_email,
+            event_type=template_name,
+            subject=subject,
+        )
+        return self._dispatcher.queue_email(email_log, html_content, text_content)
 
     # ------------------------------------------------------------------ #
     # Public flow methods                                                  #
@@ -84,7 +64,6 @@ class BetaAccessFlow:
     def notify_beta_access_invitation(self, user_email: str) -> Dict[str, Any]:
         """Send invitation email to request beta access."""
         result: Dict[str, Any] = {}
-        # Skip email notification logging for beta access invitations since no user exists yet
         try:
             try:
                 from core.utils.urls import get_app_base_url
@@ -93,7 +72,7 @@ class BetaAccessFlow:
                 base_url = 'https://app.hindsight.ai'
 
             request_url = f"{base_url}/beta-access/request"
-            result = self._send_direct_email(
+            result = self._queue_direct_email(
                 to_email=user_email,
                 subject="Request Beta Access to Hindsight AI",
                 template_name=TEMPLATE_BETA_ACCESS_INVITATION,
@@ -107,9 +86,8 @@ class BetaAccessFlow:
     def notify_beta_access_request_confirmation(self, user_email: str) -> Dict[str, Any]:
         """Send confirmation email after beta access request."""
         result: Dict[str, Any] = {}
-        # Skip email notification logging for beta access confirmations since user may not exist yet
         try:
-            result = self._send_direct_email(
+            result = self._queue_direct_email(
                 to_email=user_email,
                 subject="Beta Access Request Received",
                 template_name=TEMPLATE_BETA_ACCESS_REQUEST_CONFIRMATION,
@@ -128,7 +106,6 @@ class BetaAccessFlow:
     ) -> Dict[str, Any]:
         """Send notification to admin with accept/deny links."""
         result: Dict[str, Any] = {}
-        # Skip email notification logging for admin notifications
         try:
             from urllib.parse import urlencode
             try:
@@ -158,7 +135,7 @@ class BetaAccessFlow:
                 accept_url = f"{base_url}/beta-access/review/{request_id}?decision=accepted"
                 deny_url = f"{base_url}/beta-access/review/{request_id}?decision=denied"
 
-            result = self._send_direct_email(
+            result = self._queue_direct_email(
                 to_email='ibarz.jean@gmail.com',
                 subject=f"Beta Access Request from {user_email}",
                 template_name=TEMPLATE_BETA_ACCESS_ADMIN_NOTIFICATION,
@@ -179,7 +156,6 @@ class BetaAccessFlow:
     def notify_beta_access_acceptance(self, user_email: str) -> Dict[str, Any]:
         """Send acceptance email to user."""
         result: Dict[str, Any] = {}
-        # Skip email notification logging for beta access acceptance
         try:
             try:
                 from core.utils.urls import get_app_base_url
@@ -188,7 +164,7 @@ class BetaAccessFlow:
                 base_url = 'https://app.hindsight.ai'
 
             login_url = f"{base_url}/login"
-            result = self._send_direct_email(
+            result = self._queue_direct_email(
                 to_email=user_email,
                 subject="Beta Access Granted",
                 template_name=TEMPLATE_BETA_ACCESS_ACCEPTANCE,
@@ -202,9 +178,8 @@ class BetaAccessFlow:
     def notify_beta_access_denial(self, user_email: str, reason: Optional[str] = None) -> Dict[str, Any]:
         """Send denial email to user."""
         result: Dict[str, Any] = {}
-        # Skip email notification logging for beta access denial
         try:
-            result = self._send_direct_email(
+            result = self._queue_direct_email(
                 to_email=user_email,
                 subject="Beta Access Request Update",
                 template_name=TEMPLATE_BETA_ACCESS_DENIAL,
@@ -0,0 +1,157 @@
+"""
+NotificationChangeListener: pushes notification changes to stream subscribers.
+
+A trigger on ``notifications`` runs ``pg_notify('notification_changes',
+user_id)`` for every insert, read/expiry update and delete. One listener per
+process holds a dedicated autocommit connection with ``LISTEN`` on that
+channel in a daemon thread and wakes the ``asyncio.Event`` of every
+subscriber for the affected user, so ``GET /notifications/stream`` only
+re-reads the unread count when something changed. The listener starts on
+the first subscription and reconnects after
+``NOTIFICATION_LISTEN_RECONNECT_SECONDS`` if the connection drops; while it
+is not listening (or on databases without LISTEN, e.g. SQLite) subscribers
+fall back to re-reading on every heartbeat.
+"""
+
+import asyncio
+import logging
+import os
+import select
+import threading
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_CHANNEL = "notification_changes"
+NOTIFICATION_LISTEN_RECONNECT_SECONDS = float(os.getenv("NOTIFICATION_LISTEN_RECONNECT_SECONDS", 5))
+# Comment line sent to idle streams so proxies keep the connection open.
+NOTIFICATION_STREAM_HEARTBEAT_SECONDS = float(os.getenv("NOTIFICATION_STREAM_HEARTBEAT_SECONDS", 15))
+# Streams end after this long; EventSource reconnects on its own.
+NOTIFICATION_STREAM_MAX_SECONDS = float(os.getenv("NOTIFICATION_STREAM_MAX_SECONDS", 300))
+# How often the listener thread checks for shutdown while idle.
+_POLL_SECONDS = 1.0
+
+
+class NotificationChangeListener:
+    """Process-wide LISTEN connection fanning out to per-user subscribers."""
+
+    def __init__(self, channel: str = NOTIFICATION_CHANNEL, reconnect_seconds: float = NOTIFICATION_LISTEN_RECONNECT_SECONDS):
+        self.channel = channel
+        self.reconnect_seconds = reconnect_seconds
+        self._subscribers: Dict[str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Event]]] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._listening = threading.Event()
+
+    @property
+    def listening(self) -> bool:
+        """True while LISTEN is active; subscribers poll on heartbeat otherwise."""
+        return self._listening.is_set()
+
+    def subscribe(self, user_id: uuid.UUID) -> asyncio.Event:
+        """Register the running loop for changes to ``user_id``'s notifications."""
+        wakeup = asyncio.Event()
+        with self._lock:
+            self._subscribers.setdefault(str(user_id), []).append((asyncio.get_running_loop(), wakeup))
+        self.start()
+        return wakeup
+
+    def unsubscribe(self, user_id: uuid.UUID, wakeup: asyncio.Event) -> None:
+        with self._lock:
+            entries = self._subscribers.get(str(user_id), [])
+            entries[:] = [entry for entry in entries if entry[1] is not wakeup]
+            if not entries:
+                self._subscribers.pop(str(user_id), None)
+
+    def publish(self, user_id: Optional[str] = None) -> None:
+        """Wake every subscriber of ``user_id`` (all when None); safe from any thread."""
+        with self._lock:
+            if user_id is None:
+                entries = [entry for user_entries in self._subscribers.values() for entry in user_entries]
+            else:
+                entries = list(self._subscribers.get(user_id, ()))
+        for loop, wakeup in entries:
+            try:
+                loop.call_soon_threadsafe(wakeup.set)
+            except RuntimeError:
+                # The subscriber's loop closed; it unsubscribes on its way out.
+                pass
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="notification-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _connect(self):
+        """A dedicated driver connection detached from the pool, or None without LISTEN support."""
+        from core.db import database
+
+        engine = database.engine
+        if engine.dialect.name != "postgresql":
+            return None
+        pooled = engine.raw_connection()
+        connection = pooled.driver_connection
+        pooled.detach()
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {self.channel}")
+        return connection
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                connection = self._connect()
+            except Exception as exc:
+                logger.warning("notification listener: connect failed: %s", exc)
+                self._stop.wait(self.reconnect_seconds)
+                continue
+            if connection is None:
+                logger.info("notification listener: database has no LISTEN/NOTIFY; streams will poll")
+                return
+            # Changes made while disconnected were not delivered; re-read everywhere.
+            self.publish()
+            self._listening.set()
+            try:
+                self._listen(connection)
+            except Exception as exc:
+                logger.warning("notification listener: connection lost: %s", exc)
+                self._stop.wait(self.reconnect_seconds)
+            finally:
+                self._listening.clear()
+                try:
+                    connection.close()
+                except Exception:
+                    pass
+
+    def _listen(self, connection) -> None:
+        while not self._stop.is_set():
+            readable, _, _ = select.select([connection], [], [], _POLL_SECONDS)
+            if not readable:
+                continue
+            connection.poll()
+            user_ids = set()
+            while connection.notifies:
+                user_ids.add(connection.notifies.pop(0).payload)
+            for user_id in user_ids:
+                self.publish(user_id)
+
+
+_notification_change_listener = NotificationChangeListener()
+
+
+def get_notification_change_listener() -> NotificationChangeListener:
+    return _notification_change_listener
+
+
+def stop_notification_change_listener(timeout: float = 5.0) -> None:
+    _notification_change_listener.stop(timeout)
@@ -1,16 +1,41 @@
 """
 NotificationDispatcher: in-app notification persistence, user preferences,
-and email log management.
+email log management and queueing emails on the outbox.
 """
 
+import os
 import uuid
 from datetime import datetime, timedelta, UTC
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Sequence, Tuple
 from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy import and_, desc
+from sqlalchemy import and_, delete, desc, insert, select
 
 from core.db import models
 
+# Rows removed per DELETE/commit by cleanup_expired_notifications.
+NOTIFICATION_CLEANUP_BATCH_SIZE = int(os.getenv("NOTIFICATION_CLEANUP_BATCH_SIZE", 1000))
+
+
+def _default_preferences() -> Dict[str, Dict[str, bool]]:
+    """Default preferences for all known event types."""
+    from core.services.notifications.constants import (
+        EVENT_ORG_INVITATION,
+        EVENT_ORG_MEMBERSHIP_ADDED,
+        EVENT_ORG_MEMBERSHIP_REMOVED,
+        EVENT_ORG_ROLE_CHANGED,
+        EVENT_ORG_INVITE_ACCEPTED,
+        EVENT_ORG_INVITE_DECLINED,
+    )
+
+    return {
+        EVENT_ORG_INVITATION: {'email_enabled': True, 'in_app_enabled': True},
+        EVENT_ORG_MEMBERSHIP_ADDED: {'email_enabled': True, 'in_app_enabled': True},
+        EVENT_ORG_MEMBERSHIP_REMOVED: {'email_enabled': True, 'in_app_enabled': True},
+        EVENT_ORG_ROLE_CHANGED: {'email_enabled': True, 'in_app_enabled': True},
+        EVENT_ORG_INVITE_ACCEPTED: {'email_enabled': True, 'in_app_enabled': True},
+        EVENT_ORG_INVITE_DECLINED: {'email_enabled': False, 'in_app_enabled': True},
+    }
+
 
 class NotificationDispatcher:
     """
@@ -47,28 +72,11 @@ class NotificationDispatcher:
         Returns:
             Dict with event_type as key and {'email_enabled': bool, 'in_app_enabled': bool} as value
         """
-        from core.services.notifications.constants import (
-            EVENT_ORG_INVITATION,
-            EVENT_ORG_MEMBERSHIP_ADDED,
-            EVENT_ORG_MEMBERSHIP_REMOVED,
-            EVENT_ORG_ROLE_CHANGED,
-            EVENT_ORG_INVITE_ACCEPTED,
-            EVENT_ORG_INVITE_DECLINED,
-        )
-
         preferences = self.db.query(models.UserNotificationPreference).filter(
             models.UserNotificationPreference.user_id == user_id
         ).all()
 
-        # Default preferences for all event types
-        default_preferences = {
-            EVENT_ORG_INVITATION: {'email_enabled': True, 'in_app_enabled': True},
-            EVENT_ORG_MEMBERSHIP_ADDED: {'email_enabled': True, 'in_app_enabled': True},
-            EVENT_ORG_MEMBERSHIP_REMOVED: {'email_enabled': True, 'in_app_enabled': True},
-            EVENT_ORG_ROLE_CHANGED: {'email_enabled': True, 'in_app_enabled': True},
-            EVENT_ORG_INVITE_ACCEPTED: {'email_enabled': True, 'in_app_enabled': True},
-            EVENT_ORG_INVITE_DECLINED: {'email_enabled': False, 'in_app_enabled': True},
-        }
+        default_preferences = _default_preferences()
 
         # Override with user's actual preferences
         for pref in preferences:
@@ -80,6 +88,33 @@ class NotificationDispatcher:
 
         return default_preferences
 
+    def get_preferences_for_users(
+        self,
+        user_ids: Sequence[uuid.UUID],
+        event_type: str
+    ) -> Dict[uuid.UUID, Dict[str, bool]]:
+        """
+        Preferences of many users for one event type, in a single query.
+
+        Users without a stored preference get the event type's default
+        (both channels enabled for unknown event types).
+        """
+        default = dict(_default_preferences().get(event_type, {'email_enabled': True, 'in_app_enabled': True}))
+        preferences = {user_id: dict(default) for user_id in user_ids}
+        if not preferences:
+            return preferences
+        rows = self.db.query(
+            models.UserNotificationPreference.user_id,
+            models.UserNotificationPreference.email_enabled,
+            models.UserNotificationPreference.in_app_enabled,
+        ).filter(
+            models.UserNotificationPreference.event_type == event_type,
+            models.UserNotificationPreference.user_id.in_(list(preferences)),
+        )
+        for user_id, email_enabled, in_app_enabled in rows:
+            preferences[user_id] = {'email_enabled': email_enabled, 'in_app_enabled': in_app_enabled}
+        return preferences
+
     def set_user_preference(
         self,
         user_id: uuid.UUID,
@@ -164,6 +199,108 @@ class NotificationDispatcher:
 
         return notification
 
+    def notify_users(
+        self,
+        recipients: Sequence[Tuple[uuid.UUID, Optional[str]]],
+        event_type: str,
+        title: str,
+        message: str,
+        action_url: Optional[str] = None,
+        action_text: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        expires_days: int = 30,
+        email_subject: Optional[str] = None,
+        template_name: Optional[str] = None,
+        template_context: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, int]:
+        """
+        Notify many users of the same event in a fixed number of statements.
+
+        Preferences are loaded in one query, in-app notifications and email
+        logs are written with multi-row INSERTs, and everything commits
+        once. The email (when ``template_name`` and ``email_subject`` are
+        given) is rendered once and queued on the outbox for every
+        recipient with an address and email enabled.
+
+        Args:
+            recipients: (user_id, email_address) pairs; duplicates are ignored
+
+        Returns:
+            Counts: 'recipients', 'in_app_notifications', 'emails_queued', 'emails_failed'
+        """
+        addresses: Dict[uuid.UUID, Optional[str]] = {}
+        for user_id, email_address in recipients:
+            addresses.setdefault(user_id, email_address)
+        counts = {'recipients': len(addresses), 'in_app_notifications': 0, 'emails_queued': 0, 'emails_failed': 0}
+        if not addresses:
+            return counts
+
+        preferences = self.get_preferences_for_users(list(addresses), event_type)
+        now = datetime.now(UTC)
+
+        notification_ids: Dict[uuid.UUID, uuid.UUID] = {}
+        notification_rows = []
+        for user_id in addresses:
+            if preferences[user_id]['in_app_enabled']:
+                notification_ids[user_id] = uuid.uuid4()
+                notification_rows.append({
+                    'id': notification_ids[user_id],
+                    'user_id': user_id,
+                    'event_type': event_type,
+                    'title': title,
+                    'message': message,
+                    'action_url': action_url,
+                    'action_text': action_text,
+                    'metadata_json': metadata,
+                    'is_read': False,
+                    'created_at': now,
+                    'expires_at': now + timedelta(days=expires_days),
+                })
+        if notification_rows:
+            self.db.execute(insert(models.Notification), notification_rows)
+            counts['in_app_notifications'] = len(notification_rows)
+
+        email_rows = []
+        if email_subject and template_name:
+            email_recipients = [
+                user_id for user_id, email_address in addresses.items()
+                if email_address and preferences[user_id]['email_enabled']
+            ]
+            status, html_content, text_content, error_message = 'pending', None, None, None
+            if email_recipients:
+                try:
+                    html_content, text_content = self.email_service.render_template(
+                        template_name,
+                        template_context or {}
+                    )
+                except Exception as e:
+                    status, error_message = 'failed', f"Template render failed: {str(e)}"
+            for user_id in email_recipients:
+                email_rows.append({
+                    'id': uuid.uuid4(),
+                    'notification_id': notification_ids.get(user_id),
+                    'user_id': user_id,
+                    'email_address': addresses[user_id],
+                    'event_type': event_type,
+                    'subject': email_subject,
+                    'status': status,
+                    'error_message': error_message,
+                    'body_html': html_content,
+                    'body_text': text_content,
+                    'attempts': 0,
+                    'next_attempt_at': now if status == 'pending' else None,
+                    'created_at': now,
+                })
+            if email_rows:
+                self.db.execute(insert(models.EmailNotificationLog), email_rows)
+                counts['emails_queued' if status == 'pending' else 'emails_failed'] = len(email_rows)
+
+        self.db.commit()
+        if counts['emails_queued']:
+            from core.services.notifications.outbox import wake_email_outbox
+            wake_email_outbox()
+        return counts
+
     def get_user_notifications(
         self,
         user_id: uuid.UUID,
@@ -226,7 +363,7 @@ class NotificationDispatcher:
     def create_email_notification_log(
         self,
         notification_id: Optional[uuid.UUID],
-        user_id: uuid.UUID,
+        user_id: Optional[uuid.UUID],
         email_address: str,
         event_type: str,
         subject: str,
@@ -371,6 +508,56 @@ class NotificationDispatcher:
         db_session.commit()
         return True
 
+    def queue_email(
+        self,
+        email_log: models.EmailNotificationLog,
+        html_content: str,
+        text_content: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Queue a rendered email on the outbox and wake the local sender.
+
+        Delivery, retries and the final status are handled by
+        EmailOutboxSender; the caller never waits on the provider.
+        """
+        from core.db.repositories.email_outbox import enqueue_email
+        from core.services.notifications.outbox import wake_email_outbox
+
+        enqueue_email(self.db, email_log, html_content, text_content)
+        wake_email_outbox()
+        return {
+            'success': True,
+            'queued': True,
+            'email_log_id': email_log.id
+        }
+
+    def queue_email_notification(
+        self,
+        email_log: models.EmailNotificationLog,
+        template_name: str,
+        template_context: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Render an email template and queue the result on the outbox.
+
+        A render failure marks the log 'failed' and is returned, like
+        send_email_notification.
+        """
+        try:
+            html_content, text_content = self.email_service.render_template(
+                template_name,
+                template_context
+            )
+        except Exception as e:
+            error_msg = f"Template render failed: {str(e)}"
+            self.update_email_status(email_log.id, 'failed', error_message=error_msg)
+            return {
+                'success': False,
+                'email_log_id': email_log.id,
+                'error': error_msg
+            }
+        return self.queue_email(email_log, html_content, text_content)
+
     async def send_email_notification(
         self,
         email_log: models.EmailNotificationLog,
@@ -442,19 +629,35 @@ class NotificationDispatcher:
 
     # === Cleanup Methods ===
 
-    def cleanup_expired_notifications(self) -> int:
+    def cleanup_expired_notifications(self, batch_size: int = NOTIFICATION_CLEANUP_BATCH_SIZE) -> int:
         """
         Remove notifications that have exceeded their expiration date.
+
+        Deletes in chunks of ``batch_size`` rows, oldest expiry first, and
+        commits after each chunk so locks and WAL stay bounded. Rows locked
+        by a concurrent cleanup are skipped rather than waited on, so a chunk
+        can come back short while expired rows remain; cleanup stops only
+        once a chunk deletes nothing. Rows still locked then are left for
+        the next run.
         Returns count of cleaned up notifications.
         """
         cutoff_date = datetime.now(UTC)
-
-        expired_notifications = self.db.query(models.Notification).filter(
-            models.Notification.expires_at <= cutoff_date
-        )
-
-        count = expired_notifications.count()
-        expired_notifications.delete(synchronize_session=False)
-        self.db.commit()
-
-        return count
+        notification = models.Notification
+        total = 0
+        while True:
+            chunk = (
+                select(notification.id)
+                .where(notification.expires_at <= cutoff_date)
+                .order_by(notification.expires_at)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            deleted = self.db.execute(
+                delete(notification)
+                .where(notification.id.in_(chunk.scalar_subquery()))
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            self.db.commit()
+            total += deleted or 0
+            if not deleted:
+                return total
@@ -2,12 +2,11 @@
 MembershipChangeFlow: handles notifications for organization membership changes
 (added, role changed, removed).
 
-Nested closures from the original notify_membership_added, notify_role_changed,
-and notify_membership_removed have been promoted to private methods on this class.
+Emails are rendered here and queued on the outbox, so a membership change
+never waits on the email provider.
 """
 
 import uuid
-import threading
 from datetime import datetime
 from typing import Optional, Dict, Any
 
@@ -31,114 +30,6 @@ class MembershipChangeFlow:
         self._dispatcher = dispatcher
         self.email_service = email_service
 
-    # ------------------------------------------------------------------ #
-    # Private helpers (promoted from nested closures)                     #
-    # ------------------------------------------------------------------ #
-
-    def _update_email_status(
-        self,
-        email_log_id: uuid.UUID,
-        status: str,
-        message_id: Optional[str] = None,
-        error: Optional[str] = None,
-    ) -> None:
-        """Thin wrapper delegating to dispatcher._safe_update_email_status."""
-        self._dispatcher._safe_update_email_status(
-            email_log_id,
-            status,
-            provider_message_id=message_id,
-            error_message=error,
-        )
-
-    def _send_email_for_membership_added(
-        self,
-        email_log_id: uuid.UUID,
-        email_address: str,
-        subject: str,
-        html: str,
-        text: str,
-    ) -> None:
-        """
-        Background-thread sender for notify_membership_added.
-        Promoted from the nested _send closure in the original implementation.
-        """
-        import asyncio
-        try:
-            send_res = asyncio.run(self.email_service.send_email(
-                to_email=email_address,
-                subject=subject,
-                html_content=html,
-                text_content=text
-            ))
-            if send_res.get('success'):
-                self._update_email_status(email_log_id, 'sent', message_id=send_res.get('message_id'))
-            else:
-                self._update_email_status(email_log_id, 'failed', error=send_res.get('error'))
-        except Exception as e:
-            self._update_email_status(email_log_id, 'failed', error=str(e))
-
-    def _send_email_for_role_changed(
-        self,
-        email_log_id: uuid.UUID,
-        email_address: str,
-        subject: str,
-        html: str,
-        text: str,
-    ) -> None:
-        """
-        Background-thread sender for notify_role_changed.
-        Promoted from the nested _send closure in the original implementation.
-        """
-        import asyncio
-        try:
-            send_res = asyncio.run(self.email_service.send_email(
-                to_email=email_address,
-                subject=subject,
-                html_content=html,
-                text_content=text
-            ))
-            if send_res.get('success'):
-                self._dispatcher._safe_update_email_status(
-                    email_log_id, 'sent', provider_message_id=send_res.get('message_id')
-                )
-            else:
-                self._dispatcher._safe_update_email_status(
-                    email_log_id, 'failed', error_message=send_res.get('error')
-                )
-        except Exception as e:
-            self._dispatcher._safe_update_email_status(email_log_id, 'failed', error_message=str(e))
-
-    def _send_email_for_membership_removed(
-        self,
-        email_log_id: uuid.UUID,
-        email_address: str,
-        subject: str,
-        html: str,
-        text: str,
-    ) -> None:
-        """
-        Background-thread sender for notify_membership_removed.
-        Promoted from the nested _send closure in the original implementation.
-        """
-        import asyncio
-        try:
-            send_res = asyncio.run(self.email_service.send_email(
-                to_email=email_address,
-                subject=subject,
-                html_content=html,
-                text_content=text
-            ))
-            if send_res.get('success'):
-                self._dispatcher._safe_update_email_status(
-                    email_log_id, 'sent', provider_message_id=send_res.get('message_id')
-                )
-            else:
-                self._dispatcher._safe_update_email_status(
-                    email_log_id, 'failed', error_message=send_res.get('error')
-                )
-        except Exception as e:
-            self._dispatcher._safe_update_email_status(email_log_id, 'failed', error_message=str(e))
-
     # ------------------------------------------------------------------ #
     # Public flow methods                                                 #
     # ------------------------------------------------------------------ #
@@ -197,7 +88,7 @@ class MembershipChangeFlow:
             )
             result['email_log'] = email_log
 
-            # Send the email in background so API response isn't blocked.
+            # Queue the email so the API response isn't blocked on delivery.
             try:
                 if not self.email_service:
                     # If no email service (rare in tests), mark as failed but continue
@@ -226,15 +117,7 @@ class MembershipChangeFlow:
                         )
                         return result
 
-                    # Send in background thread using promoted private method
-                    t = threading.Thread(
-                        target=self._send_email_for_membership_added,
-                        args=(email_log.id, email_log.email_address, email_log.subject, html, text),
-                        daemon=True,
-                    )
-                    t.start()
-
-                    result['email_result'] = {'dispatched_in_background': True}
+                    result['email_result'] = self._dispatcher.queue_email(email_log, html, text)
             except Exception as e:
                 self._dispatcher._safe_update_email_status(
                     email_log.id, 'failed', error_message=f"Email dispatch error: {str(e)}"
@@ -306,15 +189,7 @@ class MembershipChangeFlow:
                     )
                     return result
 
-                # Send in background thread using promoted private method
-                t = threading.Thread(
-                    target=self._send_email_for_role_changed,
-                    args=(log.id, log.email_address, log.subject, html, text),
-                    daemon=True,
-                )
-                t.start()
-
-                result['email_result'] = {'dispatched_in_background': True}
+                result['email_result'] = self._dispatcher.queue_email(log, html, text)
             except Exception as e:
                 self._dispatcher._safe_update_email_status(
                     log.id, 'failed', error_message=f"Email dispatch error: {str(e)}"
@@ -377,15 +252,7 @@ class MembershipChangeFlow:
                     )
                     return result
 
-                # Send in background thread using promoted private method
-                t = threading.Thread(
-                    target=self._send_email_for_membership_removed,
-                    args=(log.id, log.email_address, log.subject, html, text),
-                    daemon=True,
-                )
-                t.start()
-
-                result['email_result'] = {'dispatched_in_background': True}
+                result['email_result'] = self._dispatcher.queue_email(log, html, text)
             except Exception as e:
                 self._dispatcher._safe_update_email_status(
                     log.id, 'failed', error_message=f"Email dispatch error: {str(e)}"
@@ -0,0 +1,64 @@
+"""
+OrgBroadcastFlow: notifies every member of an organization of one event.
+
+Members are loaded in one query and handed to NotificationDispatcher.notify_users,
+so a broadcast costs a fixed number of statements whatever the organization's size.
+"""
+
+import uuid
+from typing import Optional, Dict, Any, Iterable
+
+from core.db import models
+from core.services.notifications.dispatcher import NotificationDispatcher
+
+
+class OrgBroadcastFlow:
+    """
+    Handles notification flows addressed to a whole organization.
+    """
+
+    def __init__(self, dispatcher: NotificationDispatcher, email_service=None):
+        self._dispatcher = dispatcher
+        self.email_service = email_service
+
+    def notify_organization_members(
+        self,
+        organization_id: uuid.UUID,
+        event_type: str,
+        title: str,
+        message: str,
+        exclude_user_ids: Optional[Iterable[uuid.UUID]] = None,
+        action_url: Optional[str] = None,
+        action_text: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        email_subject: Optional[str] = None,
+        template_name: Optional[str] = None,
+        template_context: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, int]:
+        """
+        Notify all members of an organization, honouring each member's preferences.
+
+        Returns:
+            Counts from notify_users: 'recipients', 'in_app_notifications',
+            'emails_queued', 'emails_failed'
+        """
+        excluded = set(exclude_user_ids or ())
+        members = self._dispatcher.db.query(models.User.id, models.User.email).join(
+            models.OrganizationMembership,
+            models.OrganizationMembership.user_id == models.User.id,
+        ).filter(
+            models.OrganizationMembership.organization_id == organization_id
+        ).all()
+
+        return self._dispatcher.notify_users(
+            [(user_id, email) for user_id, email in members if user_id not in excluded],
+            event_type,
+            title,
+            message,
+            action_url=action_url,
+            action_text=action_text,
+            metadata={'organization_id': str(organization_id), **(metadata or {})},
+            email_subject=email_subject,
+            template_name=template_name,
+            template_context=template_context,
+        )
@@ -123,7 +123,7 @@ class OrgInvitationFlow:
             except Exception:
                 role_value = str(role)
 
-            # Send the actual email
+            # Queue the email on the outbox
             try:
                 template_context = {
                     'organization_name': organization_name,
@@ -137,17 +137,14 @@ class OrgInvitationFlow:
                     'role': role_value,
                 }
 
-                # Prefer using the async helper so tests can patch `send_email_notification` and
-                # receive the template_context. In normal operation this will render and send
-                # via the configured transactional email service.
+                # Go through the facade so tests can patch `queue_email_notification` and
+                # receive the template_context. The outbox sender delivers the rendered email.
                 try:
-                    import asyncio
-                    send_res = asyncio.run(
-                        self._dispatcher.send_email_notification(email_log, TEMPLATE_ORG_INVITATION, template_context)
+                    result['email_result'] = self._dispatcher.queue_email_notification(
+                        email_log, TEMPLATE_ORG_INVITATION, template_context
                     )
-                    result['email_result'] = send_res
                 except Exception as e:
-                    # If the send helper fails, mark email as failed but continue
+                    # If queueing fails, mark email as failed but continue
                     try:
                         self._dispatcher.update_email_status(email_log.id, 'failed', error_message=str(e))
                     except Exception:
@@ -198,21 +195,11 @@ class OrgInvitationFlow:
             )
             result['email_log'] = log
             try:
-                import asyncio
                 html = (
                     f"<p>{invitee_email} accepted your invitation to join <strong>{organization_name}</strong>.</p>"
                 )
                 text = f"{invitee_email} accepted your invitation to join {organization_name}."
-                send_res = asyncio.run(self.email_service.send_email(
-                    to_email=inviter_email,
-                    subject=f"{organization_name}: Invitation accepted",
-                    html_content=html,
-                    text_content=text,
-                ))
-                if send_res.get('success'):
-                    self._dispatcher.update_email_status(log.id, 'sent', provider_message_id=send_res.get('message_id'))
-                else:
-                    self._dispatcher.update_email_status(log.id, 'failed', error_message=send_res.get('error'))
+                result['email_result'] = self._dispatcher.queue_email(log, html, text)
             except Exception as e:
                 self._dispatcher.update_email_status(log.id, 'failed', error_message=str(e))
 
@@ -252,21 +239,11 @@ class OrgInvitationFlow:
             )
             result['email_log'] = log
             try:
-                import asyncio
                 html = (
                     f"<p>{invitee_email} declined the invitation to join <strong>{organization_name}</strong>.</p>"
                 )
                 text = f"{invitee_email} declined the invitation to join {organization_name}."
-                send_res = asyncio.run(self.email_service.send_email(
-                    to_email=inviter_email,
-                    subject=f"{organization_name}: Invitation declined",
-                    html_content=html,
-                    text_content=text,
-                ))
-                if send_res.get('success'):
-                    self._dispatcher.update_email_status(log.id, 'sent', provider_message_id=send_res.get('message_id'))
-                else:
-                    self._dispatcher.update_email_status(log.id, 'failed', error_message=send_res.get('error'))
+                result['email_result'] = self._dispatcher.queue_email(log, html, text)
             except Exception as e:
                 self._dispatcher.update_email_status(log.id, 'failed', error_message=str(e))
 
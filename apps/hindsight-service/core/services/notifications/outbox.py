@@ -0,0 +1,217 @@
+"""
+EmailOutboxSender: delivers the emails queued in ``email_notification_logs``.
+
+Flows render an email, queue it with ``NotificationDispatcher.queue_email``
+and return without waiting on the provider. The sender runs one long-lived
+event loop on a daemon thread with ``EMAIL_OUTBOX_CONCURRENCY`` sender
+tasks. Each task claims a batch of due rows and hands the whole batch to the
+transport's ``send_batch``, so a batch shares one SMTP connection (or one
+Resend batch request) instead of opening one per email. Database work runs
+in worker threads so the synchronous SQLAlchemy I/O never blocks the loop.
+
+Failed sends are retried with exponential backoff; rows that still fail
+after ``EMAIL_OUTBOX_MAX_ATTEMPTS`` are dead-lettered. Idle tasks poll every
+``EMAIL_OUTBOX_POLL_SECONDS`` and are woken early by :func:`wake_email_outbox`
+after a local enqueue; rows queued on other replicas are picked up on the
+next poll. ``core.workers.email_outbox_worker`` runs the same sender
+outside the API process.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from core.db.repositories.email_outbox import claim_outbox_emails, record_outbox_results
+
+logger = logging.getLogger(__name__)
+
+# 'transactional' sends through the configured provider (Resend, SendGrid,
+# Mailgun); 'smtp' sends through EmailService (SMTP_HOST/SMTP_PORT).
+EMAIL_OUTBOX_TRANSPORT = os.getenv("EMAIL_OUTBOX_TRANSPORT", "transactional").lower()
+# Sender tasks on the outbox event loop; 0 disables the in-process sender.
+EMAIL_OUTBOX_CONCURRENCY = int(os.getenv("EMAIL_OUTBOX_CONCURRENCY", 2))
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", 50))
+EMAIL_OUTBOX_POLL_SECONDS = float(os.getenv("EMAIL_OUTBOX_POLL_SECONDS", 5))
+# A claimed row stays hidden from other senders this long.
+EMAIL_OUTBOX_LEASE_SECONDS = float(os.getenv("EMAIL_OUTBOX_LEASE_SECONDS", 300))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", 5))
+EMAIL_OUTBOX_BACKOFF_BASE_SECONDS = float(os.getenv("EMAIL_OUTBOX_BACKOFF_BASE_SECONDS", 30))
+EMAIL_OUTBOX_BACKOFF_MAX_SECONDS = float(os.getenv("EMAIL_OUTBOX_BACKOFF_MAX_SECONDS", 3600))
+
+
+def get_outbox_transport():
+    """The email service selected by ``EMAIL_OUTBOX_TRANSPORT``."""
+    if EMAIL_OUTBOX_TRANSPORT == "smtp":
+        from core.services.email_service import get_email_service
+        return get_email_service()
+    from core.services.transactional_email_service import get_transactional_email_service
+    return get_transactional_email_service()
+
+
+async def send_outbox_batch(transport, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Send ``messages`` through ``transport``, batched when it supports it."""
+    send_batch = getattr(transport, "send_batch", None)
+    if send_batch is not None:
+        return await send_batch(messages)
+    results = []
+    for message in messages:
+        try:
+            results.append(await transport.send_email(**message))
+        except Exception as exc:
+            results.append({"success": False, "error": str(exc)})
+    return results
+
+
+class EmailOutboxSender:
+    """Long-lived async sender pool draining the email outbox."""
+
+    def __init__(
+        self,
+        transport=None,
+        *,
+        session_factory: Optional[Callable[[], Any]] = None,
+        concurrency: int = EMAIL_OUTBOX_CONCURRENCY,
+        batch_size: int = EMAIL_OUTBOX_BATCH_SIZE,
+        poll_seconds: float = EMAIL_OUTBOX_POLL_SECONDS,
+        lease_seconds: float = EMAIL_OUTBOX_LEASE_SECONDS,
+        max_attempts: int = EMAIL_OUTBOX_MAX_ATTEMPTS,
+        backoff_base_seconds: float = EMAIL_OUTBOX_BACKOFF_BASE_SECONDS,
+        backoff_max_seconds: float = EMAIL_OUTBOX_BACKOFF_MAX_SECONDS,
+    ):
+        self._transport = transport
+        self._session_factory = session_factory
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stop = threading.Event()
+
+    @property
+    def transport(self):
+        if self._transport is None:
+            self._transport = get_outbox_transport()
+        return self._transport
+
+    def _session(self):
+        if self._session_factory is not None:
+            return self._session_factory()
+        from core.db.database import SessionLocal
+        return SessionLocal()
+
+    def _claim(self) -> List[Dict[str, Any]]:
+        db = self._session()
+        try:
+            return claim_outbox_emails(db, self.batch_size, self.lease_seconds)
+        finally:
+            db.close()
+
+    def _record(self, results) -> Dict[str, int]:
+        db = self._session()
+        try:
+            return record_outbox_results(
+                db,
+                results,
+                max_attempts=self.max_attempts,
+                backoff_base_seconds=self.backoff_base_seconds,
+                backoff_max_seconds=self.backoff_max_seconds,
+            )
+        finally:
+            db.close()
+
+    async def drain_once(self) -> int:
+        """Claim, send and record one batch. Returns the number of rows claimed."""
+        claimed = await asyncio.to_thread(self._claim)
+        if not claimed:
+            return 0
+        messages = [
+            {
+                "to_email": row["email_address"],
+                "subject": row["subject"],
+                "html_content": row["body_html"] or "",
+                "text_content": row["body_text"],
+            }
+            for row in claimed
+        ]
+        try:
+            results = await send_outbox_batch(self.transport, messages)
+        except Exception as exc:
+            results = [{"success": False, "error": str(exc)} for _ in claimed]
+        if len(results) < len(claimed):
+            results = list(results) + [{"success": False, "error": "No send result"}] * (len(claimed) - len(results))
+        counts = await asyncio.to_thread(self._record, [(row["id"], result) for row, result in zip(claimed, results)])
+        logger.info("email outbox: batch of %d (%s)", len(claimed), counts)
+        return len(claimed)
+
+    async def _sender_task(self, index: int) -> None:
+        while not self._stop.is_set():
+            try:
+                claimed = await self.drain_once()
+            except Exception as exc:  # pragma: no cover - defensive logging
+                logger.error("email outbox sender %d: %s", index, exc)
+                claimed = 0
+            if claimed:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def run(self) -> None:
+        """Run the sender tasks until :meth:`stop` is called."""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        await asyncio.gather(*(self._sender_task(index) for index in range(max(1, self.concurrency))))
+
+    def start(self) -> None:
+        if self._thread is not None or self.concurrency <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=lambda: asyncio.run(self.run()), name="email-outbox", daemon=True)
+        self._thread.start()
+        logger.info("email outbox: started sender with %d tasks", self.concurrency)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop after the in-flight batches; their rows are re-claimed after the lease if unrecorded."""
+        self._stop.set()
+        self.wake()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+        self._loop = None
+
+    def wake(self) -> None:
+        """Wake idle sender tasks; safe to call from any thread."""
+        loop, wakeup = self._loop, self._wakeup
+        if loop is None or wakeup is None or loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(wakeup.set)
+        except RuntimeError:
+            # The loop closed between the check and the call.
+            pass
+
+
+_email_outbox_sender = EmailOutboxSender()
+
+
+def start_email_outbox() -> None:
+    """Start this process's outbox sender (no-op when EMAIL_OUTBOX_CONCURRENCY=0)."""
+    _email_outbox_sender.start()
+
+
+def stop_email_outbox(timeout: float = 10.0) -> None:
+    _email_outbox_sender.stop(timeout)
+
+
+def wake_email_outbox() -> None:
+    """Nudge the local sender after a row was queued and committed."""
+    _email_outbox_sender.wake()
@@ -6,10 +6,18 @@ import json
 import logging
 import os
 import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from dataclasses import dataclass, field
-from typing import Any, Dict, Iterable, List, Optional, Set
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from core.metrics import QUERY_EXPANSION_DURATION
+
 logger = logging.getLogger(__name__)
 
 
@@ -82,6 +90,12 @@ class QueryExpansionConfig:
     llm_temperature: float = 0.0
     llm_max_tokens: int = 64
     llm_timeout_seconds: float = 5.0
+    # How long a search waits for the LLM before going ahead with the
+    # rule-based variants; the call keeps running and fills the cache.
+    llm_budget_seconds: float = 0.5
+    llm_cache_ttl_seconds: int = 3600
+    llm_cache_max_entries: int = 1024
+    llm_workers: int = 2
 
     @classmethod
     def from_environment(cls) -> "QueryExpansionConfig":
@@ -98,6 +112,10 @@ class QueryExpansionConfig:
             llm_temperature=_env_float("QUERY_EXPANSION_LLM_TEMPERATURE", 0.0),
             llm_max_tokens=_env_int("QUERY_EXPANSION_LLM_MAX_TOKENS", 64),
             llm_timeout_seconds=_env_float("QUERY_EXPANSION_LLM_TIMEOUT_SECONDS", 5.0),
+            llm_budget_seconds=_env_float("QUERY_EXPANSION_LLM_BUDGET_SECONDS", 0.5),
+            llm_cache_ttl_seconds=_env_int("QUERY_EXPANSION_LLM_CACHE_TTL_SECONDS", 3600),
+            llm_cache_max_entries=_env_int("QUERY_EXPANSION_LLM_CACHE_MAX_ENTRIES", 1024),
+            llm_workers=_env_int("QUERY_EXPANSION_LLM_WORKERS", 2),
         )
 
 
@@ -107,6 +125,9 @@ class QueryExpansionResult:
     expanded_queries: List[str] = field(default_factory=list)
     applied_steps: List[Dict[str, Any]] = field(default_factory=list)
     disabled_reason: Optional[str] = None
+    # Where the LLM rewrites came from: "cache", "llm", "timeout" (budget
+    # exceeded, rule-based variants only), "error" or "mock".
+    llm_source: Optional[str] = None
 
     def to_metadata(self) -> Dict[str, Any]:
         return {
@@ -115,15 +136,70 @@ class QueryExpansionResult:
             "applied_steps": self.applied_steps,
             "disabled_reason": self.disabled_reason,
             "expansion_applied": bool(self.expanded_queries),
+            "llm_source": self.llm_source,
         }
 
 
+class ExpansionCache:
+    """Bounded, thread-safe LRU of LLM rewrites with a per-entry TTL."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(max_entries, 0)
+        self._entries: "OrderedDict[str, Tuple[float, List[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[List[str]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, variants = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return list(variants)
+
+    def set(self, key: str, variants: List[str]) -> None:
+        if not self.max_entries:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, list(variants))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 class QueryExpansionEngine:
     """Simple query expansion pipeline with rule-based and optional LLM steps."""
 
     def __init__(self, config: Optional[QueryExpansionConfig] = None):
         self.config = config or QueryExpansionConfig.from_environment()
         self.synonyms = self._load_synonyms(self.config.synonyms_path)
+        self.llm_cache = ExpansionCache(self.config.llm_cache_ttl_seconds, self.config.llm_cache_max_entries)
+        self._http: Optional[requests.Session] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        """Stop the LLM worker threads and release pooled connections."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            http, self._http = self._http, None
+            self._inflight.clear()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        if http is not None:
+            http.close()
 
     def expand(self, query: str, context: Optional[Dict[str, Any]] = None) -> QueryExpansionResult:
         query = (query or "").strip()
@@ -138,6 +214,12 @@ class QueryExpansionEngine:
                 disabled_reason="expansion_disabled",
             )
 
+        with QUERY_EXPANSION_DURATION.time(source="error") as timing:
+            result = self._expand(query, context)
+            timing.labels["source"] = result.llm_source or "rules"
+        return result
+
+    def _expand(self, query: str, context: Optional[Dict[str, Any]]) -> QueryExpansionResult:
         result = QueryExpansionResult(original_query=query)
         seen: Set[str] = {query}
         max_variants = max(self.config.max_expansions, 0)
@@ -165,7 +247,8 @@ class QueryExpansionEngine:
                 add_variant(variant, "synonym", detail)
 
         if self.config.llm_provider:
-            for variant, detail in self._llm_variants(query, context):
+            llm_variants, result.llm_source = self._llm_variants(query, context)
+            for variant, detail in llm_variants:
                 add_variant(variant, "llm_rewrite", detail)
 
         return result
@@ -197,40 +280,109 @@ class QueryExpansionEngine:
                 if variant != query:
                     yield variant, {"token": tokens[idx], "synonym": synonym}
 
-    def _llm_variants(self, query: str, context: Optional[Dict[str, Any]]) -> Iterable[tuple[str, Dict[str, Any]]]:
+    def _llm_variants(
+        self,
+        query: str,
+        context: Optional[Dict[str, Any]],
+    ) -> Tuple[List[Tuple[str, Dict[str, Any]]], Optional[str]]:
+        """LLM rewrites of ``query`` and where they came from."""
         provider = self.config.llm_provider
         if provider is None:
-            return []
+            return [], None
 
         provider_key = provider.lower()
         max_variants = max(self.config.llm_max_expansions, 0)
         if provider_key == "mock":
             # Lightweight deterministic rewrite for tests/local usage
-            variant = f"{query} explained"
-            yield variant, {"provider": "mock", "reason": "deterministic mock rewrite"}
+            variants = [(f"{query} explained", {"provider": "mock", "reason": "deterministic mock rewrite"})]
             if max_variants > 1:
                 variant2 = f"How to {query}" if not query.lower().startswith("how") else f"{query}?"
-                yield variant2, {"provider": "mock", "reason": "mock heuristic"}
-            return
+                variants.append((variant2, {"provider": "mock", "reason": "mock heuristic"}))
+            return variants, "mock"
 
         if provider_key == "ollama":
-            yield from self._ollama_variants(query, context)
-            return
+            return self._ollama_variants(query, context)
 
         logger.warning("Query expansion LLM provider '%s' not implemented; skipping", provider)
-        return []
+        return [], None
 
     # ------------------------------------------------------------------
     def _ollama_variants(
         self,
         query: str,
         context: Optional[Dict[str, Any]],
-    ) -> Iterable[tuple[str, Dict[str, Any]]]:
+    ) -> Tuple[List[Tuple[str, Dict[str, Any]]], Optional[str]]:
+        """Cached Ollama rewrites, waiting at most ``llm_budget_seconds`` for a miss.
+
+        Calls run on a small worker pool and are shared by concurrent searches
+        for the same query; a call that outlives the budget still stores its
+        answer, so the next search for the query is served from the cache.
+        """
         model = self.config.llm_model
         if not model:
             logger.warning("Ollama query expansion selected but QUERY_EXPANSION_LLM_MODEL is unset; skipping")
-            return []
+            return [], None
+
+        key = self._cache_key(model, query)
+        cached = self.llm_cache.get(key)
+        if cached is not None:
+            return self._ollama_details(cached, model, "cache"), "cache"
+
+        future = self._submit_ollama(key, query, context)
+        try:
+            variants = future.result(timeout=max(self.config.llm_budget_seconds, 0.0))
+        except FutureTimeoutError:
+            logger.info("Query expansion LLM exceeded %.2fs budget; using rule-based variants", self.config.llm_budget_seconds)
+            return [], "timeout"
+        if variants is None:
+            return [], "error"
+        return self._ollama_details(variants, model, "llm"), "llm"
+
+    @staticmethod
+    def _cache_key(model: str, query: str) -> str:
+        return f"{model}\0{' '.join(query.lower().split())}"
 
+    @staticmethod
+    def _ollama_details(variants: List[str], model: str, source: str) -> List[Tuple[str, Dict[str, Any]]]:
+        return [(variant, {"provider": "ollama", "model": model, "source": source}) for variant in variants]
+
+    def _submit_ollama(self, key: str, query: str, context: Optional[Dict[str, Any]]) -> Future:
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=max(self.config.llm_workers, 1),
+                    thread_name_prefix="query-expansion-llm",
+                )
+            future = self._executor.submit(self._fetch_ollama_variants, query, context)
+            self._inflight[key] = future
+
+        def _finished(done: Future) -> None:
+            # Cache first, so no search sees neither the call nor its answer.
+            if not done.cancelled() and done.exception() is None and done.result() is not None:
+                self.llm_cache.set(key, done.result())
+            with self._lock:
+                if self._inflight.get(key) is done:
+                    del self._inflight[key]
+
+        future.add_done_callback(_finished)
+        return future
+
+    def _http_session(self) -> requests.Session:
+        with self._lock:
+            if self._http is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(self.config.llm_workers, 1))
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._http = session
+            return self._http
+
+    def _fetch_ollama_variants(self, query: str, context: Optional[Dict[str, Any]]) -> Optional[List[str]]:
+        """One ``/api/generate`` call; ``None`` when the call fails."""
+        model = self.config.llm_model
         base_url = (self.config.llm_base_url or "http://ollama:11434").rstrip("/")
         prompt = self._build_ollama_prompt(query, context)
         payload = {
@@ -246,7 +398,7 @@ class QueryExpansionEngine:
         }
 
         try:
-            response = requests.post(
+            response = self._http_session().post(
                 f"{base_url}/api/generate",
                 json=payload,
                 timeout=max(self.config.llm_timeout_seconds, 1.0),
@@ -254,19 +406,16 @@ class QueryExpansionEngine:
             response.raise_for_status()
         except requests.RequestException as exc:
             logger.warning("Query expansion Ollama call failed: %s", exc)
-            return []
+            return None
 
         try:
             data = response.json()
         except ValueError as exc:
             logger.warning("Query expansion Ollama response was not JSON: %s", exc)
-            return []
+            return None
 
         text = (data.get("response") or "").strip()
-        if not text:
-            return []
-
-        emitted = 0
+        variants: List[str] = []
         max_variants = max(self.config.llm_max_expansions, 0)
         for line in text.splitlines():
             candidate = line.strip()
@@ -277,13 +426,10 @@ class QueryExpansionEngine:
                 continue
             if len(candidate) > 200:
                 candidate = candidate[:200].rstrip()
-            emitted += 1
-            yield candidate, {
-                "provider": "ollama",
-                "model": model,
-            }
-            if max_variants and emitted >= max_variants:
+            variants.append(candidate)
+            if max_variants and len(variants) >= max_variants:
                 break
+        return variants
 
     def _build_ollama_prompt(self, query: str, context: Optional[Dict[str, Any]]) -> str:
         contextual_hint = ""
@@ -357,4 +503,6 @@ def get_query_expansion_engine() -> QueryExpansionEngine:
 
 def reset_query_expansion_engine_for_tests() -> None:
     global _query_expansion_engine
+    if _query_expansion_engine is not None:
+        _query_expansion_engine.close()
     _query_expansion_engine = None
@@ -6,7 +6,7 @@ dialects and for callers that request search_type="basic".
 import logging
 import time
 import uuid
-from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
 
 from sqlalchemy.orm import Session
 from sqlalchemy import or_, and_, String
@@ -15,6 +15,7 @@ from core.db import models, schemas
 from core.services.search.base import SearchStrategy
 from core.services.search.scoring import (
     _create_memory_block_with_score,
+    _keywords_eager_load,
     _apply_user_scope_filter,
 )
 
@@ -43,28 +44,27 @@ class BasicSearchStrategy(SearchStrategy):
         current_user: Optional["CurrentUserContext"] = None,
         keyword_terms: Optional[List[str]] = None,
         match_any: bool = False,
+        variants: Optional[Sequence[str]] = None,
         **kwargs: Any,
     ) -> Tuple[List[schemas.MemoryBlockWithScore], Dict[str, Any]]:
-        """Perform ILIKE-based substring search across content/errors/lessons fields."""
+        """Perform ILIKE-based substring search across content/errors/lessons fields.
+
+        ``variants`` are alternative phrasings of ``query``; a block matching
+        any of them is returned, in the same single query.
+        """
         start_time = time.time()
 
         explicit_terms = [term.strip() for term in (keyword_terms or []) if term and term.strip()]
         search_terms = explicit_terms or query.split()
-        search_filters = []
-
-        for term in search_terms:
-            term_filter = or_(
-                models.MemoryBlock.content.ilike(f"%{term}%"),
-                models.MemoryBlock.errors.ilike(f"%{term}%"),
-                models.MemoryBlock.lessons_learned.ilike(f"%{term}%"),
-                models.MemoryBlock.id.cast(String).ilike(f"%{term}%"),
-            )
-            search_filters.append(term_filter)
+        combined_filter = self._terms_filter(search_terms, match_any)
 
-        if search_filters:
-            combined_filter = or_(*search_filters) if match_any else and_(*search_filters)
-        else:
-            combined_filter = None
+        variant_filters = [
+            self._terms_filter(variant.split(), match_any)
+            for variant in (variants or [])
+        ]
+        variant_filters = [f for f in variant_filters if f is not None]
+        if variant_filters and combined_filter is not None:
+            combined_filter = or_(combined_filter, *variant_filters)
 
         db_query = db.query(models.MemoryBlock)
 
@@ -87,7 +87,7 @@ class BasicSearchStrategy(SearchStrategy):
                 )
             )
 
-        raw_results = db_query.order_by(
+        raw_results = db_query.options(_keywords_eager_load()).order_by(
             models.MemoryBlock.created_at.desc()
         ).limit(limit).all()
 
@@ -112,5 +112,23 @@ class BasicSearchStrategy(SearchStrategy):
             "search_terms": search_terms,
             "match_any": bool(match_any),
         }
+        if variants:
+            metadata["query_variants"] = list(variants)
 
         return results, metadata
+
+    @staticmethod
+    def _terms_filter(terms: Sequence[str], match_any: bool):
+        """ILIKE filter matching all (or, with ``match_any``, any) of ``terms``."""
+        term_filters = [
+            or_(
+                models.MemoryBlock.content.ilike(f"%{term}%"),
+                models.MemoryBlock.errors.ilike(f"%{term}%"),
+                models.MemoryBlock.lessons_learned.ilike(f"%{term}%"),
+                models.MemoryBlock.id.cast(String).ilike(f"%{term}%"),
+            )
+            for term in terms
+        ]
+        if not term_filters:
+            return None
+        return or_(*term_filters) if match_any else and_(*term_filters)
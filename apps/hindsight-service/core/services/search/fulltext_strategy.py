@@ -6,15 +6,18 @@ Falls back to BasicSearchStrategy when not on PostgreSQL.
 import logging
 import time
 import uuid
-from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
 
 from sqlalchemy.orm import Session
 from sqlalchemy import func, or_
+from sqlalchemy.dialects.postgresql import TSQUERY
 
 from core.db import models, schemas
 from core.services.search.base import SearchStrategy
+from core.services.search.config import _env_float
 from core.services.search.scoring import (
     _create_memory_block_with_score,
+    _keywords_eager_load,
     _apply_user_scope_filter,
 )
 
@@ -23,6 +26,16 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Scores of matches found only through an expansion variant are scaled by
+# this factor, so a direct match on the query outranks an equal variant match.
+EXPANSION_VARIANT_WEIGHT = _env_float("SEARCH_EXPANSION_VARIANT_WEIGHT", 0.9)
+
+
+def _tsquery(query: str):
+    if any(op in query.lower() for op in ["and", "or", "not", '"']):
+        return func.websearch_to_tsquery("english", query, type_=TSQUERY)
+    return func.plainto_tsquery("english", query, type_=TSQUERY)
+
 
 class FulltextSearchStrategy(SearchStrategy):
     """BM25-like full-text search via PostgreSQL tsvector/tsquery."""
@@ -41,9 +54,15 @@ class FulltextSearchStrategy(SearchStrategy):
         include_archived: bool = False,
         current_user: Optional["CurrentUserContext"] = None,
         min_score: float = 0.1,
+        variants: Optional[Sequence[str]] = None,
         **kwargs: Any,
     ) -> Tuple[List[schemas.MemoryBlockWithScore], Dict[str, Any]]:
-        """Perform tsvector full-text search; falls back to basic on non-Postgres."""
+        """Perform tsvector full-text search; falls back to basic on non-Postgres.
+
+        ``variants`` (query expansions) are ORed into the match ``tsquery``
+        and each block is ranked by its best match, variant ranks weighted by
+        ``EXPANSION_VARIANT_WEIGHT``, so expansion stays a single query.
+        """
         start_time = time.time()
 
         try:
@@ -60,6 +79,7 @@ class FulltextSearchStrategy(SearchStrategy):
                     limit=limit,
                     include_archived=include_archived,
                     current_user=current_user,
+                    variants=variants,
                 )
                 meta.update({
                     "search_type": "fulltext_fallback",
@@ -67,16 +87,24 @@ class FulltextSearchStrategy(SearchStrategy):
                 })
                 return fallback_results, meta
 
-            search_query_func = func.plainto_tsquery("english", query)
-
-            if any(op in query.lower() for op in ["and", "or", "not", '"']):
-                search_query_func = func.websearch_to_tsquery("english", query)
+            search_query_func = _tsquery(query)
 
             rank_expression = func.ts_rank_cd(
                 models.MemoryBlock.search_vector,
                 search_query_func,
             )
 
+            if variants:
+                variant_ranks = []
+                for variant in variants:
+                    variant_query = _tsquery(variant)
+                    search_query_func = search_query_func.op("||", return_type=TSQUERY)(variant_query)
+                    variant_ranks.append(
+                        func.ts_rank_cd(models.MemoryBlock.search_vector, variant_query)
+                        * EXPANSION_VARIANT_WEIGHT
+                    )
+                rank_expression = func.greatest(rank_expression, *variant_ranks)
+
             base_query = db.query(
                 models.MemoryBlock,
                 rank_expression.label("rank"),
@@ -102,7 +130,7 @@ class FulltextSearchStrategy(SearchStrategy):
                     )
                 )
 
-            results_with_rank = base_query.order_by(
+            results_with_rank = base_query.options(_keywords_eager_load()).order_by(
                 rank_expression.desc(),
                 models.MemoryBlock.created_at.desc(),
             ).limit(limit).all()
@@ -128,6 +156,8 @@ class FulltextSearchStrategy(SearchStrategy):
                 "search_type": "fulltext",
                 "min_score_threshold": min_score,
             }
+            if variants:
+                metadata["query_variants"] = list(variants)
 
             logger.info(
                 "Full-text search for '%s' returned %d results in %.2fms",
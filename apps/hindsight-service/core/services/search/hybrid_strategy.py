@@ -7,7 +7,7 @@ import logging
 import time
 import uuid
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
 
 from sqlalchemy.orm import Session
 
@@ -54,9 +54,14 @@ class HybridSearchStrategy(SearchStrategy):
         fulltext_weight: float = 0.7,
         semantic_weight: float = 0.3,
         min_combined_score: float = 0.1,
+        variants: Optional[Sequence[str]] = None,
         **kwargs: Any,
     ) -> Tuple[List[schemas.MemoryBlockWithScore], Dict[str, Any]]:
-        """Blend fulltext + semantic results; apply recency/feedback/scope boosts."""
+        """Blend fulltext + semantic results; apply recency/feedback/scope boosts.
+
+        ``variants`` (query expansions) are handed to each component, which
+        folds them into its own single query.
+        """
         start_time = time.time()
 
         config = get_hybrid_ranking_config()
@@ -74,6 +79,7 @@ class HybridSearchStrategy(SearchStrategy):
             min_score=0.01,
             include_archived=include_archived,
             current_user=current_user,
+            variants=variants,
         )
 
         # If fulltext already fell back (non-Postgres), return truncated fallback
@@ -122,6 +128,7 @@ class HybridSearchStrategy(SearchStrategy):
             similarity_threshold=0.5,
             include_archived=include_archived,
             current_user=current_user,
+            variants=variants,
         )
 
         # If fulltext returned nothing (e.g. search_vector unpopulated), use basic
@@ -133,6 +140,7 @@ class HybridSearchStrategy(SearchStrategy):
                 limit=limit * 2,
                 include_archived=include_archived,
                 current_user=current_user,
+                variants=variants,
             )
             fulltext_results = basic_results
 
@@ -168,6 +176,8 @@ class HybridSearchStrategy(SearchStrategy):
             },
             "normalization_method": config.normalization_method,
         }
+        if variants:
+            metadata["query_variants"] = list(variants)
 
         logger.info(
             "Hybrid search for '%s' combined %d fulltext + %d semantic results into %d final results",
@@ -3,6 +3,7 @@ Shared scoring utilities used across search strategies.
 
 Includes:
 - _create_memory_block_with_score: model -> schema conversion with search metadata
+- _keywords_eager_load: loader option fetching the keywords it reads up front
 - _apply_user_scope_filter: visibility filter mirroring scope_utils
 - _normalize_component_scores: min-max / max normalization for rank fusion
 - _resolve_component_weights: normalize requested hybrid weights
@@ -15,7 +16,7 @@ import uuid
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import or_, and_
 
 from core.db import models, schemas
@@ -26,6 +27,12 @@ if TYPE_CHECKING:
     from core.api.deps import CurrentUserContext
 
 
+def _keywords_eager_load():
+    """Load option for result queries: keywords for all rows in one extra
+    query instead of lazy loads per block in _create_memory_block_with_score."""
+    return selectinload(models.MemoryBlock.memory_block_keywords).joinedload(models.MemoryBlockKeyword.keyword)
+
+
 def _create_memory_block_with_score(
     memory_block: models.MemoryBlock,
     score: float,
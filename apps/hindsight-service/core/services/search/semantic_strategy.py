@@ -6,17 +6,19 @@ Falls back to BasicSearchStrategy when pgvector or embeddings are unavailable.
 import logging
 import time
 import uuid
-from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
 
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, cast, Float
+from sqlalchemy import Float, cast, func, or_, select, union_all
 
 from core.db import models, schemas
 from core.db.types import HAS_PGVECTOR
 from core.services import get_embedding_service
 from core.services.search.base import SearchStrategy
+from core.services.search.fulltext_strategy import EXPANSION_VARIANT_WEIGHT
 from core.services.search.scoring import (
     _create_memory_block_with_score,
+    _keywords_eager_load,
     _apply_user_scope_filter,
 )
 
@@ -43,9 +45,15 @@ class SemanticSearchStrategy(SearchStrategy):
         include_archived: bool = False,
         current_user: Optional["CurrentUserContext"] = None,
         similarity_threshold: float = 0.7,
+        variants: Optional[Sequence[str]] = None,
         **kwargs: Any,
     ) -> Tuple[List[schemas.MemoryBlockWithScore], Dict[str, Any]]:
-        """Run cosine similarity search; falls back to basic on embedding/pgvector absence."""
+        """Run cosine similarity search; falls back to basic on embedding/pgvector absence.
+
+        ``variants`` (query expansions) are embedded in one batch and searched
+        together with the query in a single statement; see
+        :meth:`_multi_vector_query`.
+        """
         start_time = time.time()
 
         if not query or not query.strip():
@@ -66,6 +74,7 @@ class SemanticSearchStrategy(SearchStrategy):
                 limit=limit,
                 include_archived=include_archived,
                 current_user=current_user,
+                variants=variants,
             )
             metadata.update({
                 "search_type": "semantic_fallback",
@@ -82,6 +91,7 @@ class SemanticSearchStrategy(SearchStrategy):
                 limit=limit,
                 include_archived=include_archived,
                 current_user=current_user,
+                variants=variants,
             )
             metadata.update({
                 "search_type": "semantic_fallback",
@@ -90,22 +100,32 @@ class SemanticSearchStrategy(SearchStrategy):
             })
             return results, metadata
 
+        texts = [query.strip()]
+        texts.extend(v.strip() for v in (variants or []) if v and v.strip())
         try:
-            raw_embedding = embedding_service.embed_text(query.strip())
-            if raw_embedding:
-                try:
-                    query_embedding = [float(value) for value in raw_embedding]
-                except (TypeError, ValueError) as exc:
-                    logger.error(
-                        "Invalid embedding vector returned for semantic query '%s': %s",
-                        query, exc,
-                    )
-                    query_embedding = None
+            if len(texts) == 1:
+                raw_embeddings = [embedding_service.embed_text(texts[0])]
             else:
-                query_embedding = None
+                raw_embeddings = embedding_service.embed_texts(texts)
         except Exception as exc:  # pragma: no cover - defensive
             logger.error("Failed to embed semantic query '%s': %s", query, exc)
-            query_embedding = None
+            raw_embeddings = []
+
+        # (vector, weight) per query text; expansion variants are down-weighted.
+        query_vectors: List[Tuple[List[float], float]] = []
+        for position, (text, raw_embedding) in enumerate(zip(texts, raw_embeddings)):
+            if not raw_embedding:
+                continue
+            try:
+                vector = [float(value) for value in raw_embedding]
+            except (TypeError, ValueError) as exc:
+                logger.error(
+                    "Invalid embedding vector returned for semantic query '%s': %s",
+                    text, exc,
+                )
+                continue
+            query_vectors.append((vector, 1.0 if position == 0 else EXPANSION_VARIANT_WEIGHT))
+        query_embedding = query_vectors[0][0] if query_vectors else None
 
         if not query_embedding:
             results, metadata = self._basic.search(
@@ -115,6 +135,7 @@ class SemanticSearchStrategy(SearchStrategy):
                 limit=limit,
                 include_archived=include_archived,
                 current_user=current_user,
+                variants=variants,
             )
             metadata.update({
                 "search_type": "semantic_fallback",
@@ -134,6 +155,7 @@ class SemanticSearchStrategy(SearchStrategy):
                 limit=limit,
                 include_archived=include_archived,
                 current_user=current_user,
+                variants=variants,
             )
             metadata.update({
                 "search_type": "semantic_fallback",
@@ -151,38 +173,26 @@ class SemanticSearchStrategy(SearchStrategy):
         if max_distance < 0:
             max_distance = 0.0
 
-        distance_expr = cast(
-            models.MemoryBlock.content_embedding.op("<=>")(query_embedding),
-            Float,
-        ).label("distance")
-
-        base_query = db.query(models.MemoryBlock, distance_expr).filter(
-            models.MemoryBlock.content_embedding.isnot(None)
-        )
-
-        base_query = _apply_user_scope_filter(base_query, current_user, models.MemoryBlock)
-
-        if agent_id:
-            base_query = base_query.filter(models.MemoryBlock.agent_id == agent_id)
-        if conversation_id:
-            base_query = base_query.filter(models.MemoryBlock.conversation_id == conversation_id)
-
-        if not include_archived:
-            base_query = base_query.filter(
-                or_(
-                    models.MemoryBlock.archived == False,
-                    models.MemoryBlock.archived.is_(None),
-                )
+        if len(query_vectors) == 1:
+            base_query = self._single_vector_query(
+                db, query_embedding, max_distance, limit,
+                agent_id=agent_id, conversation_id=conversation_id,
+                include_archived=include_archived, current_user=current_user,
+            )
+        else:
+            base_query = self._multi_vector_query(
+                db, query_vectors, max_distance, limit,
+                agent_id=agent_id, conversation_id=conversation_id,
+                include_archived=include_archived, current_user=current_user,
             )
-
-        base_query = (
-            base_query.filter(distance_expr <= max_distance)
-            .order_by(distance_expr.asc(), models.MemoryBlock.created_at.desc())
-            .limit(limit)
-        )
 
         try:
             results_with_similarity = base_query.all()
+            if len(query_vectors) == 1:
+                results_with_similarity = [
+                    (memory_block, 1.0 - float(distance) if distance is not None else None, distance)
+                    for memory_block, distance in results_with_similarity
+                ]
         except Exception as exc:  # pragma: no cover - defensive database failure
             logger.error("Semantic search query failed: %s", exc)
             fallback_results, metadata = self._basic.search(
@@ -192,6 +202,7 @@ class SemanticSearchStrategy(SearchStrategy):
                 limit=limit,
                 include_archived=include_archived,
                 current_user=current_user,
+                variants=variants,
             )
             metadata.update({
                 "search_type": "semantic_fallback",
@@ -202,8 +213,8 @@ class SemanticSearchStrategy(SearchStrategy):
 
         memory_blocks_with_scores: List[schemas.MemoryBlockWithScore] = []
         scores: List[float] = []
-        for memory_block, distance in results_with_similarity:
-            score = 1.0 - float(distance) if distance is not None else 0.0
+        for memory_block, score, distance in results_with_similarity:
+            score = float(score) if score is not None else 0.0
             scores.append(score)
             memory_blocks_with_scores.append(
                 _create_memory_block_with_score(
@@ -226,6 +237,7 @@ class SemanticSearchStrategy(SearchStrategy):
                 limit=limit,
                 include_archived=include_archived,
                 current_user=current_user,
+                variants=variants,
             )
             metadata.update({
                 "search_type": "semantic_fallback",
@@ -244,5 +256,99 @@ class SemanticSearchStrategy(SearchStrategy):
             "scores": scores,
             "embedding_dimension": len(query_embedding),
         }
+        if variants:
+            metadata["query_variants"] = list(variants)
+            metadata["query_vectors_count"] = len(query_vectors)
 
         return memory_blocks_with_scores, metadata
+
+    @staticmethod
+    def _filtered(
+        query,
+        *,
+        agent_id: Optional[uuid.UUID],
+        conversation_id: Optional[uuid.UUID],
+        include_archived: bool,
+        current_user: Optional["CurrentUserContext"],
+    ):
+        """Apply scope/agent/conversation/archive filters to a Query or Select."""
+        query = query.filter(models.MemoryBlock.content_embedding.isnot(None))
+        query = _apply_user_scope_filter(query, current_user, models.MemoryBlock)
+        if agent_id:
+            query = query.filter(models.MemoryBlock.agent_id == agent_id)
+        if conversation_id:
+            query = query.filter(models.MemoryBlock.conversation_id == conversation_id)
+        if not include_archived:
+            query = query.filter(
+                or_(
+                    models.MemoryBlock.archived == False,
+                    models.MemoryBlock.archived.is_(None),
+                )
+            )
+        return query
+
+    def _single_vector_query(self, db: Session, query_embedding, max_distance: float, limit: int, **filters: Any):
+        """Rows of ``(block, distance)`` nearest one query vector."""
+        distance_expr = cast(
+            models.MemoryBlock.content_embedding.op("<=>")(query_embedding),
+            Float,
+        ).label("distance")
+        base_query = self._filtered(
+            db.query(models.MemoryBlock, distance_expr),
+            **filters,
+        )
+        return (
+            base_query.filter(distance_expr <= max_distance)
+            .options(_keywords_eager_load())
+            .order_by(distance_expr.asc(), models.MemoryBlock.created_at.desc())
+            .limit(limit)
+        )
+
+    def _multi_vector_query(
+        self,
+        db: Session,
+        query_vectors: Sequence[Tuple[List[float], float]],
+        max_distance: float,
+        limit: int,
+        **filters: Any,
+    ):
+        """Rows of ``(block, score, distance)`` nearest any of several query vectors.
+
+        Each vector gets its own nearest-neighbour branch (so each can use
+        the vector index); the branches are combined with ``UNION ALL``,
+        reduced to the best weighted score per id and cut to ``limit``
+        before blocks are joined in, all in one statement.
+        """
+        branches = []
+        for vector, weight in query_vectors:
+            distance_expr = cast(models.MemoryBlock.content_embedding.op("<=>")(vector), Float)
+            branch = self._filtered(
+                select(
+                    models.MemoryBlock.id.label("id"),
+                    distance_expr.label("distance"),
+                    ((1.0 - distance_expr) * weight).label("score"),
+                ),
+                **filters,
+            )
+            branches.append(
+                branch.where(distance_expr <= max_distance).order_by(distance_expr.asc()).limit(limit)
+            )
+        candidates = union_all(*branches).subquery("candidates")
+        best_score = func.max(candidates.c.score)
+        best = (
+            select(
+                candidates.c.id,
+                best_score.label("score"),
+                func.min(candidates.c.distance).label("distance"),
+            )
+            .group_by(candidates.c.id)
+            .order_by(best_score.desc())
+            .limit(limit)
+            .subquery("best")
+        )
+        return (
+            db.query(models.MemoryBlock, best.c.score, best.c.distance)
+            .join(best, models.MemoryBlock.id == best.c.id)
+            .options(_keywords_eager_load())
+            .order_by(best.c.score.desc(), models.MemoryBlock.created_at.desc())
+        )
@@ -6,15 +6,17 @@ either directly or as re-exports from the search sub-package.
 """
 
 import logging
+import re
 import time  # noqa: F401 — re-exported; tests patch this name on the module
 import uuid
-from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
 
 from sqlalchemy import cast  # noqa: F401 — re-exported; tests patch on module
 from sqlalchemy import func  # noqa: F401 — re-exported; tests patch on module
 from sqlalchemy.orm import Session
 
 from core.db import schemas
+from core.metrics import SEARCH_DURATION
 from core.services import (  # noqa: F401 — re-exported; tests patch these on module
     get_embedding_service,
     get_query_expansion_engine,
@@ -47,6 +49,16 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+_METRIC_LABEL = re.compile(r"^[a-z0-9_]{1,64}$")
+
+
+def _fallback_label(metadata: Dict[str, Any]) -> str:
+    """``fallback_reason`` as a metric label; free-text reasons become ``other``."""
+    reason = (metadata or {}).get("fallback_reason")
+    if not reason:
+        return "none"
+    return reason if _METRIC_LABEL.match(reason) else "other"
+
 
 class SearchService:
     """Thin facade that delegates search requests to the appropriate strategy."""
@@ -76,12 +88,17 @@ class SearchService:
         min_score: float = 0.1,
         include_archived: bool = False,
         current_user: Optional[Dict[str, Any]] = None,
+        variants: Optional[Sequence[str]] = None,
     ) -> Tuple[List[schemas.MemoryBlockWithScore], Dict[str, Any]]:
-        return self._fulltext.search(
-            db, query, agent_id=agent_id, conversation_id=conversation_id,
-            limit=limit, min_score=min_score,
-            include_archived=include_archived, current_user=current_user,
-        )
+        with SEARCH_DURATION.time(strategy="fulltext", fallback="error") as timing:
+            results, metadata = self._fulltext.search(
+                db, query, agent_id=agent_id, conversation_id=conversation_id,
+                limit=limit, min_score=min_score,
+                include_archived=include_archived, current_user=current_user,
+                variants=variants,
+            )
+            timing.labels["fallback"] = _fallback_label(metadata)
+        return results, metadata
 
     def search_memory_blocks_semantic(
         self,
@@ -93,12 +110,17 @@ class SearchService:
         similarity_threshold: float = 0.7,
         include_archived: bool = False,
         current_user: Optional[Dict[str, Any]] = None,
+        variants: Optional[Sequence[str]] = None,
     ) -> Tuple[List[schemas.MemoryBlockWithScore], Dict[str, Any]]:
-        return self._semantic.search(
-            db, query, agent_id=agent_id, conversation_id=conversation_id,
-            limit=limit, similarity_threshold=similarity_threshold,
-            include_archived=include_archived, current_user=current_user,
-        )
+        with SEARCH_DURATION.time(strategy="semantic", fallback="error") as timing:
+            results, metadata = self._semantic.search(
+                db, query, agent_id=agent_id, conversation_id=conversation_id,
+                limit=limit, similarity_threshold=similarity_threshold,
+                include_archived=include_archived, current_user=current_user,
+                variants=variants,
+            )
+            timing.labels["fallback"] = _fallback_label(metadata)
+        return results, metadata
 
     def search_memory_blocks_hybrid(
         self,
@@ -112,13 +134,18 @@ class SearchService:
         min_combined_score: float = 0.1,
         include_archived: bool = False,
         current_user: Optional[Dict[str, Any]] = None,
+        variants: Optional[Sequence[str]] = None,
     ) -> Tuple[List[schemas.MemoryBlockWithScore], Dict[str, Any]]:
-        return self._hybrid.search(
-            db, query, agent_id=agent_id, conversation_id=conversation_id,
-            limit=limit, fulltext_weight=fulltext_weight,
-            semantic_weight=semantic_weight, min_combined_score=min_combined_score,
-            include_archived=include_archived, current_user=current_user,
-        )
+        with SEARCH_DURATION.time(strategy="hybrid", fallback="error") as timing:
+            results, metadata = self._hybrid.search(
+                db, query, agent_id=agent_id, conversation_id=conversation_id,
+                limit=limit, fulltext_weight=fulltext_weight,
+                semantic_weight=semantic_weight, min_combined_score=min_combined_score,
+                include_archived=include_archived, current_user=current_user,
+                variants=variants,
+            )
+            timing.labels["fallback"] = _fallback_label(metadata)
+        return results, metadata
 
     def _basic_search_fallback(
         self,
@@ -133,11 +160,14 @@ class SearchService:
         keyword_terms: Optional[List[str]] = None,
         match_any: bool = False,
     ) -> Tuple[List[schemas.MemoryBlockWithScore], Dict[str, Any]]:
-        return self._basic.search(
-            db, search_query, agent_id=agent_id, conversation_id=conversation_id,
-            limit=limit, include_archived=include_archived, current_user=current_user,
-            keyword_terms=keyword_terms, match_any=match_any,
-        )
+        with SEARCH_DURATION.time(strategy="basic", fallback="error") as timing:
+            results, metadata = self._basic.search(
+                db, search_query, agent_id=agent_id, conversation_id=conversation_id,
+                limit=limit, include_archived=include_archived, current_user=current_user,
+                keyword_terms=keyword_terms, match_any=match_any,
+            )
+            timing.labels["fallback"] = _fallback_label(metadata)
+        return results, metadata
 
     def enhanced_search_memory_blocks(
         self,
@@ -211,39 +241,26 @@ def _execute_with_query_expansion(
     runner: Any,
     search_label: str,
 ) -> Tuple[List["schemas.MemoryBlockWithScore"], Dict[str, Any]]:
-    """Run the supplied search callable against the base query and any expansions."""
+    """Expand the query and run the search once with every variant folded in.
+
+    ``runner(query, variants)`` executes a single search; the strategies
+    combine the variants in SQL (ORed tsquery, batched query vectors) and
+    deduplicate by id before loading blocks, so expansion costs about as
+    much as one search.
+    """
     expansion_engine = get_query_expansion_engine()
     expansion_result = expansion_engine.expand(base_query, context)
+    variants: List[str] = list(expansion_result.expanded_queries)
+
+    results, metadata = runner(base_query, variants)
+    limited = list(results)[: limit if limit is not None else len(results)]
 
-    variants: List[str] = [base_query]
-    variants.extend(expansion_result.expanded_queries)
-
-    aggregated: Dict[uuid.UUID, Any] = {}
-    variant_runs: List[Dict[str, Any]] = []
-    total_time_ms = 0.0
-    base_metadata: Optional[Dict[str, Any]] = None
-
-    for variant in variants:
-        results, metadata = runner(variant)
-        if base_metadata is None:
-            base_metadata = dict(metadata)
-        variant_runs.append({"query": variant, "results_count": len(results), "metadata": metadata})
-        total_time_ms += float(metadata.get("total_search_time_ms", 0.0) or 0.0)
-        for item in results:
-            existing = aggregated.get(item.id)
-            if existing is None or item.search_score > existing.search_score:
-                aggregated[item.id] = item
-
-    ordered = sorted(aggregated.values(), key=lambda r: r.search_score, reverse=True)
-    limited = ordered[: limit if limit is not None else len(ordered)]
-
-    combined: Dict[str, Any] = base_metadata.copy() if base_metadata else {"search_type": search_label}
-    combined["variant_runs"] = variant_runs
+    combined: Dict[str, Any] = dict(metadata) if metadata else {"search_type": search_label}
     combined["expansion"] = expansion_result.to_metadata()
     combined["combined_results_count"] = len(limited)
-    combined["total_search_time_ms"] = total_time_ms
+    combined["total_search_time_ms"] = float(combined.get("total_search_time_ms", 0.0) or 0.0)
 
-    if expansion_result.expanded_queries:
+    if variants:
         combined["search_type"] = f"{combined.get('search_type', search_label)}_expanded"
     else:
         combined.setdefault("search_type", search_label)
@@ -268,11 +285,12 @@ def search_memory_blocks_fulltext(
     if not trimmed:
         return [], {"search_type": "fulltext", "message": "Empty query"}
 
-    def _runner(q):
+    def _runner(q, variants):
         return svc.search_memory_blocks_fulltext(
             db=db, query=q, agent_id=agent_id, conversation_id=conversation_id,
             limit=limit, min_score=min_score,
             include_archived=include_archived, current_user=current_user,
+            variants=variants,
         )
 
     return _execute_with_query_expansion(
@@ -301,11 +319,12 @@ def search_memory_blocks_semantic(
     if not trimmed:
         return [], {"search_type": "semantic", "message": "Empty query"}
 
-    def _runner(q):
+    def _runner(q, variants):
         return svc.search_memory_blocks_semantic(
             db=db, query=q, agent_id=agent_id, conversation_id=conversation_id,
             limit=limit, similarity_threshold=similarity_threshold,
             include_archived=include_archived, current_user=current_user,
+            variants=variants,
         )
 
     return _execute_with_query_expansion(
@@ -337,12 +356,13 @@ def search_memory_blocks_hybrid(
     if not trimmed:
         return [], {"search_type": "hybrid", "message": "Empty query"}
 
-    def _runner(q):
+    def _runner(q, variants):
         return svc.search_memory_blocks_hybrid(
             db=db, query=q, agent_id=agent_id, conversation_id=conversation_id,
             limit=limit, fulltext_weight=fulltext_weight,
             semantic_weight=semantic_weight, min_combined_score=min_combined_score,
             include_archived=include_archived, current_user=current_user,
+            variants=variants,
         )
 
     return _execute_with_query_expansion(
@@ -9,17 +9,24 @@ Supports:
 - Resend (recommended for new projects)
 - SendGrid (industry standard)
 - Mailgun (developer-focused)
+
+The provider SDKs and ``requests`` are synchronous, so every HTTP call runs
+in a worker thread; the outbox sender's concurrent send tasks share one
+event loop and would otherwise wait on each other's requests.
 """
 
+import asyncio
 import os
 import logging
 from typing import Optional, Dict, Any, List
 from enum import Enum
-from jinja2 import Environment, FileSystemLoader
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Maximum emails per Resend batch request.
+RESEND_BATCH_LIMIT = 100
+
 class EmailProvider(Enum):
     """Supported email service providers."""
     RESEND = "resend"
@@ -102,6 +109,29 @@ class ResendEmailService:
             logger.error("Resend library not installed. Install with: pip install resend")
             raise
     
+    def _email_data(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        text_content: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Resend payload for one email."""
+        email_data = {
+            "from": f"{self.config.from_name} <{self.config.from_email}>",
+            "to": [to_email],
+            "subject": subject,
+            "html": html_content,
+        }
+        
+        if text_content:
+            email_data["text"] = text_content
+        
+        if self.config.reply_to_email:
+            email_data["reply_to"] = self.config.reply_to_email
+        
+        return email_data
+    
     async def send_email(
         self,
         to_email: str,
@@ -111,20 +141,9 @@ class ResendEmailService:
     ) -> Dict[str, Any]:
         """Send email via Resend."""
         try:
-            email_data = {
-                "from": f"{self.config.from_name} <{self.config.from_email}>",
-                "to": [to_email],
-                "subject": subject,
-                "html": html_content,
-            }
+            email_data = self._email_data(to_email, subject, html_content, text_content)
             
-            if text_content:
-                email_data["text"] = text_content
-            
-            if self.config.reply_to_email:
-                email_data["reply_to"] = self.config.reply_to_email
-            
-            result = self.client.Emails.send(email_data)
+            result = await asyncio.to_thread(self.client.Emails.send, email_data)
             
             return {
                 'success': True,
@@ -140,6 +159,30 @@ class ResendEmailService:
                 'error': str(e)
             }
 
+    async def send_batch(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Send emails with Resend's batch endpoint, up to RESEND_BATCH_LIMIT per request."""
+        results: List[Dict[str, Any]] = []
+        for start in range(0, len(messages), RESEND_BATCH_LIMIT):
+            chunk = messages[start:start + RESEND_BATCH_LIMIT]
+            try:
+                response = await asyncio.to_thread(self.client.Batch.send, [
+                    self._email_data(m['to_email'], m['subject'], m['html_content'], m.get('text_content'))
+                    for m in chunk
+                ])
+            except Exception as e:
+                # The batch endpoint accepts or rejects the request as a whole.
+                results.extend({'success': False, 'provider': 'resend', 'error': str(e)} for _ in chunk)
+                continue
+            data = response.get('data') if isinstance(response, dict) else None
+            data = data or []
+            for index in range(len(chunk)):
+                item = data[index] if index < len(data) else None
+                if isinstance(item, dict) and item.get('id'):
+                    results.append({'success': True, 'provider': 'resend', 'message_id': item['id']})
+                else:
+                    results.append({'success': False, 'provider': 'resend', 'error': 'Missing id in batch response'})
+        return results
+
 class SendGridEmailService:
     """Email service implementation for SendGrid."""
     
@@ -186,7 +229,7 @@ class SendGridEmailService:
             if self.config.reply_to_email:
                 mail.reply_to = self.config.reply_to_email
             
-            response = self.client.send(mail)
+            response = await asyncio.to_thread(self.client.send, mail)
             
             return {
                 'success': True,
@@ -243,7 +286,8 @@ class MailgunEmailService:
             if self.config.reply_to_email:
                 data["h:Reply-To"] = self.config.reply_to_email
             
-            response = self.requests.post(
+            response = await asyncio.to_thread(
+                self.requests.post,
                 f"{self.base_url}/messages",
                 auth=("api", self.config.mailgun_api_key),
                 data=data
@@ -304,6 +348,8 @@ class TransactionalEmailService:
     
     def _setup_templates(self):
         """Setup Jinja2 template environment."""
+        from jinja2 import Environment, FileSystemLoader
+
         template_path = Path(self.config.template_dir)
         if template_path.exists():
             self.template_env = Environment(loader=FileSystemLoader(str(template_path)))
@@ -362,6 +408,31 @@ class TransactionalEmailService:
                 'error': error_msg
             }
     
+    async def send_batch(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Send several emails, in one provider request where the provider supports it.
+        
+        Each message is a dict of ``send_email`` keyword arguments; results
+        come back in the same order.
+        """
+        if not self.provider_service:
+            return [
+                {'success': False, 'error': 'Email service not configured or initialization failed'}
+                for _ in messages
+            ]
+        
+        provider_batch = getattr(self.provider_service, 'send_batch', None)
+        if provider_batch is None:
+            return [await self.send_email(**message) for message in messages]
+        
+        try:
+            logger.info(f"Sending batch of {len(messages)} emails via {self.config.provider.value}")
+            return await provider_batch(messages)
+        except Exception as e:
+            error_msg = f"Email service error: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            return [{'success': False, 'error': error_msg} for _ in messages]
+    
     def render_template(self, template_name: str, context: Dict[str, Any]) -> tuple[str, str]:
         """
         Render email template with context.
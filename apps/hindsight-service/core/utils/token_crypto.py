@@ -12,6 +12,7 @@ from __future__ import annotations
 import base64
 import hashlib
 import hmac
+import importlib.util
 import os
 import secrets
 import time
@@ -19,15 +20,20 @@ import uuid
 from dataclasses import dataclass
 from typing import Optional, Tuple
 
-ARGON2_AVAILABLE = False
-try:  # pragma: no cover - availability varies in environments
-    from argon2 import PasswordHasher
-    from argon2.low_level import Type
+# argon2 is imported on the first hash or verify, not when the API starts;
+# find_spec only checks that it is installed.
+ARGON2_AVAILABLE = importlib.util.find_spec("argon2") is not None
+_argon2 = None
 
-    _argon2 = PasswordHasher(time_cost=2, memory_cost=102400, parallelism=8, hash_len=32, type=Type.ID)
-    ARGON2_AVAILABLE = True
-except Exception:  # pragma: no cover
-    _argon2 = None
+
+def _argon2_hasher():
+    global _argon2
+    if _argon2 is None:
+        from argon2 import PasswordHasher
+        from argon2.low_level import Type
+
+        _argon2 = PasswordHasher(time_cost=2, memory_cost=102400, parallelism=8, hash_len=32, type=Type.ID)
+    return _argon2
 
 
 TOKEN_PREFIX = "hs_pat_"
@@ -101,7 +107,7 @@ def _pbkdf2_verify(secret: str, encoded: str) -> bool:
 def hash_secret(secret: str) -> str:
     """Hash a secret using Argon2id when available, otherwise PBKDF2-HMAC-SHA256."""
     if ARGON2_AVAILABLE:
-        return _argon2.hash(secret)  # type: ignore[arg-type]
+        return _argon2_hasher().hash(secret)
     return _pbkdf2_hash(secret)
 
 
@@ -110,7 +116,7 @@ def verify_secret(secret: str, encoded_hash: str) -> bool:
         return False
     try:
         if encoded_hash.startswith("$argon2id$") and ARGON2_AVAILABLE:
-            return _argon2.verify(encoded_hash, secret)  # type: ignore[arg-type]
+            return _argon2_hasher().verify(encoded_hash, secret)
         if encoded_hash.startswith("pbkdf2$"):
             return _pbkdf2_verify(secret, encoded_hash)
         # Unknown scheme
@@ -2,48 +2,74 @@
 Consolidation Worker for Hindsight AI
 
 This script runs as a background process to analyze memory blocks for duplicates
-and generate consolidation suggestions using an LLM-based approach. It retrieves
-memory blocks from the database in batches, processes them to identify duplicate
-groups, and stores suggestions for consolidation in the database.
+and generate consolidation suggestions using an LLM-based approach. Each run only
+reads memory blocks created or changed since the previous run's watermark, adds
+them to a persistent MinHash/LSH index, groups near-duplicates found anywhere in
+the same scope partition, and stores suggestions for consolidation in the
+database. Progress is checkpointed in ``consolidation_runs`` after every batch,
+so a crashed run resumes where it stopped.
 
 Usage:
     python -m core.workers.consolidation_worker
 
 Configuration:
     - BATCH_SIZE: Number of memory blocks to process in each batch (default: 100)
+    - CONSOLIDATION_RUN_HEARTBEAT_TIMEOUT_SECONDS: Age after which a running run is resumed (default: 900)
+    - CONSOLIDATION_WATERMARK_LAG_SECONDS: Blocks changed this recently wait for the next run (default: 60)
     - FREQUENCY: How often the worker runs (configured via cron or environment variable)
     - LLM_API_KEY: API key for accessing the LLM service (set via environment variable)
 """
 
+import asyncio
 import os
 import json
 import logging
 import uuid
-from typing import List, Dict, Any
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Iterator, Optional
 from sqlalchemy.orm import Session
-import requests
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 
 from core.db.database import get_db
-from core.db.crud import get_all_memory_blocks, create_consolidation_suggestion
-
-# Configure logging
-log_dir = "logs"
-log_file = os.path.join(log_dir, "hindsight_consolidation.log")
-if not os.path.exists(log_dir):
-    os.makedirs(log_dir)
-
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(log_file),
-        logging.StreamHandler()
-    ]
+from core.db.crud import (
+    checkpoint_consolidation_run,
+    claim_consolidation_run,
+    create_consolidation_suggestion,
+    finish_consolidation_run,
+    get_memory_block_rows,
+    get_memory_blocks_since,
+    get_pending_suggestion_memory_ids,
+)
+from core.db.repositories.consolidation_index import delete_archived_minhash_entries
+from core.services.consolidation_candidates import (
+    CANDIDATE_SOURCES,
+    candidate_pairs,
+    group_pairs,
+    refresh_minhash_index,
 )
+from core.services.llm_gateway import get_llm_gateway, run_sync
+
 logger = logging.getLogger(__name__)
 
+LOG_DIR = "logs"
+LOG_FILE = os.path.join(LOG_DIR, "hindsight_consolidation.log")
+
+
+def configure_worker_logging() -> None:
+    """Log to stderr and ``logs/hindsight_consolidation.log``; for direct execution only.
+
+    Importing this module (the API does, to run an analysis on demand) must
+    not create directories or attach handlers to the root logger.
+    """
+    os.makedirs(LOG_DIR, exist_ok=True)
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(LOG_FILE),
+            logging.StreamHandler()
+        ]
+    )
+
 
 def _safe_group_id(group: dict, fallback: str = 'unknown') -> str:
     try:
@@ -53,83 +79,94 @@ def _safe_group_id(group: dict, fallback: str = 'unknown') -> str:
         return fallback
 # Configuration settings
 BATCH_SIZE = int(os.getenv("CONSOLIDATION_BATCH_SIZE", 100))
-FALLBACK_SIMILARITY_THRESHOLD = float(os.getenv("FALLBACK_SIMILARITY_THRESHOLD", 0.4)) # Lowered further for testing
+RUN_HEARTBEAT_TIMEOUT_SECONDS = int(os.getenv("CONSOLIDATION_RUN_HEARTBEAT_TIMEOUT_SECONDS", 900))
+WATERMARK_LAG_SECONDS = int(os.getenv("CONSOLIDATION_WATERMARK_LAG_SECONDS", 60))
+# Part of the LLM result cache key; bump when the consolidation prompt changes.
+CONSOLIDATION_PROMPT_VERSION = "consolidation-v1"
 
-def fetch_memory_blocks(db: Session, offset: int, limit: int) -> List[Dict[str, Any]]:
+def fetch_memory_blocks(db: Session, watermark: tuple, limit: int, until: Optional[datetime] = None) -> List[Dict[str, Any]]:
     """
-    Retrieve a batch of memory blocks from the database with pagination.
-    This function ensures efficient data retrieval for large datasets.
+    Retrieve the next batch of active memory blocks changed after ``watermark``.
+    Keyset pagination on ``(updated_at, id)`` keeps every batch an index range scan,
+    and only the id, scope, content and lessons learned columns are read.
     
     Args:
         db: Database session
-        offset: Starting index for the batch
+        watermark: ``(updated_at, id)`` of the last processed block, or ``(None, None)``
         limit: Number of records to retrieve
+        until: Upper bound on ``updated_at`` for this run
         
     Returns:
         List of memory block dictionaries
     """
     try:
-        # Retrieve memory blocks with pagination
-        memory_blocks = get_all_memory_blocks(db, skip=offset, limit=limit)
-        logger.info(f"Fetched batch of {len(memory_blocks)} memory blocks (offset: {offset})")
-        if memory_blocks:
-            return [mb.__dict__ for mb in memory_blocks]
-        else:
+        memory_blocks = get_memory_blocks_since(db, watermark, limit, until)
+        logger.info(f"Fetched batch of {len(memory_blocks)} memory blocks (after: {watermark[0]})")
+        if not memory_blocks:
             logger.info("No memory blocks retrieved in this batch")
-            return []
+        return memory_blocks
     except Exception as e:
         logger.error(f"Error fetching memory blocks: {str(e)}")
         return []
 
-def analyze_duplicates_with_llm(memory_blocks: List[Dict[str, Any]], llm_api_key: str) -> List[Dict[str, Any]]:
+def iter_memory_block_batches(
+    db: Session,
+    watermark: tuple,
+    batch_size: int,
+    until: Optional[datetime] = None,
+) -> Iterator[List[Dict[str, Any]]]:
     """
-    Use an LLM (Gemini model) to generate consolidation suggestions for pre-identified duplicate groups.
-    First, identify duplicate groups using a fallback method (scikit-learn), then use the LLM to suggest
-    consolidated content for those groups.
-    
+    Stream the delta as batches of lightweight block dicts.
+
+    Each batch is its own bounded keyset query, so nothing accumulates across
+    batches and the caller may commit between them.
+    """
+    while True:
+        memory_blocks = fetch_memory_blocks(db, watermark, batch_size, until)
+        if not memory_blocks:
+            return
+        yield memory_blocks
+        # A short batch means the end of the delta.
+        if len(memory_blocks) < batch_size:
+            return
+        last = memory_blocks[-1]
+        watermark = (last.get("updated_at"), last.get("id"))
+
+
+def generate_group_suggestions(
+    duplicate_groups: List[Dict[str, Any]],
+    memory_blocks: List[Dict[str, Any]],
+    llm_api_key: str,
+) -> List[Dict[str, Any]]:
+    """
+    Ask the LLM for consolidated content for each duplicate group.
+
     Args:
-        memory_blocks: List of memory block dictionaries to analyze
+        duplicate_groups: Groups with ``group_id`` and ``memory_ids``
+        memory_blocks: Block dictionaries covering every id in the groups
         llm_api_key: The API key for the LLM service.
-        
+
     Returns:
-        List of duplicate group dictionaries with suggested consolidations
+        One entry per group. Groups the LLM step failed for come back
+        unenriched with an ``llm_error`` message, so the caller can retry them.
     """
-    if not memory_blocks:
-        logger.warning("No memory blocks to analyze")
-        return []
-    
-    # Step 1: Identify potential duplicate groups using scikit-learn
-    logger.info("Identifying potential duplicate groups using scikit-learn based similarity analysis")
-    duplicate_groups = analyze_duplicates_with_fallback(memory_blocks)
-    logger.info(f"Scikit-learn similarity analysis identified {len(duplicate_groups)} potential duplicate groups")
-    
-    if not duplicate_groups:
-        logger.info("No potential duplicate groups identified, skipping LLM consolidation")
-        return []
-    
-    # The LLM API key is expected to be valid here. If not, the genai.Client initialization will raise an error.
     try:
-        from google import genai
-        
-        # Initialize the Gemini client with API key
-        client = genai.Client(api_key=llm_api_key)
-        
-        # Step 2: Use LLM to generate consolidation suggestions for each identified group
         model_name = os.getenv("LLM_MODEL_NAME")
         if not model_name:
             error_msg = "LLM_MODEL_NAME environment variable not provided. A valid model name is required for Gemini API requests."
             logger.error(error_msg)
             raise ValueError(error_msg)
-        
+
         logger.info(f"Using LLM to generate consolidation suggestions for {len(duplicate_groups)} groups with model: {model_name}")
-        enriched_groups = []
-        
+
+        blocks_by_id = {str(block["id"]): block for block in memory_blocks}
+        requests_by_group = []
         for group in duplicate_groups:
             group_id = group.get("group_id", str(uuid.uuid4()))
             memory_ids = group.get("memory_ids", [])
             
             # Prepare data for LLM analysis for this specific group
-            group_blocks = [block for block in memory_blocks if str(block["id"]) in memory_ids]
+            group_blocks = [blocks_by_id[mid] for mid in memory_ids if mid in blocks_by_id]
             blocks_data = [
                 {
                     "id": str(block["id"]),
@@ -153,103 +190,83 @@ def analyze_duplicates_with_llm(memory_blocks: List[Dict[str, Any]], llm_api_key
             ) + json.dumps(blocks_data, indent=2)
             
             logger.info(f"Prompt length for Gemini API request for group {group_id}: {len(prompt)} characters")
+            requests_by_group.append((group, group_id, memory_ids, group_blocks, prompt))
+
+        async def _generate(group_id, prompt):
             try:
-                response = client.models.generate_content(
+                return await get_llm_gateway().generate(
+                    prompt,
                     model=model_name,
-                    contents=prompt,
-                    config={
-                        "response_mime_type": "application/json",
-                        "temperature": 0.3
-                    }
+                    api_key=llm_api_key,
+                    purpose="consolidation",
+                    template_version=CONSOLIDATION_PROMPT_VERSION,
                 )
-                
-                # Extract the response content
-                result_text = response.text if response.text else "{}"
-                try:
-                    suggestion_data = json.loads(result_text)
-                    suggested_content = suggestion_data.get("suggested_content", "")
-                    suggested_lessons = suggestion_data.get("suggested_lessons_learned", "")
-                    
-                    # Calculate max length of content and lessons learned in the group
-                    max_content_length = max(len(block.get("content", "")) for block in group_blocks)
-                    max_lessons_length = max(len(block.get("lessons_learned", "")) for block in group_blocks)
-                    
-                    # Assert that suggestions do not exceed max lengths
-                    if len(suggested_content) > max_content_length:
-                        logger.warning(f"Suggested content for group {group_id} exceeds max content length ({len(suggested_content)} > {max_content_length}), trimming")
-                        suggested_content = suggested_content[:max_content_length]
-                    if len(suggested_lessons) > max_lessons_length:
-                        logger.warning(f"Suggested lessons for group {group_id} exceeds max lessons length ({len(suggested_lessons)} > {max_lessons_length}), trimming")
-                        suggested_lessons = suggested_lessons[:max_lessons_length]
-                    
-                    enriched_group = {
-                        "group_id": group_id,
-                        "memory_ids": memory_ids,
-                        "suggested_content": suggested_content,
-                        "suggested_lessons_learned": suggested_lessons,
-                        "suggested_keywords": suggestion_data.get("suggested_keywords", [])
-                    }
-                    enriched_groups.append(enriched_group)
-                    logger.info(f"Generated consolidation suggestions for group {group_id}")
-                except json.JSONDecodeError:
-                    logger.error(f"Failed to parse Gemini response as JSON for group {group_id}, keeping original group data")
-                    enriched_groups.append(group)
             except Exception as model_error:
                 error_msg = f"Failed to use model {model_name} for group {group_id}. Error: {str(model_error)}"
                 logger.error(error_msg)
-                enriched_groups.append(group)
                 raise ValueError(error_msg) from model_error
+
+        async def _generate_all():
+            # The gateway bounds concurrency and rate; groups are sent together,
+            # and one failing group must not discard the others' responses.
+            return await asyncio.gather(
+                *(_generate(group_id, prompt) for _, group_id, _, _, prompt in requests_by_group),
+                return_exceptions=True,
+            )
+
+        responses = run_sync(_generate_all())
+        cache_hits = sum(1 for response in responses if not isinstance(response, BaseException) and response.cached)
+        if cache_hits:
+            logger.info(f"Reused cached LLM suggestions for {cache_hits} of {len(responses)} groups")
+
+        enriched_groups = []
+        for (group, group_id, memory_ids, group_blocks, _), response in zip(requests_by_group, responses):
+            if isinstance(response, BaseException):
+                enriched_groups.append({**group, "llm_error": str(response)})
+                continue
+            # Extract the response content
+            result_text = response.text if response.text else "{}"
+            try:
+                suggestion_data = json.loads(result_text)
+                suggested_content = suggestion_data.get("suggested_content", "")
+                suggested_lessons = suggestion_data.get("suggested_lessons_learned", "")
+                
+                # Calculate max length of content and lessons learned in the group
+                max_content_length = max(len(block.get("content", "")) for block in group_blocks)
+                max_lessons_length = max(len(block.get("lessons_learned", "")) for block in group_blocks)
+                
+                # Assert that suggestions do not exceed max lengths
+                if len(suggested_content) > max_content_length:
+                    logger.warning(f"Suggested content for group {group_id} exceeds max content length ({len(suggested_content)} > {max_content_length}), trimming")
+                    suggested_content = suggested_content[:max_content_length]
+                if len(suggested_lessons) > max_lessons_length:
+                    logger.warning(f"Suggested lessons for group {group_id} exceeds max lessons length ({len(suggested_lessons)} > {max_lessons_length}), trimming")
+                    suggested_lessons = suggested_lessons[:max_lessons_length]
+                
+                enriched_group = {
+                    "group_id": group_id,
+                    "memory_ids": memory_ids,
+                    "suggested_content": suggested_content,
+                    "suggested_lessons_learned": suggested_lessons,
+                    "suggested_keywords": suggestion_data.get("suggested_keywords", [])
+                }
+                enriched_groups.append(enriched_group)
+                logger.info(f"Generated consolidation suggestions for group {group_id}")
+            except json.JSONDecodeError:
+                logger.error(f"Failed to parse Gemini response as JSON for group {group_id}, keeping original group data")
+                enriched_groups.append({**group, "llm_error": "response was not valid JSON"})
         
         logger.info(f"Completed LLM consolidation for {len(enriched_groups)} groups")
         return enriched_groups
     except Exception as e:
         logger.error(f"Gemini API request failed: {str(e)}. Returning groups without LLM suggestions.")
-        return duplicate_groups
-
-def analyze_duplicates_with_fallback(memory_blocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """
-    Fallback method to identify duplicates using basic text similarity (TF-IDF + cosine similarity).
-    
-    Args:
-        memory_blocks: List of memory block dictionaries to analyze
-        
-    Returns:
-        List of duplicate group dictionaries with suggested consolidations
-    """
-    if len(memory_blocks) < 2:
-        return []
-    
-    # Combine content and lessons learned for similarity analysis
-    texts = [f"{block.get('content', '')} {block.get('lessons_learned', '')}" for block in memory_blocks]
-    vectorizer = TfidfVectorizer()
-    tfidf_matrix = vectorizer.fit_transform(texts)
-    similarity_matrix = cosine_similarity(tfidf_matrix)
-    
-    # Group similar blocks based on threshold
-    groups = []
-    used = set()
-    for i in range(len(memory_blocks)):
-        if i in used:
-            continue
-        current_group = {"group_id": str(uuid.uuid4()), "memory_ids": [str(memory_blocks[i]["id"]) ]}
-        for j in range(i + 1, len(memory_blocks)):
-            if j not in used and similarity_matrix[i][j] >= FALLBACK_SIMILARITY_THRESHOLD:
-                current_group["memory_ids"].append(str(memory_blocks[j]["id"]))
-                used.add(j)
-        if len(current_group["memory_ids"]) > 1:  # Only consider groups with duplicates
-            # Fallback method only identifies groups, it does not generate consolidated content.
-            # The LLM is mandatory for generating suggestions.
-            groups.append(current_group)
-        used.add(i)
-    
-    logger.info(f"Scikit-learn similarity analysis identified {len(groups)} potential duplicate groups")
-    return groups
+        return [{**group, "llm_error": str(e)} for group in duplicate_groups]
 
 def store_consolidation_suggestions(db: Session, groups: List[Dict[str, Any]]) -> int:
     """
     Store consolidation suggestions in the database for identified duplicate groups.
-    This function checks for existing pending suggestions with overlapping memory IDs
-    to avoid creating duplicate suggestions.
+    Groups overlapping an existing pending suggestion (or one stored earlier in
+    this call) are skipped; the overlap is resolved with one indexed query.
     
     Args:
         db: Database session
@@ -258,10 +275,15 @@ def store_consolidation_suggestions(db: Session, groups: List[Dict[str, Any]]) -
     Returns:
         Number of new suggestions created
     """
-    from sqlalchemy import and_
-    from core.db.models import ConsolidationSuggestion
-    
     created_count = 0
+    try:
+        pending_ids = get_pending_suggestion_memory_ids(
+            db, {mid for group in groups for mid in group.get("memory_ids", [])}
+        )
+    except Exception as e:
+        logger.error(f"Error checking pending suggestions for overlap: {str(e)}")
+        db.commit()
+        return created_count
     for group in groups:
         # Only process groups that have LLM-generated suggestions
         if not group.get("suggested_content") or not group.get("suggested_lessons_learned"):
@@ -273,21 +295,7 @@ def store_consolidation_suggestions(db: Session, groups: List[Dict[str, Any]]) -
             memory_ids = sorted(group.get("memory_ids", []))
             logger.info(f"Extracted memory_ids: {memory_ids}")
             
-            # Query for existing pending suggestions with overlapping memory IDs
-            existing_suggestions = db.query(ConsolidationSuggestion).filter(
-                ConsolidationSuggestion.status == "pending"
-            ).all()
-            
-            # Check for overlap manually since overlap method might not be available
-            has_overlap = False
-            for suggestion in existing_suggestions:
-                existing_ids = set(suggestion.original_memory_ids or [])
-                current_ids = set(memory_ids)
-                if existing_ids & current_ids:  # Check for intersection
-                    has_overlap = True
-                    break
-            
-            if has_overlap:
+            if not pending_ids.isdisjoint(str(mid) for mid in memory_ids):
                 group_id = _safe_group_id(group)
                 logger.info(f"Skipping group {group_id} due to existing pending suggestion(s) with overlapping memory IDs")
                 continue
@@ -319,6 +327,7 @@ def store_consolidation_suggestions(db: Session, groups: List[Dict[str, Any]]) -
                     suggestion_schema = ConsolidationSuggestionCreate(**suggestion_data)
                     create_consolidation_suggestion(db, suggestion_schema)
                     created_count += 1
+                    pending_ids.update(original_memory_ids_str)
                     logger.info(f"Created consolidation suggestion for group {group_id_uuid} with {len(memory_ids)} memory blocks")
                 except Exception as inner_e:
                     logger.error(f"Inner error during suggestion creation for group {group_id_uuid}: {str(inner_e)}")
@@ -334,10 +343,51 @@ def store_consolidation_suggestions(db: Session, groups: List[Dict[str, Any]]) -
     logger.info(f"Stored {created_count} new consolidation suggestions")
     return created_count
 
+def find_duplicate_groups(db: Session, memory_blocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Index a batch of blocks and find their near-duplicates across the whole corpus.
+
+    The batch is added to the persistent MinHash/LSH index first, then each
+    block is matched against every indexed block in the same partition
+    (scope, organization, owner) and against its nearest stored embeddings,
+    so duplicates in different batches are found as well.
+
+    Args:
+        db: Database session
+        memory_blocks: Batch of memory block dictionaries
+
+    Returns:
+        List of duplicate group dictionaries (``group_id``, ``memory_ids``)
+    """
+    if "minhash" in CANDIDATE_SOURCES:
+        refresh_minhash_index(db, memory_blocks)
+    pairs = candidate_pairs(db, [block["id"] for block in memory_blocks])
+    groups = [{"group_id": str(uuid.uuid4()), "memory_ids": ids} for ids in group_pairs(pairs)]
+    logger.info(f"Candidate generation matched {len(pairs)} pairs into {len(groups)} groups")
+    return groups
+
+
+def load_group_blocks(db: Session, groups: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Load the blocks referenced by ``groups`` (they may lie outside the current batch)."""
+    ids = {uuid.UUID(mid) for group in groups for mid in group["memory_ids"]}
+    return [
+        {
+            "id": block["id"],
+            "content": block["content"] or "",
+            "lessons_learned": block["lessons_learned"] or "",
+            "keywords": block["keywords"],
+        }
+        for block in get_memory_block_rows(db, list(ids))
+    ]
+
+
 def run_consolidation_analysis(llm_api_key: str):
     """
     Main function to run the consolidation analysis process.
-    Retrieves memory blocks in batches, analyzes for duplicates, and stores suggestions.
+    Claims (or resumes) a consolidation run, processes the blocks changed since its
+    watermark in batches, and checkpoints the watermark and statistics after each batch.
+    A batch whose LLM step failed for any group is not checkpointed: the run stops
+    as failed and the next one starts again from that batch.
     
     Args:
         llm_api_key: The API key for the LLM service.
@@ -345,29 +395,69 @@ def run_consolidation_analysis(llm_api_key: str):
     logger.info("Starting memory block consolidation analysis")
     total_blocks_processed = 0
     total_suggestions_created = 0
-    offset = 0
+    run = None
     
     db = next(get_db())
     try:
-        while True:
-            memory_blocks = fetch_memory_blocks(db, offset, BATCH_SIZE)
-            if not memory_blocks:
-                break
-                
+        claimed = claim_consolidation_run(db, RUN_HEARTBEAT_TIMEOUT_SECONDS)
+        if claimed is None:
+            logger.info("Another consolidation run is in progress, skipping")
+            return
+        run, resumed = claimed
+        watermark = (run.watermark_updated_at, run.watermark_id)
+        logger.info(f"{'Resuming' if resumed else 'Starting'} consolidation run {run.id} after watermark {watermark[0]}")
+        until = datetime.now(timezone.utc) - timedelta(seconds=WATERMARK_LAG_SECONDS)
+
+        delete_archived_minhash_entries(db)
+
+        for memory_blocks in iter_memory_block_batches(db, watermark, BATCH_SIZE, until):
             total_blocks_processed += len(memory_blocks)
-            duplicate_groups = analyze_duplicates_with_llm(memory_blocks, llm_api_key)
-            suggestions_created = store_consolidation_suggestions(db, duplicate_groups)
-            total_suggestions_created += suggestions_created
-            
-            offset += BATCH_SIZE
+            duplicate_groups = find_duplicate_groups(db, memory_blocks)
+            # Groups touching a block that already awaits review would be rejected at
+            # store time; skipping them here saves their LLM calls.
+            pending_ids = get_pending_suggestion_memory_ids(
+                db, {mid for group in duplicate_groups for mid in group["memory_ids"]}
+            )
+            fresh_groups = [group for group in duplicate_groups if pending_ids.isdisjoint(group["memory_ids"])]
+            created = 0
+            if fresh_groups:
+                group_blocks = load_group_blocks(db, fresh_groups)
+                db.commit()  # persist index updates; don't hold a connection during the LLM step
+                enriched_groups = generate_group_suggestions(fresh_groups, group_blocks, llm_api_key)
+                created = store_consolidation_suggestions(db, enriched_groups)
+                total_suggestions_created += created
+                failed_groups = [group for group in enriched_groups if group.get("llm_error")]
+                if failed_groups:
+                    # Keep the watermark before this batch: the next run re-reads it,
+                    # retries the failed groups and skips the ones stored above, which
+                    # are pending review by then.
+                    error = f"LLM step failed for {len(failed_groups)} of {len(fresh_groups)} groups: {failed_groups[0]['llm_error']}"
+                    logger.error(f"{error}; leaving the batch for the next run")
+                    finish_consolidation_run(db, run, "failed", error=error)
+                    return
+
+            last = memory_blocks[-1]
+            watermark = (last.get("updated_at"), last.get("id"))
+            checkpoint_consolidation_run(
+                db,
+                run,
+                watermark,
+                blocks=len(memory_blocks),
+                groups_found=len(duplicate_groups),
+                groups_skipped=len(duplicate_groups) - len(fresh_groups),
+                suggestions_created=created,
+            )
             logger.info(f"Processed {total_blocks_processed} memory blocks, created {total_suggestions_created} suggestions so far")
-            
-            # Break if we received less than BATCH_SIZE, indicating end of data
-            if len(memory_blocks) < BATCH_SIZE:
-                break
-                
+
+        finish_consolidation_run(db, run, "completed")
     except Exception as e:
         logger.error(f"Consolidation analysis failed: {str(e)}")
+        if run is not None:
+            try:
+                db.rollback()
+                finish_consolidation_run(db, run, "failed", error=str(e))
+            except Exception as finish_error:
+                logger.error(f"Could not record failed consolidation run: {finish_error}")
     finally:
         db.close()
         logger.info(f"Completed consolidation analysis. Total blocks processed: {total_blocks_processed}, Total suggestions created: {total_suggestions_created}")
@@ -376,6 +466,7 @@ if __name__ == "__main__":
     # This block is for direct execution of the worker, e.g., via a cron job.
     # In this case, LLM_API_KEY must be set in the environment where the script is run.
     # For FastAPI integration, the LLM_API_KEY is passed from main.py.
+    configure_worker_logging()
     llm_api_key_from_env = os.getenv("LLM_API_KEY", "")
     if not llm_api_key_from_env:
         logger.warning("LLM_API_KEY not set in environment for direct worker execution. LLM-based consolidation will not occur.")
@@ -0,0 +1,37 @@
+"""
+Email Outbox Worker for Hindsight AI
+
+Runs the email outbox sender as its own process, for deployments that set
+EMAIL_OUTBOX_CONCURRENCY=0 on the API replicas. With no in-process wake-ups
+the sender relies on polling, so EMAIL_OUTBOX_POLL_SECONDS bounds how long
+a queued email waits.
+
+Usage:
+    python -m core.workers.email_outbox_worker [--concurrency N]
+"""
+
+import argparse
+import asyncio
+import logging
+
+from core.services.notifications.outbox import EMAIL_OUTBOX_CONCURRENCY, EmailOutboxSender
+
+logger = logging.getLogger(__name__)
+
+
+def run_email_outbox_worker(concurrency: int) -> None:
+    """Drain the outbox until interrupted."""
+    sender = EmailOutboxSender(concurrency=concurrency)
+    logger.info(f"Email outbox worker started with {concurrency} sender tasks")
+    try:
+        asyncio.run(sender.run())
+    except KeyboardInterrupt:
+        logger.info("Email outbox worker stopped")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Deliver queued notification emails.")
+    parser.add_argument("--concurrency", type=int, default=max(1, EMAIL_OUTBOX_CONCURRENCY))
+    args = parser.parse_args()
+    run_email_outbox_worker(args.concurrency)
@@ -0,0 +1,38 @@
+"""
+Pruning Score Worker for Hindsight AI
+
+Recomputes the persisted heuristic pruning score of every active memory
+block in one set-based statement. Writes already rescore a block through a
+database trigger, so this job only has to pick up scores that changed
+because blocks aged past a threshold; run it daily.
+
+Usage:
+    python -m core.workers.pruning_score_worker
+"""
+
+import logging
+
+from core.db.database import get_db
+from core.db.crud import refresh_pruning_scores
+
+logger = logging.getLogger(__name__)
+
+
+def run_pruning_score_refresh() -> int:
+    """Refresh pruning scores and return the number of blocks rescored."""
+    db = next(get_db())
+    try:
+        changed = refresh_pruning_scores(db)
+        logger.info(f"Refreshed pruning scores for {changed} memory blocks")
+        return changed
+    except Exception as e:
+        logger.error(f"Pruning score refresh failed: {str(e)}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    run_pruning_score_refresh()
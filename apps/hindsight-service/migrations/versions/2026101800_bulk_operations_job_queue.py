@@ -0,0 +1,42 @@
+"""Job-queue lease columns on bulk_operations
+
+Revision ID: 2026101800
+Revises: 2026050201
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2026101800"
+down_revision: Union[str, None] = "2026050201"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("bulk_operations", sa.Column("worker_id", sa.Text(), nullable=True))
+    op.add_column("bulk_operations", sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column(
+        "bulk_operations",
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+    )
+    # Workers poll "oldest pending or stale running row"; keep that scan on a
+    # small partial index instead of the whole history.
+    op.create_index(
+        "ix_bulk_operations_queue",
+        "bulk_operations",
+        ["created_at"],
+        postgresql_where=sa.text("status IN ('pending', 'running')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_bulk_operations_queue", table_name="bulk_operations")
+    op.drop_column("bulk_operations", "attempts")
+    op.drop_column("bulk_operations", "heartbeat_at")
+    op.drop_column("bulk_operations", "worker_id")
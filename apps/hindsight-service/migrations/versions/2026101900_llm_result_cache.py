@@ -0,0 +1,45 @@
+"""Add llm_result_cache table
+
+Revision ID: 2026101900
+Revises: 2026101800
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2026101900"
+down_revision: Union[str, None] = "2026101800"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "llm_result_cache",
+        sa.Column("cache_key", sa.Text(), primary_key=True),
+        sa.Column("model", sa.Text(), nullable=False),
+        sa.Column("purpose", sa.Text(), nullable=False),
+        sa.Column("template_version", sa.Text(), nullable=False),
+        sa.Column("content_hash", sa.Text(), nullable=False),
+        sa.Column("response_text", sa.Text(), nullable=False),
+        sa.Column("input_tokens", sa.Integer(), nullable=True),
+        sa.Column("output_tokens", sa.Integer(), nullable=True),
+        sa.Column("hit_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.Column("last_used_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    # TTL sweeps scan by expiry; size-based eviction drops least recently used.
+    op.create_index("ix_llm_result_cache_expires_at", "llm_result_cache", ["expires_at"])
+    op.create_index("ix_llm_result_cache_last_used_at", "llm_result_cache", ["last_used_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_llm_result_cache_last_used_at", table_name="llm_result_cache")
+    op.drop_index("ix_llm_result_cache_expires_at", table_name="llm_result_cache")
+    op.drop_table("llm_result_cache")
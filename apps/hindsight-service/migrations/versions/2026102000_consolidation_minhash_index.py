@@ -0,0 +1,55 @@
+"""MinHash/LSH index tables for consolidation
+
+Revision ID: 2026102000
+Revises: 2026101900
+Create Date: 2026-10-20 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2026102000"
+down_revision: Union[str, None] = "2026101900"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "memory_block_minhash",
+        sa.Column(
+            "memory_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("memory_blocks.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("partition_key", sa.Text(), nullable=False),
+        sa.Column("content_hash", sa.Text(), nullable=False),
+        sa.Column("signature", postgresql.ARRAY(sa.Integer()), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+    )
+    # Primary key order (partition, band, bucket) is the candidate lookup path.
+    op.create_table(
+        "memory_block_lsh_buckets",
+        sa.Column("partition_key", sa.Text(), primary_key=True),
+        sa.Column("band", sa.SmallInteger(), primary_key=True),
+        sa.Column("bucket", sa.BigInteger(), primary_key=True),
+        sa.Column(
+            "memory_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("memory_blocks.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+    )
+    op.create_index("ix_memory_block_lsh_buckets_memory_id", "memory_block_lsh_buckets", ["memory_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_memory_block_lsh_buckets_memory_id", table_name="memory_block_lsh_buckets")
+    op.drop_table("memory_block_lsh_buckets")
+    op.drop_table("memory_block_minhash")
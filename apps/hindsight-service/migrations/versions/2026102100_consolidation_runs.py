@@ -0,0 +1,57 @@
+"""Consolidation run watermarks and statistics
+
+Revision ID: 2026102100
+Revises: 2026102000
+Create Date: 2026-10-21 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2026102100"
+down_revision: Union[str, None] = "2026102000"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "consolidation_runs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("status", sa.Text(), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="1"),
+        sa.Column("watermark_updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("watermark_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("blocks_processed", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("batches_processed", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("groups_found", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("groups_skipped", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("suggestions_created", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error", sa.Text(), nullable=True),
+    )
+    op.create_index("ix_consolidation_runs_started_at", "consolidation_runs", ["started_at"])
+    op.create_index(
+        "uq_consolidation_runs_running",
+        "consolidation_runs",
+        ["status"],
+        unique=True,
+        postgresql_where=sa.text("status = 'running'"),
+    )
+    # Runs walk memory_blocks by (updated_at, id); rows without a timestamp would never be visited.
+    op.execute("UPDATE memory_blocks SET updated_at = COALESCE(created_at, now()) WHERE updated_at IS NULL")
+    op.create_index("idx_memory_blocks_updated_at_id", "memory_blocks", ["updated_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_memory_blocks_updated_at_id", table_name="memory_blocks")
+    op.drop_index("uq_consolidation_runs_running", table_name="consolidation_runs")
+    op.drop_index("ix_consolidation_runs_started_at", table_name="consolidation_runs")
+    op.drop_table("consolidation_runs")
@@ -0,0 +1,68 @@
+"""Indexed overlap and scope lookups for consolidation suggestions
+
+Revision ID: 2026102200
+Revises: 2026102100
+Create Date: 2026-10-22 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2026102200"
+down_revision: Union[str, None] = "2026102100"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("consolidation_suggestions", sa.Column("visibility_scope", sa.String(length=20), nullable=True))
+    op.add_column("consolidation_suggestions", sa.Column("owner_user_id", postgresql.UUID(as_uuid=True), nullable=True))
+    op.add_column("consolidation_suggestions", sa.Column("organization_id", postgresql.UUID(as_uuid=True), nullable=True))
+
+    # Backfill the scope where every surviving original shares one.
+    op.execute(
+        """
+        UPDATE consolidation_suggestions s
+        SET visibility_scope = x.visibility_scope,
+            owner_user_id = x.owner_user_id,
+            organization_id = x.organization_id
+        FROM (
+            SELECT s2.suggestion_id,
+                   (array_agg(mb.visibility_scope))[1] AS visibility_scope,
+                   (array_agg(mb.owner_user_id))[1] AS owner_user_id,
+                   (array_agg(mb.organization_id))[1] AS organization_id
+            FROM consolidation_suggestions s2
+            CROSS JOIN LATERAL jsonb_array_elements_text(s2.original_memory_ids) AS e(memory_id)
+            JOIN memory_blocks mb ON mb.id::text = e.memory_id
+            GROUP BY s2.suggestion_id
+            HAVING count(DISTINCT (mb.visibility_scope, mb.owner_user_id, mb.organization_id)) = 1
+        ) x
+        WHERE x.suggestion_id = s.suggestion_id
+        """
+    )
+
+    op.create_index(
+        "idx_consolidation_suggestions_scope",
+        "consolidation_suggestions",
+        ["visibility_scope", "organization_id", "owner_user_id"],
+    )
+    op.create_index(
+        "idx_consolidation_suggestions_pending_originals",
+        "consolidation_suggestions",
+        ["original_memory_ids"],
+        postgresql_using="gin",
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_consolidation_suggestions_pending_originals", table_name="consolidation_suggestions")
+    op.drop_index("idx_consolidation_suggestions_scope", table_name="consolidation_suggestions")
+    op.drop_column("consolidation_suggestions", "organization_id")
+    op.drop_column("consolidation_suggestions", "owner_user_id")
+    op.drop_column("consolidation_suggestions", "visibility_scope")
@@ -0,0 +1,37 @@
+"""Indexed random key for pruning samples
+
+Revision ID: 2026102300
+Revises: 2026102200
+Create Date: 2026-10-23 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2026102300"
+down_revision: Union[str, None] = "2026102200"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A volatile default rewrites the table once, giving every existing row its own key.
+    op.add_column(
+        "memory_blocks",
+        sa.Column("random_key", sa.Float(), nullable=False, server_default=sa.text("random()")),
+    )
+    op.create_index(
+        "idx_memory_blocks_random_key",
+        "memory_blocks",
+        ["random_key", "id"],
+        postgresql_where=sa.text("archived IS NOT TRUE"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_memory_blocks_random_key", table_name="memory_blocks")
+    op.drop_column("memory_blocks", "random_key")
@@ -0,0 +1,89 @@
+"""Persisted heuristic pruning scores for memory blocks
+
+Revision ID: 2026102400
+Revises: 2026102300
+Create Date: 2026-10-24 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2026102400"
+down_revision: Union[str, None] = "2026102300"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("memory_blocks", sa.Column("pruning_score", sa.Integer(), nullable=True))
+
+    # Same arithmetic, in float8 and in the same order, as
+    # PruningService._fallback_score_block so both give identical scores.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION memory_block_pruning_score(
+            feedback integer, retrievals integer, body text, created timestamptz
+        )
+        RETURNS integer
+        LANGUAGE sql STABLE AS $$
+            SELECT GREATEST(1, LEAST(100, floor((10 - (
+                GREATEST(1, LEAST(10, COALESCE(feedback, 0) + 5))::float8 * 0.3::float8
+                + LEAST(10::float8, COALESCE(retrievals, 0) * 0.1::float8 + 1) * 0.3::float8
+                + (CASE
+                       WHEN length(COALESCE(body, '')) < 100 THEN 0.5::float8
+                       WHEN length(COALESCE(body, '')) < 500 THEN 0.8::float8
+                       ELSE 1.0::float8
+                   END) * 0.2::float8
+                + (CASE
+                       WHEN created IS NULL THEN 1.0::float8
+                       WHEN now() - created >= interval '366 days' THEN 0.7::float8
+                       WHEN now() - created >= interval '181 days' THEN 0.85::float8
+                       ELSE 1.0::float8
+                   END) * 0.2::float8
+            )) * 10)::integer))
+        $$;
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION update_pruning_score()
+        RETURNS trigger AS $$
+        BEGIN
+            NEW.pruning_score := memory_block_pruning_score(
+                NEW.feedback_score, NEW.retrieval_count, NEW.content, NEW.created_at
+            );
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER update_pruning_score_trigger
+            BEFORE INSERT OR UPDATE OF feedback_score, retrieval_count, content, created_at ON memory_blocks
+            FOR EACH ROW EXECUTE FUNCTION update_pruning_score();
+        """
+    )
+
+    op.execute(
+        "UPDATE memory_blocks "
+        "SET pruning_score = memory_block_pruning_score(feedback_score, retrieval_count, content, created_at)"
+    )
+    op.create_index(
+        "idx_memory_blocks_pruning_score",
+        "memory_blocks",
+        ["pruning_score", "id"],
+        postgresql_where=sa.text("archived IS NOT TRUE"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_memory_blocks_pruning_score", table_name="memory_blocks")
+    op.execute("DROP TRIGGER IF EXISTS update_pruning_score_trigger ON memory_blocks;")
+    op.execute("DROP FUNCTION IF EXISTS update_pruning_score();")
+    op.execute("DROP FUNCTION IF EXISTS memory_block_pruning_score(integer, integer, text, timestamptz);")
+    op.drop_column("memory_blocks", "pruning_score")
@@ -0,0 +1,34 @@
+"""Content hash for exact-duplicate detection on memory blocks
+
+Revision ID: 2026102500
+Revises: 2026102400
+Create Date: 2026-10-25 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2026102500"
+down_revision: Union[str, None] = "2026102400"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing rows are hashed by scripts/backfill_content_hashes.py: the
+    # hash covers the application's composed text, which SQL cannot reproduce.
+    op.add_column("memory_blocks", sa.Column("content_hash", sa.String(length=64), nullable=True))
+    op.create_index(
+        "idx_memory_blocks_scope_content_hash",
+        "memory_blocks",
+        ["visibility_scope", "organization_id", "owner_user_id", "content_hash"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_memory_blocks_scope_content_hash", table_name="memory_blocks")
+    op.drop_column("memory_blocks", "content_hash")
@@ -0,0 +1,51 @@
+"""Durable email outbox on email_notification_logs
+
+Revision ID: 2026102600
+Revises: 2026102500
+Create Date: 2026-10-26 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2026102600"
+down_revision: Union[str, None] = "2026102500"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Queued rows carry their rendered bodies so the sender never re-renders,
+    # and emails without an account (beta access) can be queued too.
+    op.add_column("email_notification_logs", sa.Column("body_html", sa.Text(), nullable=True))
+    op.add_column("email_notification_logs", sa.Column("body_text", sa.Text(), nullable=True))
+    op.add_column(
+        "email_notification_logs",
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "email_notification_logs",
+        sa.Column("next_attempt_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.alter_column("email_notification_logs", "user_id", existing_type=postgresql.UUID(), nullable=True)
+    op.create_index(
+        "idx_email_notification_logs_outbox",
+        "email_notification_logs",
+        ["next_attempt_at"],
+        postgresql_where=sa.text("status = 'pending' AND next_attempt_at IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_email_notification_logs_outbox", table_name="email_notification_logs")
+    op.execute("DELETE FROM email_notification_logs WHERE user_id IS NULL")
+    op.alter_column("email_notification_logs", "user_id", existing_type=postgresql.UUID(), nullable=False)
+    op.drop_column("email_notification_logs", "next_attempt_at")
+    op.drop_column("email_notification_logs", "attempts")
+    op.drop_column("email_notification_logs", "body_text")
+    op.drop_column("email_notification_logs", "body_html")
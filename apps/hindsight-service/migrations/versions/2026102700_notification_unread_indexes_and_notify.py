@@ -0,0 +1,72 @@
+"""Partial unread indexes and change NOTIFY on notifications
+
+Revision ID: 2026102700
+Revises: 2026102600
+Create Date: 2026-10-27 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2026102700"
+down_revision: Union[str, None] = "2026102600"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Unread rows only. `expires_at > now()` cannot be part of the predicate
+    # (now() is not immutable), so expiry is the second key column and stays
+    # a range condition inside the user's slice of the index.
+    op.create_index(
+        "idx_notifications_unread_user_expires_at",
+        "notifications",
+        ["user_id", "expires_at"],
+        postgresql_where=sa.text("is_read = false"),
+    )
+    op.create_index(
+        "idx_notifications_unread_user_created_at",
+        "notifications",
+        ["user_id", "created_at"],
+        postgresql_where=sa.text("is_read = false"),
+    )
+    # Superseded by the partial indexes above.
+    op.drop_index("idx_notifications_user_id_is_read", table_name="notifications")
+
+    # Publish the affected user id on every change so /notifications/stream
+    # can push instead of clients polling. Postgres folds identical payloads
+    # within a transaction, so a bulk insert for one user notifies once.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_notification_change()
+        RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                PERFORM pg_notify('notification_changes', OLD.user_id::text);
+            ELSE
+                PERFORM pg_notify('notification_changes', NEW.user_id::text);
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER notify_notification_change_trigger
+            AFTER INSERT OR UPDATE OF is_read, expires_at OR DELETE ON notifications
+            FOR EACH ROW EXECUTE FUNCTION notify_notification_change();
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS notify_notification_change_trigger ON notifications;")
+    op.execute("DROP FUNCTION IF EXISTS notify_notification_change();")
+    op.create_index("idx_notifications_user_id_is_read", "notifications", ["user_id", "is_read"])
+    op.drop_index("idx_notifications_unread_user_created_at", table_name="notifications")
+    op.drop_index("idx_notifications_unread_user_expires_at", table_name="notifications")
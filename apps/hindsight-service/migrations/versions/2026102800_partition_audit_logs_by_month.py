@@ -0,0 +1,134 @@
+"""Partition audit_logs by month with query-path indexes
+
+Revision ID: 2026102800
+Revises: 2026102700
+Create Date: 2026-10-28 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2026102800"
+down_revision: Union[str, None] = "2026102700"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Partitions created ahead of the current month; the app keeps this horizon
+# moving (core.services.audit_retention).
+PARTITION_MONTHS_AHEAD = 2
+
+# (name, columns) of the indexes serving GET /audits/ filters, all ending in
+# the keyset order (created_at DESC, id DESC). Created on the parent, so
+# every partition gets them.
+QUERY_INDEXES = (
+    ("ix_audit_logs_created_at_id", ["created_at DESC", "id DESC"]),
+    ("ix_audit_logs_org_created_at_id", ["organization_id", "created_at DESC", "id DESC"]),
+    ("ix_audit_logs_org_action_created_at_id", ["organization_id", "action_type", "created_at DESC", "id DESC"]),
+    ("ix_audit_logs_org_status_created_at_id", ["organization_id", "status", "created_at DESC", "id DESC"]),
+    ("ix_audit_logs_actor_created_at_id", ["actor_user_id", "created_at DESC", "id DESC"]),
+    ("ix_audit_logs_action_created_at_id", ["action_type", "created_at DESC", "id DESC"]),
+)
+
+LEGACY_INDEXES = (
+    ("ix_audit_logs_organization_id_created_at", ["organization_id", "created_at"]),
+    ("ix_audit_logs_actor_user_id_created_at", ["actor_user_id", "created_at"]),
+    ("ix_audit_logs_action_type", ["action_type"]),
+)
+
+_COLUMNS = "id, organization_id, actor_user_id, action_type, target_type, target_id, status, reason, metadata, created_at"
+
+
+def _columns():
+    return [
+        sa.Column("id", postgresql.UUID(as_uuid=True), server_default=sa.text("gen_random_uuid()"), nullable=False),
+        sa.Column("organization_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("organizations.id", ondelete="SET NULL"), nullable=True),
+        sa.Column("actor_user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("action_type", sa.Text(), nullable=False),
+        sa.Column("target_type", sa.Text(), nullable=True),
+        sa.Column("target_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("status", sa.Text(), nullable=False),
+        sa.Column("reason", sa.Text(), nullable=True),
+        sa.Column("metadata", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column("created_at", sa.TIMESTAMP(timezone=True), server_default=sa.text("now()"), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_unpartitioned")
+    op.execute("ALTER TABLE audit_logs_unpartitioned RENAME CONSTRAINT audit_logs_pkey TO audit_logs_unpartitioned_pkey")
+    for name, _ in LEGACY_INDEXES:
+        op.drop_index(name, table_name="audit_logs_unpartitioned")
+
+    # The partition key has to be part of the primary key.
+    op.create_table(
+        "audit_logs",
+        *_columns(),
+        sa.PrimaryKeyConstraint("id", "created_at", name="audit_logs_pkey"),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+    # Catches rows outside every monthly partition so inserts never fail;
+    # ensure_audit_log_partition moves them out when their month is created.
+    op.execute("CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT")
+    for name, columns in QUERY_INDEXES:
+        op.create_index(name, "audit_logs", [sa.text(column) for column in columns])
+
+    # Creates the month's partition (UTC bounds) unless it exists and returns
+    # its name, or NULL. Rows for that month already in the default partition
+    # are moved into it first, as ATTACH refuses overlapping default rows.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION ensure_audit_log_partition(month_start date)
+        RETURNS text AS $$
+        DECLARE
+            lower_bound timestamptz := date_trunc('month', month_start::timestamp) AT TIME ZONE 'UTC';
+            upper_bound timestamptz := (date_trunc('month', month_start::timestamp) + interval '1 month') AT TIME ZONE 'UTC';
+            partition_name text := 'audit_logs_p' || to_char(month_start, 'YYYYMM');
+        BEGIN
+            IF to_regclass(partition_name) IS NOT NULL THEN
+                RETURN NULL;
+            END IF;
+            EXECUTE format('CREATE TABLE %I (LIKE audit_logs INCLUDING DEFAULTS)', partition_name);
+            EXECUTE format(
+                'WITH moved AS (DELETE FROM audit_logs_default WHERE created_at >= %L AND created_at < %L RETURNING *) '
+                'INSERT INTO %I SELECT * FROM moved',
+                lower_bound, upper_bound, partition_name
+            );
+            EXECUTE format(
+                'ALTER TABLE audit_logs ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                partition_name, lower_bound, upper_bound
+            );
+            RETURN partition_name;
+        END
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        f"""
+        SELECT ensure_audit_log_partition(month::date)
+        FROM generate_series(
+            date_trunc('month', COALESCE((SELECT min(created_at) FROM audit_logs_unpartitioned), now()) AT TIME ZONE 'UTC'),
+            date_trunc('month', now() AT TIME ZONE 'UTC') + interval '{PARTITION_MONTHS_AHEAD} months',
+            interval '1 month'
+        ) AS month
+        """
+    )
+
+    op.execute(f"INSERT INTO audit_logs ({_COLUMNS}) SELECT {_COLUMNS} FROM audit_logs_unpartitioned")
+    op.drop_table("audit_logs_unpartitioned")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_partitioned")
+    op.execute("ALTER TABLE audit_logs_partitioned RENAME CONSTRAINT audit_logs_pkey TO audit_logs_partitioned_pkey")
+    op.create_table("audit_logs", *_columns(), sa.PrimaryKeyConstraint("id", name="audit_logs_pkey"))
+    op.execute(f"INSERT INTO audit_logs ({_COLUMNS}) SELECT {_COLUMNS} FROM audit_logs_partitioned")
+    # Dropping the parent drops every partition with it.
+    op.drop_table("audit_logs_partitioned")
+    op.execute("DROP FUNCTION IF EXISTS ensure_audit_log_partition(date);")
+    for name, columns in LEGACY_INDEXES:
+        op.create_index(name, "audit_logs", columns)
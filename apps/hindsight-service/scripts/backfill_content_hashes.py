@@ -0,0 +1,48 @@
+"""Utility to set content hashes on memory blocks created before they existed."""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from contextlib import suppress
+
+from core.db import database
+from core.db.repositories.memory_blocks import backfill_memory_block_content_hashes
+
+
+logger = logging.getLogger("core.scripts.backfill_content_hashes")
+
+
+# Access SessionLocal dynamically so test fixtures that rebind the
+# sessionmaker (e.g. Postgres testcontainers) are respected.
+SessionLocal = lambda: database.SessionLocal()
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Populate missing memory block content hashes")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=500,
+        help="Number of rows to hash per batch (default: 500)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    if not logging.getLogger().handlers:
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    args = parse_args(argv)
+    session = SessionLocal()
+    try:
+        updated = backfill_memory_block_content_hashes(session, batch_size=args.batch_size)
+        print(f"Set content hashes for {updated} memory blocks.")
+        return 0
+    finally:
+        with suppress(Exception):
+            session.close()
+
+
+if __name__ == "__main__":  # pragma: no cover - manual execution path
+    sys.exit(main())
@@ -12,6 +12,12 @@ from alembic.config import Config
 # Store original environment variables to restore after tests
 _original_env = {}
 
+# Offline tests must not sleep through LLM rate limiting or retry backoff.
+os.environ.setdefault("LLM_REQUESTS_PER_MINUTE", "0")
+os.environ.setdefault("LLM_RETRY_BACKOFF_SECONDS", "0")
+# The result cache commits through its own sessions; tests opt in explicitly.
+os.environ.setdefault("LLM_CACHE_ENABLED", "false")
+
 def _setup_test_env():
     """Set up environment variables needed for database connection during tests"""
     global _original_env
@@ -65,6 +71,15 @@ def _beta_access_admin_env(monkeypatch):
     monkeypatch.setenv('BETA_ACCESS_ADMINS', 'ibarz.jean@gmail.com,dev@localhost')
     yield
 
+
+@pytest.fixture(autouse=True)
+def _fresh_optimization_snapshots():
+    # Suggestion snapshots are cached per scope in-process; don't let one
+    # test's data leak into another's.
+    from core.api.memory_optimization import reset_suggestion_snapshots
+    reset_suggestion_snapshots()
+    yield
+
 # Session-wide Postgres test container
 @pytest.fixture(scope="session")
 def _test_postgres():
@@ -192,3 +207,23 @@ def client():
     # Provide a default active scope header to tests to avoid many tests failing
     # with 'scope_required' when they don't set an explicit scope.
     return TestClient(app, headers={"X-Active-Scope": "personal"})
+
+
+@pytest.fixture
+def max_queries(db_session):
+    """Query budget: ``with max_queries(5): client.get(...)`` fails the test
+    when the block runs more than 5 statements on the test connection.
+
+    Yields the ``QueryStats``; the failure message lists the most repeated
+    statement shapes, which usually points straight at the N+1 loop.
+    """
+    from contextlib import contextmanager
+    from core.db.query_stats import collect_queries
+
+    @contextmanager
+    def _budget(limit: int):
+        with collect_queries(bind=db_session.connection()) as stats:
+            yield stats
+        assert stats.count <= limit, f"query budget {limit} exceeded:\n{stats.describe()}"
+
+    return _budget
@@ -114,6 +114,63 @@ def test_bulk_move_keyword_conflict(client, org_owner, second_org, db):
     assert len(resp.json()["conflicts"]["keywords"]) == 1
 
 
+
+def test_bulk_move_plan_counts_and_samples_conflicts(client, org_owner, second_org, db, monkeypatch):
+    from core.api import bulk_operations as bo_mod
+    monkeypatch.setattr(bo_mod, "CONFLICT_SAMPLE_SIZE", 2)
+    user, source_org = org_owner
+    dest_org = second_org
+    for name in ("Alpha", "beta", "gamma", "unique"):
+        crud.create_keyword(db, schemas.KeywordCreate(keyword_text=name, visibility_scope="organization", organization_id=source_org.id))
+    for name in ("alpha", "BETA", "Gamma"):
+        crud.create_keyword(db, schemas.KeywordCreate(keyword_text=name, visibility_scope="organization", organization_id=dest_org.id))
+    resp = client.post(
+        f"/bulk-operations/organizations/{source_org.id}/bulk-move",
+        json={"destination_organization_id": str(dest_org.id), "resource_types": ["keywords", "memory_blocks"]},
+        headers=_headers(user.email),
+    )
+    assert resp.status_code == 200
+    plan = resp.json()
+    assert plan["resources_to_move"] == {"keywords": 4, "memory_blocks": 0}
+    assert plan["conflict_counts"] == {"keywords": 3, "memory_blocks": 0}
+    assert len(plan["conflicts"]["keywords"]) == 2
+    assert plan["conflicts"]["memory_blocks"] == []
+
+
+def test_bulk_move_conflicts_are_paged(client, org_owner, second_org, db):
+    user, source_org = org_owner
+    dest_org = second_org
+    for i in range(5):
+        crud.create_agent(db, schemas.AgentCreate(agent_name=f"agent-{i}", visibility_scope="organization", organization_id=source_org.id))
+        crud.create_agent(db, schemas.AgentCreate(agent_name=f"AGENT-{i}", visibility_scope="organization", organization_id=dest_org.id))
+    crud.create_agent(db, schemas.AgentCreate(agent_name="only-in-source", visibility_scope="organization", organization_id=source_org.id))
+    url = f"/bulk-operations/organizations/{source_org.id}/bulk-move/conflicts"
+    body = {"destination_organization_id": str(dest_org.id), "resource_type": "agents", "limit": 2}
+
+    names, cursor, pages = [], None, 0
+    while True:
+        resp = client.post(url, json={**body, "cursor": cursor}, headers=_headers(user.email))
+        assert resp.status_code == 200
+        page = resp.json()
+        names.extend(item["name"] for item in page["items"])
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert sorted(names) == [f"agent-{i}" for i in range(5)]
+    assert pages == 3
+
+
+def test_bulk_move_conflicts_requires_source_membership(client, org_owner, db):
+    _, source_org = org_owner
+    resp = client.post(
+        f"/bulk-operations/organizations/{source_org.id}/bulk-move/conflicts",
+        json={"destination_owner_user_id": str(uuid.uuid4()), "resource_type": "agents"},
+        headers=_headers("outsider@example.com"),
+    )
+    assert resp.status_code == 403
+
 def test_bulk_move_no_dry_run(client, org_owner, second_org, monkeypatch):
     import os
     os.environ["ADMIN_EMAILS"] = "owner_it@example.com"
@@ -186,3 +186,36 @@ def test_get_operation_status_not_found_for_superadmin(db):
             ),
         )
     assert exc.value.status_code == 404
+
+
+def test_cancel_operation_persists_cancel_for_pending_row(db):
+    actor = models.User(email=f"cancel_{uuid.uuid4().hex[:8]}@example.com")
+    db.add(actor); db.commit(); db.refresh(actor)
+    org = create_org(db, name="CancelOrg")
+    op = models.BulkOperation(type="bulk_delete", status="pending", organization_id=org.id, actor_user_id=actor.id)
+    db.add(op); db.commit(); db.refresh(op)
+    context = UserContext(
+        user=actor,
+        current=CurrentUserContext(
+            id=actor.id,
+            email=actor.email,
+            display_name=None,
+            is_superadmin=True,
+            is_beta_access_admin=False,
+            memberships=[],
+            memberships_by_org={},
+            beta_access_status=None,
+        ),
+    )
+
+    result = bulk_operations.cancel_operation(op.id, db=db, user_context=context)
+
+    assert result == {"message": "Operation cancelled successfully"}
+    db.refresh(op)
+    assert op.status == "cancelled"
+    assert op.finished_at is not None
+
+    # A terminal row cannot be cancelled again.
+    with pytest.raises(HTTPException) as exc:
+        bulk_operations.cancel_operation(op.id, db=db, user_context=context)
+    assert exc.value.status_code == 400
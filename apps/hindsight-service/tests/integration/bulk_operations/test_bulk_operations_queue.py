@@ -0,0 +1,156 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.orm import Session
+
+from core import async_bulk_operations
+from core.async_bulk_operations import BulkOperationTask, BulkOperationWorkerPool, claim_next_bulk_operation
+from core.db import models
+
+
+def _seed(db: Session):
+    user = models.User(email=f"queue_{uuid.uuid4().hex[:8]}@example.com")
+    db.add(user); db.commit(); db.refresh(user)
+    org = models.Organization(name=f"QueueOrg {uuid.uuid4().hex[:6]}", slug=f"queue-{uuid.uuid4().hex[:8]}", created_by=user.id)
+    db.add(org); db.commit(); db.refresh(org)
+    return user, org
+
+
+def _queue(db: Session, user, org, status="pending", heartbeat_at=None, attempts=0, worker_id=None):
+    op = models.BulkOperation(
+        type="bulk_delete",
+        status=status,
+        organization_id=org.id,
+        actor_user_id=user.id,
+        request_payload={"resource_types": ["agents"]},
+        heartbeat_at=heartbeat_at,
+        attempts=attempts,
+        worker_id=worker_id,
+    )
+    db.add(op); db.commit(); db.refresh(op)
+    return op
+
+
+def test_claim_pending_operation(db_session: Session):
+    user, org = _seed(db_session)
+    op = _queue(db_session, user, org)
+
+    claimed = claim_next_bulk_operation(db_session, "worker-a")
+
+    assert claimed is not None
+    row, resumed = claimed
+    assert row.id == op.id
+    assert resumed is False
+    assert row.status == "running"
+    assert row.worker_id == "worker-a"
+    assert row.attempts == 1
+    assert row.heartbeat_at is not None
+    # Nothing else is claimable while the lease is fresh.
+    assert claim_next_bulk_operation(db_session, "worker-b") is None
+
+
+def test_claim_resumes_stale_running_operation(db_session: Session):
+    user, org = _seed(db_session)
+    stale = datetime.now(timezone.utc) - timedelta(hours=1)
+    op = _queue(db_session, user, org, status="running", heartbeat_at=stale, attempts=1, worker_id="dead")
+
+    claimed = claim_next_bulk_operation(db_session, "worker-b", heartbeat_timeout_seconds=60)
+
+    assert claimed is not None
+    row, resumed = claimed
+    assert row.id == op.id
+    assert resumed is True
+    assert row.worker_id == "worker-b"
+    assert row.attempts == 2
+
+
+def test_claim_skips_non_queued_and_terminal_rows(db_session: Session):
+    user, org = _seed(db_session)
+    _queue(db_session, user, org, status="running", heartbeat_at=datetime.now(timezone.utc), worker_id="alive")
+    _queue(db_session, user, org, status="cancelled")
+    compact = _queue(db_session, user, org)
+    compact.type = "bulk_compact"
+    db_session.commit()
+
+    assert claim_next_bulk_operation(db_session, "worker-a") is None
+
+
+def test_claim_fails_operation_over_max_attempts(db_session: Session, monkeypatch):
+    monkeypatch.setattr(async_bulk_operations, "BULK_OPERATION_MAX_ATTEMPTS", 2)
+    user, org = _seed(db_session)
+    stale = datetime.now(timezone.utc) - timedelta(hours=1)
+    op = _queue(db_session, user, org, status="running", heartbeat_at=stale, attempts=2, worker_id="dead")
+
+    assert claim_next_bulk_operation(db_session, "worker-a", heartbeat_timeout_seconds=60) is None
+
+    db_session.refresh(op)
+    assert op.status == "failed"
+    assert op.finished_at is not None
+    assert op.error_log == {"errors": ["abandoned after 2 attempts"]}
+
+
+def test_lease_renewal_fails_once_the_row_is_reclaimed(db_session: Session):
+    user, org = _seed(db_session)
+    stale = datetime.now(timezone.utc) - timedelta(hours=1)
+    op = _queue(db_session, user, org, status="running", heartbeat_at=stale, attempts=1, worker_id="slow")
+    task = BulkOperationTask(op.id, op.type, user.id, org.id, {}, worker_id="slow")
+    task._heartbeat_at = stale
+
+    assert task._renew_lease(db_session) is True
+    db_session.commit()
+    renewed = task._heartbeat_at
+    assert renewed > stale
+
+    # The row is claimed by another worker after the heartbeat went stale.
+    db_session.query(models.BulkOperation).filter_by(id=op.id).update(
+        {"worker_id": "worker-b", "heartbeat_at": renewed + timedelta(seconds=1)}
+    )
+    db_session.commit()
+
+    assert task._renew_lease(db_session) is False
+    assert task.lease_lost is True
+    db_session.rollback()
+    db_session.refresh(op)
+    assert op.worker_id == "worker-b"
+
+
+def test_pool_stop_leaves_the_row_for_another_worker(db_session: Session, monkeypatch):
+    user, org = _seed(db_session)
+    db_session.add_all([
+        models.Agent(agent_name=f"Stop {i}", visibility_scope="organization", organization_id=org.id)
+        for i in range(3)
+    ])
+    db_session.commit()
+    _queue(db_session, user, org)
+    op, _ = claim_next_bulk_operation(db_session, "worker-a")
+
+    pool = BulkOperationWorkerPool(workers=1)
+    task = BulkOperationTask(op.id, op.type, user.id, org.id, dict(op.request_payload), chunk_size=1, worker_id="worker-a")
+    pool._active[op.id] = task
+    real_delete_rows = BulkOperationTask._delete_agent_rows
+
+    def delete_then_stop(self, db, org_id, ids):
+        # The process shuts down (graceful restart) while the first chunk runs.
+        pool.stop(timeout=0)
+        return real_delete_rows(self, db, org_id, ids)
+
+    monkeypatch.setattr(BulkOperationTask, "_delete_agent_rows", delete_then_stop)
+    result = asyncio.run(task._perform_bulk_delete(db_session))
+
+    assert result["interrupted"] is True
+    db_session.refresh(op)
+    assert (op.status, op.progress, op.finished_at) == ("running", 1, None)
+
+    # Once its heartbeat is stale another worker resumes it.
+    monkeypatch.setattr(BulkOperationTask, "_delete_agent_rows", real_delete_rows)
+    claimed = claim_next_bulk_operation(db_session, "worker-b", heartbeat_timeout_seconds=0)
+    assert claimed is not None
+    row, resumed = claimed
+    assert (row.id, resumed) == (op.id, True)
+    resumed_task = BulkOperationTask(row.id, row.type, user.id, org.id, dict(row.request_payload), worker_id="worker-b", resume=True)
+    asyncio.run(resumed_task._perform_bulk_delete(db_session))
+
+    db_session.refresh(op)
+    assert (op.status, op.progress) == ("completed", 3)
+    assert db_session.query(models.Agent).filter_by(organization_id=org.id).count() == 0
@@ -85,25 +85,23 @@ async def test_bulk_delete_operation_with_error(db_session: Session, monkeypatch
     # Create a bulk delete op
     op = _create_bulk_operation(db, "delete", org.id, user.id)
 
-    # Monkeypatch delete_agent to raise for one agent
-    real_delete_agent = crud.delete_agent
-    def fake_delete_agent(db_, agent_id):
-        if agent_id == agent_fail.agent_id:
+    # Fail the chunk that contains agent_fail; chunk_size=1 isolates it.
+    real_delete_rows = BulkOperationTask._delete_agent_rows
+    def fake_delete_rows(self, db_, org_id, ids):
+        if agent_fail.agent_id in ids:
             raise RuntimeError("simulated delete failure")
-        return real_delete_agent(db_, agent_id)
-    crud.delete_agent = fake_delete_agent
+        return real_delete_rows(self, db_, org_id, ids)
+    monkeypatch.setattr(BulkOperationTask, "_delete_agent_rows", fake_delete_rows)
 
-    try:
-        task = BulkOperationTask(
-            operation_id=op.id,
-            task_type="bulk_delete",
-            actor_user_id=user.id,
-            organization_id=org.id,
-            payload={"resource_types": ["agents"]},
-        )
-        await task._perform_bulk_delete(db)
-    finally:
-        crud.delete_agent = real_delete_agent
+    task = BulkOperationTask(
+        operation_id=op.id,
+        task_type="bulk_delete",
+        actor_user_id=user.id,
+        organization_id=org.id,
+        payload={"resource_types": ["agents"]},
+        chunk_size=1,
+    )
+    await task._perform_bulk_delete(db)
 
     try:
         db.refresh(op)
@@ -122,3 +120,114 @@ async def test_bulk_delete_operation_with_error(db_session: Session, monkeypatch
             pass  # Operation completed but session rolled back
         else:
             raise
+
+
+@pytest.mark.asyncio
+async def test_bulk_move_chunks_record_progress(db_session: Session):
+    db = db_session
+    user = models.User(email="bulk_chunk_user@example.com")
+    db.add(user); db.commit(); db.refresh(user)
+    src_org = models.Organization(name="ChunkSrc", slug="chunk-src", created_by=user.id)
+    dst_org = models.Organization(name="ChunkDst", slug="chunk-dst", created_by=user.id)
+    db.add_all([src_org, dst_org]); db.commit()
+
+    agent = models.Agent(agent_name="ChunkAgent", organization_id=src_org.id, owner_user_id=user.id, visibility_scope="organization")
+    db.add(agent); db.commit(); db.refresh(agent)
+    blocks = [
+        models.MemoryBlock(agent_id=agent.agent_id, conversation_id=uuid.uuid4(), content=f"chunk {i}",
+                           organization_id=src_org.id, owner_user_id=user.id, visibility_scope="organization")
+        for i in range(5)
+    ]
+    db.add_all(blocks); db.commit()
+
+    op = _create_bulk_operation(db, "move", src_org.id, user.id)
+    task = BulkOperationTask(
+        operation_id=op.id,
+        task_type="bulk_move",
+        actor_user_id=user.id,
+        organization_id=src_org.id,
+        payload={"destination_organization_id": dst_org.id, "resource_types": ["memory_blocks"]},
+        chunk_size=2,
+    )
+    result = await task._perform_bulk_move(db)
+
+    db.refresh(op)
+    assert result["total_moved"] == 5
+    assert op.status == "completed"
+    assert op.total == 5
+    assert op.progress == 5
+    moved = db.query(models.MemoryBlock).filter(models.MemoryBlock.organization_id == dst_org.id).count()
+    assert moved == 5
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete_stops_when_row_cancelled(db_session: Session, monkeypatch):
+    db = db_session
+    user = models.User(email="bulk_cancel_user@example.com")
+    db.add(user); db.commit(); db.refresh(user)
+    org = models.Organization(name="CancelOrg", slug="cancel-org", created_by=user.id)
+    db.add(org); db.commit()
+    keywords = [
+        models.Keyword(keyword_text=f"cancel-kw-{i}", organization_id=org.id, owner_user_id=user.id, visibility_scope="organization")
+        for i in range(3)
+    ]
+    db.add_all(keywords); db.commit()
+
+    op = _create_bulk_operation(db, "delete", org.id, user.id)
+    task = BulkOperationTask(
+        operation_id=op.id,
+        task_type="bulk_delete",
+        actor_user_id=user.id,
+        organization_id=org.id,
+        payload={"resource_types": ["keywords"]},
+        chunk_size=1,
+    )
+
+    # Another replica flips the row to cancelled after the first chunk.
+    real_delete_rows = BulkOperationTask._delete_keyword_rows
+    def delete_then_cancel(self, db_, org_id, ids):
+        count = real_delete_rows(self, db_, org_id, ids)
+        db_.query(models.BulkOperation).filter(models.BulkOperation.id == op.id).update(
+            {"status": "cancelled"}, synchronize_session=False
+        )
+        return count
+    monkeypatch.setattr(BulkOperationTask, "_delete_keyword_rows", delete_then_cancel)
+
+    result = await task._perform_bulk_delete(db)
+
+    db.refresh(op)
+    assert result["total_deleted"] == 1
+    assert op.status == "cancelled"
+    assert db.query(models.Keyword).filter(models.Keyword.organization_id == org.id).count() == 2
+
+
+@pytest.mark.asyncio
+async def test_bulk_move_leaves_name_conflicts_behind(db_session: Session):
+    db = db_session
+    user = models.User(email="bulk_move_conflict@example.com")
+    db.add(user); db.commit(); db.refresh(user)
+    src_org = models.Organization(name="ConflictSrc", slug="conflict-src", created_by=user.id)
+    dst_org = models.Organization(name="ConflictDst", slug="conflict-dst", created_by=user.id)
+    db.add_all([src_org, dst_org]); db.commit(); db.refresh(src_org); db.refresh(dst_org)
+
+    clash = models.Agent(agent_name="Planner", organization_id=src_org.id, owner_user_id=user.id, visibility_scope="organization")
+    free = models.Agent(agent_name="Reviewer", organization_id=src_org.id, owner_user_id=user.id, visibility_scope="organization")
+    taken = models.Agent(agent_name="planner", organization_id=dst_org.id, owner_user_id=user.id, visibility_scope="organization")
+    db.add_all([clash, free, taken]); db.commit()
+
+    op = _create_bulk_operation(db, "bulk_move", src_org.id, user.id)
+    task = BulkOperationTask(
+        operation_id=op.id,
+        task_type="bulk_move",
+        actor_user_id=user.id,
+        organization_id=src_org.id,
+        payload={"destination_organization_id": dst_org.id, "resource_types": ["agents"]},
+    )
+    result = await task._perform_bulk_move(db)
+
+    assert result["total_moved"] == 1
+    db.refresh(op); db.refresh(clash); db.refresh(free)
+    assert free.organization_id == dst_org.id
+    assert clash.organization_id == src_org.id
+    assert op.status == "failed"
+    assert op.error_log["errors"] == [f"1 agents not moved, name already exists in the destination: {clash.agent_id}"]
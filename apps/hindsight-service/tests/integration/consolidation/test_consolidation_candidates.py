@@ -0,0 +1,106 @@
+import uuid
+
+from core.db import models
+from core.services.consolidation_candidates import partition_key
+from core.workers.consolidation_worker import find_duplicate_groups
+
+
+TEXT = (
+    "Deploy failed because the migration locked the users table for ten minutes; "
+    "run long migrations with lock_timeout and split backfills into batches"
+)
+
+
+def _user(db):
+    user = models.User(email=f"cand_{uuid.uuid4().hex}@example.com", display_name="Cand")
+    db.add(user)
+    db.flush()
+    return user
+
+
+def _block(db, owner, content, **scope):
+    agent = models.Agent(agent_name=f"Agent {uuid.uuid4().hex[:6]}", owner_user_id=owner.id)
+    db.add(agent)
+    db.flush()
+    block = models.MemoryBlock(
+        agent_id=agent.agent_id,
+        conversation_id=uuid.uuid4(),
+        content=content,
+        lessons_learned="",
+        visibility_scope=scope.get("visibility_scope", "personal"),
+        owner_user_id=owner.id,
+        organization_id=scope.get("organization_id"),
+        content_embedding=scope.get("embedding"),
+    )
+    db.add(block)
+    db.flush()
+    return {
+        "id": block.id,
+        "content": block.content,
+        "lessons_learned": block.lessons_learned,
+        "visibility_scope": block.visibility_scope,
+        "owner_user_id": block.owner_user_id,
+        "organization_id": block.organization_id,
+    }
+
+
+def test_duplicates_in_different_batches_are_grouped(db_session):
+    owner = _user(db_session)
+    first = _block(db_session, owner, TEXT)
+    unrelated = _block(db_session, owner, "Quarterly planning notes about hiring and roadmap themes")
+    second = _block(db_session, owner, TEXT + " immediately")
+
+    assert find_duplicate_groups(db_session, [first, unrelated]) == []
+    groups = find_duplicate_groups(db_session, [second])
+
+    assert len(groups) == 1
+    assert sorted(groups[0]["memory_ids"]) == sorted([str(first["id"]), str(second["id"])])
+
+
+def test_candidates_never_cross_owner_partition(db_session):
+    alice, bob = _user(db_session), _user(db_session)
+    mine = _block(db_session, alice, TEXT)
+    theirs = _block(db_session, bob, TEXT)
+
+    assert find_duplicate_groups(db_session, [mine, theirs]) == []
+    stored = {
+        row.memory_id: row.partition_key
+        for row in db_session.query(models.MemoryBlockMinHash).filter(
+            models.MemoryBlockMinHash.memory_id.in_([mine["id"], theirs["id"]])
+        )
+    }
+    assert stored[mine["id"]] == partition_key("personal", None, alice.id)
+    assert stored[theirs["id"]] != stored[mine["id"]]
+
+
+def test_unchanged_blocks_are_not_reindexed(db_session):
+    from core.services.consolidation_candidates import refresh_minhash_index
+
+    owner = _user(db_session)
+    block = _block(db_session, owner, TEXT)
+
+    assert refresh_minhash_index(db_session, [block]) == [block["id"]]
+    assert refresh_minhash_index(db_session, [block]) == []
+    block["content"] = "Completely different text about caching strategies"
+    assert refresh_minhash_index(db_session, [block]) == [block["id"]]
+
+
+def test_embedding_neighbours_group_reworded_duplicates(db_session):
+    owner = _user(db_session)
+    first = _block(db_session, owner, "Cache warmup avoided cold start latency", embedding=[1.0, 0.0, 0.0])
+    reworded = _block(db_session, owner, "Prefilling caches removed slow first requests", embedding=[0.99, 0.05, 0.0])
+    distinct = _block(db_session, owner, "Hiring plan for next quarter", embedding=[0.0, 1.0, 0.0])
+
+    groups = find_duplicate_groups(db_session, [first, reworded, distinct])
+
+    assert [sorted(group["memory_ids"]) for group in groups] == [sorted([str(first["id"]), str(reworded["id"])])]
+
+
+def test_embedding_neighbours_stay_inside_owner_partition(db_session):
+    from core.services.consolidation_candidates import embedding_candidate_pairs
+
+    alice, bob = _user(db_session), _user(db_session)
+    mine = _block(db_session, alice, "Cache warmup avoided cold start latency", embedding=[1.0, 0.0, 0.0])
+    theirs = _block(db_session, bob, "Prefilling caches removed slow first requests", embedding=[1.0, 0.0, 0.0])
+
+    assert embedding_candidate_pairs(db_session, [mine["id"], theirs["id"]]) == []
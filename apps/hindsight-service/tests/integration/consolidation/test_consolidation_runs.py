@@ -0,0 +1,111 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from core.db import models
+from core.db.repositories.consolidation_runs import (
+    checkpoint_consolidation_run,
+    claim_consolidation_run,
+    finish_consolidation_run,
+    get_memory_block_rows,
+    get_memory_blocks_since,
+)
+
+
+def _block(db, owner, updated_at, **fields):
+    agent = models.Agent(agent_name=f"Agent {uuid.uuid4().hex[:6]}", owner_user_id=owner.id)
+    db.add(agent)
+    db.flush()
+    block = models.MemoryBlock(
+        agent_id=agent.agent_id,
+        conversation_id=uuid.uuid4(),
+        content="note",
+        visibility_scope="personal",
+        owner_user_id=owner.id,
+        **fields,
+    )
+    db.add(block)
+    db.flush()
+    # onupdate would stamp now(); pin the timestamp the test reasons about.
+    db.query(models.MemoryBlock).filter(models.MemoryBlock.id == block.id).update(
+        {"updated_at": updated_at}, synchronize_session=False
+    )
+    return block
+
+
+def _owner(db):
+    user = models.User(email=f"runs_{uuid.uuid4().hex}@example.com", display_name="Runs")
+    db.add(user)
+    db.flush()
+    return user
+
+
+def test_delta_uses_keyset_order_and_skips_archived(db_session):
+    owner = _owner(db_session)
+    base = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    first = _block(db_session, owner, base)
+    _block(db_session, owner, base + timedelta(seconds=1), archived=True)
+    second = _block(db_session, owner, base + timedelta(seconds=2))
+    later = _block(db_session, owner, base + timedelta(hours=1))
+
+    start = (base - timedelta(microseconds=1), None)
+    batch = get_memory_blocks_since(db_session, start, limit=10, until=base + timedelta(minutes=1))
+    assert [b["id"] for b in batch] == [first.id, second.id]
+
+    after_first = get_memory_blocks_since(db_session, (base, first.id), limit=10, until=base + timedelta(hours=2))
+    assert [b["id"] for b in after_first] == [second.id, later.id]
+
+
+def test_new_run_starts_from_previous_watermark(db_session):
+    claimed = claim_consolidation_run(db_session, heartbeat_timeout_seconds=60)
+    assert claimed is not None
+    run, resumed = claimed
+    assert not resumed
+
+    # A live run blocks a second worker.
+    assert claim_consolidation_run(db_session, heartbeat_timeout_seconds=60) is None
+
+    mark = (datetime(2030, 1, 1, tzinfo=timezone.utc), uuid.uuid4())
+    checkpoint_consolidation_run(db_session, run, mark, blocks=5, groups_found=2, groups_skipped=1, suggestions_created=1)
+    finish_consolidation_run(db_session, run, "completed")
+
+    assert (run.blocks_processed, run.batches_processed, run.groups_skipped) == (5, 1, 1)
+    next_run, resumed = claim_consolidation_run(db_session, heartbeat_timeout_seconds=60)
+    assert not resumed
+    assert next_run.id != run.id
+    assert (next_run.watermark_updated_at, next_run.watermark_id) == mark
+
+
+def test_stale_run_is_resumed_from_checkpoint(db_session):
+    run, _ = claim_consolidation_run(db_session, heartbeat_timeout_seconds=60)
+    mark = (datetime(2030, 1, 1, tzinfo=timezone.utc), uuid.uuid4())
+    checkpoint_consolidation_run(db_session, run, mark, blocks=3)
+    run.heartbeat_at = datetime.now(timezone.utc) - timedelta(hours=1)
+    db_session.commit()
+
+    resumed_run, resumed = claim_consolidation_run(db_session, heartbeat_timeout_seconds=60)
+
+    assert resumed
+    assert resumed_run.id == run.id
+    assert resumed_run.attempts == 2
+    assert resumed_run.blocks_processed == 3
+    assert (resumed_run.watermark_updated_at, resumed_run.watermark_id) == mark
+
+
+def test_block_rows_are_plain_dicts_with_keyword_texts(db_session):
+    owner = _owner(db_session)
+    block = _block(db_session, owner, datetime(2030, 1, 1, tzinfo=timezone.utc), lessons_learned="ll")
+    for text in ("beta", "alpha"):
+        keyword = models.Keyword(keyword_text=f"{text}-{uuid.uuid4().hex[:6]}", owner_user_id=owner.id)
+        db_session.add(keyword)
+        db_session.flush()
+        db_session.add(models.MemoryBlockKeyword(memory_id=block.id, keyword_id=keyword.keyword_id))
+    db_session.flush()
+
+    [row] = get_memory_block_rows(db_session, [block.id])
+
+    assert set(row) == {
+        "id", "updated_at", "visibility_scope", "owner_user_id", "organization_id",
+        "content", "lessons_learned", "keywords",
+    }
+    assert [kw.split("-")[0] for kw in row["keywords"]] == ["alpha", "beta"]
+    assert row["owner_user_id"] == owner.id
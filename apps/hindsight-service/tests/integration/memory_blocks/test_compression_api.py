@@ -35,3 +35,64 @@ def test_compress_memory_block_not_found(monkeypatch):
     r = client.post(f"/memory-blocks/00000000-0000-0000-0000-000000000000/compress", headers=auth())
     assert r.status_code in (400, 500)
 
+
+
+def test_bulk_compact_uses_llm_gateway(monkeypatch, db_session):
+    import json as _json
+    import uuid as _uuid
+    from sqlalchemy.orm import Session
+    from core.db import database
+    from core.services import llm_gateway
+
+    # The endpoint reads and writes on its own sessions; share the test
+    # connection so they see the blocks created below.
+    monkeypatch.setattr(
+        database, "SessionLocal",
+        lambda: Session(bind=db_session.connection(), join_transaction_mode="create_savepoint"),
+    )
+
+    def responder(prompt, config):
+        return _json.dumps({"compressed_content": "short", "compressed_lessons_learned": "tiny"})
+
+    gateway = llm_gateway.LLMGateway(
+        llm_gateway.LLMGatewayConfig(provider="stub", requests_per_minute=0, backoff_seconds=0, cache_enabled=False),
+        provider=llm_gateway.StubLLMProvider(responder),
+    )
+    llm_gateway.reset_llm_gateway_for_tests(gateway)
+    monkeypatch.setenv("LLM_API_KEY", "fake")
+    try:
+        headers = auth("bulkcomp@example.com", "BulkComp")
+        agent_resp = client.post("/agents/", json={"agent_name": "BulkCompAgent", "visibility_scope": "personal"}, headers=headers)
+        assert agent_resp.status_code == 201, agent_resp.text
+        agent_id = agent_resp.json()["agent_id"]
+        ids = []
+        for i in range(3):
+            mb = client.post("/memory-blocks/", json={
+                "content": f"A rather long piece of content number {i} that can be compressed",
+                "lessons_learned": "Some verbose lessons learned text",
+                "visibility_scope": "personal",
+                "agent_id": agent_id,
+                "conversation_id": str(_uuid.uuid4()),
+            }, headers=headers)
+            assert mb.status_code == 201, mb.text
+            ids.append(mb.json()["id"])
+
+        missing = str(_uuid.uuid4())
+        r = client.post("/memory-blocks/bulk-compact", json={
+            "memory_block_ids": ids + [missing, "not-a-uuid"],
+            "max_concurrent": 2,
+        }, headers=headers)
+        assert r.status_code == 200, r.text
+        body = r.json()
+        assert body["successful_count"] == 3
+        assert body["failed_count"] == 2
+        by_id = {item["memory_block_id"]: item for item in body["results"]}
+        assert by_id["not-a-uuid"]["error"] == "Invalid UUID format"
+        assert "does not exist" in by_id[missing]["error"]
+        assert gateway.provider.calls == 3
+        assert gateway.metrics()["compression"]["calls"] == 3
+
+        fetched = client.get(f"/memory-blocks/{ids[0]}", headers=headers)
+        assert fetched.json()["content"] == "short"
+    finally:
+        llm_gateway.reset_llm_gateway_for_tests()
@@ -60,3 +60,68 @@ def test_consolidation_full_flow(db_session):
     assert crud.delete_consolidation_suggestion(db, suggestion.suggestion_id) is True
     # Deleting again is False
     assert crud.delete_consolidation_suggestion(db, suggestion.suggestion_id) is False
+
+
+def _create_suggestion(db, *blocks, status="pending"):
+    return crud.create_consolidation_suggestion(db, schemas.ConsolidationSuggestionCreate(
+        group_id=uuid.uuid4(),
+        suggested_content="c",
+        suggested_lessons_learned="l",
+        suggested_keywords=[],
+        original_memory_ids=[str(b.id) for b in blocks],
+        status=status,
+    ))
+
+
+def test_suggestion_denormalizes_shared_scope(db_session):
+    db = db_session
+    mb1, agent, owner = _seed_memory_block(db, "First")
+    mb2, _, _ = _seed_memory_block(db, "Second", owner=owner, agent=agent)
+    other, _, _ = _seed_memory_block(db, "Other owner")
+
+    shared = _create_suggestion(db, mb1, mb2)
+    mixed = _create_suggestion(db, mb1, other)
+
+    assert (shared.visibility_scope, shared.owner_user_id, shared.organization_id) == ("personal", owner.id, None)
+    assert mixed.visibility_scope is None and mixed.owner_user_id is None
+
+
+def test_pending_overlap_lookup_only_returns_pending_members(db_session):
+    db = db_session
+    mb1, agent, owner = _seed_memory_block(db, "First")
+    mb2, _, _ = _seed_memory_block(db, "Second", owner=owner, agent=agent)
+    mb3, _, _ = _seed_memory_block(db, "Third", owner=owner, agent=agent)
+    _create_suggestion(db, mb1, mb2)
+    _create_suggestion(db, mb3, status="rejected")
+
+    pending = crud.get_pending_suggestion_memory_ids(db, [str(mb1.id), str(mb3.id), str(uuid.uuid4())])
+
+    assert pending == {str(mb1.id)}
+    assert crud.get_pending_suggestion_memory_ids(db, []) == set()
+
+
+def test_resync_follows_moved_originals(db_session):
+    db = db_session
+    mb1, agent, owner = _seed_memory_block(db, "First")
+    mb2, _, _ = _seed_memory_block(db, "Second", owner=owner, agent=agent)
+    org = models.Organization(name=f"Resync {uuid.uuid4().hex[:6]}", slug=f"resync-{uuid.uuid4().hex[:6]}")
+    db.add(org); db.commit()
+    suggestion = _create_suggestion(db, mb1, mb2)
+    rejected = _create_suggestion(db, mb1, status="rejected")
+
+    def move(*blocks):
+        # Set-based, as the bulk move does it.
+        db.query(models.MemoryBlock).filter(models.MemoryBlock.id.in_([b.id for b in blocks])).update(
+            {"visibility_scope": "organization", "organization_id": org.id, "owner_user_id": None},
+            synchronize_session=False,
+        )
+        return crud.resync_suggestion_scopes(db, [b.id for b in blocks])
+
+    # Half moved: the originals no longer share a scope.
+    assert move(mb1) == 1
+    assert suggestion.visibility_scope is None and suggestion.owner_user_id is None
+
+    assert move(mb2) == 1
+    assert (suggestion.visibility_scope, suggestion.owner_user_id, suggestion.organization_id) == ("organization", None, org.id)
+    # Only pending suggestions are touched.
+    assert (rejected.visibility_scope, rejected.owner_user_id) == ("personal", owner.id)
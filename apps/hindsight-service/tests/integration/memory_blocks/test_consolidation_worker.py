@@ -3,87 +3,40 @@ from unittest.mock import Mock, patch, MagicMock
 import uuid
 from core.workers.consolidation_worker import (
     fetch_memory_blocks,
-    analyze_duplicates_with_fallback,
+    generate_group_suggestions,
     store_consolidation_suggestions,
     run_consolidation_analysis,
-    analyze_duplicates_with_llm
 )
 
 
 class TestConsolidationWorker:
 
-    @patch('core.workers.consolidation_worker.get_all_memory_blocks')
+    @patch('core.workers.consolidation_worker.get_memory_blocks_since')
     def test_fetch_memory_blocks_success(self, mock_get_all):
-        # Mock memory blocks as objects with __dict__
-        class MockBlock:
-            def __init__(self, id_val, content):
-                self.id = id_val
-                self.content = content
-
+        # The repository returns lightweight row dicts
         mock_blocks = [
-            MockBlock(uuid.uuid4(), 'Test content 1'),
-            MockBlock(uuid.uuid4(), 'Test content 2')
+            {'id': uuid.uuid4(), 'content': 'Test content 1'},
+            {'id': uuid.uuid4(), 'content': 'Test content 2'},
         ]
         mock_get_all.return_value = mock_blocks
 
         db = Mock()
-        result = fetch_memory_blocks(db, 0, 100)
+        result = fetch_memory_blocks(db, (None, None), 100)
 
         assert len(result) == 2
         assert 'id' in result[0]
         assert 'content' in result[0]
-        mock_get_all.assert_called_once_with(db, skip=0, limit=100)
+        mock_get_all.assert_called_once_with(db, (None, None), 100, None)
 
-    @patch('core.workers.consolidation_worker.get_all_memory_blocks')
+    @patch('core.workers.consolidation_worker.get_memory_blocks_since')
     def test_fetch_memory_blocks_empty(self, mock_get_all):
         mock_get_all.return_value = []
 
         db = Mock()
-        result = fetch_memory_blocks(db, 0, 100)
-
-        assert result == []
+        result = fetch_memory_blocks(db, (None, None), 100)
 
-    def test_analyze_duplicates_with_fallback_no_blocks(self):
-        result = analyze_duplicates_with_fallback([])
         assert result == []
 
-    def test_analyze_duplicates_with_fallback_single_block(self):
-        blocks = [{'id': uuid.uuid4(), 'content': 'Single content'}]
-        result = analyze_duplicates_with_fallback(blocks)
-        assert result == []
-
-    def test_analyze_duplicates_with_fallback_with_duplicates(self):
-        block1_id = uuid.uuid4()
-        block2_id = uuid.uuid4()
-        blocks = [
-            {'id': block1_id, 'content': 'This is a test content about AI', 'lessons_learned': 'AI is powerful'},
-            {'id': block2_id, 'content': 'This is a test content about AI', 'lessons_learned': 'AI is very powerful'}
-        ]
-
-        result = analyze_duplicates_with_fallback(blocks)
-
-        # Should find at least one group with both blocks
-        assert len(result) >= 1
-        group = result[0]
-        assert 'group_id' in group
-        assert 'memory_ids' in group
-        assert len(group['memory_ids']) > 1
-        assert str(block1_id) in group['memory_ids']
-        assert str(block2_id) in group['memory_ids']
-
-    def test_analyze_duplicates_with_fallback_no_duplicates(self):
-        block1_id = uuid.uuid4()
-        block2_id = uuid.uuid4()
-        blocks = [
-            {'id': block1_id, 'content': 'This is about cats', 'lessons_learned': 'Cats are cute'},
-            {'id': block2_id, 'content': 'This is about quantum physics', 'lessons_learned': 'Physics is complex'}
-        ]
-
-        result = analyze_duplicates_with_fallback(blocks)
-
-        # Should find no groups
-        assert len(result) == 0
-
     @patch('core.workers.consolidation_worker.create_consolidation_suggestion')
     @patch('core.db.models.ConsolidationSuggestion')
     def test_store_consolidation_suggestions_success(self, mock_suggestion_model, mock_create):
@@ -126,18 +79,11 @@ class TestConsolidationWorker:
             }
         ]
 
-        # Mock existing suggestion with overlapping memory ID
-        mock_existing = Mock()
-        mock_existing.original_memory_ids = [memory_id]
-        
-        # Mock the database query chain
-        mock_query = Mock()
-        mock_filtered = Mock()
-        db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_filtered
-        mock_filtered.all.return_value = [mock_existing]
+        # An existing pending suggestion already covers memory_id
+        with patch('core.workers.consolidation_worker.get_pending_suggestion_memory_ids', return_value={memory_id}) as mock_pending:
+            result = store_consolidation_suggestions(db, groups)
 
-        result = store_consolidation_suggestions(db, groups)
+        mock_pending.assert_called_once_with(db, set(groups[0]['memory_ids']))
 
         assert result == 0
         mock_create.assert_not_called()
@@ -168,11 +114,21 @@ class TestConsolidationWorker:
         assert result == 0
         mock_create.assert_not_called()
 
+    @patch.multiple(
+        'core.workers.consolidation_worker',
+        claim_consolidation_run=Mock(return_value=(Mock(watermark_updated_at=None, watermark_id=None), False)),
+        checkpoint_consolidation_run=Mock(),
+        finish_consolidation_run=Mock(),
+        get_pending_suggestion_memory_ids=Mock(return_value=set()),
+        delete_archived_minhash_entries=Mock(return_value=0),
+    )
     @patch('core.workers.consolidation_worker.fetch_memory_blocks')
-    @patch('core.workers.consolidation_worker.analyze_duplicates_with_llm')
+    @patch('core.workers.consolidation_worker.find_duplicate_groups')
+    @patch('core.workers.consolidation_worker.load_group_blocks')
+    @patch('core.workers.consolidation_worker.generate_group_suggestions')
     @patch('core.workers.consolidation_worker.store_consolidation_suggestions')
     @patch('core.workers.consolidation_worker.get_db')
-    def test_run_consolidation_analysis_full_cycle(self, mock_get_db, mock_store, mock_analyze, mock_fetch):
+    def test_run_consolidation_analysis_full_cycle(self, mock_get_db, mock_store, mock_analyze, mock_load, mock_find, mock_fetch):
         # Mock database
         db = Mock()
         mock_get_db.return_value = iter([db])
@@ -183,6 +139,9 @@ class TestConsolidationWorker:
             []
         ]
 
+        mock_find.return_value = [{'group_id': str(uuid.uuid4()), 'memory_ids': [str(uuid.uuid4()), str(uuid.uuid4())]}]
+        mock_load.return_value = []
+
         # Mock analysis returning groups
         mock_analyze.return_value = [
             {
@@ -205,8 +164,16 @@ class TestConsolidationWorker:
         mock_store.assert_called_once()
         db.close.assert_called_once()
 
+    @patch.multiple(
+        'core.workers.consolidation_worker',
+        claim_consolidation_run=Mock(return_value=(Mock(watermark_updated_at=None, watermark_id=None), False)),
+        checkpoint_consolidation_run=Mock(),
+        finish_consolidation_run=Mock(),
+        get_pending_suggestion_memory_ids=Mock(return_value=set()),
+        delete_archived_minhash_entries=Mock(return_value=0),
+    )
     @patch('core.workers.consolidation_worker.fetch_memory_blocks')
-    @patch('core.workers.consolidation_worker.analyze_duplicates_with_llm')
+    @patch('core.workers.consolidation_worker.generate_group_suggestions')
     @patch('core.workers.consolidation_worker.store_consolidation_suggestions')
     @patch('core.workers.consolidation_worker.get_db')
     def test_run_consolidation_analysis_no_blocks(self, mock_get_db, mock_store, mock_analyze, mock_fetch):
@@ -225,30 +192,25 @@ class TestConsolidationWorker:
         db.close.assert_called_once()
 
     @patch('google.genai.Client')
-    def test_analyze_duplicates_with_llm_success(self, mock_client_class):
+    def test_generate_group_suggestions_success(self, mock_client_class):
         mock_client = MagicMock()
         mock_client_class.return_value = mock_client
         mock_response = MagicMock()
         mock_response.text = '{"suggested_content": "consolidated", "suggested_lessons_learned": "lessons", "suggested_keywords": ["kw"]}'
         mock_client.models.generate_content.return_value = mock_response
-        
+
         memory_blocks = [{"id": "1", "content": "test", "lessons_learned": "lesson", "keywords": []}]
-        with patch('core.workers.consolidation_worker.analyze_duplicates_with_fallback', return_value=[{"group_id": "test-group", "memory_ids": ["1"]}]):
-            with patch.dict('os.environ', {'LLM_MODEL_NAME': 'test-model'}):
-                result = analyze_duplicates_with_llm(memory_blocks, "fake_key")
-                assert len(result) == 1
-                assert result[0]["group_id"] == "test-group"
+        with patch.dict('os.environ', {'LLM_MODEL_NAME': 'test-model'}):
+            result = generate_group_suggestions([{"group_id": "test-group", "memory_ids": ["1"]}], memory_blocks, "fake_key")
+            assert len(result) == 1
+            assert result[0]["group_id"] == "test-group"
 
     @patch('google.genai.Client')
-    def test_analyze_duplicates_with_llm_no_model_name(self, mock_client_class):
+    def test_generate_group_suggestions_no_model_name(self, mock_client_class):
         memory_blocks = [{"id": "1", "content": "test"}]
-        with patch('core.workers.consolidation_worker.analyze_duplicates_with_fallback', return_value=[{"group_id": "test", "memory_ids": ["1"]}]):
-            with patch.dict('os.environ', {}, clear=True):
-                result = analyze_duplicates_with_llm(memory_blocks, "fake_key")
-                # Should return the original groups without LLM suggestions
-                assert result == [{"group_id": "test", "memory_ids": ["1"]}]
-
-    def test_analyze_duplicates_with_llm_no_api_key(self):
-        memory_blocks = [{"id": "1", "content": "test"}]
-        result = analyze_duplicates_with_llm(memory_blocks, "")
-        assert result == []
+        with patch.dict('os.environ', {}, clear=True):
+            result = generate_group_suggestions([{"group_id": "test", "memory_ids": ["1"]}], memory_blocks, "fake_key")
+            # Should return the original groups, flagged for retry
+            assert len(result) == 1
+            assert result[0]["group_id"] == "test"
+            assert "LLM_MODEL_NAME" in result[0]["llm_error"]
@@ -0,0 +1,155 @@
+import json
+from datetime import datetime, timedelta, UTC
+
+from sqlalchemy.orm import Session
+
+from core.db import models
+from core.db.repositories.llm_cache import (
+    count_llm_cache_entries,
+    get_llm_cache_entry,
+    prune_llm_cache,
+    put_llm_cache_entry,
+)
+from core.pruning.pruning_service import PruningService
+from core.services import llm_gateway
+from core.services.llm_gateway import (
+    LLMGateway,
+    LLMGatewayConfig,
+    LLMResultCache,
+    StubLLMProvider,
+    run_sync,
+)
+
+
+def _gateway(db_session, responder=None):
+    # Cache sessions join the test transaction so everything rolls back.
+    cache = LLMResultCache(
+        ttl_seconds=3600,
+        max_entries=100,
+        session_factory=lambda: Session(bind=db_session.connection(), join_transaction_mode="create_savepoint"),
+    )
+    config = LLMGatewayConfig(provider="stub", requests_per_minute=0, backoff_seconds=0, cache_enabled=True)
+    return LLMGateway(config, provider=StubLLMProvider(responder), cache=cache)
+
+
+def test_cache_hit_skips_provider(db_session):
+    gateway = _gateway(db_session, lambda prompt, config: json.dumps({"answer": prompt}))
+
+    first = run_sync(gateway.generate("same prompt", model="m", purpose="compression", template_version="v1"))
+    second = run_sync(gateway.generate("same prompt", model="m", purpose="compression", template_version="v1"))
+
+    assert not first.cached
+    assert second.cached
+    assert second.text == first.text
+    assert gateway.provider.calls == 1
+    assert gateway.metrics()["compression"]["cache_hits"] == 1
+
+    entry = db_session.query(models.LLMResultCache).one()
+    assert entry.hit_count == 1
+    assert entry.template_version == "v1"
+
+
+def test_cache_key_includes_template_version_and_model(db_session):
+    gateway = _gateway(db_session)
+
+    run_sync(gateway.generate("p", model="m", template_version="v1"))
+    run_sync(gateway.generate("p", model="m", template_version="v2"))
+    run_sync(gateway.generate("p", model="other", template_version="v1"))
+    run_sync(gateway.generate("p", model="m"))  # uncached call
+
+    assert gateway.provider.calls == 4
+    assert count_llm_cache_entries(db_session) == 3
+
+
+def test_invalid_json_is_not_cached(db_session):
+    gateway = _gateway(db_session, lambda prompt, config: "{not json")
+
+    run_sync(gateway.generate("p", model="m", template_version="v1"))
+    run_sync(gateway.generate("p", model="m", template_version="v1"))
+
+    assert gateway.provider.calls == 2
+    assert count_llm_cache_entries(db_session) == 0
+
+
+def test_prune_drops_expired_then_least_recently_used(db_session):
+    now = datetime.now(UTC)
+    for i in range(4):
+        put_llm_cache_entry(
+            db_session,
+            cache_key=f"k{i}",
+            model="m",
+            purpose="p",
+            template_version="v1",
+            content_hash=f"h{i}",
+            response_text="{}",
+            ttl_seconds=3600,
+            now=now + timedelta(seconds=i),
+        )
+    put_llm_cache_entry(
+        db_session,
+        cache_key="expired",
+        model="m",
+        purpose="p",
+        template_version="v1",
+        content_hash="hx",
+        response_text="{}",
+        ttl_seconds=1,
+        now=now - timedelta(hours=1),
+    )
+
+    removed = prune_llm_cache(db_session, max_entries=2, now=now + timedelta(seconds=10))
+
+    assert removed == 3
+    keys = {row.cache_key for row in db_session.query(models.LLMResultCache).all()}
+    assert keys == {"k2", "k3"}
+
+
+def test_expired_entries_are_not_returned(db_session):
+    now = datetime.now(UTC)
+    put_llm_cache_entry(
+        db_session,
+        cache_key="k",
+        model="m",
+        purpose="p",
+        template_version="v1",
+        content_hash="h",
+        response_text="{}",
+        ttl_seconds=60,
+        now=now,
+    )
+
+    assert get_llm_cache_entry(db_session, "k", now=now).response_text == "{}"
+    assert get_llm_cache_entry(db_session, "k", now=now + timedelta(minutes=5)) is None
+    assert db_session.query(models.LLMResultCache).one().hit_count == 1
+
+
+def test_pruning_evaluations_are_cached_per_block(db_session):
+    def responder(prompt, config):
+        ids = [line.split(": ", 1)[1] for line in prompt.splitlines() if line.startswith("Memory Block ID: ")]
+        return json.dumps([
+            {"memory_block_id": block_id, "pruning_priority_score": 10, "rationale": "stub"}
+            for block_id in ids
+        ])
+
+    gateway = _gateway(db_session, responder)
+    llm_gateway.reset_llm_gateway_for_tests(gateway)
+    try:
+        service = PruningService(llm_api_key="key")
+        blocks = [
+            {"id": f"block-{i}", "created_at": None, "content": f"content {i}", "lessons_learned": ""}
+            for i in range(3)
+        ]
+
+        first = service.evaluate_memory_blocks_with_llm(blocks[:2])
+        # Usage counters move between samples; they are not part of the key.
+        for block in blocks:
+            block.update(retrieval_count=7, feedback_score=-2)
+        second = service.evaluate_memory_blocks_with_llm(blocks)
+
+        assert not any(block["llm_cache_hit"] for block in first)
+        hits = {block["id"]: block["llm_cache_hit"] for block in second}
+        assert hits == {"block-0": True, "block-1": True, "block-2": False}
+        # The second batch only sent the unseen block to the model.
+        assert gateway.provider.calls == 2
+    finally:
+        llm_gateway.reset_llm_gateway_for_tests()
@@ -103,6 +103,39 @@ def test_bulk_generate_keywords_success(db_session):
     assert isinstance(suggestion["suggested_keywords"], list)
 
 
+
+def test_bulk_generate_keywords_stream(db_session):
+    import json
+    client = TestClient(main_app, headers={"x-active-scope": "personal"})
+    h = _h("streamkeyworduser")
+    agent_id = _create_personal_agent(client, h, name="StreamKeywordAgent")
+    ids = []
+    for content in ("Docker deployment on Kubernetes", "the and of"):
+        r = client.post("/memory-blocks/", json={
+            "agent_id": agent_id,
+            "conversation_id": str(uuid.uuid4()),
+            "content": content,
+            "visibility_scope": "personal",
+        }, headers=h)
+        assert r.status_code == 201
+        ids.append(r.json()["id"])
+
+    r = client.post(
+        "/memory-blocks/bulk-generate-keywords",
+        json={"memory_block_ids": ids + ["not-a-uuid", str(uuid.uuid4())], "stream": True},
+        headers=h,
+    )
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in r.text.splitlines()]
+    assert [line["type"] for line in lines] == ["suggestion", "summary"]
+    assert lines[0]["memory_block_id"] == ids[0]
+    assert "docker" in lines[0]["suggested_keywords"]
+    assert lines[1]["successful_count"] == 1
+    # the stop-word-only block and the malformed id
+    assert lines[1]["failed_count"] == 2
+    assert lines[1]["total_processed"] == 4
+
 def test_bulk_generate_keywords_empty_list(db_session):
     client = TestClient(main_app, headers={"x-active-scope": "personal"})
     h = _h("emptyuser")
@@ -147,6 +180,49 @@ def test_bulk_apply_keywords_success(db_session):
     assert "added_keywords" in result
 
 
+def test_bulk_apply_keywords_is_scoped_and_case_insensitive(db_session):
+    from core.db import models
+
+    client = TestClient(main_app, headers={"x-active-scope": "personal"})
+    other = _h("applyother")
+    client.get("/keywords/", headers=other)
+    other_user = db_session.query(models.User).filter_by(email="applyother@example.com").one()
+    db_session.add(models.Keyword(keyword_text="Retry", visibility_scope="personal", owner_user_id=other_user.id))
+    db_session.commit()
+
+    h = _h("applycase")
+    agent_id = _create_personal_agent(client, h, name="CaseAgent")
+    mb_ids = []
+    for content in ("first block", "second block"):
+        r = client.post("/memory-blocks/", json={
+            "agent_id": agent_id,
+            "conversation_id": str(uuid.uuid4()),
+            "content": content,
+            "visibility_scope": "personal",
+        }, headers=h)
+        assert r.status_code == 201, r.text
+        mb_ids.append(r.json()["id"])
+
+    r = client.post("/memory-blocks/bulk-apply-keywords", json={"applications": [
+        {"memory_block_id": mb_ids[0], "selected_keywords": ["retry", "Backoff", "backoff"]},
+        {"memory_block_id": mb_ids[1], "selected_keywords": ["BACKOFF"]},
+    ]}, headers=h)
+    assert r.status_code == 200, r.text
+    data = r.json()
+    assert data["successful_count"] == 2
+    assert data["results"][0]["added_keywords"] == ["retry", "Backoff"]
+    assert data["results"][0]["skipped_keywords"] == ["backoff"]
+    assert data["results"][1]["added_keywords"] == ["BACKOFF"]
+
+    user = db_session.query(models.User).filter_by(email="applycase@example.com").one()
+    for mb_id in mb_ids:
+        block = db_session.get(models.MemoryBlock, uuid.UUID(mb_id))
+        db_session.refresh(block)
+        assert all(kw.owner_user_id == user.id for kw in block.keywords)
+    backoff = db_session.query(models.Keyword).filter(models.Keyword.owner_user_id == user.id, models.Keyword.keyword_text.ilike("backoff")).all()
+    assert len(backoff) == 1
+
+
 def test_bulk_apply_keywords_empty_list(db_session):
     client = TestClient(main_app, headers={"x-active-scope": "personal"})
     h = _h("applyempty")
@@ -92,3 +92,64 @@ def test_backfill_missing_embeddings(monkeypatch, db_session):
     db.refresh(stored)
     assert stored.content_embedding is not None
     assert len(stored.content_embedding or []) == 6
+
+
+def _payload(agent, owner, content):
+    return schemas.MemoryBlockCreate(
+        agent_id=agent.agent_id,
+        conversation_id=uuid.uuid4(),
+        content=content,
+        visibility_scope="personal",
+        owner_user_id=owner.id,
+    )
+
+
+def test_unchanged_text_skips_reembedding(monkeypatch, db_session):
+    monkeypatch.setenv("EMBEDDING_PROVIDER", "mock")
+    monkeypatch.setenv("EMBEDDING_DIMENSION", "5")
+    reset_embedding_service_for_tests()
+    agent, owner = _make_agent(db_session)
+    block = crud.create_memory_block(db_session, _payload(agent, owner, "Deploy notes"))
+    service = get_embedding_service()
+    calls = []
+    original = service.attach_embedding
+    monkeypatch.setattr(service, "attach_embedding", lambda mb, **kw: calls.append(mb.id) or original(mb, **kw))
+
+    original_hash = block.content_hash
+    crud.update_memory_block(db_session, block.id, schemas.MemoryBlockUpdate(content="Deploy notes"))
+    assert calls == []
+
+    # content_hash ignores case, the embedding does not.
+    updated = crud.update_memory_block(db_session, block.id, schemas.MemoryBlockUpdate(content="deploy NOTES"))
+    assert calls == [block.id]
+    assert updated.content_hash == original_hash
+
+    updated = crud.update_memory_block(db_session, block.id, schemas.MemoryBlockUpdate(content="Rollback notes"))
+    assert calls == [block.id, block.id]
+    assert updated.content_hash == service.content_hash(updated)
+
+
+def test_duplicate_rejection_and_grouping(db_session):
+    agent, owner = _make_agent(db_session)
+    first = crud.create_memory_block(db_session, _payload(agent, owner, "Same text"))
+    second = crud.create_memory_block(db_session, _payload(agent, owner, "same   TEXT"))
+
+    with pytest.raises(crud.DuplicateMemoryBlockError) as exc:
+        crud.create_memory_block(db_session, _payload(agent, owner, "Same text"), reject_duplicates=True)
+    assert exc.value.existing_id in {first.id, second.id}
+
+    scoped = db_session.query(models.MemoryBlock).filter(models.MemoryBlock.owner_user_id == owner.id)
+    assert crud.get_duplicate_content_groups(db_session, scoped) == [sorted([first.id, second.id], key=str)]
+
+
+def test_backfill_content_hashes(db_session):
+    agent, owner = _make_agent(db_session)
+    block = crud.create_memory_block(db_session, _payload(agent, owner, "Legacy row"))
+    db_session.query(models.MemoryBlock).filter(models.MemoryBlock.id == block.id).update(
+        {"content_hash": None}, synchronize_session=False
+    )
+    db_session.commit()
+
+    assert crud.backfill_memory_block_content_hashes(db_session) >= 1
+    stored = db_session.query(models.MemoryBlock).filter(models.MemoryBlock.id == block.id).one()
+    assert stored.content_hash == get_embedding_service().content_hash(stored)
@@ -0,0 +1,127 @@
+import uuid
+from datetime import datetime, timedelta, UTC
+
+from fastapi import BackgroundTasks
+
+from core.api import memory_optimization
+from core.api.memory_optimization import _compute_suggestions, _get_suggestions_snapshot
+from core.db import models
+from core.services.embedding_service import memory_text_hash
+
+
+def _owner_and_agent(db):
+    owner = models.User(email=f"snap_{uuid.uuid4().hex}@example.com", display_name="Snap")
+    db.add(owner)
+    db.flush()
+    agent = models.Agent(agent_name="SnapAgent", owner_user_id=owner.id)
+    db.add(agent)
+    db.flush()
+    return owner, agent
+
+
+def _block(db, owner, agent, content, **fields):
+    block = models.MemoryBlock(
+        agent_id=agent.agent_id,
+        conversation_id=uuid.uuid4(),
+        content=content,
+        owner_user_id=owner.id,
+        visibility_scope="personal",
+        **fields,
+    )
+    db.add(block)
+    db.flush()
+    return block
+
+
+class _User:
+    def __init__(self, user_id):
+        self.id = user_id
+        self.is_superadmin = False
+        self.memberships = []
+
+
+def _by_type(result):
+    return {s["type"]: s for s in result["suggestions"]}
+
+
+def test_aggregate_suggestions_cover_the_whole_scope(db_session):
+    owner, agent = _owner_and_agent(db_session)
+    long_block = _block(db_session, owner, agent, "L" * 1600)
+    keyword = models.Keyword(keyword_text=f"kw-{uuid.uuid4().hex[:6]}", owner_user_id=owner.id)
+    db_session.add(keyword)
+    db_session.flush()
+    db_session.add(models.MemoryBlockKeyword(memory_id=long_block.id, keyword_id=keyword.keyword_id))
+    old = _block(db_session, owner, agent, "old", created_at=datetime.now(UTC) - timedelta(days=120))
+    _block(db_session, owner, agent, "recent", created_at=datetime.now(UTC) - timedelta(days=90, hours=1))
+    # Duplicates past the first 100 blocks used to be missed.
+    for i in range(101):
+        _block(db_session, owner, agent, f"filler block number {i}", content_hash=f"filler-{i}")
+    # Hashes are normalized, so case and whitespace differences still match.
+    dups = [
+        _block(db_session, owner, agent, text, content_hash=memory_text_hash(text))
+        for text in ("Same  note about deploys", "same note about DEPLOYS")
+    ]
+    db_session.flush()
+
+    result = _compute_suggestions(db_session, current_user=_User(owner.id), scope_ctx=None)
+    suggestions = _by_type(result)
+
+    assert result["total_memory_blocks_analyzed"] == 106
+    assert suggestions["compaction"]["all_affected_blocks"] == [str(long_block.id)]
+    assert str(long_block.id) not in suggestions["keywords"]["all_affected_blocks"]
+    assert len(suggestions["keywords"]["all_affected_blocks"]) == 105
+    assert suggestions["archive"]["affected_blocks"] == [str(old.id)]
+    assert sorted(suggestions["merge"]["affected_blocks"]) == sorted(str(b.id) for b in dups)
+
+
+def test_snapshot_is_reused_then_refreshed_in_background(db_session, monkeypatch):
+    owner, agent = _owner_and_agent(db_session)
+    _block(db_session, owner, agent, "L" * 1600)
+    user = _User(owner.id)
+
+    first = _get_suggestions_snapshot(db_session, current_user=user, scope_ctx=None, background_tasks=BackgroundTasks())
+    _block(db_session, owner, agent, "M" * 1600)
+    tasks = BackgroundTasks()
+    again = _get_suggestions_snapshot(db_session, current_user=user, scope_ctx=None, background_tasks=tasks)
+
+    assert again is first
+    assert not tasks.tasks
+
+    monkeypatch.setattr(memory_optimization, "SNAPSHOT_TTL_SECONDS", 0)
+    stale = _get_suggestions_snapshot(db_session, current_user=user, scope_ctx=None, background_tasks=tasks)
+    assert stale is first
+    assert len(tasks.tasks) == 1
+    # A refresh already in flight is not scheduled twice.
+    _get_suggestions_snapshot(db_session, current_user=user, scope_ctx=None, background_tasks=tasks)
+    assert len(tasks.tasks) == 1
+
+
+def test_duplicate_ids_are_capped_but_totals_are_not(db_session, monkeypatch):
+    owner, agent = _owner_and_agent(db_session)
+    monkeypatch.setattr(memory_optimization, "PREVIEW_LIMIT", 2)
+    for _ in range(3):
+        _block(db_session, owner, agent, "repeated note", content_hash=memory_text_hash("repeated note"))
+    for _ in range(2):
+        _block(db_session, owner, agent, "other note", content_hash=memory_text_hash("other note"))
+
+    merge = _by_type(_compute_suggestions(db_session, current_user=_User(owner.id), scope_ctx=None))["merge"]
+
+    assert merge["title"] == "Merge 5 potentially duplicate memory blocks"
+    assert merge["description"].startswith("Found 2 groups")
+    assert len(merge["affected_blocks"]) == 2
+
+
+def test_snapshots_are_bounded_least_recently_used_first(db_session, monkeypatch):
+    monkeypatch.setattr(memory_optimization, "SNAPSHOT_MAX_ENTRIES", 2)
+    users = [_User(uuid.uuid4()) for _ in range(3)]
+
+    def snapshot(user):
+        return _get_suggestions_snapshot(db_session, current_user=user, scope_ctx=None, background_tasks=BackgroundTasks())
+
+    first = snapshot(users[0])
+    snapshot(users[1])
+    assert snapshot(users[0]) is first  # now the most recently used
+    snapshot(users[2])
+
+    cached_users = {key[0] for key in memory_optimization._snapshots}
+    assert cached_users == {users[0].id, users[2].id}
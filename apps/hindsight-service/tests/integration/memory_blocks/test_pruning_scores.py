@@ -0,0 +1,96 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from core.db import models
+from core.db.repositories.pruning_scores import refresh_pruning_scores
+from core.pruning.pruning_service import PruningService
+from core.pruning.samplers import LowestScoreSampler
+
+
+def _agent(db):
+    owner = models.User(email=f"score_{uuid.uuid4().hex}@example.com", display_name="Score")
+    db.add(owner)
+    db.flush()
+    agent = models.Agent(agent_name="ScoreAgent", visibility_scope="personal", owner_user_id=owner.id)
+    db.add(agent)
+    db.flush()
+    return agent
+
+
+def _block(db, agent, content, age_days=0, feedback=0, retrievals=0):
+    block = models.MemoryBlock(
+        agent_id=agent.agent_id,
+        conversation_id=uuid.uuid4(),
+        content=content,
+        visibility_scope="personal",
+        owner_user_id=agent.owner_user_id,
+        feedback_score=feedback,
+        retrieval_count=retrievals,
+        created_at=datetime.now(timezone.utc) - timedelta(days=age_days),
+    )
+    db.add(block)
+    db.flush()
+    db.refresh(block)
+    return block
+
+
+def _python_score(block):
+    return PruningService()._fallback_score_block({
+        "content": block.content,
+        "feedback_score": block.feedback_score,
+        "retrieval_count": block.retrieval_count,
+        "created_at": block.created_at.isoformat(),
+    })["pruning_score"]
+
+
+def test_trigger_score_matches_python_fallback(db_session):
+    agent = _agent(db_session)
+    blocks = [
+        _block(db_session, agent, "short"),
+        _block(db_session, agent, "x" * 300, age_days=200, feedback=-3, retrievals=7),
+        _block(db_session, agent, "y" * 800, age_days=400, feedback=4, retrievals=120),
+        _block(db_session, agent, "z" * 120, age_days=181, feedback=9),
+    ]
+    for block in blocks:
+        assert block.pruning_score == _python_score(block)
+
+    blocks[0].feedback_score = 5
+    db_session.flush()
+    db_session.refresh(blocks[0])
+    assert blocks[0].pruning_score == _python_score(blocks[0])
+
+
+def test_refresh_only_rewrites_stale_scores(db_session):
+    agent = _agent(db_session)
+    block = _block(db_session, agent, "aging note", age_days=10)
+    expected = block.pruning_score
+    db_session.commit()
+    refresh_pruning_scores(db_session)
+
+    # Simulate a score that drifted (e.g. the block crossed an age threshold).
+    db_session.query(models.MemoryBlock).filter(models.MemoryBlock.id == block.id).update(
+        {"pruning_score": None}, synchronize_session=False
+    )
+    db_session.commit()
+
+    assert refresh_pruning_scores(db_session) == 1
+    db_session.refresh(block)
+    assert block.pruning_score == expected
+    assert refresh_pruning_scores(db_session) == 0
+
+
+def test_lowest_score_sampler_walks_scores_upwards(db_session):
+    agent = _agent(db_session)
+    for i in range(4):
+        _block(db_session, agent, "w" * (i * 200), feedback=i)
+
+    sampler = LowestScoreSampler()
+    first, second = sampler.sample(db_session, 2), sampler.sample(db_session, 2)
+    scores = {
+        block.id: block.pruning_score
+        for block in db_session.query(models.MemoryBlock).filter(models.MemoryBlock.id.in_(first + second))
+    }
+
+    assert not set(first) & set(second)
+    walked = [scores[memory_id] for memory_id in first + second]
+    assert walked == sorted(walked)
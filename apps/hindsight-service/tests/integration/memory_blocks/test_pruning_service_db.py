@@ -1,3 +1,4 @@
+import pytest
 import uuid
 from core.pruning.pruning_service import PruningService
 from core.db import models
@@ -80,3 +81,54 @@ def test_fallback_score_block():
     assert "pruning_score" in result
     assert "pruning_rationale" in result
     assert 1 <= result["pruning_score"] <= 100
+
+
+def _seeded_ids(db):
+    seed_blocks(db)
+    return {
+        block.id
+        for block in db.query(models.MemoryBlock).filter(models.MemoryBlock.content.like("block % content%")).all()
+    }
+
+
+def test_random_key_sampler_walks_every_active_block_once(db_session):
+    from core.pruning.samplers import RandomKeySampler
+
+    seeded = _seeded_ids(db_session)
+    archived = next(iter(seeded))
+    db_session.query(models.MemoryBlock).filter(models.MemoryBlock.id == archived).update({"archived": True})
+    db_session.flush()
+
+    sampler = RandomKeySampler()
+    walked = []
+    while True:
+        batch = sampler.sample(db_session, 2)
+        if not batch:
+            break
+        walked.extend(batch)
+
+    assert len(walked) == len(set(walked))
+    assert seeded - {archived} <= set(walked)
+    assert archived not in walked
+
+
+@pytest.mark.parametrize("method", ["system", "bernoulli"])
+def test_tablesample_sampler_tops_up_and_excludes(db_session, method):
+    from core.pruning.samplers import TableSampleSampler
+
+    seeded = _seeded_ids(db_session)
+    ids = TableSampleSampler(method=method).sample(db_session, 3, exclude_ids=seeded)
+
+    assert len(ids) == len(set(ids)) <= 3
+    assert not set(ids) & seeded
+
+
+def test_generate_pruning_suggestions_with_stratified_sampler(db_session, monkeypatch):
+    from core.pruning import samplers
+
+    monkeypatch.setattr(samplers, "PRUNING_SAMPLER", "stratified")
+    seed_blocks(db_session)
+    result = PruningService(llm_api_key=None).generate_pruning_suggestions(db_session, batch_size=2, max_iterations=2)
+
+    assert 1 <= result["iterations"] <= 2
+    assert len({s["memory_block_id"] for s in result["suggestions"]}) == len(result["suggestions"])
@@ -0,0 +1,102 @@
+import asyncio
+import threading
+
+import pytest
+
+
+class SMTPSink:
+    """Minimal local SMTP server that records messages instead of delivering them.
+
+    Runs on its own event loop thread. ``reject`` holds recipient addresses
+    answered with a 550 so per-message failures can be exercised.
+    """
+
+    def __init__(self):
+        self.messages = []
+        self.connections = 0
+        self.reject = set()
+        self.port = None
+        self._loop = asyncio.new_event_loop()
+        self._server = None
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        future = asyncio.run_coroutine_threadsafe(
+            asyncio.start_server(self._handle, "127.0.0.1", 0), self._loop
+        )
+        self._server = future.result(5)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    def stop(self):
+        async def _close():
+            self._server.close()
+            await self._server.wait_closed()
+
+        asyncio.run_coroutine_threadsafe(_close(), self._loop).result(5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(5)
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+
+        def reply(line):
+            writer.write(f"{line}\r\n".encode())
+
+        reply("220 sink ready")
+        sender, recipients = None, []
+        while True:
+            await writer.drain()
+            raw = await reader.readline()
+            if not raw:
+                break
+            command = raw.decode().strip()
+            verb = command.split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                reply("250-sink")
+                reply("250 8BITMIME")
+            elif verb == "HELO":
+                reply("250 sink")
+            elif verb == "MAIL":
+                sender, recipients = command.split(":", 1)[1].strip(" <>"), []
+                reply("250 OK")
+            elif verb == "RCPT":
+                address = command.split(":", 1)[1].strip(" <>")
+                if address in self.reject:
+                    reply("550 mailbox unavailable")
+                else:
+                    recipients.append(address)
+                    reply("250 OK")
+            elif verb == "DATA":
+                reply("354 end with <CRLF>.<CRLF>")
+                await writer.drain()
+                lines = []
+                while True:
+                    line = await reader.readline()
+                    if line in (b".\r\n", b".\n", b""):
+                        break
+                    lines.append(line)
+                self.messages.append({"from": sender, "to": recipients, "data": b"".join(lines).decode()})
+                reply("250 queued")
+            elif verb == "RSET":
+                sender, recipients = None, []
+                reply("250 OK")
+            elif verb == "NOOP":
+                reply("250 OK")
+            elif verb == "QUIT":
+                reply("221 bye")
+                await writer.drain()
+                break
+            else:
+                reply("502 not implemented")
+        writer.close()
+
+
+@pytest.fixture
+def smtp_sink():
+    sink = SMTPSink().start()
+    try:
+        yield sink
+    finally:
+        sink.stop()
@@ -0,0 +1,105 @@
+import uuid
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import insert
+
+from core.db import models
+from core.services.notification_service import NotificationService
+
+EVENT = "org_announcement"
+
+
+def _org_with_members(db, count):
+    org = models.Organization(name=f"Broadcast {uuid.uuid4().hex[:8]}")
+    db.add(org)
+    db.flush()
+    users = [
+        {"id": uuid.uuid4(), "email": f"member{i}_{uuid.uuid4().hex[:8]}@example.com", "display_name": f"m{i}"}
+        for i in range(count)
+    ]
+    db.execute(insert(models.User), users)
+    db.execute(
+        insert(models.OrganizationMembership),
+        [{"organization_id": org.id, "user_id": u["id"], "role": "viewer"} for u in users],
+    )
+    db.commit()
+    return org, [u["id"] for u in users]
+
+
+def _service(db):
+    email_service = Mock()
+    email_service.render_template.return_value = ("<p>News</p>", "News")
+    return NotificationService(db, email_service=email_service), email_service
+
+
+def _broadcast(service, org, **kwargs):
+    return service.notify_organization_members(
+        org.id,
+        EVENT,
+        "Announcement",
+        "Something happened",
+        email_subject="Announcement",
+        template_name="announcement",
+        template_context={"organization_name": org.name},
+        **kwargs,
+    )
+
+
+def test_broadcast_honours_preferences_and_links_email_logs(db_session):
+    org, (plain, no_in_app, no_email, excluded) = _org_with_members(db_session, 4)
+    service, email_service = _service(db_session)
+    service.set_user_preference(no_in_app, EVENT, email_enabled=True, in_app_enabled=False)
+    service.set_user_preference(no_email, EVENT, email_enabled=False, in_app_enabled=True)
+
+    counts = _broadcast(service, org, exclude_user_ids=[excluded])
+
+    assert counts == {"recipients": 3, "in_app_notifications": 2, "emails_queued": 2, "emails_failed": 0}
+    email_service.render_template.assert_called_once_with("announcement", {"organization_name": org.name})
+    notified = {n.user_id: n for n in db_session.query(models.Notification).filter_by(event_type=EVENT)}
+    assert set(notified) == {plain, no_email}
+    assert notified[plain].get_metadata() == {"organization_id": str(org.id)}
+    logs = {log.user_id: log for log in db_session.query(models.EmailNotificationLog).filter_by(event_type=EVENT)}
+    assert set(logs) == {plain, no_in_app}
+    assert logs[plain].notification_id == notified[plain].id
+    assert logs[no_in_app].notification_id is None
+    assert (logs[plain].status, logs[plain].body_html) == ("pending", "<p>News</p>")
+    assert logs[plain].next_attempt_at is not None
+
+
+def test_render_failure_records_failed_logs(db_session):
+    org, _ = _org_with_members(db_session, 2)
+    service, email_service = _service(db_session)
+    email_service.render_template.side_effect = RuntimeError("boom")
+
+    counts = _broadcast(service, org)
+
+    assert (counts["in_app_notifications"], counts["emails_queued"], counts["emails_failed"]) == (2, 0, 2)
+    statuses = {log.status for log in db_session.query(models.EmailNotificationLog).filter_by(event_type=EVENT)}
+    assert statuses == {"failed"}
+
+
+def test_statement_count_does_not_grow_with_members(db_session, max_queries):
+    small, _ = _org_with_members(db_session, 3)
+    large, _ = _org_with_members(db_session, 60)
+    service, _ = _service(db_session)
+
+    with max_queries(20) as few:
+        _broadcast(service, small)
+    with max_queries(20) as many:
+        _broadcast(service, large)
+
+    assert many.count == few.count
+
+
+@pytest.mark.slow
+def test_broadcast_to_5000_member_org_stays_within_statement_budget(db_session, max_queries):
+    members = 5000
+    org, _ = _org_with_members(db_session, members)
+    service, _ = _service(db_session)
+
+    # Membership + preferences reads, paged multi-row INSERTs, commit.
+    with max_queries(20):
+        counts = _broadcast(service, org)
+
+    assert counts == {"recipients": members, "in_app_notifications": members, "emails_queued": members, "emails_failed": 0}
@@ -0,0 +1,142 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock
+
+from sqlalchemy.orm import Session
+
+from core.db import models
+from core.db.repositories.email_outbox import claim_outbox_emails
+from core.services.email_service import EmailService, EmailServiceConfig
+from core.services.notification_service import NotificationService
+from core.services.notifications.outbox import EmailOutboxSender
+
+
+def _user(db):
+    user = models.User(email=f"outbox_{uuid.uuid4().hex}@example.com", display_name="Outbox")
+    db.add(user)
+    db.commit()
+    return user
+
+
+def _queue(db, service, user, count=1):
+    logs = []
+    for index in range(count):
+        log = service.create_email_notification_log(
+            notification_id=None,
+            user_id=user.id,
+            email_address=f"to{index}_{uuid.uuid4().hex[:6]}@example.com",
+            event_type="org_membership_added",
+            subject=f"Hello {index}",
+        )
+        service.queue_email(log, f"<p>Hello {index}</p>", f"Hello {index}")
+        logs.append(log)
+    return logs
+
+
+def _sender(db, transport, **kwargs):
+    # Sender sessions share the test connection so they see its uncommitted rows.
+    return EmailOutboxSender(
+        transport,
+        session_factory=lambda: Session(bind=db.connection(), join_transaction_mode="create_savepoint"),
+        **kwargs,
+    )
+
+
+def _smtp_service(sink):
+    config = EmailServiceConfig()
+    config.smtp_host, config.smtp_port = "127.0.0.1", sink.port
+    config.smtp_use_tls = config.smtp_use_ssl = False
+    config.smtp_username = config.smtp_password = ""
+    return EmailService(config)
+
+
+class _FailingTransport:
+    async def send_email(self, *, to_email, subject, html_content, text_content=None):
+        return {"success": False, "error": "provider down"}
+
+
+def test_membership_change_queues_email_without_sending(db_session):
+    user = _user(db_session)
+    email_service = Mock()
+    email_service.render_template.return_value = ("<p>Welcome</p>", "Welcome")
+    service = NotificationService(db_session, email_service=email_service)
+
+    result = service.notify_membership_added(
+        user_id=user.id,
+        user_email=user.email,
+        organization_name="Acme",
+        role="viewer",
+        added_by_name="Owner",
+    )
+
+    email_service.send_email.assert_not_called()
+    assert result["email_result"]["queued"] is True
+    log = result["email_log"]
+    db_session.refresh(log)
+    assert (log.status, log.body_html, log.body_text, log.attempts) == ("pending", "<p>Welcome</p>", "Welcome", 0)
+    assert log.next_attempt_at is not None
+
+
+def test_sender_delivers_a_batch_over_one_smtp_connection(db_session, smtp_sink):
+    service = NotificationService(db_session, email_service=Mock())
+    logs = _queue(db_session, service, _user(db_session), count=3)
+
+    sender = _sender(db_session, _smtp_service(smtp_sink), batch_size=10)
+    assert asyncio.run(sender.drain_once()) == 3
+    assert asyncio.run(sender.drain_once()) == 0
+
+    assert smtp_sink.connections == 1
+    assert sorted(m["to"][0] for m in smtp_sink.messages) == sorted(log.email_address for log in logs)
+    assert "Hello 0" in next(m["data"] for m in smtp_sink.messages if m["to"][0] == logs[0].email_address)
+    for log in logs:
+        db_session.refresh(log)
+        assert (log.status, log.attempts, log.next_attempt_at) == ("sent", 1, None)
+        assert log.sent_at is not None
+
+
+def test_rejected_recipient_is_retried_alone(db_session, smtp_sink):
+    service = NotificationService(db_session, email_service=Mock())
+    good, bad = _queue(db_session, service, _user(db_session), count=2)
+    smtp_sink.reject.add(bad.email_address)
+
+    sender = _sender(db_session, _smtp_service(smtp_sink), batch_size=10, backoff_base_seconds=60)
+    before = datetime.now(timezone.utc)
+    asyncio.run(sender.drain_once())
+
+    db_session.refresh(good)
+    db_session.refresh(bad)
+    assert good.status == "sent"
+    assert (bad.status, bad.attempts) == ("pending", 1)
+    assert bad.next_attempt_at >= before + timedelta(seconds=60 * 0.8)
+    assert bad.error_message
+
+
+def test_failures_back_off_then_dead_letter(db_session):
+    service = NotificationService(db_session, email_service=Mock())
+    [log] = _queue(db_session, service, _user(db_session))
+    sender = _sender(db_session, _FailingTransport(), max_attempts=2, backoff_base_seconds=30)
+
+    assert asyncio.run(sender.drain_once()) == 1
+    db_session.refresh(log)
+    assert (log.status, log.attempts, log.error_message) == ("pending", 1, "provider down")
+    # Not due yet: the backoff hides the row from the next drain.
+    assert asyncio.run(sender.drain_once()) == 0
+
+    log.next_attempt_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+    db_session.commit()
+    assert asyncio.run(sender.drain_once()) == 1
+    db_session.refresh(log)
+    assert (log.status, log.attempts, log.next_attempt_at) == ("dead_letter", 2, None)
+
+
+def test_claimed_rows_are_leased_from_other_senders(db_session):
+    service = NotificationService(db_session, email_service=Mock())
+    _queue(db_session, service, _user(db_session), count=2)
+
+    first = claim_outbox_emails(db_session, limit=1, lease_seconds=300)
+    second = claim_outbox_emails(db_session, limit=10, lease_seconds=300)
+
+    assert len(first) == 1 and len(second) == 1
+    assert first[0]["id"] != second[0]["id"]
+    assert claim_outbox_emails(db_session, limit=10, lease_seconds=300) == []
@@ -0,0 +1,192 @@
+import asyncio
+import json
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, UTC
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+
+from core.api import notifications as notifications_api
+from core.api.main import app
+from core.db import database, models
+from core.services.notification_service import NotificationService
+from core.services.notifications.change_stream import (
+    NotificationChangeListener,
+    get_notification_change_listener,
+    stop_notification_change_listener,
+)
+
+
+def _notification(user_id, **overrides):
+    values = dict(
+        user_id=user_id,
+        event_type="org_invitation",
+        title="Hello",
+        message="World",
+        expires_at=datetime.now(UTC) + timedelta(days=1),
+    )
+    values.update(overrides)
+    return models.Notification(**values)
+
+
+@pytest.fixture
+def committed_user():
+    # NOTIFY is only delivered on a real commit, so these rows bypass the
+    # per-test rollback and are deleted (with their notifications) afterwards.
+    session = database.SessionLocal()
+    user = models.User(email=f"stream_{uuid.uuid4().hex[:8]}@example.com", display_name="Stream")
+    session.add(user)
+    session.commit()
+    try:
+        yield session, user
+    finally:
+        session.rollback()
+        session.delete(user)
+        session.commit()
+        session.close()
+        stop_notification_change_listener()
+
+
+def _wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.02)
+
+
+def test_cleanup_deletes_expired_rows_in_chunks(db_session):
+    user = models.User(email=f"cleanup_{uuid.uuid4().hex[:8]}@example.com", display_name="Cleanup")
+    db_session.add(user)
+    db_session.flush()
+    past = datetime.now(UTC) - timedelta(days=1)
+    db_session.add_all([_notification(user.id, expires_at=past) for _ in range(7)])
+    live = _notification(user.id)
+    db_session.add(live)
+    db_session.commit()
+
+    deletes = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("DELETE"):
+            deletes.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        removed = NotificationService(db_session).cleanup_expired_notifications(batch_size=3)
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+    assert removed == 7
+    # Three chunks of at most 3 rows, then an empty one that ends the loop.
+    assert len(deletes) == 4
+    remaining = db_session.query(models.Notification).filter_by(user_id=user.id).all()
+    assert [n.id for n in remaining] == [live.id]
+
+
+def test_unread_count_uses_partial_index(db_session):
+    names = {
+        row[0]
+        for row in db_session.execute(text("SELECT indexname FROM pg_indexes WHERE tablename = 'notifications'"))
+    }
+    assert {"idx_notifications_unread_user_expires_at", "idx_notifications_unread_user_created_at"} <= names
+    assert "idx_notifications_user_id_is_read" not in names
+
+    db_session.execute(text("SET LOCAL enable_seqscan = off"))
+    plan = "\n".join(
+        row[0]
+        for row in db_session.execute(
+            text(
+                "EXPLAIN SELECT count(*) FROM notifications "
+                "WHERE user_id = :user_id AND is_read = false AND expires_at > now()"
+            ),
+            {"user_id": uuid.uuid4()},
+        )
+    )
+    assert "Scan using idx_notifications_unread_user_" in plan
+
+
+def test_listener_wakes_subscriber_on_committed_change(committed_user):
+    session, user = committed_user
+    listener = NotificationChangeListener(reconnect_seconds=0.1)
+
+    async def _scenario():
+        wakeup = listener.subscribe(user.id)
+        other = listener.subscribe(uuid.uuid4())
+        try:
+            await asyncio.to_thread(_wait_until, lambda: listener.listening)
+            # Connecting wakes everyone once to cover changes missed meanwhile.
+            await asyncio.sleep(0.05)
+            wakeup.clear()
+            other.clear()
+            session.add(_notification(user.id))
+            await asyncio.to_thread(session.commit)
+            await asyncio.wait_for(wakeup.wait(), 5)
+            return other.is_set()
+        finally:
+            listener.unsubscribe(user.id, wakeup)
+            listener.stop()
+
+    assert asyncio.run(_scenario()) is False
+
+
+@pytest.fixture
+def committed_requests():
+    # Authentication may write to the user row; through the per-test session
+    # override that row lock would be held until the test's outer rollback.
+    def _get_db():
+        db = database.SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    previous = app.dependency_overrides.get(database.get_db)
+    app.dependency_overrides[database.get_db] = _get_db
+    try:
+        yield
+    finally:
+        app.dependency_overrides[database.get_db] = previous
+
+
+def test_stream_pushes_unread_count_changes(committed_user, committed_requests, monkeypatch):
+    session, user = committed_user
+    session.add(_notification(user.id))
+    session.commit()
+    listener = get_notification_change_listener()
+
+    first_read = threading.Event()
+    read_unread_count = notifications_api._read_unread_count
+
+    def _tracking_read(user_id):
+        count = read_unread_count(user_id)
+        first_read.set()
+        return count
+
+    monkeypatch.setattr(notifications_api, "_read_unread_count", _tracking_read)
+
+    def _add_notification_while_streaming():
+        assert first_read.wait(5)
+        _wait_until(lambda: listener.listening)
+        session.add(_notification(user.id))
+        session.commit()
+
+    # TestClient buffers the whole body, so the change is made from another
+    # thread while the stream is open and the events are read afterwards.
+    writer = threading.Thread(target=_add_notification_while_streaming)
+    writer.start()
+    client = TestClient(app)
+    headers = {"x-auth-request-user": "stream", "x-auth-request-email": user.email}
+    started = time.monotonic()
+    response = client.get("/notifications/stream", params={"max_seconds": 3}, headers=headers)
+    writer.join(5)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text.startswith("retry: ")
+    events = [json.loads(line[len("data:"):]) for line in response.text.splitlines() if line.startswith("data:")]
+    assert events == [{"unread_count": 1}, {"unread_count": 2}]
+    assert time.monotonic() - started < 6
@@ -0,0 +1,173 @@
+import uuid
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from core import audit
+from core.audit import AuditAction, log
+from core.db import models
+from core.services import audit_writer
+from core.services.audit_writer import AuditLogWriter
+
+
+def _user(db):
+    user = models.User(email=f"audit_sink_{uuid.uuid4().hex[:8]}@example.com", display_name="Auditor")
+    db.add(user)
+    db.commit()
+    return user
+
+
+def _writer(db, **kwargs):
+    # Writer sessions share the test connection so they see its uncommitted rows.
+    return AuditLogWriter(
+        session_factory=lambda: Session(bind=db.connection(), join_transaction_mode="create_savepoint"),
+        **kwargs,
+    )
+
+
+class _StatementCounter:
+    def __init__(self, db):
+        self.statements = []
+        self._engine = db.get_bind()
+
+    def __enter__(self):
+        event.listen(self._engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self._engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+
+def _audit_rows(db, actor):
+    return db.query(models.AuditLog).filter(models.AuditLog.actor_user_id == actor.id).all()
+
+
+def test_transactional_sink_commits_with_the_caller(db_session):
+    actor = _user(db_session)
+    actor_id = actor.id
+
+    with _StatementCounter(db_session) as counter:
+        entry = log(db_session, action=AuditAction.MEMBER_ADD, target_type="user", actor_user_id=actor_id)
+    assert not [s for s in counter.statements if "audit_logs" in s]
+    assert entry in db_session.new
+
+    db_session.rollback()
+    assert _audit_rows(db_session, actor) == []
+
+    log(db_session, action=AuditAction.MEMBER_ADD, target_type="user", actor_user_id=actor.id, metadata={"n": 1})
+    db_session.commit()
+    [row] = _audit_rows(db_session, actor)
+    assert (row.action_type, row.get_metadata()) == ("member_add", {"n": 1})
+
+
+def test_member_removal_persists_its_audit(db_session, client):
+    owner = _user(db_session)
+    member = _user(db_session)
+    org = models.Organization(name=f"Audited {uuid.uuid4().hex[:8]}", created_by=owner.id)
+    db_session.add(org)
+    db_session.flush()
+    db_session.add_all([
+        models.OrganizationMembership(organization_id=org.id, user_id=owner.id, role="owner", can_read=True, can_write=True),
+        models.OrganizationMembership(organization_id=org.id, user_id=member.id, role="viewer", can_read=True, can_write=False),
+    ])
+    db_session.commit()
+
+    response = client.delete(
+        f"/organizations/{org.id}/members/{member.id}",
+        headers={"x-auth-request-user": "owner", "x-auth-request-email": owner.email},
+    )
+
+    assert response.status_code == 204
+    [row] = _audit_rows(db_session, owner)
+    assert (row.action_type, row.target_id) == ("member_remove", member.id)
+    assert db_session.query(models.OrganizationMembership).filter_by(organization_id=org.id, user_id=member.id).first() is None
+
+
+def test_async_sink_bulk_inserts_in_batches(db_session, monkeypatch):
+    actor = _user(db_session)
+    writer = _writer(db_session, batch_size=500, flush_seconds=60)
+    monkeypatch.setattr(audit_writer, "_audit_log_writer", writer)
+
+    with _StatementCounter(db_session) as counter:
+        for index in range(2000):
+            assert log(
+                db_session,
+                action=AuditAction.MEMORY_DELETE,
+                target_type="memory_block",
+                target_id=uuid.uuid4(),
+                actor_user_id=actor.id,
+                metadata={"index": index},
+                sink=audit.AUDIT_SINK_ASYNC,
+            ) is None
+        writer.stop()
+
+    inserts = [s for s in counter.statements if s.lstrip().upper().startswith("INSERT INTO AUDIT_LOGS")]
+    assert 1 <= len(inserts) <= 2000 // 500
+    rows = _audit_rows(db_session, actor)
+    assert len(rows) == 2000
+    assert sorted(row.get_metadata()["index"] for row in rows) == list(range(2000))
+    assert writer.written == 2000 and writer.pending == 0
+
+
+def test_async_writer_stays_bounded_and_flushes_on_stop(db_session):
+    actor = _user(db_session)
+    writer = _writer(db_session, batch_size=10, flush_seconds=60, max_pending=25)
+
+    record = lambda: {
+        "id": uuid.uuid4(),
+        "actor_user_id": actor.id,
+        "action_type": "custom",
+        "status": "success",
+    }
+    for _ in range(3):
+        writer.submit(record())
+    assert writer.pending == 3
+    assert _audit_rows(db_session, actor) == []
+
+    for _ in range(200):
+        writer.submit(record())
+        assert writer.pending <= 25
+
+    assert writer.stop() >= 0
+    assert writer.pending == 0
+    assert len(_audit_rows(db_session, actor)) == 203
+
+
+def test_async_writer_drops_only_the_failing_record(db_session):
+    from core.metrics import AUDIT_LOG_DROPPED
+
+    actor = _user(db_session)
+    writer = _writer(db_session, batch_size=50, flush_seconds=60)
+    dropped_before = AUDIT_LOG_DROPPED.value()
+
+    for index in range(40):
+        writer.submit({
+            "id": uuid.uuid4(),
+            # One record the database rejects on its own.
+            "actor_user_id": None if index == 17 else actor.id,
+            "action_type": "custom",
+            "status": "success",
+        })
+
+    assert writer.stop() == 39
+    assert len(_audit_rows(db_session, actor)) == 39
+    assert writer.failed == 1
+    assert AUDIT_LOG_DROPPED.value() == dropped_before + 1
+
+
+@pytest.mark.parametrize("mode", [audit.AUDIT_SINK_TRANSACTIONAL, audit.AUDIT_SINK_ASYNC])
+def test_sink_mode_setting_picks_the_default(db_session, monkeypatch, mode):
+    actor = _user(db_session)
+    writer = _writer(db_session, flush_seconds=60)
+    monkeypatch.setattr(audit_writer, "_audit_log_writer", writer)
+    monkeypatch.setattr(audit, "AUDIT_SINK_MODE", mode)
+
+    entry = log(db_session, action="custom", target_type="thing", actor_user_id=actor.id)
+
+    assert (entry is None) == (mode == audit.AUDIT_SINK_ASYNC)
+    assert writer.pending == (1 if mode == audit.AUDIT_SINK_ASYNC else 0)
+    writer.stop()
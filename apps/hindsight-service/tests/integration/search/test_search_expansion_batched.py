@@ -0,0 +1,119 @@
+import uuid
+
+import pytest
+from sqlalchemy import event
+
+from core.db import models
+from core.services.embedding_service import get_embedding_service, reset_embedding_service_for_tests
+from core.services.search.fulltext_strategy import EXPANSION_VARIANT_WEIGHT
+from core.services.search_service import SearchService
+
+
+def _owner_agent(db):
+    owner = models.User(email=f"expansion_{uuid.uuid4().hex}@example.com", display_name="Expansion")
+    db.add(owner)
+    db.flush()
+    agent = models.Agent(agent_name=f"Expansion {uuid.uuid4().hex[:6]}", owner_user_id=owner.id)
+    db.add(agent)
+    db.flush()
+    return owner, agent
+
+
+def _blocks(db, owner, agent, contents):
+    blocks = []
+    for text in contents:
+        block = models.MemoryBlock(
+            agent_id=agent.agent_id,
+            conversation_id=uuid.uuid4(),
+            content=text,
+            lessons_learned="",
+            visibility_scope="public",
+            owner_user_id=owner.id,
+        )
+        db.add(block)
+        blocks.append(block)
+    db.flush()
+    return blocks
+
+
+class _StatementCounter:
+    def __init__(self, db):
+        self.selects = []
+        self._engine = db.get_bind()
+
+    def __enter__(self):
+        event.listen(self._engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self._engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "memory_blocks" in statement:
+            self.selects.append(statement)
+
+
+def test_fulltext_variants_match_in_one_statement(db_session):
+    owner, agent = _owner_agent(db_session)
+    direct, synonym, _other = _blocks(
+        db_session, owner, agent,
+        ["speed of the parser", "parser performance tuning", "unrelated gardening notes"],
+    )
+
+    service = SearchService()
+    with _StatementCounter(db_session) as counter:
+        results, metadata = service.search_memory_blocks_fulltext(
+            db_session, "speed", agent_id=agent.agent_id, min_score=0.0, variants=["performance"],
+        )
+
+    ids = [r.id for r in results]
+    assert set(ids) == {direct.id, synonym.id}
+    assert ids[0] == direct.id
+    assert len([s for s in counter.selects if "ts_rank_cd" in s]) == 1
+    assert metadata["query_variants"] == ["performance"]
+
+    # Variant-only matches keep their own rank, scaled by the variant weight.
+    plain, _ = service.search_memory_blocks_fulltext(
+        db_session, "performance", agent_id=agent.agent_id, min_score=0.0,
+    )
+    by_id = {r.id: r.search_score for r in results}
+    assert by_id[synonym.id] == pytest.approx(plain[0].search_score * EXPANSION_VARIANT_WEIGHT)
+
+
+@pytest.fixture
+def mock_embeddings(monkeypatch):
+    monkeypatch.setenv("EMBEDDING_PROVIDER", "mock")
+    monkeypatch.setenv("EMBEDDING_DIMENSION", "8")
+    reset_embedding_service_for_tests()
+    yield get_embedding_service()
+    reset_embedding_service_for_tests()
+
+
+def test_semantic_variants_batch_embeddings_and_dedupe_by_id(db_session, mock_embeddings, monkeypatch):
+    owner, agent = _owner_agent(db_session)
+    # Mock embeddings hash the text, so each block matches exactly one query text.
+    first, second = _blocks(db_session, owner, agent, ["alpha", "beta"])
+    mock_embeddings.backfill_missing_embeddings(db_session, batch_size=10)
+
+    embed_calls = []
+    original = mock_embeddings.embed_texts
+    monkeypatch.setattr(
+        mock_embeddings, "embed_texts", lambda texts: embed_calls.append(list(texts)) or original(texts)
+    )
+
+    service = SearchService()
+    with _StatementCounter(db_session) as counter:
+        results, metadata = service.search_memory_blocks_semantic(
+            db_session, "alpha", agent_id=agent.agent_id, similarity_threshold=0.99,
+            # A repeated variant must not produce a duplicate row.
+            variants=["beta", "beta"],
+        )
+
+    assert embed_calls == [["alpha", "beta", "beta"]]
+    assert [r.id for r in results] == [first.id, second.id]
+    assert results[0].search_score == pytest.approx(1.0)
+    assert results[1].search_score == pytest.approx(EXPANSION_VARIANT_WEIGHT)
+    assert metadata["search_type"] == "semantic"
+    assert metadata["query_vectors_count"] == 3
+    block_selects = [s for s in counter.selects if "UNION ALL" in s]
+    assert len(block_selects) == 1
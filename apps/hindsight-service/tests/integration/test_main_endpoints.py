@@ -2,6 +2,7 @@ import uuid
 import json
 from fastapi.testclient import TestClient
 from core.api.main import app as main_app
+from core.pruning.pruning_service import DEFAULT_MAX_ITERATIONS
 
 
 def _h(user: str):
@@ -206,9 +207,25 @@ def test_memory_prune_suggest_endpoint(db_session):
     assert "suggestions" in data or "message" in data
     
     # Test with parameters
+    payload = {"batch_size": 10}
+    r = client.post("/memory/prune/suggest", json=payload, headers=h)
+    assert r.status_code == 200
+    # One batch (one LLM call) unless max_iterations asks for more.
+    assert r.json()["max_iterations"] == 1
+
     payload = {"batch_size": 10, "max_iterations": 5}
     r = client.post("/memory/prune/suggest", json=payload, headers=h)
     assert r.status_code == 200
+    assert r.json()["max_iterations"] == 5
+
+    payload = {"batch_size": 10, "max_iterations": 10_000}
+    r = client.post("/memory/prune/suggest", json=payload, headers=h)
+    assert r.status_code == 200
+    assert r.json()["max_iterations"] == DEFAULT_MAX_ITERATIONS
+
+    for bad in ("many", 0, 2.5):
+        r = client.post("/memory/prune/suggest", json={"max_iterations": bad}, headers=h)
+        assert r.status_code == 422, bad
 
 
 def test_memory_prune_confirm_endpoint(db_session):
@@ -0,0 +1,158 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+
+from core import metrics
+from core.api import metrics as metrics_api
+from core.db import database, models
+from core.db.database import TimedQueuePool
+from core.services.embedding_service import reset_embedding_service_for_tests
+from core.services.llm_gateway import reset_llm_gateway_for_tests
+
+AUTH = {"x-auth-request-email": "metrics@example.com", "x-auth-request-user": "Metrics"}
+
+
+@pytest.fixture(autouse=True)
+def mock_embeddings(monkeypatch):
+    monkeypatch.setenv("EMBEDDING_PROVIDER", "mock")
+    monkeypatch.setenv("EMBEDDING_DIMENSION", "8")
+    reset_embedding_service_for_tests()
+    yield
+    reset_embedding_service_for_tests()
+
+
+def _scrape(client):
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == metrics.CONTENT_TYPE
+    samples = {}
+    for line in response.text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return response.text, samples
+
+
+def _seed_memory_block(client):
+    client.get("/keywords/", headers=AUTH)
+    agent = client.post("/agents/", json={"agent_name": "MetricsAgent", "visibility_scope": "personal"}, headers=AUTH)
+    assert agent.status_code == 201, agent.text
+    response = client.post(
+        "/memory-blocks/",
+        json={
+            "agent_id": agent.json()["agent_id"],
+            "conversation_id": str(uuid.uuid4()),
+            "content": "Retry logic for flaky network calls",
+            "visibility_scope": "personal",
+        },
+        headers=AUTH,
+    )
+    assert response.status_code == 201, response.text
+
+
+def test_search_and_embedding_metrics_are_scraped(client):
+    _seed_memory_block(client)
+    _, before = _scrape(client)
+
+    for strategy in ("fulltext", "semantic", "hybrid"):
+        response = client.get(f"/memory-blocks/search/{strategy}", params={"query": "retry logic"}, headers=AUTH)
+        assert response.status_code == 200, response.text
+
+    text, after = _scrape(client)
+    assert "# TYPE hindsight_search_duration_seconds histogram" in text
+    for strategy in ("fulltext", "semantic", "hybrid"):
+        counts = [
+            value - before.get(name, 0)
+            for name, value in after.items()
+            if name.startswith("hindsight_search_duration_seconds_count") and f'strategy="{strategy}"' in name
+        ]
+        assert sum(counts) >= 1, strategy
+    embedding_calls = [
+        value - before.get(name, 0)
+        for name, value in after.items()
+        if name.startswith('hindsight_embedding_request_duration_seconds_count{provider="mock"')
+    ]
+    assert sum(embedding_calls) >= 1
+    assert 'hindsight_embedding_batch_size_bucket{provider="mock",le="1"}' in after
+    assert "hindsight_query_expansion_duration_seconds_count" in text
+
+
+def test_embedding_errors_are_counted(client, monkeypatch):
+    from core.services.embedding_service import get_embedding_service
+
+    service = get_embedding_service()
+    monkeypatch.setattr(service._provider, "embed_many", lambda texts: (_ for _ in ()).throw(RuntimeError("down")))
+    before = metrics.EMBEDDING_ERRORS.value(provider="mock", operation="embed_many")
+
+    with pytest.raises(RuntimeError):
+        service.embed_texts(["a", "b", " "])
+
+    assert metrics.EMBEDDING_ERRORS.value(provider="mock", operation="embed_many") == before + 1
+
+
+def test_background_job_gauges_are_read_at_scrape_time(client, db_session):
+    client.get("/keywords/", headers=AUTH)
+    user = db_session.query(models.User).filter_by(email="metrics@example.com").one()
+    for status in ("pending", "pending", "running", "completed"):
+        db_session.add(models.BulkOperation(type="bulk_delete", actor_user_id=user.id, status=status))
+    db_session.add(
+        models.EmailNotificationLog(
+            email_address=user.email,
+            event_type="metrics_test",
+            subject="queued",
+            status="pending",
+            next_attempt_at=datetime.now(timezone.utc) - timedelta(minutes=5),
+        )
+    )
+    db_session.commit()
+
+    _, samples = _scrape(client)
+
+    assert samples['hindsight_bulk_operation_queue_depth{status="pending"}'] >= 2
+    assert samples['hindsight_bulk_operation_queue_depth{status="running"}'] >= 1
+    assert samples["hindsight_email_outbox_queued"] >= 1
+    assert samples["hindsight_email_outbox_lag_seconds"] >= 300
+
+
+def test_llm_gateway_totals_are_mirrored(client):
+    stats = {
+        "calls": 3, "errors": 1, "cache_hits": 2, "latency_seconds_total": 1.5,
+        "input_tokens": 120, "output_tokens": 40, "throttled_seconds_total": 0.25,
+    }
+    reset_llm_gateway_for_tests(SimpleNamespace(metrics=lambda: {"metrics_test": stats}))
+    try:
+        _, samples = _scrape(client)
+    finally:
+        reset_llm_gateway_for_tests()
+
+    assert samples['hindsight_llm_calls_total{purpose="metrics_test"}'] == 3
+    assert samples['hindsight_llm_errors_total{purpose="metrics_test"}'] == 1
+    assert samples['hindsight_llm_latency_seconds_total{purpose="metrics_test"}'] == 1.5
+    assert samples['hindsight_llm_tokens_total{purpose="metrics_test",direction="output"}'] == 40
+
+
+def test_pool_gauges_and_checkout_wait(client, monkeypatch, _test_postgres):
+    engine = create_engine(_test_postgres, poolclass=TimedQueuePool, pool_size=3, max_overflow=2)
+    waits = metrics.DB_POOL_WAIT.count()
+    try:
+        with engine.connect():
+            monkeypatch.setattr(database, "engine", engine)
+            _, samples = _scrape(client)
+    finally:
+        engine.dispose()
+
+    assert metrics.DB_POOL_WAIT.count() > waits
+    assert samples["hindsight_db_pool_size"] == 3
+    assert samples["hindsight_db_pool_checked_out"] == 1
+
+
+def test_failing_collector_does_not_break_the_scrape(client, monkeypatch):
+    def _broken(_db):
+        raise RuntimeError("outbox unavailable")
+
+    monkeypatch.setattr(metrics_api, "_collect_email_outbox", _broken)
+    text, _ = _scrape(client)
+    assert "hindsight_search_duration_seconds" in text
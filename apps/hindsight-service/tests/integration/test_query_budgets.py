@@ -0,0 +1,150 @@
+"""Query budgets for list-shaped endpoints.
+
+Each test runs the endpoint for a small and a larger batch: the statement
+count must not grow with the number of rows (no per-row lazy loads or
+lookups) and must stay under a fixed budget.
+"""
+import logging
+import uuid
+
+import pytest
+
+from core.api.middleware import query_stats as query_stats_middleware
+from core.db import models
+
+AUTH = {"x-auth-request-email": "budget@example.com", "x-auth-request-user": "Budget"}
+
+
+def _user(client, db_session):
+    client.get("/keywords/", headers=AUTH)
+    return db_session.query(models.User).filter_by(email="budget@example.com").one()
+
+
+def _seed_blocks(db_session, user, count, keywords_per_block=2):
+    agent = models.Agent(agent_name=f"Budget {uuid.uuid4().hex[:6]}", visibility_scope="personal", owner_user_id=user.id)
+    db_session.add(agent)
+    db_session.flush()
+    blocks = []
+    for index in range(count):
+        block = models.MemoryBlock(
+            agent_id=agent.agent_id,
+            conversation_id=uuid.uuid4(),
+            content=f"budget retry logic note {index}",
+            lessons_learned="keep queries flat",
+            visibility_scope="personal",
+            owner_user_id=user.id,
+        )
+        db_session.add(block)
+        db_session.flush()
+        for k in range(keywords_per_block):
+            keyword = models.Keyword(keyword_text=f"budget-{uuid.uuid4().hex[:8]}-{k}", visibility_scope="personal", owner_user_id=user.id)
+            db_session.add(keyword)
+            db_session.flush()
+            db_session.add(models.MemoryBlockKeyword(memory_id=block.id, keyword_id=keyword.keyword_id))
+        blocks.append(block)
+    db_session.commit()
+    # Start from a cold identity map, as a real request would.
+    db_session.expire_all()
+    return blocks
+
+
+@pytest.mark.parametrize("strategy", ["basic", "fulltext"])
+def test_search_results_do_not_lazy_load_keywords(client, db_session, max_queries, strategy):
+    user = _user(client, db_session)
+    counts = []
+    for count in (2, 8):
+        _seed_blocks(db_session, user, count)
+        if strategy == "basic":
+            path, params = "/memory-blocks/search/", {"query": "budget", "search_type": "basic", "limit": 50}
+        else:
+            path, params = "/memory-blocks/search/fulltext", {"query": "budget retry", "limit": 50}
+        with max_queries(25) as stats:
+            response = client.get(path, params=params, headers=AUTH)
+        assert response.status_code == 200, response.text
+        assert all(len(item["keywords"]) == 2 for item in response.json())
+        counts.append(stats.count)
+        db_session.expire_all()
+    assert counts[0] == counts[1]
+
+
+def test_bulk_apply_keywords_is_flat_in_the_number_of_blocks(client, db_session, max_queries):
+    user = _user(client, db_session)
+    counts = []
+    for count in (2, 6):
+        blocks = _seed_blocks(db_session, user, count, keywords_per_block=1)
+        existing = blocks[0].keywords[0].keyword_text
+        db_session.expire_all()
+        applications = [
+            {"memory_block_id": str(block.id), "selected_keywords": [existing, f"fresh-{uuid.uuid4().hex[:6]}", "budget-shared"]}
+            for block in blocks
+        ]
+        # Writes run in one savepoint per block; only the reads must stay flat.
+        with max_queries(10 + 5 * count) as stats:
+            response = client.post("/memory-blocks/bulk-apply-keywords", json={"applications": applications}, headers=AUTH)
+        assert response.status_code == 200, response.text
+        data = response.json()
+        assert data["successful_count"] == count
+        assert data["results"][0]["skipped_keywords"] == [existing]
+        assert len(data["results"][1]["added_keywords"]) == 3
+        counts.append(sum(n for shape, n in stats.shapes.items() if shape.startswith("SELECT")))
+        db_session.expire_all()
+    assert counts[0] == counts[1]
+
+    texts = [kw.keyword_text for kw in db_session.get(models.MemoryBlock, blocks[-1].id).keywords]
+    assert "budget-shared" in texts and len(texts) == 4
+
+
+def test_consolidation_listing_is_flat_in_the_number_of_suggestions(client, db_session, max_queries):
+    user = _user(client, db_session)
+    counts = []
+    for count in (2, 8):
+        for block in _seed_blocks(db_session, user, count, keywords_per_block=0):
+            db_session.add(models.ConsolidationSuggestion(
+                group_id=uuid.uuid4(),
+                suggested_content="merged",
+                suggested_lessons_learned="merged",
+                suggested_keywords=[],
+                original_memory_ids=[str(block.id)],
+                status="pending",
+            ))
+        db_session.commit()
+        db_session.expire_all()
+        with max_queries(15) as stats:
+            response = client.get("/consolidation-suggestions/", params={"limit": 50}, headers=AUTH)
+        assert response.status_code == 200, response.text
+        counts.append(stats.count)
+    assert counts[0] == counts[1]
+
+
+def test_budget_overrun_fails_with_the_repeated_shapes(client, db_session, max_queries):
+    user = _user(client, db_session)
+    blocks = _seed_blocks(db_session, user, 3, keywords_per_block=0)
+    with pytest.raises(AssertionError, match="query budget 1 exceeded"):
+        with max_queries(1):
+            for block in blocks:
+                db_session.get(models.MemoryBlock, block.id)
+
+
+def test_server_timing_header_outside_production(client, monkeypatch):
+    monkeypatch.delenv("DEV_MODE", raising=False)
+    monkeypatch.setenv("QUERY_STATS_SERVER_TIMING", "false")
+    assert "server-timing" not in client.get("/keywords/", headers=AUTH).headers
+
+    monkeypatch.setenv("QUERY_STATS_SERVER_TIMING", "true")
+    header = client.get("/keywords/", headers=AUTH).headers["server-timing"]
+    assert header.startswith("db;dur=")
+    assert 'queries"' in header and not header.endswith('"0 queries"')
+
+
+def test_repeated_statement_shapes_are_logged(client, monkeypatch, caplog):
+    # The migrations' logging fileConfig disables loggers created before it ran.
+    monkeypatch.setattr(logging.getLogger(query_stats_middleware.__name__), "disabled", False)
+    monkeypatch.setattr(query_stats_middleware, "QUERY_STATS_REPEAT_THRESHOLD", 1000)
+    with caplog.at_level(logging.WARNING, logger=query_stats_middleware.__name__):
+        client.get("/keywords/", headers=AUTH)
+    assert not [r for r in caplog.records if "possible N+1" in r.getMessage()]
+
+    monkeypatch.setattr(query_stats_middleware, "QUERY_STATS_REPEAT_THRESHOLD", 1)
+    with caplog.at_level(logging.WARNING, logger=query_stats_middleware.__name__):
+        client.get("/keywords/", headers=AUTH)
+    assert any("possible N+1: GET /keywords/" in r.getMessage() for r in caplog.records)
@@ -15,9 +15,8 @@ import anyio
 from core import async_bulk_operations
 from core.async_bulk_operations import (
     BulkOperationTask, 
-    AsyncBulkOperationsManager,
+    BulkOperationWorkerPool,
     execute_bulk_operation_async,
-    get_bulk_operation_status,
     cancel_bulk_operation,
     get_running_bulk_operations_count,
     get_async_db_session
@@ -30,6 +29,8 @@ def mock_db():
     """Create a mock database session."""
     db = Mock()
     db.query.return_value.filter.return_value.all.return_value = []
+    # (status, worker_id) read by the between-chunk cancellation check
+    db.query.return_value.filter.return_value.first.return_value = ("running", None)
     db.commit = Mock()
     db.rollback = Mock()
     db.refresh = Mock()
@@ -51,6 +52,17 @@ def sample_operation_data():
     }
 
 
+def _chunks_for(chunks_by_model):
+    """Fake ``_next_chunk_ids`` serving the given chunks per model, then []."""
+    remaining = {model: list(chunks) for model, chunks in chunks_by_model.items()}
+
+    def next_chunk(db, model, pk, org_id, after_id):
+        chunks = remaining.get(model) or []
+        return chunks.pop(0) if chunks else []
+
+    return Mock(side_effect=next_chunk)
+
+
 class TestBulkOperationTask:
     """Test the BulkOperationTask class."""
 
@@ -137,6 +149,7 @@ class TestBulkOperationTask:
             assert result["status"] == "failed"
             assert result["error"] == "Operation not found"
 
+
     @pytest.mark.asyncio
     async def test_bulk_move_success(self, sample_operation_data, mock_db):
         """Test successful bulk move operation."""
@@ -156,41 +169,32 @@ class TestBulkOperationTask:
         mock_operation.result_summary = None
         mock_operation.error_log = None
 
-        # Mock agents for move
-        mock_agents = [
-            Mock(agent_id=uuid.uuid4(), organization_id=sample_operation_data["organization_id"]),
-            Mock(agent_id=uuid.uuid4(), organization_id=sample_operation_data["organization_id"])
-        ]
+        agent_ids = [uuid.uuid4(), uuid.uuid4()]
+        task._next_chunk_ids = _chunks_for({models.Agent: [agent_ids]})
+        mock_db.execute.return_value.all.return_value = [(i,) for i in agent_ids]
 
         with patch('core.async_bulk_operations.get_async_db_session') as mock_get_db, \
              patch('core.async_bulk_operations.crud.get_bulk_operation') as mock_get_op, \
+             patch.object(BulkOperationTask, '_count_rows', side_effect=lambda db, rt, org: 2 if rt == "agents" else 0), \
              patch('core.async_bulk_operations.log_bulk_operation') as mock_log:
-            
+
             mock_get_db.return_value.__aenter__ = AsyncMock(return_value=mock_db)
             mock_get_db.return_value.__aexit__ = AsyncMock(return_value=None)
             mock_get_op.return_value = mock_operation
-            
-            # Setup database query mocks for different resource types
-            def query_side_effect(model_class):
-                query_mock = Mock()
-                if model_class == models.Agent:
-                    query_mock.filter.return_value.all.return_value = mock_agents
-                else:
-                    query_mock.filter.return_value.all.return_value = []
-                return query_mock
-            
-            mock_db.query.side_effect = query_side_effect
-            
+
             result = await task.execute()
-            
+
             # Verify operation was updated correctly
             assert mock_operation.status == "completed"
             assert mock_operation.started_at is not None
             assert mock_operation.finished_at is not None
+            assert mock_operation.total == 2
+            assert mock_operation.progress == 2
             assert mock_operation.result_summary["total_moved"] == 2  # 2 agents moved
+            assert result["total_moved"] == 2
             mock_log.assert_called()
 
-    @pytest.mark.asyncio 
+    @pytest.mark.asyncio
     async def test_bulk_delete_success(self, sample_operation_data, mock_db):
         """Test successful bulk delete operation."""
         task = BulkOperationTask(
@@ -198,33 +202,35 @@ class TestBulkOperationTask:
             task_type="bulk_delete",
             actor_user_id=sample_operation_data["actor_user_id"],
             organization_id=sample_operation_data["organization_id"],
-            payload={"resource_types": ["agents"]}
+            payload={"resource_types": ["agents"]},
+            chunk_size=2,
         )
 
         # Create mock operation
         mock_operation = Mock()
         mock_operation.status = "pending"
 
-        # Mock agents for deletion
-        mock_agents = [Mock(agent_id=uuid.uuid4()) for _ in range(3)]
+        agent_ids = [uuid.uuid4() for _ in range(3)]
+        task._next_chunk_ids = _chunks_for({models.Agent: [agent_ids[:2], agent_ids[2:]]})
+        # Only the final DELETE ... RETURNING of each chunk is read.
+        mock_db.execute.return_value.all.side_effect = [[(i,) for i in agent_ids[:2]], [(agent_ids[2],)]]
 
         with patch('core.async_bulk_operations.get_async_db_session') as mock_get_db, \
              patch('core.async_bulk_operations.crud.get_bulk_operation') as mock_get_op, \
-             patch('core.async_bulk_operations.crud.delete_agent') as mock_delete, \
+             patch.object(BulkOperationTask, '_count_rows', return_value=3), \
              patch('core.async_bulk_operations.log_bulk_operation') as mock_log:
-            
+
             mock_get_db.return_value.__aenter__ = AsyncMock(return_value=mock_db)
             mock_get_db.return_value.__aexit__ = AsyncMock(return_value=None)
             mock_get_op.return_value = mock_operation
-            mock_delete.return_value = True
-            
-            # Setup database query for agents
-            mock_db.query.return_value.filter.return_value.all.return_value = mock_agents
-            
+
             result = await task.execute()
-            
-            # Verify deletion was called for each agent
-            assert mock_delete.call_count == 3
+
+            # One transaction to start the operation, one per chunk, one for the
+            # final (empty) chunk read, one to finish.
+            assert mock_db.commit.call_count == 5
+            assert result["total_deleted"] == 3
+            assert mock_operation.progress == 3
             assert mock_operation.status == "completed"
 
     @pytest.mark.asyncio
@@ -238,40 +244,50 @@ class TestBulkOperationTask:
             payload=sample_operation_data["payload"],
         )
 
-        blocks = [Mock(id=uuid.uuid4()) for _ in range(2)]
-        mock_db.query.return_value.filter.return_value.all.return_value = blocks
+        block_ids = [uuid.uuid4() for _ in range(2)]
+        task._next_chunk_ids = _chunks_for({models.MemoryBlock: [block_ids]})
+        mock_db.execute.return_value.all.return_value = [(i,) for i in block_ids]
 
         errors: list[str] = []
-        moved = await task._move_memory_blocks(
-            mock_db,
-            sample_operation_data["organization_id"],
-            uuid.uuid4(),
-            uuid.uuid4(),
-            errors,
-        )
+        with patch.object(async_bulk_operations.crud, "resync_suggestion_scopes") as resync:
+            moved = await task._move_memory_blocks(
+                mock_db,
+                sample_operation_data["organization_id"],
+                uuid.uuid4(),
+                uuid.uuid4(),
+                errors,
+            )
 
         assert moved == 2
         assert errors == []
+        # Pending suggestions over the moved blocks are resynced in the chunk's transaction.
+        resync.assert_called_once_with(mock_db, block_ids)
+        # A single set-based UPDATE and a single commit for the whole chunk,
+        # then the commit of the final (empty) chunk read.
+        assert mock_db.execute.call_count == 1
+        assert mock_db.commit.call_count == 2
 
     @pytest.mark.asyncio
     async def test_move_keywords_records_generic_failure(self, sample_operation_data, mock_db):
-        """Generic exceptions while moving keywords are captured and logged."""
+        """A failing chunk is rolled back and recorded; later chunks still run."""
         task = BulkOperationTask(
             operation_id=sample_operation_data["operation_id"],
             task_type="bulk_move",
             actor_user_id=sample_operation_data["actor_user_id"],
             organization_id=sample_operation_data["organization_id"],
             payload=sample_operation_data["payload"],
+            chunk_size=1,
         )
 
-        keywords = [Mock(keyword_id=uuid.uuid4()) for _ in range(2)]
-        mock_db.query.return_value.filter.return_value.all.return_value = keywords
+        keyword_ids = [uuid.uuid4(), uuid.uuid4()]
+        task._next_chunk_ids = _chunks_for({models.Keyword: [[keyword_ids[0]], [keyword_ids[1]]]})
+        mock_db.execute.return_value.all.return_value = [(keyword_ids[0],)]
 
         commit_calls = {"count": 0}
 
         def commit_side_effect():
             commit_calls["count"] += 1
-            if commit_calls["count"] >= 2:
+            if commit_calls["count"] == 2:
                 raise Exception("boom")
 
         mock_db.commit.side_effect = commit_side_effect
@@ -286,8 +302,9 @@ class TestBulkOperationTask:
         )
 
         assert moved == 1
+        assert task.progress == 1
         assert len(errors) == 1
-        assert "Failed to move keyword" in errors[0]
+        assert "Failed to move keywords" in errors[0]
         mock_db.rollback.assert_called_once()
 
     @pytest.mark.asyncio
@@ -299,23 +316,25 @@ class TestBulkOperationTask:
             actor_user_id=sample_operation_data["actor_user_id"],
             organization_id=sample_operation_data["organization_id"],
             payload={"resource_types": ["memory_blocks"]},
+            chunk_size=1,
         )
 
-        blocks = [Mock(id=uuid.uuid4()) for _ in range(2)]
-        mock_db.query.return_value.filter.return_value.all.return_value = blocks
+        block_ids = [uuid.uuid4(), uuid.uuid4()]
+        task._next_chunk_ids = _chunks_for({models.MemoryBlock: [[block_ids[0]], [block_ids[1]]]})
+        ok = Mock()
+        ok.all.return_value = [(block_ids[0],)]
+        mock_db.execute.side_effect = [ok, Exception("fail")]
 
-        with patch('core.async_bulk_operations.crud.delete_memory_block') as mock_delete:
-            mock_delete.side_effect = [True, Exception("fail")]
-            errors: list[str] = []
-            deleted = await task._delete_memory_blocks(mock_db, sample_operation_data["organization_id"], errors)
+        errors: list[str] = []
+        deleted = await task._delete_memory_blocks(mock_db, sample_operation_data["organization_id"], errors)
 
         assert deleted == 1
         assert len(errors) == 1
-        assert "Failed to delete memory block" in errors[0]
+        assert "Failed to delete memory blocks" in errors[0]
 
     @pytest.mark.asyncio
     async def test_delete_keywords_success(self, sample_operation_data, mock_db):
-        """Keyword deletion success path increments counter."""
+        """Keyword deletion removes associations first, then the keywords."""
         task = BulkOperationTask(
             operation_id=sample_operation_data["operation_id"],
             task_type="bulk_delete",
@@ -324,121 +343,241 @@ class TestBulkOperationTask:
             payload={"resource_types": ["keywords"]},
         )
 
-        keywords = [Mock(keyword_id=uuid.uuid4()) for _ in range(3)]
-        mock_db.query.return_value.filter.return_value.all.return_value = keywords
+        keyword_ids = [uuid.uuid4() for _ in range(3)]
+        task._next_chunk_ids = _chunks_for({models.Keyword: [keyword_ids]})
+        mock_db.execute.return_value.all.return_value = [(i,) for i in keyword_ids]
 
-        with patch('core.async_bulk_operations.crud.delete_keyword') as mock_delete:
-            mock_delete.return_value = True
-            errors: list[str] = []
-            deleted = await task._delete_keywords(mock_db, sample_operation_data["organization_id"], errors)
+        errors: list[str] = []
+        deleted = await task._delete_keywords(mock_db, sample_operation_data["organization_id"], errors)
 
         assert deleted == 3
         assert errors == []
+        # association DELETE + keyword DELETE ... RETURNING
+        assert mock_db.execute.call_count == 2
 
+    @pytest.mark.asyncio
+    async def test_cancel_between_chunks(self, sample_operation_data, mock_db):
+        """A cancel request stops the task before the next chunk and is kept as the final status."""
+        task = BulkOperationTask(
+            operation_id=sample_operation_data["operation_id"],
+            task_type="bulk_move",
+            actor_user_id=sample_operation_data["actor_user_id"],
+            organization_id=sample_operation_data["organization_id"],
+            payload={**sample_operation_data["payload"], "resource_types": ["memory_blocks"]},
+            chunk_size=1,
+        )
+        mock_operation = Mock()
+        block_ids = [uuid.uuid4(), uuid.uuid4()]
+        task._next_chunk_ids = _chunks_for({models.MemoryBlock: [[block_ids[0]], [block_ids[1]]]})
 
-class TestAsyncBulkOperationsManager:
-    """Test the AsyncBulkOperationsManager class."""
+        def execute_side_effect(stmt):
+            # First chunk runs, then someone cancels.
+            task.request_cancel()
+            result = Mock()
+            result.all.return_value = [(block_ids[0],)]
+            return result
 
-    def test_manager_initialization(self):
-        """Test that the manager initializes correctly."""
-        manager = AsyncBulkOperationsManager()
-        
-        assert manager._running_tasks == {}
-        assert manager._task_results == {}
+        mock_db.execute.side_effect = execute_side_effect
+
+        with patch('core.async_bulk_operations.crud.get_bulk_operation', return_value=mock_operation), \
+             patch.object(BulkOperationTask, '_count_rows', return_value=2), \
+             patch('core.async_bulk_operations.log_bulk_operation'):
+            result = await task._perform_bulk_move(mock_db)
+
+        assert result["total_moved"] == 1
+        assert result["status"] == "cancelled"
+        assert mock_operation.status == "cancelled"
+        assert mock_operation.result_summary["cancelled"] is True
 
     @pytest.mark.asyncio
-    async def test_submit_task(self, sample_operation_data):
-        """Test submitting a task to the manager."""
-        manager = AsyncBulkOperationsManager()
-        
-        with patch.object(BulkOperationTask, 'execute', new_callable=AsyncMock) as mock_execute:
-            mock_execute.return_value = {"status": "completed"}
-            
-            await manager.submit_task(
-                operation_id=sample_operation_data["operation_id"],
-                task_type=sample_operation_data["task_type"],
-                actor_user_id=sample_operation_data["actor_user_id"],
-                organization_id=sample_operation_data["organization_id"],
-                payload=sample_operation_data["payload"]
-            )
-            
-            # Task should be in running tasks initially
-            assert sample_operation_data["operation_id"] in manager._running_tasks
-            
-            # Wait for task completion
-            await asyncio.sleep(0.1)
-            
-            # Task should be completed and moved to results
-            assert sample_operation_data["operation_id"] not in manager._running_tasks
-            assert sample_operation_data["operation_id"] in manager._task_results
-            assert manager._task_results[sample_operation_data["operation_id"]]["status"] == "completed"
-
-    def test_get_task_status_running(self, sample_operation_data):
-        """Test getting status of a running task."""
-        manager = AsyncBulkOperationsManager()
-        
-        # Mock a running task
-        mock_task = Mock()
-        manager._running_tasks[sample_operation_data["operation_id"]] = mock_task
-        
-        status = manager.get_task_status(sample_operation_data["operation_id"])
-        
-        assert status == {"status": "running"}
+    async def test_pool_stop_leaves_the_operation_running(self, sample_operation_data, mock_db):
+        """Stopping the pool mid-run stops after the chunk but does not finish the row."""
+        pool = BulkOperationWorkerPool(workers=1)
+        task = BulkOperationTask(
+            operation_id=sample_operation_data["operation_id"],
+            task_type="bulk_move",
+            actor_user_id=sample_operation_data["actor_user_id"],
+            organization_id=sample_operation_data["organization_id"],
+            payload={**sample_operation_data["payload"], "resource_types": ["memory_blocks"]},
+            chunk_size=1,
+        )
+        pool._active[task.operation_id] = task
+        mock_operation = Mock()
+        mock_operation.status = "running"
+        block_ids = [uuid.uuid4(), uuid.uuid4()]
+        task._next_chunk_ids = _chunks_for({models.MemoryBlock: [[block_ids[0]], [block_ids[1]]]})
+
+        def execute_side_effect(stmt):
+            # First chunk runs, then the process shuts down.
+            pool.stop(timeout=0)
+            result = Mock()
+            result.all.return_value = [(block_ids[0],)]
+            return result
+
+        mock_db.execute.side_effect = execute_side_effect
+
+        with patch('core.async_bulk_operations.crud.get_bulk_operation', return_value=mock_operation), \
+             patch.object(BulkOperationTask, '_count_rows', return_value=2), \
+             patch('core.async_bulk_operations.log_bulk_operation') as audit:
+            result = await task._perform_bulk_move(mock_db)
+
+        assert result["status"] == "running"
+        assert result["interrupted"] is True
+        assert result["total_moved"] == 1
+        assert task.cancelled is False
+        assert mock_operation.status == "running"
+        audit.assert_not_called()
+
+    def test_cancellation_requested_reads_db_status(self, sample_operation_data, mock_db):
+        """A cancel written to the DB row (e.g. by another replica) is honoured."""
+        task = BulkOperationTask(
+            operation_id=sample_operation_data["operation_id"],
+            task_type="bulk_move",
+            actor_user_id=sample_operation_data["actor_user_id"],
+            organization_id=sample_operation_data["organization_id"],
+            payload=sample_operation_data["payload"],
+        )
+        mock_db.query.return_value.filter.return_value.first.return_value = ("running", None)
+        assert task._cancellation_requested(mock_db) is False
+        mock_db.query.return_value.filter.return_value.first.return_value = ("cancelled", None)
+        assert task._cancellation_requested(mock_db) is True
 
-    def test_get_task_status_completed(self, sample_operation_data):
-        """Test getting status of a completed task."""
-        manager = AsyncBulkOperationsManager()
-        
-        # Mock a completed task result
-        expected_result = {"status": "completed", "total_moved": 5}
-        manager._task_results[sample_operation_data["operation_id"]] = expected_result
-        
-        status = manager.get_task_status(sample_operation_data["operation_id"])
-        
-        assert status == expected_result
+    def test_lost_lease_stops_without_marking_cancelled(self, sample_operation_data, mock_db):
+        """A row re-claimed by another worker stops this task but is left to its new owner."""
+        task = BulkOperationTask(
+            operation_id=sample_operation_data["operation_id"],
+            task_type="bulk_move",
+            actor_user_id=sample_operation_data["actor_user_id"],
+            organization_id=sample_operation_data["organization_id"],
+            payload=sample_operation_data["payload"],
+            worker_id="host:1:a:0",
+        )
+        mock_db.query.return_value.filter.return_value.first.return_value = ("running", "host:2:b:0")
+        assert task._cancellation_requested(mock_db) is True
+        assert task.lease_lost is True
 
-    def test_get_task_status_not_found(self, sample_operation_data):
-        """Test getting status of a non-existent task."""
-        manager = AsyncBulkOperationsManager()
-        
-        status = manager.get_task_status(sample_operation_data["operation_id"])
-        
-        assert status is None
+        operation = Mock()
+        operation.status = "running"
+        task._finish_operation(mock_db, operation, {"total_moved": 0}, [])
+        assert operation.status == "running"
+        mock_db.commit.assert_not_called()
 
-    def test_cancel_task_success(self, sample_operation_data):
-        """Test successfully canceling a running task."""
-        manager = AsyncBulkOperationsManager()
-        
-        # Mock a running task
-        mock_task = Mock()
-        mock_task.cancel = Mock()
-        manager._running_tasks[sample_operation_data["operation_id"]] = mock_task
-        
-        result = manager.cancel_task(sample_operation_data["operation_id"])
-        
-        assert result is True
-        mock_task.cancel.assert_called_once()
+    @pytest.mark.asyncio
+    async def test_failed_lease_renewal_stops_before_the_chunk(self, sample_operation_data, mock_db):
+        """When the conditional heartbeat UPDATE matches nothing the chunk is not applied."""
+        task = BulkOperationTask(
+            operation_id=sample_operation_data["operation_id"],
+            task_type="bulk_move",
+            actor_user_id=sample_operation_data["actor_user_id"],
+            organization_id=sample_operation_data["organization_id"],
+            payload=sample_operation_data["payload"],
+            worker_id="host:1:a:0",
+        )
+        task._next_chunk_ids = _chunks_for({models.MemoryBlock: [[uuid.uuid4()]]})
+        mock_db.query.return_value.filter.return_value.update.return_value = 0
 
-    def test_cancel_task_not_found(self, sample_operation_data):
-        """Test canceling a non-existent task."""
-        manager = AsyncBulkOperationsManager()
-        
-        result = manager.cancel_task(sample_operation_data["operation_id"])
-        
-        assert result is False
+        errors: list[str] = []
+        moved = await task._move_memory_blocks(mock_db, sample_operation_data["organization_id"], uuid.uuid4(), None, errors)
 
-    def test_get_running_tasks_count(self, sample_operation_data):
-        """Test getting the count of running tasks."""
-        manager = AsyncBulkOperationsManager()
-        
-        # Initially should be 0
-        assert manager.get_running_tasks_count() == 0
-        
-        # Add some mock running tasks
-        manager._running_tasks[sample_operation_data["operation_id"]] = Mock()
-        manager._running_tasks[uuid.uuid4()] = Mock()
-        
-        assert manager.get_running_tasks_count() == 2
+        assert moved == 0
+        assert task.lease_lost is True
+        assert task.cancelled is False
+        mock_db.execute.assert_not_called()
+        mock_db.commit.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_failed_chunk_still_renews_the_heartbeat(self, sample_operation_data, mock_db):
+        """A rolled-back chunk is followed by a heartbeat committed on its own."""
+        task = BulkOperationTask(
+            operation_id=sample_operation_data["operation_id"],
+            task_type="bulk_delete",
+            actor_user_id=sample_operation_data["actor_user_id"],
+            organization_id=sample_operation_data["organization_id"],
+            payload={"resource_types": ["memory_blocks"]},
+            worker_id="host:1:a:0",
+        )
+        task._next_chunk_ids = _chunks_for({models.MemoryBlock: [[uuid.uuid4()]]})
+        mock_db.execute.side_effect = Exception("fail")
+        calls = []
+        mock_db.rollback.side_effect = lambda: calls.append("rollback")
+        mock_db.commit.side_effect = lambda: calls.append("commit")
+
+        errors: list[str] = []
+        await task._delete_memory_blocks(mock_db, sample_operation_data["organization_id"], errors)
+
+        assert len(errors) == 1
+        # chunk rolled back, heartbeat committed, final empty read committed
+        assert calls == ["rollback", "commit", "commit"]
+        assert mock_db.query.return_value.filter.return_value.update.call_count == 3
+
+class TestBulkOperationWorkerPool:
+    """Test the BulkOperationWorkerPool class."""
+
+    def test_pool_initialization(self):
+        """Test that the pool initializes without starting threads."""
+        pool = BulkOperationWorkerPool(workers=2, poll_seconds=1)
+
+        assert pool._threads == []
+        assert pool.active_count() == 0
+
+    def test_start_is_noop_without_workers(self):
+        """BULK_OPERATION_WORKERS=0 leaves the queue to other replicas."""
+        pool = BulkOperationWorkerPool(workers=0)
+        pool.start()
+
+        assert pool._threads == []
+
+    def test_run_once_returns_false_when_queue_empty(self):
+        """No claimable row means nothing runs."""
+        pool = BulkOperationWorkerPool(workers=1)
+        with patch('core.db.database.SessionLocal') as mock_session_local, \
+             patch('core.async_bulk_operations.claim_next_bulk_operation', return_value=None):
+            assert pool.run_once("worker-0") is False
+            mock_session_local.return_value.close.assert_called_once()
+
+    def test_run_once_executes_claimed_operation(self, sample_operation_data):
+        """A claimed row is run as a BulkOperationTask owned by the claiming worker."""
+        pool = BulkOperationWorkerPool(workers=1)
+        operation = Mock()
+        operation.id = sample_operation_data["operation_id"]
+        operation.type = "bulk_delete"
+        operation.actor_user_id = sample_operation_data["actor_user_id"]
+        operation.organization_id = sample_operation_data["organization_id"]
+        operation.request_payload = {"resource_types": ["agents"]}
+        seen = {}
+
+        async def fake_execute(task):
+            seen["worker_id"] = task.worker_id
+            seen["resume"] = task.resume
+            seen["active"] = pool.active_count()
+            return {"status": "completed"}
+
+        with patch('core.db.database.SessionLocal'), \
+             patch('core.async_bulk_operations.claim_next_bulk_operation', return_value=(operation, True)), \
+             patch.object(BulkOperationTask, 'execute', fake_execute):
+            assert pool.run_once("worker-0") is True
+
+        assert seen == {"worker_id": "worker-0", "resume": True, "active": 1}
+        assert pool.active_count() == 0
+
+    def test_cancel_local(self, sample_operation_data):
+        """Only tasks running in this process can be flagged locally."""
+        pool = BulkOperationWorkerPool(workers=1)
+        task = Mock()
+        pool._active[sample_operation_data["operation_id"]] = task
+
+        assert pool.cancel_local(sample_operation_data["operation_id"]) is True
+        task.request_cancel.assert_called_once()
+        assert pool.cancel_local(uuid.uuid4()) is False
+
+    def test_wake_releases_waiting_worker(self):
+        """A wake-up is consumed without waiting for the poll interval."""
+        pool = BulkOperationWorkerPool(workers=1, poll_seconds=30)
+        pool.wake()
+
+        pool._wait_for_work()
+
+        assert pool._pending_wakeups == 0
 
 
 class TestModuleFunctions:
@@ -446,10 +585,8 @@ class TestModuleFunctions:
 
     @pytest.mark.asyncio
     async def test_execute_bulk_operation_async(self, sample_operation_data):
-        """Test the execute_bulk_operation_async function."""
-        with patch('core.async_bulk_operations._bulk_operations_manager.submit_task') as mock_submit:
-            mock_submit.return_value = None
-            
+        """Test the execute_bulk_operation_async function wakes a queue worker."""
+        with patch('core.async_bulk_operations._worker_pool.wake') as mock_wake:
             await execute_bulk_operation_async(
                 operation_id=sample_operation_data["operation_id"],
                 task_type=sample_operation_data["task_type"],
@@ -457,30 +594,12 @@ class TestModuleFunctions:
                 organization_id=sample_operation_data["organization_id"],
                 payload=sample_operation_data["payload"]
             )
-            
-            mock_submit.assert_called_once_with(
-                sample_operation_data["operation_id"],
-                sample_operation_data["task_type"],
-                sample_operation_data["actor_user_id"],
-                sample_operation_data["organization_id"],
-                sample_operation_data["payload"]
-            )
 
-    def test_get_bulk_operation_status(self, sample_operation_data):
-        """Test the get_bulk_operation_status function."""
-        expected_status = {"status": "completed"}
-        
-        with patch('core.async_bulk_operations._bulk_operations_manager.get_task_status') as mock_get_status:
-            mock_get_status.return_value = expected_status
-            
-            status = get_bulk_operation_status(sample_operation_data["operation_id"])
-            
-            assert status == expected_status
-            mock_get_status.assert_called_once_with(sample_operation_data["operation_id"])
+            mock_wake.assert_called_once_with()
 
     def test_cancel_bulk_operation(self, sample_operation_data):
         """Test the cancel_bulk_operation function."""
-        with patch('core.async_bulk_operations._bulk_operations_manager.cancel_task') as mock_cancel:
+        with patch('core.async_bulk_operations._worker_pool.cancel_local') as mock_cancel:
             mock_cancel.return_value = True
             
             result = cancel_bulk_operation(sample_operation_data["operation_id"])
@@ -490,7 +609,7 @@ class TestModuleFunctions:
 
     def test_get_running_bulk_operations_count(self):
         """Test the get_running_bulk_operations_count function."""
-        with patch('core.async_bulk_operations._bulk_operations_manager.get_running_tasks_count') as mock_count:
+        with patch('core.async_bulk_operations._worker_pool.active_count') as mock_count:
             mock_count.return_value = 3
             
             count = get_running_bulk_operations_count()
@@ -503,11 +622,13 @@ class TestModuleFunctions:
         """Test the get_async_db_session context manager."""
         mock_session = Mock()
         
-        with patch('core.async_bulk_operations.get_db_session_local') as mock_get_session_local:
-            mock_session_local = Mock()
-            mock_session_local.return_value = mock_session
-            mock_get_session_local.return_value = mock_session_local
-            
+        def fake_session_local():
+            try:
+                yield mock_session
+            finally:
+                mock_session.close()
+
+        with patch('core.async_bulk_operations.get_db_session_local', side_effect=fake_session_local):
             async with get_async_db_session() as db:
                 assert db == mock_session
             
@@ -528,18 +649,15 @@ class TestResourceTypeProcessing:
             task_type="bulk_move",
             actor_user_id=sample_operation_data["actor_user_id"],
             organization_id=sample_operation_data["organization_id"],
-            payload=sample_operation_data["payload"]
+            payload=sample_operation_data["payload"],
+            chunk_size=1,
         )
 
-        # Create mock agents, one that will cause an error
-        mock_agent1 = Mock()
-        mock_agent1.agent_id = uuid.uuid4()
-        mock_agent2 = Mock()
-        mock_agent2.agent_id = uuid.uuid4()
-        
-        mock_db.query.return_value.filter.return_value.all.return_value = [mock_agent1, mock_agent2]
+        agent_ids = [uuid.uuid4(), uuid.uuid4()]
+        task._next_chunk_ids = _chunks_for({models.Agent: [[agent_ids[0]], [agent_ids[1]]]})
+        mock_db.execute.return_value.all.return_value = [(agent_ids[0],)]
         
-        # First commit succeeds, second fails with StaleDataError
+        # First chunk commits, second fails with StaleDataError
         commit_call_count = 0
         def commit_side_effect():
             nonlocal commit_call_count
@@ -555,12 +673,36 @@ class TestResourceTypeProcessing:
         
         moved_count = await task._move_agents(mock_db, sample_operation_data["organization_id"], dest_org_id, dest_owner_id, errors)
         
-        # Should have moved 1 agent successfully, 1 failed
+        # Should have moved 1 chunk successfully, 1 failed
         assert moved_count == 1
         assert len(errors) == 1
         assert "Concurrent modification" in errors[0]
         mock_db.rollback.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_move_agents_skips_name_conflicts(self, sample_operation_data, mock_db):
+        """Agents whose name is taken in the destination are left behind and reported, not the whole chunk."""
+        task = BulkOperationTask(
+            operation_id=sample_operation_data["operation_id"],
+            task_type="bulk_move",
+            actor_user_id=sample_operation_data["actor_user_id"],
+            organization_id=sample_operation_data["organization_id"],
+            payload=sample_operation_data["payload"],
+        )
+
+        agent_ids = [uuid.uuid4() for _ in range(3)]
+        task._next_chunk_ids = _chunks_for({models.Agent: [agent_ids]})
+        mock_db.execute.return_value.all.return_value = [(agent_ids[0],), (agent_ids[2],)]
+
+        errors = []
+        moved = await task._move_agents(mock_db, sample_operation_data["organization_id"], uuid.uuid4(), None, errors)
+
+        assert moved == 2
+        assert task.progress == 2
+        assert errors == [f"1 agents not moved, name already exists in the destination: {agent_ids[1]}"]
+        statement = str(mock_db.execute.call_args[0][0])
+        assert "NOT (EXISTS" in statement and "lower(agents_1.agent_name)" in statement
+
     @pytest.mark.asyncio
     async def test_delete_agents_success(self, sample_operation_data, mock_db):
         """Test successful agent deletion."""
@@ -572,16 +714,15 @@ class TestResourceTypeProcessing:
             payload={"resource_types": ["agents"]}
         )
 
-        # Mock agents for deletion
-        mock_agents = [Mock(agent_id=uuid.uuid4()) for _ in range(2)]
-        mock_db.query.return_value.filter.return_value.all.return_value = mock_agents
-        
-        with patch('core.async_bulk_operations.crud.delete_agent') as mock_delete:
-            mock_delete.return_value = True
-            
-            errors = []
-            deleted_count = await task._delete_agents(mock_db, sample_operation_data["organization_id"], errors)
-            
-            assert deleted_count == 2
-            assert len(errors) == 0
-            assert mock_delete.call_count == 2
+        agent_ids = [uuid.uuid4() for _ in range(2)]
+        task._next_chunk_ids = _chunks_for({models.Agent: [agent_ids]})
+        mock_db.execute.return_value.all.return_value = [(i,) for i in agent_ids]
+
+        errors = []
+        deleted_count = await task._delete_agents(mock_db, sample_operation_data["organization_id"], errors)
+
+        assert deleted_count == 2
+        assert len(errors) == 0
+        # transcripts, memory blocks, agents — one statement each for the chunk
+        assert mock_db.execute.call_count == 3
+        assert mock_db.commit.call_count == 2
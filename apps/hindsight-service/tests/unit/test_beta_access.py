@@ -614,7 +614,7 @@ class TestBetaAccessNotifications:
         result = notification_service.notify_beta_access_invitation("test@example.com")
 
         assert result["success"] is True
-        assert "message_id" in result
+        assert result["queued"] is True
         # Verify email service was called with correct template
         mock_service.render_template.assert_called_with(
             "beta_access_invitation",
@@ -632,7 +632,7 @@ class TestBetaAccessNotifications:
         result = notification_service.notify_beta_access_request_confirmation("test@example.com")
 
         assert result["success"] is True
-        assert "message_id" in result
+        assert result["queued"] is True
         mock_service.render_template.assert_called_with(
             "beta_access_request_confirmation",
             {}
@@ -664,7 +664,7 @@ class TestBetaAccessNotifications:
         result = notification_service.notify_beta_access_admin_notification(request_id, "user@example.com", review_token)
 
         assert result["success"] is True
-        assert "message_id" in result
+        assert result["queued"] is True
         mock_service.render_template.assert_called_with(
             "beta_access_admin_notification",
             {
@@ -705,27 +705,27 @@ class TestBetaAccessNotifications:
         result = notification_service.notify_beta_access_acceptance("test@example.com")
 
         assert result["success"] is True
-        assert "message_id" in result
+        assert result["queued"] is True
         mock_service.render_template.assert_called_with(
             "beta_access_acceptance",
             {"login_url": "https://app.hindsight.ai/login"}
         )
 
-    def test_notify_beta_access_acceptance_async_send(self, db_session: Session):
-        """Async send_email paths should use asyncio.run and capture success."""
-
-        async def fake_send_email(**kwargs):  # pragma: no cover - but executed via fake run
-            return {"success": True, "message_id": "async-id"}
-
+    def test_notify_beta_access_acceptance_queues_outbox_row(self, db_session: Session):
+        """The rendered email is queued without a user instead of being sent inline."""
         mock_service = Mock()
-        mock_service.render_template.return_value = ("<html>Test</html>", "Test")
-        mock_service.send_email = fake_send_email
+        mock_service.render_template.return_value = ("<html>Granted</html>", "Granted")
 
         notification_service = NotificationService(db_session, email_service=mock_service)
         result = notification_service.notify_beta_access_acceptance("test@example.com")
 
         assert result["success"] is True
-        assert result["message_id"] == "async-id"
+        mock_service.send_email.assert_not_called()
+        log = db_session.get(models.EmailNotificationLog, result["email_log_id"])
+        assert log.user_id is None
+        assert log.event_type == "beta_access_acceptance"
+        assert (log.status, log.body_html, log.body_text) == ("pending", "<html>Granted</html>", "Granted")
+        assert log.next_attempt_at is not None
 
     def test_notify_beta_access_denial(self, db_session: Session):
         """Test sending beta access denial email."""
@@ -737,28 +737,12 @@ class TestBetaAccessNotifications:
         result = notification_service.notify_beta_access_denial("test@example.com", "Not approved")
 
         assert result["success"] is True
-        assert "message_id" in result
+        assert result["queued"] is True
         mock_service.render_template.assert_called_with(
             "beta_access_denial",
             {"decision_reason": "Not approved"}
         )
 
-    def test_notify_beta_access_denial_async_send(self, db_session: Session):
-        """Async denial paths should succeed and surface message id."""
-
-        async def fake_send_email(**kwargs):
-            return {"success": True, "message_id": "async-deny"}
-
-        mock_service = Mock()
-        mock_service.render_template.return_value = ("<html>Test</html>", "Test")
-        mock_service.send_email = fake_send_email
-
-        notification_service = NotificationService(db_session, email_service=mock_service)
-        result = notification_service.notify_beta_access_denial("test@example.com", "reason")
-
-        assert result["success"] is True
-        assert result["message_id"] == "async-deny"
-
 
 class TestBetaAccessAPI:
     """Test beta access API endpoints."""
@@ -8,10 +8,11 @@ Three concerns this file pins:
    returns. Pre-#76 the worker only recorded "failed" in the in-memory
    dict and left the DB row stuck at `running` forever.
 
-2. **Cancel reconciliation**: `cancel_task` records `cancelled` in the
-   in-memory `_task_results` BEFORE the task callback fires, so the
-   `asyncio.CancelledError` propagating through `_on_task_complete`
-   does not clobber the cancel state with "failed".
+2. **Cancel reconciliation**: a cancel recorded on the DB row is the
+   source of truth. A task that observes it finishes as `cancelled`
+   (never clobbered to `completed`/`failed`), and stopping the worker
+   pool flags in-flight tasks so they stop after the current chunk (left
+   `running` for another worker to resume, not cancelled).
 
 3. **Duplicate `GET /admin/operations/{operation_id}` registration**:
    the dummy 403-only route at `bulk_operations.py:267` (which used to
@@ -26,8 +27,8 @@ import uuid
 from fastapi.routing import APIRoute
 
 from core.async_bulk_operations import (
-    AsyncBulkOperationsManager,
     BulkOperationTask,
+    BulkOperationWorkerPool,
 )
 from core.db import models, schemas, crud
 
@@ -92,98 +93,45 @@ def test_worker_crash_transitions_db_row_to_failed():
     )
 
 
-def test_cancel_task_records_cancelled_state_in_memory():
-    """cancel_task() must record "cancelled" so the post-cancel callback
-    does not clobber it with "failed" (CancelledError default)."""
-    mgr = AsyncBulkOperationsManager()
-    op_id = uuid.uuid4()
+def test_db_cancel_is_not_clobbered_on_finish():
+    """A row cancelled in the DB mid-run must finish as "cancelled", not "completed"."""
+    from unittest.mock import MagicMock
 
-    async def _slow():
-        await asyncio.sleep(60)
-        return {"status": "completed"}
-
-    loop = asyncio.new_event_loop()
-    try:
-        task = loop.create_task(_slow())
-        mgr._running_tasks[op_id] = task
-
-        # Cancel — should record "cancelled" in _task_results.
-        result = mgr.cancel_task(op_id)
-        assert result is True
-        assert mgr._task_results[op_id] == {"status": "cancelled"}
-
-        # Drive the cancellation through the asyncio loop.
-        async def _wait():
-            try:
-                await task
-            except asyncio.CancelledError:
-                pass
-        loop.run_until_complete(_wait())
-        # Manually invoke the callback (in real usage asyncio fires it).
-        mgr._on_task_complete(op_id, task)
-
-        # Must remain "cancelled" — _on_task_complete must not clobber it.
-        assert mgr._task_results[op_id] == {"status": "cancelled"}, (
-            "REGRESSION (#76): cancel state was clobbered by _on_task_complete; "
-            "the asyncio.CancelledError propagating through the callback must "
-            "not overwrite the explicit cancel record."
-        )
-        assert op_id not in mgr._running_tasks, (
-            "Running-tasks dict should be cleaned up after cancellation completes."
-        )
-    finally:
-        loop.close()
-
-
-def test_on_task_complete_records_cancelled_for_uncancelled_callers():
-    """If a task is cancelled externally (not via cancel_task), the callback's
-    asyncio.CancelledError branch records 'cancelled' as the result."""
-    mgr = AsyncBulkOperationsManager()
-    op_id = uuid.uuid4()
+    task = BulkOperationTask(
+        operation_id=uuid.uuid4(),
+        task_type="bulk_delete",
+        actor_user_id=uuid.uuid4(),
+        organization_id=uuid.uuid4(),
+        payload={},
+    )
+    fake_db = MagicMock()
+    fake_db.query.return_value.filter.return_value.first.return_value = ("cancelled", None)
+    assert task._cancellation_requested(fake_db) is True
+    task.cancelled = True
 
-    async def _slow():
-        await asyncio.sleep(60)
-
-    loop = asyncio.new_event_loop()
-    try:
-        task = loop.create_task(_slow())
-        mgr._running_tasks[op_id] = task
-        # Cancel directly (bypass cancel_task — simulates external cancel)
-        task.cancel()
-        async def _wait():
-            try:
-                await task
-            except asyncio.CancelledError:
-                pass
-        loop.run_until_complete(_wait())
-        mgr._on_task_complete(op_id, task)
-        assert mgr._task_results[op_id] == {"status": "cancelled"}, (
-            f"_on_task_complete should record cancelled for an externally-"
-            f"cancelled task; got {mgr._task_results[op_id]!r}"
-        )
-    finally:
-        loop.close()
-
-
-def test_on_task_complete_records_failed_for_unexpected_exception():
-    """If a task raises a non-CancelledError, the callback records 'failed'."""
-    mgr = AsyncBulkOperationsManager()
-    op_id = uuid.uuid4()
+    fake_op = MagicMock(status="cancelled")
+    fake_op.error_log = None
+    task._finish_operation(fake_db, fake_op, {"total_deleted": 3}, [])
+
+    assert fake_op.status == "cancelled", (
+        "REGRESSION (#76): a persisted cancel was overwritten on finish."
+    )
+    assert fake_op.result_summary == {"total_deleted": 3, "cancelled": True}
+
+
+def test_pool_stop_flags_running_tasks():
+    """Shutdown asks in-flight tasks to stop after their current chunk,
+    without cancelling them: another worker resumes the row."""
+    from unittest.mock import MagicMock
+
+    pool = BulkOperationWorkerPool(workers=1)
+    running = MagicMock()
+    pool._active[uuid.uuid4()] = running
+
+    pool.stop(timeout=0)
 
-    async def _explode():
-        raise RuntimeError("boom")
-
-    loop = asyncio.new_event_loop()
-    try:
-        task = loop.create_task(_explode())
-        mgr._running_tasks[op_id] = task
-        loop.run_until_complete(asyncio.gather(task, return_exceptions=True))
-        mgr._on_task_complete(op_id, task)
-        result = mgr._task_results[op_id]
-        assert result["status"] == "failed"
-        assert "boom" in result.get("error", ""), result
-    finally:
-        loop.close()
+    running.request_shutdown.assert_called_once()
+    running.request_cancel.assert_not_called()
 
 
 def test_admin_operations_route_registered_only_once():
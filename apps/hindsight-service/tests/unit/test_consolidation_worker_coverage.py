@@ -21,6 +21,18 @@ def _install_fake_google(monkeypatch, client_factory):
     monkeypatch.setitem(sys.modules, "google.genai", fake_genai)
 
 
+def _fake_run(monkeypatch, pending_ids=()):
+    run = SimpleNamespace(id=uuid.uuid4(), watermark_updated_at=None, watermark_id=None)
+    checkpoint = MagicMock()
+    finish = MagicMock()
+    monkeypatch.setattr(worker, "claim_consolidation_run", lambda db, timeout: (run, False))
+    monkeypatch.setattr(worker, "checkpoint_consolidation_run", checkpoint)
+    monkeypatch.setattr(worker, "finish_consolidation_run", finish)
+    monkeypatch.setattr(worker, "get_pending_suggestion_memory_ids", lambda db, ids: set(pending_ids) & set(ids))
+    monkeypatch.setattr(worker, "delete_archived_minhash_entries", lambda db: 0)
+    return run, checkpoint, finish
+
+
 def test_safe_group_id_handles_errors():
     class Bad:
         def get(self, key, default=None):
@@ -31,32 +43,43 @@ def test_safe_group_id_handles_errors():
 
 
 def test_fetch_memory_blocks_success(monkeypatch):
-    class Block:
-        def __init__(self, value):
-            self.id = value
-            self.content = f"content-{value}"
-
-    blocks = [Block("a"), Block("b")]
-    monkeypatch.setattr(worker, "get_all_memory_blocks", lambda db, skip, limit: blocks)
+    blocks = [{"id": "a", "content": "content-a"}, {"id": "b", "content": "content-b"}]
+    monkeypatch.setattr(worker, "get_memory_blocks_since", lambda db, watermark, limit, until: blocks)
 
     db = MagicMock()
-    result = worker.fetch_memory_blocks(db, offset=0, limit=5)
+    result = worker.fetch_memory_blocks(db, (None, None), limit=5)
 
-    assert [b.__dict__ for b in blocks] == result
+    assert result == blocks
+
+
+def test_iter_memory_block_batches_advances_keyset(monkeypatch):
+    pages = [
+        [{"id": 1, "updated_at": "t1"}, {"id": 2, "updated_at": "t2"}],
+        [{"id": 3, "updated_at": "t3"}],
+    ]
+    fetch_mock = MagicMock(side_effect=pages)
+    monkeypatch.setattr(worker, "fetch_memory_blocks", fetch_mock)
+
+    batches = list(worker.iter_memory_block_batches("db", (None, None), 2, until="u"))
+
+    assert batches == pages
+    assert fetch_mock.call_args_list == [
+        call("db", (None, None), 2, "u"),
+        call("db", ("t2", 2), 2, "u"),
+    ]
 
 
 def test_fetch_memory_blocks_handles_exception(monkeypatch):
-    monkeypatch.setattr(worker, "get_all_memory_blocks", lambda *args, **kwargs: (_ for _ in ()).throw(RuntimeError("boom")))
+    monkeypatch.setattr(worker, "get_memory_blocks_since", lambda *args, **kwargs: (_ for _ in ()).throw(RuntimeError("boom")))
     db = MagicMock()
 
-    result = worker.fetch_memory_blocks(db, offset=0, limit=5)
+    result = worker.fetch_memory_blocks(db, (None, None), limit=5)
 
     assert result == []
 
 
-def test_analyze_duplicates_with_llm_requires_model_name(monkeypatch):
-    fallback_groups = [{"group_id": "grp", "memory_ids": ["1"]}]
-    monkeypatch.setattr(worker, "analyze_duplicates_with_fallback", lambda blocks: fallback_groups)
+def test_generate_group_suggestions_requires_model_name(monkeypatch):
+    groups = [{"group_id": "grp", "memory_ids": ["1"]}]
 
     class FakeClient:
         def __init__(self, api_key):
@@ -66,18 +89,19 @@ def test_analyze_duplicates_with_llm_requires_model_name(monkeypatch):
     _install_fake_google(monkeypatch, FakeClient)
     monkeypatch.delenv("LLM_MODEL_NAME", raising=False)
 
-    result = worker.analyze_duplicates_with_llm([{"id": "1", "content": "text", "lessons_learned": ""}], llm_api_key="key")
+    result = worker.generate_group_suggestions(groups, [{"id": "1", "content": "text", "lessons_learned": ""}], llm_api_key="key")
 
-    assert result == fallback_groups
+    assert len(result) == 1
+    assert "LLM_MODEL_NAME" in result[0]["llm_error"]
+    assert "suggested_content" not in result[0]
 
 
-def test_analyze_duplicates_with_llm_trims_long_responses(monkeypatch):
+def test_generate_group_suggestions_trims_long_responses(monkeypatch):
     block_a = {"id": uuid.uuid4(), "content": "short", "lessons_learned": "alpha", "keywords": []}
     block_b = {"id": uuid.uuid4(), "content": "this is much longer", "lessons_learned": "beta lessons", "keywords": []}
     memory_blocks = [block_a, block_b]
 
-    fallback_groups = [{"group_id": "grp", "memory_ids": [str(block_a["id"]), str(block_b["id"])]}]
-    monkeypatch.setattr(worker, "analyze_duplicates_with_fallback", lambda blocks: fallback_groups)
+    groups = [{"group_id": "grp", "memory_ids": [str(block_a["id"]), str(block_b["id"])]}]
 
     def generate_content(**kwargs):
         payload = {
@@ -95,7 +119,7 @@ def test_analyze_duplicates_with_llm_trims_long_responses(monkeypatch):
     _install_fake_google(monkeypatch, FakeClient)
     monkeypatch.setenv("LLM_MODEL_NAME", "test-model")
 
-    result = worker.analyze_duplicates_with_llm(memory_blocks, llm_api_key="key")
+    result = worker.generate_group_suggestions(groups, memory_blocks, llm_api_key="key")
 
     assert len(result) == 1
     group = result[0]
@@ -104,11 +128,10 @@ def test_analyze_duplicates_with_llm_trims_long_responses(monkeypatch):
     assert group["suggested_keywords"] == ["kw"]
 
 
-def test_analyze_duplicates_with_llm_preserves_short_response(monkeypatch):
+def test_generate_group_suggestions_preserves_short_response(monkeypatch):
     block = {"id": uuid.uuid4(), "content": "abc", "lessons_learned": "xyz", "keywords": []}
     memory_blocks = [block]
-    fallback_groups = [{"group_id": "grp", "memory_ids": [str(block["id"])], "suggested_content": ""}]
-    monkeypatch.setattr(worker, "analyze_duplicates_with_fallback", lambda blocks: fallback_groups)
+    groups = [{"group_id": "grp", "memory_ids": [str(block["id"])], "suggested_content": ""}]
 
     class FakeClient:
         def __init__(self, api_key):
@@ -127,17 +150,16 @@ def test_analyze_duplicates_with_llm_preserves_short_response(monkeypatch):
     _install_fake_google(monkeypatch, FakeClient)
     monkeypatch.setenv("LLM_MODEL_NAME", "test-model")
 
-    result = worker.analyze_duplicates_with_llm(memory_blocks, llm_api_key="key")
+    result = worker.generate_group_suggestions(groups, memory_blocks, llm_api_key="key")
 
     assert result[0]["suggested_content"] == "abc"
     assert result[0]["suggested_lessons_learned"] == "xyz"
     assert result[0]["suggested_keywords"] == ["kw"]
 
 
-def test_analyze_duplicates_with_llm_returns_group_on_bad_json(monkeypatch):
+def test_generate_group_suggestions_returns_group_on_bad_json(monkeypatch):
     block = {"id": uuid.uuid4(), "content": "data", "lessons_learned": "info", "keywords": []}
-    fallback_groups = [{"group_id": "grp", "memory_ids": [str(block["id"])], "extra": True}]
-    monkeypatch.setattr(worker, "analyze_duplicates_with_fallback", lambda blocks: fallback_groups)
+    groups = [{"group_id": "grp", "memory_ids": [str(block["id"])], "extra": True}]
 
     class FakeClient:
         def __init__(self, api_key):
@@ -146,15 +168,14 @@ def test_analyze_duplicates_with_llm_returns_group_on_bad_json(monkeypatch):
     _install_fake_google(monkeypatch, FakeClient)
     monkeypatch.setenv("LLM_MODEL_NAME", "test-model")
 
-    result = worker.analyze_duplicates_with_llm([block], llm_api_key="key")
+    result = worker.generate_group_suggestions(groups, [block], llm_api_key="key")
 
-    assert result == fallback_groups
+    assert result == [{**groups[0], "llm_error": "response was not valid JSON"}]
 
 
-def test_analyze_duplicates_with_llm_returns_fallback_on_model_error(monkeypatch):
+def test_generate_group_suggestions_returns_groups_on_model_error(monkeypatch):
     block = {"id": uuid.uuid4(), "content": "data", "lessons_learned": "info", "keywords": []}
-    fallback_groups = [{"group_id": "grp", "memory_ids": [str(block["id"])], "from_fallback": True}]
-    monkeypatch.setattr(worker, "analyze_duplicates_with_fallback", lambda blocks: fallback_groups)
+    groups = [{"group_id": "grp", "memory_ids": [str(block["id"])], "unenriched": True}]
 
     def _boom(**kwargs):
         raise RuntimeError("model failure")
@@ -166,9 +187,43 @@ def test_analyze_duplicates_with_llm_returns_fallback_on_model_error(monkeypatch
     _install_fake_google(monkeypatch, FakeClient)
     monkeypatch.setenv("LLM_MODEL_NAME", "test-model")
 
-    result = worker.analyze_duplicates_with_llm([block], llm_api_key="key")
+    result = worker.generate_group_suggestions(groups, [block], llm_api_key="key")
+
+    assert len(result) == 1
+    assert result[0]["unenriched"] is True
+    assert "model failure" in result[0]["llm_error"]
 
-    assert result == fallback_groups
+
+def test_generate_group_suggestions_keeps_other_groups_when_one_fails(monkeypatch):
+    good = {"id": uuid.uuid4(), "content": "good data", "lessons_learned": "good info", "keywords": []}
+    bad = {"id": uuid.uuid4(), "content": "bad data", "lessons_learned": "bad info", "keywords": []}
+    groups = [
+        {"group_id": "good", "memory_ids": [str(good["id"])]},
+        {"group_id": "bad", "memory_ids": [str(bad["id"])]},
+    ]
+
+    def generate_content(**kwargs):
+        if "bad data" in str(kwargs.get("contents")):
+            raise RuntimeError("model failure")
+        return SimpleNamespace(text=json.dumps({
+            "suggested_content": "good",
+            "suggested_lessons_learned": "good",
+            "suggested_keywords": [],
+        }))
+
+    class FakeClient:
+        def __init__(self, api_key):
+            self.models = SimpleNamespace(generate_content=generate_content)
+
+    _install_fake_google(monkeypatch, FakeClient)
+    monkeypatch.setenv("LLM_MODEL_NAME", "test-model")
+
+    result = worker.generate_group_suggestions(groups, [good, bad], llm_api_key="key")
+
+    assert [group["group_id"] for group in result] == ["good", "bad"]
+    assert result[0]["suggested_content"] == "good"
+    assert "llm_error" not in result[0]
+    assert "model failure" in result[1]["llm_error"]
 
 
 def test_store_consolidation_suggestions_creates_entries(monkeypatch):
@@ -213,10 +268,8 @@ def test_store_consolidation_suggestions_creates_entries(monkeypatch):
 
 def test_store_consolidation_suggestions_skips_overlap(monkeypatch):
     db = MagicMock()
-    existing = MagicMock()
     overlap_id = str(uuid.uuid4())
-    existing.original_memory_ids = [overlap_id]
-    db.query.return_value.filter.return_value.all.return_value = [existing]
+    monkeypatch.setattr(worker, "get_pending_suggestion_memory_ids", lambda db, ids: {overlap_id} & set(ids))
 
     monkeypatch.setattr(worker, "create_consolidation_suggestion", MagicMock())
 
@@ -257,9 +310,7 @@ def test_store_consolidation_suggestions_skips_when_missing_fields(monkeypatch):
 
 def test_store_consolidation_suggestions_handles_no_overlap(monkeypatch):
     db = MagicMock()
-    existing = MagicMock()
-    existing.original_memory_ids = [str(uuid.uuid4())]
-    db.query.return_value.filter.return_value.all.return_value = [existing]
+    monkeypatch.setattr(worker, "get_pending_suggestion_memory_ids", lambda db, ids: set())
 
     import core.db.schemas as schemas
 
@@ -354,12 +405,17 @@ def test_run_consolidation_analysis_processes_batches(monkeypatch):
         yield db
 
     monkeypatch.setattr(worker, "get_db", fake_get_db)
+    run, checkpoint, finish = _fake_run(monkeypatch)
 
-    first_batch = [{"id": i} for i in range(worker.BATCH_SIZE)]
+    first_batch = [{"id": i, "updated_at": f"t{i}"} for i in range(worker.BATCH_SIZE)]
     fetch_mock = MagicMock(side_effect=[first_batch, []])
     monkeypatch.setattr(worker, "fetch_memory_blocks", fetch_mock)
 
-    analyze_mock = MagicMock(return_value=[
+    groups = [{"group_id": "g", "memory_ids": [str(uuid.uuid4()), str(uuid.uuid4())]}]
+    find_mock = MagicMock(return_value=groups)
+    group_blocks = [{"id": "1"}]
+    load_mock = MagicMock(return_value=group_blocks)
+    suggest_mock = MagicMock(return_value=[
         {
             "group_id": "g",
             "memory_ids": ["1"],
@@ -369,17 +425,80 @@ def test_run_consolidation_analysis_processes_batches(monkeypatch):
         }
     ])
     store_mock = MagicMock(return_value=2)
-    monkeypatch.setattr(worker, "analyze_duplicates_with_llm", analyze_mock)
+    monkeypatch.setattr(worker, "find_duplicate_groups", find_mock)
+    monkeypatch.setattr(worker, "load_group_blocks", load_mock)
+    monkeypatch.setattr(worker, "generate_group_suggestions", suggest_mock)
+    monkeypatch.setattr(worker, "store_consolidation_suggestions", store_mock)
+
+    worker.run_consolidation_analysis("key")
+
+    last = worker.BATCH_SIZE - 1
+    assert [c.args[1] for c in fetch_mock.call_args_list] == [(None, None), (f"t{last}", last)]
+    find_mock.assert_called_once_with(db, first_batch)
+    suggest_mock.assert_called_once_with(groups, group_blocks, "key")
+    store_mock.assert_called_once()
+    checkpoint.assert_called_once_with(
+        db, run, (f"t{last}", last),
+        blocks=worker.BATCH_SIZE, groups_found=1, groups_skipped=0, suggestions_created=2,
+    )
+    finish.assert_called_once_with(db, run, "completed")
+    db.close.assert_called_once()
+
+
+def test_run_consolidation_analysis_keeps_watermark_when_llm_step_fails(monkeypatch):
+    db = MagicMock()
+    monkeypatch.setattr(worker, "get_db", lambda: iter([db]))
+    run, checkpoint, finish = _fake_run(monkeypatch)
+
+    monkeypatch.setattr(worker, "fetch_memory_blocks", MagicMock(return_value=[{"id": "x", "updated_at": "t"}]))
+    monkeypatch.setattr(worker, "find_duplicate_groups", MagicMock(return_value=[
+        {"group_id": "ok", "memory_ids": [str(uuid.uuid4())]},
+        {"group_id": "down", "memory_ids": [str(uuid.uuid4())]},
+    ]))
+    monkeypatch.setattr(worker, "load_group_blocks", MagicMock(return_value=[]))
+    monkeypatch.setattr(worker, "generate_group_suggestions", MagicMock(return_value=[
+        {"group_id": "ok", "memory_ids": ["1"], "suggested_content": "c", "suggested_lessons_learned": "l"},
+        {"group_id": "down", "memory_ids": ["2"], "llm_error": "quota exceeded"},
+    ]))
+    store_mock = MagicMock(return_value=1)
     monkeypatch.setattr(worker, "store_consolidation_suggestions", store_mock)
 
     worker.run_consolidation_analysis("key")
 
-    assert fetch_mock.call_args_list == [
-        call(db, 0, worker.BATCH_SIZE),
-        call(db, worker.BATCH_SIZE, worker.BATCH_SIZE),
-    ]
     store_mock.assert_called_once()
-    analyze_mock.assert_called_once()
+    checkpoint.assert_not_called()
+    finish.assert_called_once_with(db, run, "failed", error="LLM step failed for 1 of 2 groups: quota exceeded")
+
+
+def test_run_consolidation_analysis_skips_groups_with_pending_suggestions(monkeypatch):
+    db = MagicMock()
+    monkeypatch.setattr(worker, "get_db", lambda: iter([db]))
+    pending = str(uuid.uuid4())
+    run, checkpoint, finish = _fake_run(monkeypatch, pending_ids=[pending])
+
+    monkeypatch.setattr(worker, "fetch_memory_blocks", MagicMock(return_value=[{"id": "x", "updated_at": "t"}]))
+    monkeypatch.setattr(worker, "find_duplicate_groups", MagicMock(return_value=[
+        {"group_id": "g", "memory_ids": [pending, str(uuid.uuid4())]},
+    ]))
+    suggest_mock = MagicMock()
+    monkeypatch.setattr(worker, "generate_group_suggestions", suggest_mock)
+
+    worker.run_consolidation_analysis("key")
+
+    suggest_mock.assert_not_called()
+    assert checkpoint.call_args.kwargs["groups_skipped"] == 1
+
+
+def test_run_consolidation_analysis_skips_when_run_in_progress(monkeypatch):
+    db = MagicMock()
+    monkeypatch.setattr(worker, "get_db", lambda: iter([db]))
+    monkeypatch.setattr(worker, "claim_consolidation_run", lambda db, timeout: None)
+    fetch_mock = MagicMock()
+    monkeypatch.setattr(worker, "fetch_memory_blocks", fetch_mock)
+
+    worker.run_consolidation_analysis("key")
+
+    fetch_mock.assert_not_called()
     db.close.assert_called_once()
 
 
@@ -391,55 +510,28 @@ def test_run_consolidation_analysis_handles_exception(monkeypatch):
         yield db
 
     monkeypatch.setattr(worker, "get_db", fake_get_db)
+    run, _, finish = _fake_run(monkeypatch)
 
     def fake_fetch(*args, **kwargs):
         raise RuntimeError("boom")
 
     monkeypatch.setattr(worker, "fetch_memory_blocks", fake_fetch)
-    monkeypatch.setattr(worker, "analyze_duplicates_with_llm", MagicMock())
+    monkeypatch.setattr(worker, "find_duplicate_groups", MagicMock())
     monkeypatch.setattr(worker, "store_consolidation_suggestions", MagicMock())
 
     worker.run_consolidation_analysis("key")
 
+    db.rollback.assert_called_once()
+    finish.assert_called_once_with(db, run, "failed", error="boom")
     assert db.close.called
 
 
 def test_fetch_memory_blocks_returns_empty_batch(monkeypatch):
-    monkeypatch.setattr(worker, "get_all_memory_blocks", lambda *args, **kwargs: [])
-    result = worker.fetch_memory_blocks(MagicMock(), offset=0, limit=10)
-    assert result == []
-
-
-def test_analyze_duplicates_with_llm_no_memory_blocks():
-    assert worker.analyze_duplicates_with_llm([], llm_api_key="key") == []
-
-
-def test_analyze_duplicates_with_llm_no_duplicate_groups(monkeypatch):
-    monkeypatch.setattr(worker, "analyze_duplicates_with_fallback", lambda blocks: [])
-    result = worker.analyze_duplicates_with_llm(
-        [{"id": uuid.uuid4(), "content": "note", "lessons_learned": ""}],
-        llm_api_key="key",
-    )
+    monkeypatch.setattr(worker, "get_memory_blocks_since", lambda *args, **kwargs: [])
+    result = worker.fetch_memory_blocks(MagicMock(), (None, None), limit=10)
     assert result == []
 
 
-def test_analyze_duplicates_with_fallback_small_input():
-    blocks = [{"id": uuid.uuid4(), "content": "only one", "lessons_learned": ""}]
-    assert worker.analyze_duplicates_with_fallback(blocks) == []
-
-
-def test_analyze_duplicates_with_fallback_detects_group():
-    a_id = uuid.uuid4()
-    b_id = uuid.uuid4()
-    blocks = [
-        {"id": a_id, "content": "shared text", "lessons_learned": ""},
-        {"id": b_id, "content": "shared text", "lessons_learned": ""},
-        {"id": uuid.uuid4(), "content": "different", "lessons_learned": ""},
-    ]
-    groups = worker.analyze_duplicates_with_fallback(blocks)
-    assert any({str(a_id), str(b_id)}.issubset(set(group["memory_ids"])) for group in groups)
-
-
 def test_store_consolidation_suggestions_handles_value_error(monkeypatch):
     db = MagicMock()
     db.query.return_value.filter.return_value.all.return_value = []
@@ -482,15 +574,18 @@ def test_run_consolidation_analysis_breaks_on_short_batch(monkeypatch):
 
     monkeypatch.setattr(worker, "get_db", fake_get_db)
     monkeypatch.setattr(worker, "BATCH_SIZE", 5)
+    _fake_run(monkeypatch)
 
     fetch_mock = MagicMock(return_value=[{"id": uuid.uuid4()}])
     monkeypatch.setattr(worker, "fetch_memory_blocks", fetch_mock)
-    monkeypatch.setattr(worker, "analyze_duplicates_with_llm", MagicMock(return_value=[]))
-    monkeypatch.setattr(worker, "store_consolidation_suggestions", MagicMock(return_value=0))
+    monkeypatch.setattr(worker, "find_duplicate_groups", MagicMock(return_value=[]))
+    store_mock = MagicMock(return_value=0)
+    monkeypatch.setattr(worker, "store_consolidation_suggestions", store_mock)
 
     worker.run_consolidation_analysis("key")
 
     fetch_mock.assert_called_once()
+    store_mock.assert_not_called()
     db.close.assert_called_once()
 
 
@@ -504,7 +599,12 @@ def test_main_block_executes_without_db(monkeypatch, tmp_path):
         yield fake_db
 
     fake_crud = ModuleType("core.db.crud")
-    fake_crud.get_all_memory_blocks = lambda *args, **kwargs: []
+    fake_crud.claim_consolidation_run = lambda *args, **kwargs: None
+    fake_crud.checkpoint_consolidation_run = lambda *args, **kwargs: None
+    fake_crud.finish_consolidation_run = lambda *args, **kwargs: None
+    fake_crud.get_memory_blocks_since = lambda *args, **kwargs: []
+    fake_crud.get_pending_suggestion_memory_ids = lambda *args, **kwargs: set()
+    fake_crud.get_memory_block_rows = lambda *args, **kwargs: []
     fake_crud.create_consolidation_suggestion = lambda *args, **kwargs: None
 
     fake_database = ModuleType("core.db.database")
@@ -17,17 +17,18 @@ class DummyEngine:
         return QueryExpansionResult(original_query=query, expanded_queries=self._expansions, applied_steps=[{"step": "synonym"}])
 
 
-def test_execute_with_query_expansion_merges_results(monkeypatch):
+def test_execute_with_query_expansion_runs_once_with_variants(monkeypatch):
     expanded_id = uuid.uuid4()
     expanded_result = SimpleNamespace(id=expanded_id, search_score=0.9, search_type="fulltext", rank_explanation="synonym")
 
     engine = DummyEngine(["performance"])
     monkeypatch.setattr(search_service_module, "get_query_expansion_engine", lambda: engine)
 
-    def runner(query):
-        if query == "performance":
-            return [expanded_result], {"total_search_time_ms": 5.0, "search_type": "fulltext"}
-        return [], {"total_search_time_ms": 1.0, "search_type": "fulltext"}
+    calls = []
+
+    def runner(query, variants):
+        calls.append((query, variants))
+        return [expanded_result], {"total_search_time_ms": 6.0, "search_type": "fulltext"}
 
     results, metadata = _execute_with_query_expansion(
         base_query="speed",
@@ -37,6 +38,7 @@ def test_execute_with_query_expansion_merges_results(monkeypatch):
         search_label="fulltext",
     )
 
+    assert calls == [("speed", ["performance"])]
     assert results == [expanded_result]
     assert metadata["expansion"]["expanded_queries"] == ["performance"]
     assert metadata["search_type"] == "fulltext_expanded"
@@ -44,6 +46,22 @@ def test_execute_with_query_expansion_merges_results(monkeypatch):
     assert metadata["total_search_time_ms"] == 6.0
 
 
+def test_execute_with_query_expansion_without_variants(monkeypatch):
+    monkeypatch.setattr(search_service_module, "get_query_expansion_engine", lambda: DummyEngine([]))
+
+    results, metadata = _execute_with_query_expansion(
+        base_query="speed",
+        limit=1,
+        context={"search_type": "semantic"},
+        runner=lambda query, variants: ([1, 2], {"search_type": "semantic"}),
+        search_label="semantic",
+    )
+
+    assert results == [1]
+    assert metadata["search_type"] == "semantic"
+    assert metadata["combined_results_count"] == 1
+
+
 def test_search_memory_blocks_hybrid_uses_expansion(monkeypatch):
     expanded_id = uuid.uuid4()
     expanded_result = SimpleNamespace(
@@ -60,11 +78,8 @@ def test_search_memory_blocks_hybrid_uses_expansion(monkeypatch):
 
     class FakeService:
         def search_memory_blocks_hybrid(self, **kwargs):  # pylint: disable=unused-argument
-            query = kwargs["query"]
-            calls.append(query)
-            if query == "performance":
-                return [expanded_result], {"total_search_time_ms": 5.0, "search_type": "hybrid"}
-            return [], {"total_search_time_ms": 1.0, "search_type": "hybrid"}
+            calls.append((kwargs["query"], kwargs["variants"]))
+            return [expanded_result], {"total_search_time_ms": 5.0, "search_type": "hybrid"}
 
     monkeypatch.setattr("core.services.search_service.get_search_service", lambda: FakeService())
 
@@ -81,7 +96,7 @@ def test_search_memory_blocks_hybrid_uses_expansion(monkeypatch):
         current_user=None,
     )
 
-    assert calls == ["speed", "performance"]
+    assert calls == [("speed", ["performance"])]
     assert results == [expanded_result]
     assert metadata["expansion"]["expanded_queries"] == ["performance"]
     assert metadata["search_type"].endswith("_expanded")
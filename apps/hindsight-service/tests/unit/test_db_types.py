@@ -24,8 +24,7 @@ def test_embedding_vector_prefers_safe_pgvector(monkeypatch):
             captured["dim"] = dim
 
     dialect = DummyDialect()
-    monkeypatch.setattr(db_types, "_SafePGVector", DummyVector)
-    monkeypatch.setattr(db_types, "Vector", object())  # ensure fallback is unused
+    monkeypatch.setattr(db_types, "_pgvector_type", DummyVector)
 
     embedding_type = db_types.EmbeddingVector(dimension=7)
     result = embedding_type.load_dialect_impl(dialect)
@@ -35,10 +34,18 @@ def test_embedding_vector_prefers_safe_pgvector(monkeypatch):
     assert dialect.calls[0] is result
 
 
+def test_pgvector_is_imported_on_first_use():
+    if not db_types.HAS_PGVECTOR:
+        pytest.skip("pgvector not installed")
+    vector_type = db_types._load_pgvector_type()
+    assert vector_type is db_types._load_pgvector_type()
+    assert vector_type.__name__ == "_SafePGVector"
+
+
 def test_embedding_vector_falls_back_without_pgvector(monkeypatch):
     dialect = DummyDialect()
-    monkeypatch.setattr(db_types, "_SafePGVector", None)
-    monkeypatch.setattr(db_types, "Vector", None)
+    monkeypatch.setattr(db_types, "_pgvector_type", None)
+    monkeypatch.setattr(db_types, "HAS_PGVECTOR", False)
 
     embedding_type = db_types.EmbeddingVector()
     descriptor = embedding_type.load_dialect_impl(dialect)
@@ -50,7 +57,7 @@ def test_embedding_vector_falls_back_without_pgvector(monkeypatch):
 
 def test_embedding_vector_process_result_handles_strings(monkeypatch):
     dialect = SimpleNamespace(name="postgresql")
-    monkeypatch.setattr(db_types, "Vector", None)
+    monkeypatch.setattr(db_types, "HAS_PGVECTOR", False)
 
     embedding_type = db_types.EmbeddingVector()
 
@@ -66,7 +73,7 @@ def test_embedding_vector_process_result_handles_strings(monkeypatch):
 
 def test_embedding_vector_bind_param_validates_dimension(monkeypatch):
     dialect = SimpleNamespace(name="postgresql")
-    monkeypatch.setattr(db_types, "Vector", object())
+    monkeypatch.setattr(db_types, "HAS_PGVECTOR", True)
 
     embedding_type = db_types.EmbeddingVector(dimension=2)
     with pytest.raises(ValueError):
@@ -28,7 +28,7 @@ class TestEmailTemplateRendering:
     def test_render_organization_invitation_template(self):
         """Test rendering the organization invitation email template."""
         # Mock the email service setup
-        with patch('core.services.transactional_email_service.Environment') as mock_env:
+        with patch('jinja2.Environment') as mock_env:
             mock_template = MagicMock()
             mock_template.render.return_value = "<html>Welcome John to Test Org!</html>"
             
@@ -56,7 +56,7 @@ class TestEmailTemplateRendering:
 
     def test_render_template_with_fallback_text(self):
         """Test template rendering when text template doesn't exist."""
-        with patch('core.services.transactional_email_service.Environment') as mock_env:
+        with patch('jinja2.Environment') as mock_env:
             # HTML template exists
             mock_html_template = MagicMock()
             mock_html_template.render.return_value = "<html><body>Test</body></html>"
@@ -81,7 +81,7 @@ class TestEmailTemplateRendering:
 
     def test_render_template_missing_html_template(self):
         """Test error handling when HTML template is missing."""
-        with patch('core.services.transactional_email_service.Environment') as mock_env:
+        with patch('jinja2.Environment') as mock_env:
             mock_template_env = MagicMock()
             mock_template_env.get_template.side_effect = Exception("Template not found")
             mock_env.return_value = mock_template_env
@@ -0,0 +1,61 @@
+"""Cold-start budget for ``import core.api.main``.
+
+Runs the import in a fresh interpreter under ``python -X importtime`` and
+checks that heavy optional dependencies stay out of it, that importing has
+no filesystem side effects, and that the cumulative time stays under
+``IMPORT_TIME_BUDGET_SECONDS`` (generous by default: importtime itself adds
+overhead, and CI machines vary).
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SERVICE_ROOT = Path(__file__).resolve().parents[2]
+IMPORT_TIME_BUDGET_SECONDS = float(os.getenv("IMPORT_TIME_BUDGET_SECONDS", 3.0))
+
+# Only imported on first use: by the consolidation fallback, the LLM gateway,
+# PAT hashing, email rendering/sending and Postgres embedding columns.
+LAZY_MODULES = ("sklearn", "scipy", "numpy", "google.genai", "argon2", "jinja2", "resend", "sendgrid", "pgvector")
+
+
+def _import_times(tmp_path, statement):
+    env = {
+        key: value
+        for key, value in os.environ.items()
+        if key not in ("HINDSIGHT_TEST_DB", "TEST_DATABASE_URL", "PYTEST_CURRENT_TEST")
+    }
+    env["DATABASE_URL"] = "sqlite:///:memory:"
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SERVICE_ROOT), env.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=tmp_path,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, name = line[len("import time:"):].split("|")
+        if total.strip().isdigit():
+            cumulative[name.strip()] = int(total) / 1_000_000
+    return cumulative
+
+
+def test_api_import_stays_within_budget_and_skips_heavy_dependencies(tmp_path):
+    cumulative = _import_times(tmp_path, "import core.api.main")
+
+    loaded = [name for name in LAZY_MODULES if name in cumulative]
+    assert loaded == []
+    assert cumulative["core.api.main"] < IMPORT_TIME_BUDGET_SECONDS
+
+
+def test_worker_import_has_no_side_effects(tmp_path):
+    cumulative = _import_times(tmp_path, "import core.workers.consolidation_worker")
+
+    assert "sklearn" not in cumulative
+    assert list(tmp_path.iterdir()) == []
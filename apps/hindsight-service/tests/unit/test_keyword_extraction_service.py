@@ -0,0 +1,44 @@
+from core.services import keyword_extraction_service as kes
+
+
+TEXTS = [
+    "Python FastAPI service with a PostgreSQL database and Redis cache",
+    "Deployment to Kubernetes with Docker images and nginx",
+    "",
+    "the and of to",
+    "User dashboard login form with notification settings",
+]
+
+
+def test_iter_extract_keywords_matches_single_calls():
+    expected = [kes.extract_keywords(text, max_keywords=5) for text in TEXTS]
+
+    assert list(kes.iter_extract_keywords(TEXTS, max_keywords=5)) == expected
+
+
+def test_iter_extract_keywords_process_pool_preserves_order(monkeypatch):
+    monkeypatch.setattr(kes, "KEYWORD_EXTRACTION_WORKERS", 2)
+    monkeypatch.setattr(kes, "KEYWORD_EXTRACTION_PARALLEL_THRESHOLD", 1)
+    texts = TEXTS * 10
+    try:
+        results = list(kes.iter_extract_keywords(texts))
+    finally:
+        kes.shutdown_keyword_extraction_pool()
+
+    assert [sorted(r) for r in results] == [sorted(kes.extract_keywords(t)) for t in texts]
+
+
+def test_process_pool_does_not_fork(monkeypatch):
+    monkeypatch.setattr(kes, "KEYWORD_EXTRACTION_WORKERS", 2)
+    try:
+        pool = kes._get_process_pool()
+        assert pool._mp_context.get_start_method() in ("forkserver", "spawn")
+    finally:
+        kes.shutdown_keyword_extraction_pool()
+
+
+def test_technical_terms_rank_first():
+    keywords = kes.extract_keywords("banana banana banana kubernetes")
+
+    assert keywords[0] == "kubernetes"
+    assert "banana" in keywords
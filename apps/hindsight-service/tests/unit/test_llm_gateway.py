@@ -0,0 +1,220 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from core.services.llm_gateway import (
+    BaseLLMProvider,
+    LLMGateway,
+    LLMGatewayConfig,
+    LLMProviderError,
+    LLMResponse,
+    StubLLMProvider,
+    TokenBucket,
+    _run_blocking,
+    release_db_connection,
+    run_sync,
+)
+
+
+def _config(**overrides):
+    values = dict(
+        provider="stub",
+        requests_per_minute=0,
+        burst=1,
+        max_concurrency=4,
+        max_retries=2,
+        backoff_seconds=0,
+        timeout_seconds=5,
+    )
+    values.update(overrides)
+    return LLMGatewayConfig(**values)
+
+
+class FlakyProvider(BaseLLMProvider):
+    def __init__(self, failures, retryable=True):
+        self.failures = failures
+        self.retryable = retryable
+        self.calls = 0
+
+    async def generate(self, prompt, *, model, api_key, config):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise LLMProviderError("rate limited", retryable=self.retryable)
+        return LLMResponse(text="{}", model=model, latency_seconds=0.01, input_tokens=3, output_tokens=1)
+
+
+class SlowProvider(BaseLLMProvider):
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    async def generate(self, prompt, *, model, api_key, config):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.05)
+        with self._lock:
+            self.active -= 1
+        return LLMResponse(text="{}", model=model, latency_seconds=0.05)
+
+
+class BlockingProvider(BaseLLMProvider):
+    """Blocks a worker thread for longer than the gateway timeout."""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def _call(self):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.seconds)
+        with self._lock:
+            self.active -= 1
+
+    async def generate(self, prompt, *, model, api_key, config):
+        await _run_blocking(self._call)
+        return LLMResponse(text="{}", model=model, latency_seconds=self.seconds)
+
+
+def test_token_bucket_allows_burst_then_spaces_calls():
+    bucket = TokenBucket(rate_per_second=10, capacity=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    wait = bucket.reserve()
+    assert 0.05 < wait <= 0.1
+    assert bucket.reserve() > wait
+
+
+def test_token_bucket_zero_rate_is_unlimited():
+    bucket = TokenBucket(rate_per_second=0, capacity=1)
+    assert all(bucket.reserve() == 0 for _ in range(100))
+
+
+def test_stub_provider_synthesises_schema_shaped_json():
+    gateway = LLMGateway(_config(), provider=StubLLMProvider())
+    schema = {
+        "type": "object",
+        "properties": {
+            "text": {"type": "string"},
+            "ratio": {"type": "number", "minimum": 0},
+            "items": {"type": "array", "items": {"type": "string"}},
+        },
+    }
+    response = run_sync(gateway.generate("prompt", model="m", response_schema=schema))
+    assert json.loads(response.text) == {"text": "stub", "ratio": 0, "items": []}
+    assert not gateway.requires_api_key
+
+
+def test_transient_errors_are_retried_and_recorded():
+    provider = FlakyProvider(failures=2)
+    gateway = LLMGateway(_config(), provider=provider)
+
+    response = run_sync(gateway.generate("prompt", model="m", purpose="compression"))
+
+    assert response.attempts == 3
+    stats = gateway.metrics()["compression"]
+    assert stats["calls"] == 1
+    assert stats["errors"] == 2
+    assert stats["input_tokens"] == 3
+
+
+def test_non_retryable_errors_raise_immediately():
+    provider = FlakyProvider(failures=1, retryable=False)
+    gateway = LLMGateway(_config(), provider=provider)
+
+    with pytest.raises(LLMProviderError):
+        run_sync(gateway.generate("prompt", model="m"))
+    assert provider.calls == 1
+
+
+def test_retries_are_bounded():
+    provider = FlakyProvider(failures=10)
+    gateway = LLMGateway(_config(max_retries=2), provider=provider)
+
+    with pytest.raises(LLMProviderError):
+        run_sync(gateway.generate("prompt", model="m"))
+    assert provider.calls == 3
+
+
+def test_concurrency_limit_spans_threads():
+    provider = SlowProvider()
+    gateway = LLMGateway(_config(max_concurrency=2), provider=provider)
+
+    async def _batch():
+        await asyncio.gather(*(gateway.generate("p", model="m") for _ in range(3)))
+
+    threads = [threading.Thread(target=lambda: asyncio.run(_batch())) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert provider.peak == 2
+    assert gateway.metrics()["default"]["calls"] == 6
+
+
+def test_timed_out_call_keeps_its_slot_until_the_thread_finishes():
+    provider = BlockingProvider(0.3)
+    gateway = LLMGateway(_config(max_concurrency=1, max_retries=0, timeout_seconds=0.05), provider=provider)
+
+    async def _batch():
+        return await asyncio.gather(*(gateway.generate("p", model="m") for _ in range(2)), return_exceptions=True)
+
+    results = asyncio.run(_batch())
+
+    assert all(isinstance(result, asyncio.TimeoutError) for result in results)
+    assert provider.peak == 1
+    assert gateway._slots.acquire(blocking=False)
+
+
+def _session(calls, **pending):
+    attrs = {"new": (), "dirty": (), "deleted": (), **pending}
+    attrs.update(commit=lambda self: calls.append("commit"), rollback=lambda self: calls.append("rollback"))
+    return type("Session", (), attrs)()
+
+
+def test_release_db_connection_commits_a_clean_session():
+    calls = []
+    release_db_connection(_session(calls))
+    assert calls == ["commit"]
+
+
+def test_release_db_connection_refuses_pending_changes():
+    calls = []
+    with pytest.raises(RuntimeError, match="pending changes"):
+        release_db_connection(_session(calls, dirty=("block",)))
+    assert calls == []
+
+
+def test_provider_base_is_abstract():
+    with pytest.raises(TypeError):
+        BaseLLMProvider()
+
+
+def test_rate_limit_throttles_calls():
+    gateway = LLMGateway(_config(requests_per_minute=600, burst=1), provider=StubLLMProvider())
+
+    async def _batch():
+        await asyncio.gather(*(gateway.generate("p", model="m") for _ in range(3)))
+
+    started = time.monotonic()
+    run_sync(_batch())
+    assert time.monotonic() - started >= 0.18
+    assert gateway.metrics()["default"]["throttled_seconds_total"] > 0
+
+
+def test_run_sync_inside_running_loop():
+    gateway = LLMGateway(_config(), provider=StubLLMProvider())
+
+    async def _outer():
+        return run_sync(gateway.generate("p", model="m"))
+
+    assert asyncio.run(_outer()).text == "{}"
@@ -0,0 +1,66 @@
+import pytest
+
+from core.metrics import Counter, Gauge, Histogram, MetricsRegistry, OVERFLOW_LABEL_VALUE
+
+
+def test_render_uses_the_text_exposition_format():
+    registry = MetricsRegistry()
+    requests = registry.counter("app_requests_total", "Requests served.", ("route",))
+    latency = registry.histogram("app_latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    temperature = registry.gauge("app_temperature", "Current temperature.")
+
+    requests.inc(route="/a")
+    requests.inc(2, route='/b"q')
+    latency.observe(0.05, route="/a")
+    latency.observe(0.5, route="/a")
+    temperature.set(21.5)
+
+    assert registry.render().splitlines() == [
+        "# HELP app_latency_seconds Latency.",
+        "# TYPE app_latency_seconds histogram",
+        'app_latency_seconds_bucket{route="/a",le="0.1"} 1',
+        'app_latency_seconds_bucket{route="/a",le="1"} 2',
+        'app_latency_seconds_bucket{route="/a",le="+Inf"} 2',
+        'app_latency_seconds_sum{route="/a"} 0.55',
+        'app_latency_seconds_count{route="/a"} 2',
+        "# HELP app_requests_total Requests served.",
+        "# TYPE app_requests_total counter",
+        'app_requests_total{route="/a"} 1',
+        'app_requests_total{route="/b\\"q"} 2',
+        "# HELP app_temperature Current temperature.",
+        "# TYPE app_temperature gauge",
+        "app_temperature 21.5",
+    ]
+
+
+def test_series_beyond_the_cap_fold_into_other():
+    counter = Counter("c_total", "c", ("user",), max_series=2)
+    for user in ("a", "b", "c", "d"):
+        counter.inc(user=user)
+    counter.inc(user="a")
+
+    assert counter.value(user="a") == 2
+    assert counter.value(user=OVERFLOW_LABEL_VALUE) == 2
+    assert counter.value(user="c") == 0
+
+
+def test_labels_must_match_the_declared_names():
+    gauge = Gauge("g", "g", ("pool",))
+    with pytest.raises(ValueError):
+        gauge.set(1)
+    with pytest.raises(ValueError):
+        gauge.set(1, pool="a", extra="b")
+    with pytest.raises(ValueError):
+        Counter("c_total", "c").inc(-1)
+
+
+def test_timer_records_labels_set_inside_the_block():
+    histogram = Histogram("h_seconds", "h", ("outcome",))
+    with histogram.time(outcome="error") as timing:
+        timing.labels["outcome"] = "ok"
+    with pytest.raises(RuntimeError):
+        with histogram.time(outcome="error"):
+            raise RuntimeError("boom")
+
+    assert histogram.count(outcome="ok") == 1
+    assert histogram.count(outcome="error") == 1
@@ -0,0 +1,40 @@
+from core.services.consolidation_candidates import DisjointSet, group_pairs
+from core.services.minhash import MinHasher, normalize_text
+
+
+def test_signature_similarity_tracks_text_overlap():
+    hasher = MinHasher(num_perm=128, bands=32)
+    base = "the cache layer returned stale entries after the deploy because keys were not versioned"
+    near = base + " at all"
+    other = "quarterly planning covered hiring goals and the product roadmap for next year"
+
+    sig = hasher.signature(base)
+    assert MinHasher.similarity(sig, hasher.signature(base)) == 1.0
+    assert MinHasher.similarity(sig, hasher.signature(near)) > 0.6
+    assert MinHasher.similarity(sig, hasher.signature(other)) < 0.2
+
+
+def test_signature_is_stable_and_banded():
+    a, b = MinHasher(), MinHasher()
+    sig = a.signature("stable signatures across processes")
+    assert sig == b.signature("stable signatures across processes")
+    assert len(a.band_hashes(sig)) == a.bands
+    assert all(0 <= value < 2 ** 31 for value in sig)
+
+
+def test_empty_text_has_no_signature():
+    assert MinHasher().signature("  ... ") is None
+    assert normalize_text(" Hello\n World ", None, "X") == "hello world x"
+
+
+def test_disjoint_set_and_group_pairs():
+    ds = DisjointSet()
+    ds.union("a", "b")
+    ds.union("c", "d")
+    ds.union("b", "d")
+    ds.find("lonely")
+    assert sorted(map(sorted, ds.groups())) == [["a", "b", "c", "d"]]
+
+    pairs = [(str(i), str(i + 1)) for i in range(5)]
+    assert group_pairs(pairs, max_group_size=4) == [["0", "1", "2", "3"], ["4", "5"]]
+    assert group_pairs([("x", "y"), ("y", "z"), ("q", "z")], max_group_size=3) == [["q", "x", "y"]]
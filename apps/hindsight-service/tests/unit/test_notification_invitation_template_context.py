@@ -14,13 +14,13 @@ def test_notify_organization_invitation_role_is_string(db_session, monkeypatch):
 
     fake_email_service = MagicMock()
 
-    async def _fake_send(email_log, template_name, template_context):
+    def _fake_queue(email_log, template_name, template_context):
         captured['template_name'] = template_name
         captured['context'] = dict(template_context)
-        return {"success": True, "message_id": "test"}
+        return {"success": True, "queued": True, "email_log_id": email_log.id}
 
-    # Intercept NotificationService-level send to capture template context
-    service.send_email_notification = _fake_send  # type: ignore
+    # Intercept NotificationService-level queueing to capture template context
+    service.queue_email_notification = _fake_queue  # type: ignore
     service.email_service = fake_email_service
 
     inviter_id = uuid.uuid4()
@@ -0,0 +1,61 @@
+import uuid
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from core.pruning.samplers import (
+    LowestScoreSampler,
+    PruningSampler,
+    RandomKeySampler,
+    StratifiedSampler,
+    TableSampleSampler,
+    get_sampler,
+)
+
+Row = namedtuple("Row", "random_key id created_at feedback_score")
+NOW = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+
+def _row(age_days, feedback):
+    return Row(0.5, uuid.uuid4(), NOW - timedelta(days=age_days), feedback)
+
+
+def test_get_sampler_by_name_and_unknown_fallback():
+    assert isinstance(get_sampler("stratified"), StratifiedSampler)
+    assert isinstance(get_sampler("tablesample"), TableSampleSampler)
+    assert isinstance(get_sampler("random_key"), RandomKeySampler)
+    assert isinstance(get_sampler("nope"), LowestScoreSampler)
+
+
+def test_base_sampler_is_abstract():
+    with pytest.raises(TypeError):
+        PruningSampler()
+
+
+def test_tablesample_rejects_unknown_method():
+    with pytest.raises(ValueError):
+        TableSampleSampler(method="reservoir")
+
+
+def test_stratified_buckets_by_age_and_feedback():
+    sampler = StratifiedSampler(now=NOW)
+    assert sampler.bucket(NOW - timedelta(days=1), 0) == (0, 1)
+    assert sampler.bucket(NOW - timedelta(days=200), -2) == (2, 0)
+    assert sampler.bucket(NOW - timedelta(days=1000), 3) == (3, 2)
+    assert sampler.bucket(None, None) == (3, 1)
+
+
+def test_stratified_round_robins_across_buckets(monkeypatch):
+    sampler = StratifiedSampler(window_factor=4, now=NOW)
+    fresh = [_row(1, 0) for _ in range(6)]
+    old_disliked = _row(400, -1)
+    window = fresh + [old_disliked]
+    monkeypatch.setattr(sampler._walk, "rows", lambda db, size, *cols: window[:size])
+
+    picked = sampler.sample(None, 2)
+
+    assert picked == [fresh[0].id, old_disliked.id]
+    # Unpicked window rows carry over to the next batch.
+    window = []
+    assert sampler.sample(None, 2) == [fresh[1].id, fresh[2].id]
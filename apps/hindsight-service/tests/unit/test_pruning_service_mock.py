@@ -6,6 +6,11 @@ from unittest.mock import Mock, patch
 from core.pruning.pruning_service import PruningService
 
 
+def _clean_session():
+    # release_db_connection() refuses sessions with pending changes.
+    return Mock(new=(), dirty=(), deleted=())
+
+
 class TestPruningService:
     """Test cases for the PruningService class aligned with current API."""
 
@@ -45,7 +50,7 @@ class TestPruningService:
 
     def test_generate_pruning_suggestions(self):
         """Generate pruning suggestions with mocked memory blocks and DB."""
-        mock_db = Mock()
+        mock_db = _clean_session()
         service = PruningService()  # no LLM => fallback path
 
         # Prepare mock blocks in the dict format expected by evaluate method
@@ -78,3 +83,40 @@ class TestPruningService:
             assert "memory_block_id" in first
             assert "pruning_score" in first
             assert "content_preview" in first
+
+    def test_generate_pruning_suggestions_runs_multiple_batches(self):
+        """Batches are sampled until max_iterations when too few blocks are prunable."""
+        service = PruningService()
+
+        def batch(_db, size, exclude_ids=None, sampler=None):
+            return [
+                {
+                    "id": str(uuid.uuid4()),
+                    "content": "Critical incident notes " * 40,
+                    "created_at": datetime.now(timezone.utc).isoformat(),
+                    "retrieval_count": 50,
+                    "feedback_score": 5,
+                }
+                for _ in range(size)
+            ]
+
+        with patch.object(PruningService, "get_random_memory_blocks", side_effect=batch) as sample:
+            result = service.generate_pruning_suggestions(db=_clean_session(), batch_size=4, target_count=2, max_iterations=3)
+
+        assert sample.call_count == 3
+        assert result["iterations"] == 3
+        assert result["total_evaluated"] == 12
+        assert len(result["suggestions"]) == 2
+        scores = [s["pruning_score"] for s in result["suggestions"]]
+        assert scores == sorted(scores)
+
+    def test_generate_pruning_suggestions_defaults_to_one_batch(self):
+        """Without an explicit max_iterations a request costs a single LLM batch."""
+        service = PruningService()
+        block = {"id": "b1", "content": "notes", "created_at": datetime.now(timezone.utc).isoformat(), "retrieval_count": 50, "feedback_score": 5}
+
+        with patch.object(PruningService, "get_random_memory_blocks", side_effect=lambda *a, **k: [dict(block, id=str(uuid.uuid4()))]) as sample:
+            result = service.generate_pruning_suggestions(db=_clean_session(), batch_size=4, target_count=5)
+
+        assert sample.call_count == 1
+        assert result["iterations"] == 1
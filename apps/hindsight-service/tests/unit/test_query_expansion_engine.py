@@ -1,7 +1,9 @@
 import json
+import threading
+import time
 from pathlib import Path
 
-from core.services.query_expansion import QueryExpansionConfig, QueryExpansionEngine
+from core.services.query_expansion import ExpansionCache, QueryExpansionConfig, QueryExpansionEngine
 
 
 def _make_engine(**overrides) -> QueryExpansionEngine:
@@ -18,6 +20,9 @@ def _make_engine(**overrides) -> QueryExpansionEngine:
         llm_temperature=overrides.pop("llm_temperature", 0.0),
         llm_max_tokens=overrides.pop("llm_max_tokens", 64),
         llm_timeout_seconds=overrides.pop("llm_timeout_seconds", 5.0),
+        llm_budget_seconds=overrides.pop("llm_budget_seconds", 5.0),
+        llm_cache_ttl_seconds=overrides.pop("llm_cache_ttl_seconds", 3600),
+        llm_cache_max_entries=overrides.pop("llm_cache_max_entries", 16),
     )
     if overrides:
         raise AssertionError(f"Unexpected overrides: {sorted(overrides)}")
@@ -92,38 +97,110 @@ def test_query_expansion_llm_mock(monkeypatch):
     assert any(step["step"] == "llm_rewrite" for step in result.applied_steps)
 
 
-def test_query_expansion_llm_ollama(monkeypatch):
-    class FakeResponse:
-        def __init__(self, payload):
-            self._payload = payload
+class FakeResponse:
+    def __init__(self, payload):
+        self._payload = payload
 
-        def raise_for_status(self):
-            return None
+    def raise_for_status(self):
+        return None
 
-        def json(self):
-            return self._payload
+    def json(self):
+        return self._payload
 
-    captured = {}
 
-    def fake_post(url, json=None, timeout=None):  # noqa: A002 - shadowing by design
-        captured["url"] = url
-        captured["payload"] = json
-        captured["timeout"] = timeout
-        return FakeResponse({"response": "synonym for reliability\nrobust query handling"})
+class FakeSession:
+    def __init__(self, text="synonym for reliability\nrobust query handling", gate=None):
+        self.calls = []
+        self._text = text
+        self._gate = gate
 
-    monkeypatch.setattr("core.services.query_expansion.requests.post", fake_post)
+    def post(self, url, json=None, timeout=None):  # noqa: A002 - shadowing by design
+        self.calls.append({"url": url, "payload": json, "timeout": timeout})
+        if self._gate is not None:
+            self._gate.wait(5)
+        return FakeResponse({"response": self._text})
 
-    engine = _make_engine(
-        llm_provider="ollama",
-        llm_model="llama3.2:1b",
-        max_expansions=3,
-        synonyms_enabled=False,
-        stemming_enabled=False,
-    )
+    def close(self):
+        return None
+
+
+def _ollama_engine(**overrides):
+    settings = {
+        "llm_provider": "ollama",
+        "llm_model": "llama3.2:1b",
+        "max_expansions": 3,
+        "synonyms_enabled": False,
+        "stemming_enabled": False,
+    }
+    settings.update(overrides)
+    return _make_engine(**settings)
+
+
+def test_query_expansion_llm_ollama():
+    engine = _ollama_engine()
+    engine._http = FakeSession()
 
     result = engine.expand("reliable search")
 
-    assert captured["url"].endswith("/api/generate")
-    assert captured["payload"]["model"] == "llama3.2:1b"
+    [call] = engine._http.calls
+    assert call["url"].endswith("/api/generate")
+    assert call["payload"]["model"] == "llama3.2:1b"
     assert len(result.expanded_queries) == 2
     assert all(step["step"] == "llm_rewrite" for step in result.applied_steps)
+    assert result.llm_source == "llm"
+    engine.close()
+
+
+def test_ollama_rewrites_are_cached_per_normalized_query():
+    engine = _ollama_engine()
+    session = engine._http = FakeSession()
+
+    first = engine.expand("Reliable  search")
+    second = engine.expand("reliable search")
+
+    assert len(session.calls) == 1
+    assert second.expanded_queries == first.expanded_queries
+    assert second.to_metadata()["llm_source"] == "cache"
+    assert {step["source"] for step in second.applied_steps} == {"cache"}
+    engine.close()
+
+
+def test_ollama_over_budget_falls_back_and_fills_cache_in_background():
+    gate = threading.Event()
+    engine = _ollama_engine(llm_budget_seconds=0.01, synonyms_enabled=True, max_expansions=6)
+    session = engine._http = FakeSession(gate=gate)
+
+    result = engine.expand("reliable performance")
+
+    assert result.llm_source == "timeout"
+    assert result.expanded_queries  # rule-based synonyms still apply
+    assert all(step["step"] != "llm_rewrite" for step in result.applied_steps)
+
+    # A concurrent search for the same query joins the call in flight.
+    assert engine.expand("reliable performance").llm_source == "timeout"
+    gate.set()
+    deadline = time.monotonic() + 5
+    while engine._inflight and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    cached = engine.expand("reliable performance")
+    assert cached.llm_source == "cache"
+    assert "robust query handling" in cached.expanded_queries
+    assert len(session.calls) == 1
+    engine.close()
+
+
+def test_expansion_cache_is_bounded_and_expires(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr("core.services.query_expansion.time.monotonic", lambda: clock[0])
+    cache = ExpansionCache(ttl_seconds=10, max_entries=2)
+
+    cache.set("a", ["1"])
+    cache.set("b", ["2"])
+    assert cache.get("a") == ["1"]  # refreshes "a"
+    cache.set("c", ["3"])
+
+    assert cache.get("b") is None
+    assert len(cache) == 2
+    clock[0] += 11
+    assert cache.get("a") is None
@@ -0,0 +1,73 @@
+import threading
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine, text
+
+from core.db import query_stats
+from core.db.query_stats import QueryStats, collect_queries, statement_shape
+
+
+def test_statement_shape_collapses_parameters_literals_and_in_lists():
+    a = statement_shape("SELECT * FROM keywords WHERE keyword_id IN (%(id_1)s, %(id_2)s, %(id_3)s) AND x = 'a'")
+    b = statement_shape("SELECT *\n  FROM keywords WHERE keyword_id IN (%(id_1)s) AND x = 'it''s'")
+    assert a == b == "SELECT * FROM keywords WHERE keyword_id IN (?) AND x = ?"
+    assert statement_shape("SELECT 1 LIMIT 20") == statement_shape("SELECT 2 LIMIT 50")
+
+
+def test_repeated_shapes_and_server_timing():
+    stats = QueryStats()
+    for memory_id in range(12):
+        stats.record(f"SELECT * FROM memory_blocks WHERE id = {memory_id}", 0.001)
+    stats.record("SELECT count(*) FROM agents", 0.002)
+
+    assert stats.count == 13
+    assert stats.repeated(10) == [("SELECT * FROM memory_blocks WHERE id = ?", 12)]
+    assert stats.repeated(20) == []
+    assert stats.server_timing() == 'db;dur=14.0;desc="13 queries"'
+    assert "12 x SELECT * FROM memory_blocks" in stats.describe()
+
+
+def test_collectors_only_see_their_own_context():
+    engine = create_engine("sqlite://")
+    with engine.connect() as conn:
+        with collect_queries() as outer:
+            conn.execute(text("SELECT 1"))
+            with collect_queries() as inner:
+                conn.execute(text("SELECT 2"))
+        conn.execute(text("SELECT 3"))
+
+    assert inner.count == 1
+    assert outer.count == 1
+
+
+def test_bound_collector_counts_other_threads():
+    engine = create_engine("sqlite://")
+
+    def _query():
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    with collect_queries(bind=engine) as stats:
+        worker = threading.Thread(target=_query)
+        worker.start()
+        worker.join()
+    _query()
+
+    assert stats.count == 1
+
+
+def test_bound_collector_times_overlapping_statements_per_connection(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'stats.db'}")
+    ticks = iter([0.0, 10.0, 11.0, 20.0])
+    monkeypatch.setattr(query_stats, "time", SimpleNamespace(perf_counter=lambda: next(ticks)))
+
+    with engine.connect() as outer, engine.connect() as inner:
+        # A statement on ``inner`` starts and ends while one on ``outer`` runs.
+        outer.connection.driver_connection.create_function(
+            "nested", 0, lambda: inner.exec_driver_sql("SELECT 1").scalar()
+        )
+        with collect_queries(bind=engine) as stats:
+            outer.exec_driver_sql("SELECT nested()")
+
+    assert stats.count == 2
+    assert stats.duration_seconds == 21.0
@@ -131,6 +131,7 @@ class TestSearchService:
 
         query_mock = MagicMock()
         query_mock.filter.return_value = query_mock
+        query_mock.options.return_value = query_mock
         query_mock.order_by.return_value = query_mock
         query_mock.limit.return_value = query_mock
         query_mock.all.return_value = [(MagicMock(keywords=[]), 0.86)]
@@ -79,6 +79,9 @@ def test_semantic_search_handles_query_failure(monkeypatch):
         def filter(self, *args, **kwargs):
             return self
 
+        def options(self, *args, **kwargs):
+            return self
+
         def order_by(self, *args, **kwargs):
             return self
 
@@ -117,6 +120,9 @@ def test_semantic_search_interprets_threshold(monkeypatch):
         def filter(self, *args, **kwargs):
             return self
 
+        def options(self, *args, **kwargs):
+            return self
+
         def order_by(self, *args, **kwargs):
             return self
 
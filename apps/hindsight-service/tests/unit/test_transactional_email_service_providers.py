@@ -41,6 +41,36 @@ async def test_resend_provider_success(monkeypatch):
     assert out["success"] is True and out["provider"] == "resend"
 
 
+@pytest.mark.asyncio
+async def test_provider_calls_do_not_block_the_event_loop(monkeypatch):
+    import asyncio
+    import threading
+
+    monkeypatch.setenv("EMAIL_PROVIDER", "resend")
+    monkeypatch.setenv("FROM_EMAIL", "noreply@example.com")
+    monkeypatch.setenv("RESEND_API_KEY", "rk")
+
+    # Each send waits for the other one: this only completes if the two SDK
+    # calls run at the same time, i.e. off the event loop.
+    both_sending = threading.Barrier(2, timeout=5)
+    resend_mod = ModuleType("resend")
+    class _Emails:
+        @staticmethod
+        def send(data):
+            both_sending.wait()
+            return {"id": data["to"][0]}
+    resend_mod.api_key = None
+    resend_mod.Emails = _Emails
+    monkeypatch.setitem(sys.modules, "resend", resend_mod)
+
+    svc = TransactionalEmailService()
+    results = await asyncio.gather(
+        svc.send_email("a@example.com", "S", "<b>A</b>"),
+        svc.send_email("b@example.com", "S", "<b>B</b>"),
+    )
+    assert [r["message_id"] for r in results] == ["a@example.com", "b@example.com"]
+
+
 @pytest.mark.asyncio
 async def test_resend_provider_success_async(monkeypatch):
     monkeypatch.setenv("EMAIL_PROVIDER", "resend")